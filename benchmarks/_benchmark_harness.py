@@ -0,0 +1,128 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import Callable, List, Dict, Any, Optional
+import os
+import sys
+import argparse
+import datetime
+import gc
+import json
+import platform
+import statistics
+import time
+from sidein.SideinConstants import SideinConstants
+
+
+class Benchmark:
+    """
+    A single named benchmark.
+
+    The 'setup' function is called once before the benchmark is measured. It must return a function which performs
+     the measured operation the number of times passed to it in its only argument.
+    """
+
+    __slots__ = "name", "setup"
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[int], None]]):
+        self.name: str = name
+        self.setup: Callable[[], Callable[[int], None]] = setup
+
+
+def _time_iterations(run: Callable[[int], None], iterations: int) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        run(iterations)
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure_benchmark(benchmark: Benchmark, repeat: int, min_time: float) -> Dict[str, Any]:
+    run = benchmark.setup()
+
+    # Calibrate the number of iterations, so that each sample takes at least 'min_time' seconds
+    iterations = 1
+    while True:
+        elapsed = _time_iterations(run, iterations)
+        if elapsed >= min_time:
+            break
+        iterations = max(iterations * 2, int(iterations * min_time / max(elapsed, 1e-9) * 1.2))
+
+    samples_ns_per_op = [(_time_iterations(run, iterations) * 1_000_000_000 / iterations) for _ in range(repeat)]
+
+    return {
+        "iterations": iterations,
+        "ns_per_op": {
+            "min": min(samples_ns_per_op),
+            "median": statistics.median(samples_ns_per_op),
+            "mean": statistics.mean(samples_ns_per_op),
+            "max": max(samples_ns_per_op),
+        },
+        "samples_ns_per_op": samples_ns_per_op,
+    }
+
+
+def run_benchmarks(benchmarks: List[Benchmark], repeat: int, min_time: float, name_filter: Optional[str]) -> Dict[str, Any]:
+    results = {}
+    for benchmark in benchmarks:
+        if name_filter is not None and name_filter not in benchmark.name:
+            continue
+
+        result = measure_benchmark(benchmark, repeat, min_time)
+        results[benchmark.name] = result
+        print("{:<60} {:>12.1f} ns/op (median {:.1f})".format(benchmark.name, result["ns_per_op"]["min"], result["ns_per_op"]["median"]), file=sys.stderr)
+
+    return {
+        "format_version": 1,
+        "metadata": {
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "sidein_version": SideinConstants.LIBRARY_VERSION,
+            "python_implementation": platform.python_implementation(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def main(benchmarks: List[Benchmark]) -> None:
+    parser = argparse.ArgumentParser(description="Runs Sidein benchmarks and optionally saves their results in a JSON file (which can be compared with another one using compare_benchmarks.py).")
+    parser.add_argument("-o", "--output", help="The JSON file to save the results to.")
+    parser.add_argument("-f", "--filter", help="Run only the benchmarks whose names contain this string.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="The number of samples taken of each benchmark (default: %(default)s).")
+    parser.add_argument("-t", "--min-time", type=float, default=0.2, help="The minimum duration of a single sample in seconds (default: %(default)s).")
+    args = parser.parse_args()
+
+    report = run_benchmarks(benchmarks, args.repeat, args.min_time, args.filter)
+
+    if args.output is not None:
+        with open(args.output, "w") as output_io:
+            json.dump(report, output_io, indent=2)
+            output_io.write("\n")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import os.path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from typing import Callable
+from sidein.Sidein import Sidein
+from _benchmark_harness import Benchmark, main
+
+
+NAMESPACE_NAME = "cz.vitlabuda.sidein.benchmark_001.namespace"
+
+
+def _setup_sidein_ns() -> Callable[[int], None]:
+    Sidein.ns(NAMESPACE_NAME)
+
+    def _run(iterations: int) -> None:
+        ns = Sidein.ns
+        for _ in range(iterations):
+            ns(NAMESPACE_NAME)
+
+    return _run
+
+
+def _setup_namespace_manager_get_namespace() -> Callable[[int], None]:
+    Sidein.ns(NAMESPACE_NAME)
+    get_namespace = Sidein.get_namespace_manager().get_namespace
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            get_namespace(NAMESPACE_NAME)
+
+    return _run
+
+
+def _setup_get_dependency() -> Callable[[int], None]:
+    ns = Sidein.ns(NAMESPACE_NAME)
+    ns.get_dependency_provider().add_or_replace_dependency("dependency", object())
+    get_dependency = ns.get_dependency
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            get_dependency("dependency")
+
+    return _run
+
+
+BENCHMARKS = [
+    Benchmark("namespace_lookup/Sidein.ns", _setup_sidein_ns),
+    Benchmark("namespace_lookup/nsmgr.get_namespace", _setup_namespace_manager_get_namespace),
+    Benchmark("namespace_lookup/ns.get_dependency", _setup_get_dependency),
+]
+
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import os.path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from typing import Callable
+from sidein.Sidein import Sidein
+from _benchmark_harness import Benchmark, main
+
+
+NAMESPACE_NAME = "cz.vitlabuda.sidein.benchmark_002.namespace"
+DEPENDENCY_NAMES = ("first_dependency", "second_dependency", "third_dependency")
+
+
+def _prepare_namespace() -> None:
+    container = Sidein.ns(NAMESPACE_NAME).get_dependency_provider()
+    for name in DEPENDENCY_NAMES:
+        container.add_or_replace_dependency(name, object())
+
+
+def _setup_undecorated_baseline() -> Callable[[int], None]:
+    dependencies = {name: object() for name in DEPENDENCY_NAMES}
+
+    def _function(argument, first_dependency, second_dependency, third_dependency):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1, **dependencies)
+
+    return _run
+
+
+def _setup_kwargs_injection() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).inject_dependencies(*DEPENDENCY_NAMES, as_kwargs=True)
+    def _function(argument, first_dependency, second_dependency, third_dependency):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+def _setup_positional_injection() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).inject_dependencies(*DEPENDENCY_NAMES, as_kwargs=False)
+    def _function(argument, first_dependency, second_dependency, third_dependency):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+def _setup_obtainer_injection() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).inject_dependencies(*DEPENDENCY_NAMES, in_obtainers=True)
+    def _function(argument, first_dependency, second_dependency, third_dependency):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+def _setup_obtainer_injection_with_obtaining() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).inject_dependencies(*DEPENDENCY_NAMES, in_obtainers=True)
+    def _function(argument, first_dependency, second_dependency, third_dependency):
+        first_dependency.obtain_dependency()
+        second_dependency.obtain_dependency()
+        third_dependency.obtain_dependency()
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+BENCHMARKS = [
+    Benchmark("injection/undecorated_baseline", _setup_undecorated_baseline),
+    Benchmark("injection/kwargs", _setup_kwargs_injection),
+    Benchmark("injection/positional", _setup_positional_injection),
+    Benchmark("injection/obtainers", _setup_obtainer_injection),
+    Benchmark("injection/obtainers_obtained", _setup_obtainer_injection_with_obtaining),
+]
+
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import os.path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from typing import Callable
+import asyncio
+import functools
+from sidein.Sidein import Sidein
+from _benchmark_harness import Benchmark, main
+
+
+NAMESPACE_NAME = "cz.vitlabuda.sidein.benchmark_003.namespace"
+
+
+def _passthrough_decorator(func):
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return _wrapper
+
+
+def _async_passthrough_decorator(async_func):
+    @functools.wraps(async_func)
+    async def _async_wrapper(*args, **kwargs):
+        return await async_func(*args, **kwargs)
+
+    return _async_wrapper
+
+
+def _prepare_namespace() -> None:
+    container = Sidein.ns(NAMESPACE_NAME).get_dependency_provider()
+    container.add_or_replace_dependency("decorator", _passthrough_decorator)
+    container.add_or_replace_dependency("async_decorator", _async_passthrough_decorator)
+
+
+def _setup_sync_undecorated_baseline() -> Callable[[int], None]:
+    @_passthrough_decorator
+    def _function(argument):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+def _setup_sync_decoration() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).decorate_with_dependency("decorator")
+    def _function(argument):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+def _setup_sync_decoration_with_extractor() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).decorate_with_dependency("decorator", lambda dependency: dependency)
+    def _function(argument):
+        return argument
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            _function(1)
+
+    return _run
+
+
+def _make_async_runner(async_function: Callable) -> Callable[[int], None]:
+    loop = asyncio.new_event_loop()
+
+    async def _batch(iterations: int) -> None:
+        for _ in range(iterations):
+            await async_function(1)
+
+    def _run(iterations: int) -> None:
+        loop.run_until_complete(_batch(iterations))
+
+    return _run
+
+
+def _setup_async_undecorated_baseline() -> Callable[[int], None]:
+    @_async_passthrough_decorator
+    async def _async_function(argument):
+        return argument
+
+    return _make_async_runner(_async_function)
+
+
+def _setup_async_decoration() -> Callable[[int], None]:
+    _prepare_namespace()
+
+    @Sidein.ns(NAMESPACE_NAME).decorate_with_dependency("async_decorator")
+    async def _async_function(argument):
+        return argument
+
+    return _make_async_runner(_async_function)
+
+
+BENCHMARKS = [
+    Benchmark("decoration/sync_undecorated_baseline", _setup_sync_undecorated_baseline),
+    Benchmark("decoration/sync", _setup_sync_decoration),
+    Benchmark("decoration/sync_with_extractor", _setup_sync_decoration_with_extractor),
+    Benchmark("decoration/async_undecorated_baseline", _setup_async_undecorated_baseline),
+    Benchmark("decoration/async", _setup_async_decoration),
+]
+
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import os.path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from typing import Callable
+from sidein.Sidein import Sidein
+from sidein.providers.simplecontainer.SimpleContainerInterface import SimpleContainerInterface
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.ThreadLocalSimpleContainer import ThreadLocalSimpleContainer
+from _benchmark_harness import Benchmark, main
+
+
+NAMESPACE_NAME = "cz.vitlabuda.sidein.benchmark_004.namespace"
+DEPENDENCY_COUNT = 1000
+
+
+def _fill_container(container: SimpleContainerInterface) -> SimpleContainerInterface:
+    for index in range(DEPENDENCY_COUNT):
+        container.add_dependency("dependency_{}".format(index), object())
+
+    return container
+
+
+def _make_container_read_runner(container: SimpleContainerInterface) -> Callable[[int], None]:
+    get_dependency = container.get_dependency
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            get_dependency("dependency_500")
+
+    return _run
+
+
+def _make_namespace_read_runner(container: SimpleContainerInterface) -> Callable[[int], None]:
+    ns = Sidein.ns(NAMESPACE_NAME)
+    ns.set_dependency_provider(container)
+    get_dependency = ns.get_dependency
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            get_dependency("dependency_500")
+
+    return _run
+
+
+def _make_container_get_all_runner(container: SimpleContainerInterface) -> Callable[[int], None]:
+    get_all_dependencies = container.get_all_dependencies
+
+    def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            get_all_dependencies()
+
+    return _run
+
+
+BENCHMARKS = [
+    Benchmark("containers/global_simple_container_read", lambda: _make_container_read_runner(_fill_container(GlobalSimpleContainer()))),
+    Benchmark("containers/thread_local_simple_container_read", lambda: _make_container_read_runner(_fill_container(ThreadLocalSimpleContainer()))),
+    Benchmark("containers/global_simple_container_read_via_namespace", lambda: _make_namespace_read_runner(_fill_container(GlobalSimpleContainer()))),
+    Benchmark("containers/thread_local_simple_container_read_via_namespace", lambda: _make_namespace_read_runner(_fill_container(ThreadLocalSimpleContainer()))),
+    Benchmark("containers/global_simple_container_get_all_dependencies", lambda: _make_container_get_all_runner(_fill_container(GlobalSimpleContainer()))),
+]
+
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import os.path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from typing import Callable
+import threading
+from sidein.Sidein import Sidein
+from _benchmark_harness import Benchmark, main
+
+
+NAMESPACE_NAME = "cz.vitlabuda.sidein.benchmark_005.namespace"
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+# The results of these benchmarks are in nanoseconds per operation across all threads, i.e. perfect scaling would
+#  mean that the result doesn't change with the number of threads (with the GIL, the result is expected to get worse
+#  as the threads start contending on the library's locks).
+def _make_multi_threaded_runner(thread_count: int, operation: Callable[[], None]) -> Callable[[int], None]:
+    def _worker(iterations: int, barrier: threading.Barrier) -> None:
+        barrier.wait()
+        for _ in range(iterations):
+            operation()
+
+    def _run(iterations: int) -> None:
+        barrier = threading.Barrier(thread_count)
+        iterations_per_thread = max(iterations // thread_count, 1)
+        threads = [threading.Thread(target=_worker, args=(iterations_per_thread, barrier)) for _ in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return _run
+
+
+def _setup_injection(thread_count: int) -> Callable[[int], None]:
+    ns = Sidein.ns(NAMESPACE_NAME)
+    ns.get_dependency_provider().add_or_replace_dependency("dependency", object())
+
+    @ns.inject_dependencies("dependency")
+    def _function(dependency):
+        return dependency
+
+    return _make_multi_threaded_runner(thread_count, _function)
+
+
+def _setup_sidein_ns(thread_count: int) -> Callable[[int], None]:
+    return _make_multi_threaded_runner(thread_count, lambda: Sidein.ns(NAMESPACE_NAME))
+
+
+BENCHMARKS = [
+    Benchmark("thread_scaling/injection_{}_threads".format(thread_count), (lambda thread_count_=thread_count: _setup_injection(thread_count_))) for thread_count in THREAD_COUNTS
+] + [
+    Benchmark("thread_scaling/sidein_ns_{}_threads".format(thread_count), (lambda thread_count_=thread_count: _setup_sidein_ns(thread_count_))) for thread_count in THREAD_COUNTS
+]
+
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
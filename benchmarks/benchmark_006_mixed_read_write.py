@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os.path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+from typing import Callable
+import threading
+import time
+import itertools
+from sidein.providers.simplecontainer.SimpleContainerInterface import SimpleContainerInterface
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.StripedGlobalSimpleContainer import StripedGlobalSimpleContainer
+from _benchmark_harness import Benchmark, main
+
+
+WRITTEN_NAME = "refreshed_dependency"
+READ_NAME_COUNT = 32
+RELEASE_SECONDS = 0.001  # How long it takes to release a replaced dependency (e.g. to close its connections)
+
+
+class _SlowlyReleasedDependency:
+    # The container drops its reference to a replaced dependency while its lock is held, so the writer holds the lock
+    #  (of the whole container, or of a single stripe) for RELEASE_SECONDS on each replacement
+    def __del__(self):
+        time.sleep(RELEASE_SECONDS)
+
+
+# The results of these benchmarks are in nanoseconds per lookup, measured while a writer thread keeps replacing
+#  another dependency (like a refresher thread would). With the global container, a lookup has to wait whenever the
+#  writer holds the container's lock; with the striped container, the lookups of the dependencies in the other
+#  stripes never wait for the writer.
+def _make_mixed_load_runner(container: SimpleContainerInterface) -> Callable[[int], None]:
+    # The read dependencies are chosen so that none of them is in the written dependency's stripe (of the striped
+    #  container) - contention within a stripe is the same as with the global container
+    stripe_count = StripedGlobalSimpleContainer.DEFAULT_STRIPE_COUNT
+    candidate_names = ("dependency{}".format(i) for i in itertools.count())
+    read_names = tuple(itertools.islice((name for name in candidate_names if hash(name) % stripe_count != hash(WRITTEN_NAME) % stripe_count), READ_NAME_COUNT))
+
+    container.add_dependency(WRITTEN_NAME, _SlowlyReleasedDependency())
+    for name in read_names:
+        container.add_dependency(name, object())
+
+    def _writer(writer_stopped: threading.Event) -> None:
+        while not writer_stopped.is_set():
+            container.replace_dependency(WRITTEN_NAME, _SlowlyReleasedDependency())
+
+    def _run(iterations: int) -> None:
+        writer_stopped = threading.Event()
+        writer = threading.Thread(target=_writer, args=(writer_stopped,))
+        writer.start()
+        try:
+            for i in range(iterations):
+                container.get_dependency(read_names[i % READ_NAME_COUNT])
+        finally:
+            writer_stopped.set()
+            writer.join()
+
+    return _run
+
+
+BENCHMARKS = [
+    Benchmark("mixed_read_write/global_simple_container", lambda: _make_mixed_load_runner(GlobalSimpleContainer())),
+    Benchmark("mixed_read_write/striped_global_simple_container", lambda: _make_mixed_load_runner(StripedGlobalSimpleContainer())),
+]
+
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
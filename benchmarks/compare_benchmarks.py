@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import argparse
+import json
+
+
+# Compares two JSON files produced by run_benchmarks.py (or by the individual benchmark_*.py files) and prints the
+#  change of each benchmark's best (minimum) time per operation. The best time is used, as it is the least affected by
+#  noise from other processes.
+# The script exits with status 1 if any benchmark has slowed down by more than the specified threshold.
+
+
+def _load_results(path: str) -> dict:
+    with open(path, "r") as input_io:
+        report = json.load(input_io)
+
+    if report.get("format_version") != 1:
+        raise ValueError("Unsupported benchmark results format in {}!".format(path))
+
+    return report["results"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares two benchmark result files.")
+    parser.add_argument("baseline", help="The JSON file with the baseline results.")
+    parser.add_argument("candidate", help="The JSON file with the results to compare with the baseline.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="The slowdown (in percent) above which a benchmark is considered to have regressed (default: %(default)s).")
+    args = parser.parse_args()
+
+    baseline_results = _load_results(args.baseline)
+    candidate_results = _load_results(args.candidate)
+
+    regressions = []
+    print("{:<60} {:>14} {:>14} {:>9}".format("benchmark", "baseline ns/op", "candidate ns/op", "change"))
+    for name in sorted(set(baseline_results) | set(candidate_results)):
+        if name not in baseline_results or name not in candidate_results:
+            print("{:<60} {:>14} {:>14} {:>9}".format(name, ("-" if name not in baseline_results else "{:.1f}".format(baseline_results[name]["ns_per_op"]["min"])), ("-" if name not in candidate_results else "{:.1f}".format(candidate_results[name]["ns_per_op"]["min"])), "n/a"))
+            continue
+
+        baseline_ns = baseline_results[name]["ns_per_op"]["min"]
+        candidate_ns = candidate_results[name]["ns_per_op"]["min"]
+        change_percent = (candidate_ns / baseline_ns - 1.0) * 100.0
+        flag = ""
+        if change_percent > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print("{:<60} {:>14.1f} {:>14.1f} {:>+8.1f}%{}".format(name, baseline_ns, candidate_ns, change_percent, flag))
+
+    if regressions:
+        print()
+        print("{} benchmark(s) regressed by more than {}%.".format(len(regressions), args.threshold))
+        raise SystemExit(1)
@@ -29,8 +29,11 @@ from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleC
 
 
 # If you have a decorator stored as a dependency, you can decorate a function with it using a namespace's
-#  decorate_with_dependency() method. Keep in mind that the decorator is acquired and called EACH TIME a decorated
-#  method is called! Both regular functions and coroutines can be decorated in this way.
+#  decorate_with_dependency() method. Keep in mind that the decorator is acquired EACH TIME a decorated method is
+#  called! It's only called again when it differs from the previously acquired one, as the replacement function it
+#  returns is cached - a decorator extractor which creates a new decorator on each call (such as the one in the 2nd
+#  example) therefore causes the decorator to be called each time too. Both regular functions and coroutines can be
+#  decorated in this way.
 
 
 def non_parametrized_decorator(func):
@@ -0,0 +1,162 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Tuple, List
+import sys
+import time
+
+
+@final
+class InstrumentedLock:
+    """
+    A wrapper around a threading.Lock (or threading.RLock) object which records how many times it has been acquired,
+     how long the acquiring threads have waited for it and how long it has been held (in total and per call site).
+
+    As it is a wrapper, an instrumented lock can replace the lock it wraps even while the wrapped lock is in use - the
+     mutual exclusion is still provided by the wrapped lock.
+
+    Used by the lock profiler (see LockProfiler).
+    """
+
+    # All the statistics are updated while the wrapped lock is being held, so no additional locking is necessary.
+    # Reading them from another thread may produce a slightly inconsistent snapshot, which is fine for a debugging tool.
+
+    __slots__ = "_inner_lock", "_lock_name", "_acquisition_count", "_contended_acquisition_count", "_total_wait_ns", \
+                "_max_wait_ns", "_total_hold_ns", "_max_hold_ns", "_call_site_hold_stats", "_depth", "_acquired_at_ns", \
+                "_holder_call_site"
+
+    def __init__(self, inner_lock: Any, lock_name: str):
+        self._inner_lock: Any = inner_lock
+        self._lock_name: str = lock_name
+
+        self._acquisition_count: int = 0
+        self._contended_acquisition_count: int = 0
+        self._total_wait_ns: int = 0
+        self._max_wait_ns: int = 0
+        self._total_hold_ns: int = 0
+        self._max_hold_ns: int = 0
+        self._call_site_hold_stats: Dict[str, List[int]] = {}  # {call site: [hold count, total hold ns, max hold ns]}
+
+        self._depth: int = 0  # Greater than 1 only when a wrapped RLock is acquired recursively
+        self._acquired_at_ns: int = 0
+        self._holder_call_site: str = ""
+
+    def get_inner_lock(self) -> Any:
+        return self._inner_lock
+
+    def get_lock_name(self) -> str:
+        return self._lock_name
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self._acquire(blocking, timeout, sys._getframe(1))
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            hold_ns = time.perf_counter_ns() - self._acquired_at_ns
+
+            self._total_hold_ns += hold_ns
+            self._max_hold_ns = max(self._max_hold_ns, hold_ns)
+
+            call_site_stats = self._call_site_hold_stats.get(self._holder_call_site)
+            if call_site_stats is None:
+                call_site_stats = [0, 0, 0]
+                self._call_site_hold_stats[self._holder_call_site] = call_site_stats
+            call_site_stats[0] += 1
+            call_site_stats[1] += hold_ns
+            call_site_stats[2] = max(call_site_stats[2], hold_ns)
+
+        self._inner_lock.release()
+
+    def locked(self) -> bool:
+        return self._inner_lock.locked()
+
+    def __enter__(self) -> bool:
+        return self._acquire(True, -1, sys._getframe(1))
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    def _acquire(self, blocking: bool, timeout: float, caller_frame: Any) -> bool:
+        wait_start_ns = time.perf_counter_ns()
+
+        # A non-blocking attempt is made first, so that contended acquisitions can be told apart from uncontended ones
+        is_contended = False
+        acquired = self._inner_lock.acquire(False)
+        if not acquired and blocking:
+            is_contended = True
+            acquired = self._inner_lock.acquire(True, timeout)
+
+        if not acquired:
+            return False
+
+        acquired_at_ns = time.perf_counter_ns()
+        wait_ns = acquired_at_ns - wait_start_ns
+
+        self._acquisition_count += 1
+        if is_contended:
+            self._contended_acquisition_count += 1
+        self._total_wait_ns += wait_ns
+        self._max_wait_ns = max(self._max_wait_ns, wait_ns)
+
+        if self._depth == 0:
+            self._acquired_at_ns = acquired_at_ns
+            self._holder_call_site = self._describe_call_site(caller_frame)
+        self._depth += 1
+
+        return True
+
+    @staticmethod
+    def _describe_call_site(frame: Any) -> str:
+        code = frame.f_code
+        function_name = getattr(code, "co_qualname", code.co_name)  # co_qualname is available since Python 3.11
+
+        return "{}:{} ({})".format(code.co_filename, frame.f_lineno, function_name)
+
+    def reset_statistics(self) -> None:
+        self._acquisition_count = 0
+        self._contended_acquisition_count = 0
+        self._total_wait_ns = 0
+        self._max_wait_ns = 0
+        self._total_hold_ns = 0
+        self._max_hold_ns = 0
+        self._call_site_hold_stats = {}
+
+    def export_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the statistics recorded by this lock in a dictionary. The times are in nanoseconds.
+        """
+
+        call_site_hold_stats: List[Tuple[str, List[int]]] = list(self._call_site_hold_stats.items())
+
+        return {
+            "lock_name": self._lock_name,
+            "acquisition_count": self._acquisition_count,
+            "contended_acquisition_count": self._contended_acquisition_count,
+            "total_wait_ns": self._total_wait_ns,
+            "max_wait_ns": self._max_wait_ns,
+            "total_hold_ns": self._total_hold_ns,
+            "max_hold_ns": self._max_hold_ns,
+            "call_sites": {
+                call_site: {"hold_count": stats[0], "total_hold_ns": stats[1], "max_hold_ns": stats[2]} for call_site, stats in call_site_hold_stats
+            },
+        }
@@ -0,0 +1,117 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable
+from sidein.Sidein import Sidein
+from sidein._ThreadSafeSidein import _ThreadSafeSidein
+from sidein.nsmgr._NamespaceManager import _NamespaceManager
+from sidein.ns._Namespace import _Namespace
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.StripedGlobalSimpleContainer import StripedGlobalSimpleContainer
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+from sidein.lockprofiler.LockProfilerReport import LockProfilerReport
+
+
+@final
+class LockProfiler:
+    """
+    A debug mode which swaps the locks guarding the library's objects (Sidein._SIDEIN_LOCK,
+     _NamespaceManager._nsmgr_lock, _Namespace._lock, GlobalSimpleContainer._sc_lock and the stripe locks of
+     StripedGlobalSimpleContainer) for instrumented ones, which record how many times they have been acquired, how long
+     threads have waited for them and how long (and where) they have been held.
+
+    While enabled, the locks of the existing namespaces (and of their global simple containers) are instrumented, as
+     well as the locks of any objects created afterwards. Instrumentation adds overhead to each lock acquisition, so the
+     profiler should not be left enabled in production.
+    """
+
+    @classmethod
+    def enable(cls) -> None:
+        _LockRegistry.set_profiling_enabled(True)
+        cls._swap_locks(_LockRegistry.instrument_lock)
+
+    @classmethod
+    def disable(cls) -> None:
+        """
+        Swaps the instrumented locks back for the original ones. The statistics recorded so far are kept, so that a
+         report can still be generated.
+        """
+
+        _LockRegistry.set_profiling_enabled(False)
+        cls._swap_locks(lambda lock, _: _LockRegistry.uninstrument_lock(lock))
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return _LockRegistry.is_profiling_enabled()
+
+    @classmethod
+    def generate_report(cls) -> LockProfilerReport:
+        return LockProfilerReport([lock.export_statistics() for lock in _LockRegistry.get_instrumented_locks()])
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Resets the statistics of the instrumented locks which are currently in use, and forgets the ones which are not
+         (e.g. the locks of removed namespaces, or all of them if the profiler is disabled).
+        """
+
+        _LockRegistry.forget_instrumented_locks()
+        cls._swap_locks(cls._reregister_lock)
+
+    @classmethod
+    def _reregister_lock(cls, lock: Any, lock_name: str) -> Any:
+        if not _LockRegistry.is_profiling_enabled():
+            return _LockRegistry.uninstrument_lock(lock)
+
+        return _LockRegistry.instrument_lock(_LockRegistry.uninstrument_lock(lock), lock_name)
+
+    @classmethod
+    def _swap_locks(cls, swap_func: Callable[[Any, str], Any]) -> None:
+        # An instrumented lock wraps the original one, so the locks can be swapped even while they are being held - the
+        #  mutual exclusion is still provided by the original lock objects.
+        Sidein._SIDEIN_LOCK = swap_func(Sidein._SIDEIN_LOCK, "Sidein._SIDEIN_LOCK")
+
+        namespace_manager = _ThreadSafeSidein._namespace_manager
+        if not isinstance(namespace_manager, _NamespaceManager):
+            return
+
+        namespaces = namespace_manager.get_all_namespaces()
+        namespace_manager._nsmgr_lock = swap_func(namespace_manager._nsmgr_lock, "_NamespaceManager._nsmgr_lock")
+
+        for namespace in namespaces.values():
+            if not isinstance(namespace, _Namespace):
+                continue
+
+            # The provider is retrieved before the namespace's lock is swapped, so that the retrieval doesn't show up
+            #  in the statistics
+            dependency_provider = namespace.get_dependency_provider()
+            namespace._lock = swap_func(namespace._lock, "_Namespace._lock[{}]".format(namespace.get_name()))
+
+            if isinstance(dependency_provider, GlobalSimpleContainer):
+                dependency_provider._sc_lock = swap_func(dependency_provider._sc_lock, "GlobalSimpleContainer._sc_lock[{}]".format(hex(id(dependency_provider))))
+            elif isinstance(dependency_provider, StripedGlobalSimpleContainer):
+                dependency_provider._stripe_locks = tuple(
+                    swap_func(stripe_lock, "StripedGlobalSimpleContainer._stripe_locks[{}][{}]".format(hex(id(dependency_provider)), index)) for index, stripe_lock in enumerate(dependency_provider._stripe_locks)
+                )
+
+    def __init__(self):
+        raise NotImplementedError("{} is not supposed to be instantiated!".format(LockProfiler.__qualname__))
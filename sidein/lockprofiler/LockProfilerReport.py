@@ -0,0 +1,98 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, List
+
+
+@final
+class LockProfilerReport:
+    """
+    A snapshot of the statistics recorded by the instrumented locks, ranked from the "hottest" lock (the one which
+     threads have spent the most time waiting for) to the coolest one. The call sites of each lock are ranked by the
+     total time they have held it.
+    """
+
+    __slots__ = "_lock_statistics",
+
+    def __init__(self, lock_statistics: List[Dict[str, Any]]):
+        self._lock_statistics: List[Dict[str, Any]] = sorted(
+            lock_statistics,
+            key=lambda stats: (stats["total_wait_ns"], stats["total_hold_ns"]),
+            reverse=True
+        )
+
+    def get_ranked_lock_statistics(self) -> List[Dict[str, Any]]:
+        """
+        Returns the statistics of each instrumented lock (as returned by InstrumentedLock.export_statistics()), hottest first.
+        """
+
+        return self._lock_statistics.copy()
+
+    def get_longest_holding_call_sites(self, lock_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Returns up to 'limit' call sites which have held the specified lock for the longest total time, longest first.
+
+        :param lock_name: The name of the lock whose call sites should be returned.
+        :param limit: The maximum number of returned call sites.
+        :return: A list of dictionaries with the keys "call_site", "hold_count", "total_hold_ns" and "max_hold_ns".
+        """
+
+        call_sites = []
+        for stats in self._lock_statistics:
+            if stats["lock_name"] == lock_name:
+                call_sites.extend({"call_site": call_site, **call_site_stats} for call_site, call_site_stats in stats["call_sites"].items())
+
+        call_sites.sort(key=lambda call_site_stats: call_site_stats["total_hold_ns"], reverse=True)
+        return call_sites[:limit]
+
+    def export_as_dict(self) -> Dict[str, Any]:
+        return {"locks": self.get_ranked_lock_statistics()}
+
+    def export_as_text(self, lock_limit: int = 10, call_site_limit: int = 5) -> str:
+        """
+        Returns a human-readable version of the report, containing up to 'lock_limit' hottest locks and up to
+         'call_site_limit' longest-holding call sites of each of them.
+        """
+
+        lines = []
+        for rank, stats in enumerate(self._lock_statistics[:lock_limit], start=1):
+            lines.append("#{} {}: {} acquisitions ({} contended), wait total {:.3f} ms / max {:.3f} ms, hold total {:.3f} ms / max {:.3f} ms".format(
+                rank,
+                stats["lock_name"],
+                stats["acquisition_count"],
+                stats["contended_acquisition_count"],
+                stats["total_wait_ns"] / 1_000_000,
+                stats["max_wait_ns"] / 1_000_000,
+                stats["total_hold_ns"] / 1_000_000,
+                stats["max_hold_ns"] / 1_000_000
+            ))
+
+            call_sites = sorted(stats["call_sites"].items(), key=lambda item: item[1]["total_hold_ns"], reverse=True)
+            for call_site, call_site_stats in call_sites[:call_site_limit]:
+                lines.append("    {}: held {} times, total {:.3f} ms / max {:.3f} ms".format(
+                    call_site,
+                    call_site_stats["hold_count"],
+                    call_site_stats["total_hold_ns"] / 1_000_000,
+                    call_site_stats["max_hold_ns"] / 1_000_000
+                ))
+
+        return "\n".join(lines)
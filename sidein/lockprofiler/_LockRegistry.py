@@ -0,0 +1,93 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, List
+import threading
+from sidein.lockprofiler.InstrumentedLock import InstrumentedLock
+
+
+@final
+class _LockRegistry:
+    """
+    Creates the locks guarding the library's objects and keeps track of the instrumented ones.
+    While the lock profiler is enabled, newly created locks are instrumented (see LockProfiler).
+    """
+
+    _REGISTRY_LOCK: threading.Lock = threading.Lock()
+    _profiling_enabled: bool = False
+    _instrumented_locks: List[InstrumentedLock] = []
+
+    @classmethod
+    def create_lock(cls, lock_name: str) -> Any:
+        # Reading the flag without locking is fine - it only decides whether the new lock is going to be instrumented
+        if not cls._profiling_enabled:
+            return threading.Lock()
+
+        return cls.instrument_lock(threading.Lock(), lock_name)
+
+    @classmethod
+    def create_rlock(cls, lock_name: str) -> Any:
+        if not cls._profiling_enabled:
+            return threading.RLock()
+
+        return cls.instrument_lock(threading.RLock(), lock_name)
+
+    @classmethod
+    def instrument_lock(cls, lock: Any, lock_name: str) -> InstrumentedLock:
+        if isinstance(lock, InstrumentedLock):
+            return lock
+
+        instrumented_lock = InstrumentedLock(lock, lock_name)
+        with cls._REGISTRY_LOCK:
+            cls._instrumented_locks.append(instrumented_lock)
+
+        return instrumented_lock
+
+    @classmethod
+    def uninstrument_lock(cls, lock: Any) -> Any:
+        if isinstance(lock, InstrumentedLock):
+            return lock.get_inner_lock()
+
+        return lock
+
+    @classmethod
+    def set_profiling_enabled(cls, enabled: bool) -> None:
+        with cls._REGISTRY_LOCK:
+            cls._profiling_enabled = enabled
+
+    @classmethod
+    def is_profiling_enabled(cls) -> bool:
+        with cls._REGISTRY_LOCK:
+            return cls._profiling_enabled
+
+    @classmethod
+    def get_instrumented_locks(cls) -> List[InstrumentedLock]:
+        with cls._REGISTRY_LOCK:
+            return cls._instrumented_locks.copy()
+
+    @classmethod
+    def forget_instrumented_locks(cls) -> None:
+        with cls._REGISTRY_LOCK:
+            cls._instrumented_locks.clear()
+
+    def __init__(self):
+        raise NotImplementedError("{} is not supposed to be instantiated!".format(_LockRegistry.__qualname__))
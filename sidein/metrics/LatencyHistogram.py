@@ -0,0 +1,75 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Tuple, Dict, Any, List
+import bisect
+
+
+@final
+class LatencyHistogram:
+    """
+    A fixed-bucket histogram of durations, laid out in the same way as Prometheus histograms.
+    The durations are observed in nanoseconds, but exported in seconds.
+
+    This class is NOT thread-safe - its users are responsible for locking.
+    """
+
+    __slots__ = "_bucket_bounds_seconds", "_bucket_bounds_ns", "_bucket_counts", "_count", "_sum_ns"
+
+    def __init__(self, bucket_bounds_seconds: Tuple[float, ...]):
+        self._bucket_bounds_seconds: Tuple[float, ...] = tuple(sorted(bucket_bounds_seconds))
+        self._bucket_bounds_ns: Tuple[int, ...] = tuple(int(bound * 1_000_000_000) for bound in self._bucket_bounds_seconds)
+        self._bucket_counts: List[int] = [0] * (len(self._bucket_bounds_ns) + 1)  # The last bucket is "+Inf"
+        self._count: int = 0
+        self._sum_ns: int = 0
+
+    def observe_ns(self, duration_ns: int) -> None:
+        self._bucket_counts[bisect.bisect_left(self._bucket_bounds_ns, duration_ns)] += 1
+        self._count += 1
+        self._sum_ns += duration_ns
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_sum_seconds(self) -> float:
+        return self._sum_ns / 1_000_000_000
+
+    def get_cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """
+        Returns the histogram's buckets as (upper bound in seconds, cumulative count) tuples, the last bucket's upper
+         bound being float("inf").
+        """
+
+        cumulative_buckets = []
+        cumulative_count = 0
+        for bound, count in zip(self._bucket_bounds_seconds + (float("inf"),), self._bucket_counts):
+            cumulative_count += count
+            cumulative_buckets.append((bound, cumulative_count))
+
+        return cumulative_buckets
+
+    def export_as_dict(self) -> Dict[str, Any]:
+        return {
+            "buckets": {("+Inf" if bound == float("inf") else bound): count for bound, count in self.get_cumulative_buckets()},
+            "count": self._count,
+            "sum_seconds": self.get_sum_seconds(),
+        }
@@ -0,0 +1,57 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import Optional
+import abc
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+
+
+class MetricsCapableInterface(metaclass=abc.ABCMeta):
+    """
+    Objects implementing this interface are able to record metrics about the dependency resolutions they perform into
+     a metrics recorder.
+
+    Metrics recording is opt-in - no metrics recorder is set by default, and as long as it stays that way, the
+     resolutions don't pay for any time measurements.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_metrics_recorder(self) -> Optional[MetricsRecorder]:
+        """
+        Returns the metrics recorder used by this object, or None if metrics recording is disabled.
+
+        :return: The metrics recorder used by this object, or None if metrics recording is disabled.
+        """
+
+        raise NotImplementedError(MetricsCapableInterface.get_metrics_recorder.__qualname__)
+
+    @abc.abstractmethod
+    def set_metrics_recorder(self, metrics_recorder: Optional[MetricsRecorder]) -> None:
+        """
+        Sets a metrics recorder to be used by this object. Passing None disables metrics recording.
+
+        :param metrics_recorder: The new metrics recorder, or None to disable metrics recording.
+        """
+
+        raise NotImplementedError(MetricsCapableInterface.set_metrics_recorder.__qualname__)
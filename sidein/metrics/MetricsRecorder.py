@@ -0,0 +1,139 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Tuple, Dict, Any, Optional
+import threading
+from sidein.metrics._DependencyMetrics import _DependencyMetrics
+
+
+@final
+class MetricsRecorder:
+    """
+    Collects per-dependency metrics from the namespaces and dependency containers it is attached to (see
+     MetricsCapableInterface):
+      - resolution count - the number of times the dependency was requested from a dependency provider
+      - miss count - how many of those requests ended with a DependencyProviderException (e.g. "not found")
+      - provider latency - a histogram of the time spent in the dependency provider
+      - lock wait - a histogram of the time spent waiting for the lock which guards the resolution
+
+    A single metrics recorder should not be attached to a namespace and to its dependency container at the same time,
+     as each resolution would then be counted twice.
+
+    This class is thread-safe.
+    """
+
+    __slots__ = "_lock", "_histogram_bucket_bounds", "_dependency_metrics"
+
+    DEFAULT_HISTOGRAM_BUCKET_BOUNDS: Tuple[float, ...] = (0.000_001, 0.000_01, 0.000_1, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+    def __init__(self, histogram_bucket_bounds: Tuple[float, ...] = DEFAULT_HISTOGRAM_BUCKET_BOUNDS):
+        """
+        :param histogram_bucket_bounds: The upper bounds (in seconds) of the latency histograms' buckets. The "+Inf" bucket is always added automatically.
+        """
+
+        self._lock: threading.Lock = threading.Lock()
+        self._histogram_bucket_bounds: Tuple[float, ...] = tuple(histogram_bucket_bounds)
+        self._dependency_metrics: Dict[str, _DependencyMetrics] = {}
+
+    def record_resolution(self, name: str, provider_latency_ns: int, is_miss: bool) -> None:
+        with self._lock:
+            dependency_metrics = self._get_dependency_metrics_thread_safe(name)
+
+            dependency_metrics.resolution_count += 1
+            if is_miss:
+                dependency_metrics.miss_count += 1
+            dependency_metrics.provider_latency.observe_ns(provider_latency_ns)
+
+    def record_lock_wait(self, name: str, lock_wait_ns: int) -> None:
+        with self._lock:
+            self._get_dependency_metrics_thread_safe(name).lock_wait.observe_ns(lock_wait_ns)
+
+    # This method must be called in a thread-safe context!
+    def _get_dependency_metrics_thread_safe(self, name: str) -> _DependencyMetrics:
+        dependency_metrics = self._dependency_metrics.get(name)
+        if dependency_metrics is None:
+            dependency_metrics = _DependencyMetrics(self._histogram_bucket_bounds)
+            self._dependency_metrics[name] = dependency_metrics
+
+        return dependency_metrics
+
+    def reset(self) -> None:
+        """
+        Discards all the metrics recorded so far.
+        """
+
+        with self._lock:
+            self._dependency_metrics.clear()
+
+    def export_as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the recorded metrics in a {dependency name: metrics} dictionary. The returned dictionary is a deep copy
+         of the recorder's state, so it can be freely modified or serialized (e.g. to JSON).
+
+        :return: The recorded metrics.
+        """
+
+        with self._lock:
+            return {name: dependency_metrics.export_as_dict() for name, dependency_metrics in self._dependency_metrics.items()}
+
+    def export_as_prometheus_text(self, metric_name_prefix: str = "sidein", labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Returns the recorded metrics in the Prometheus text exposition format.
+
+        :param metric_name_prefix: The prefix of the exported metrics' names.
+        :param labels: Additional labels attached to each exported sample (e.g. {"namespace": "com.example"}).
+        :return: The recorded metrics in the Prometheus text exposition format.
+        """
+
+        exported_metrics = self.export_as_dict()
+        common_labels = "".join(",{}=\"{}\"".format(key, self._escape_label_value(value)) for key, value in (labels or {}).items())
+        lines = []
+
+        for metric_name, help_text, metrics_key in (
+            ("dependency_resolutions_total", "Number of times the dependency was requested from a dependency provider.", "resolution_count"),
+            ("dependency_misses_total", "Number of dependency requests which ended with a DependencyProviderException.", "miss_count"),
+        ):
+            full_metric_name = metric_name_prefix + "_" + metric_name
+            lines.append("# HELP {} {}".format(full_metric_name, help_text))
+            lines.append("# TYPE {} counter".format(full_metric_name))
+            for name, dependency_metrics in exported_metrics.items():
+                lines.append("{}{{dependency=\"{}\"{}}} {}".format(full_metric_name, self._escape_label_value(name), common_labels, dependency_metrics[metrics_key]))
+
+        for metric_name, help_text, metrics_key in (
+            ("dependency_provider_latency_seconds", "Time spent in the dependency provider.", "provider_latency"),
+            ("dependency_lock_wait_seconds", "Time spent waiting for the lock guarding the dependency resolution.", "lock_wait"),
+        ):
+            full_metric_name = metric_name_prefix + "_" + metric_name
+            lines.append("# HELP {} {}".format(full_metric_name, help_text))
+            lines.append("# TYPE {} histogram".format(full_metric_name))
+            for name, dependency_metrics in exported_metrics.items():
+                sample_labels = "dependency=\"{}\"{}".format(self._escape_label_value(name), common_labels)
+                histogram = dependency_metrics[metrics_key]
+                for bound, count in histogram["buckets"].items():
+                    lines.append("{}_bucket{{{},le=\"{}\"}} {}".format(full_metric_name, sample_labels, bound, count))
+                lines.append("{}_count{{{}}} {}".format(full_metric_name, sample_labels, histogram["count"]))
+                lines.append("{}_sum{{{}}} {}".format(full_metric_name, sample_labels, histogram["sum_seconds"]))
+
+        return "\n".join(lines) + "\n"
+
+    def _escape_label_value(self, value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
@@ -0,0 +1,48 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Tuple, Dict, Any
+from sidein.metrics.LatencyHistogram import LatencyHistogram
+
+
+@final
+class _DependencyMetrics:
+    """
+    The metrics recorded for a single dependency name.
+    Used by MetricsRecorder, which is responsible for locking.
+    """
+
+    __slots__ = "resolution_count", "miss_count", "provider_latency", "lock_wait"
+
+    def __init__(self, histogram_bucket_bounds: Tuple[float, ...]):
+        self.resolution_count: int = 0
+        self.miss_count: int = 0
+        self.provider_latency: LatencyHistogram = LatencyHistogram(histogram_bucket_bounds)
+        self.lock_wait: LatencyHistogram = LatencyHistogram(histogram_bucket_bounds)
+
+    def export_as_dict(self) -> Dict[str, Any]:
+        return {
+            "resolution_count": self.resolution_count,
+            "miss_count": self.miss_count,
+            "provider_latency": self.provider_latency.export_as_dict(),
+            "lock_wait": self.lock_wait.export_as_dict(),
+        }
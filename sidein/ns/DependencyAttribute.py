@@ -0,0 +1,134 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Callable, Any, Optional
+import threading
+from sidein.ns.DependencyCachingPolicy import DependencyCachingPolicy
+from sidein.ns.exc.DependencyAttributeError import DependencyAttributeError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class DependencyAttribute:
+    """
+    A descriptor returned by NamespaceInterface.dependency(). When it's accessed on an instance of the class it's
+     defined in, it acquires the dependency from the namespace and caches it according to its caching policy (see
+     DependencyCachingPolicy). Accessing it on the class itself returns the descriptor.
+
+    With the PER_INSTANCE policy, the dependency is stored in the instance's __dict__ under the attribute's name, so
+     the subsequent accesses don't even call the descriptor. Instances of __slots__ classes have no __dict__, so the
+     class must be decorated with NamespaceInterface.inject_dependency_attributes(), which adds a hidden slot for each
+     dependency attribute. The cached dependency can be discarded (and acquired again on the next access) using
+     "del instance.attribute" in the case of __dict__ classes.
+
+    The descriptor itself doesn't lock anything when a dependency is cached per instance, so two threads which access
+     the same attribute of the same instance for the first time at once might both acquire the dependency; one of the
+     acquired dependencies is then cached.
+    """
+
+    SLOT_NAME_PREFIX = "_sidein_dependency_"
+
+    __slots__ = "_get_dependency", "_name", "_caching_policy", "_attribute_name", "_slot_name", "_class_cache_lock", "_class_cached_dependency"
+
+    _NOTHING_CACHED = object()
+
+    def __init__(self, get_dependency: Callable[[str], Any], name: str, caching_policy: DependencyCachingPolicy):
+        if not isinstance(caching_policy, DependencyCachingPolicy):
+            raise DependencyAttributeError("The caching policy must be a DependencyCachingPolicy, not {}!".format(caching_policy))
+
+        self._get_dependency: Callable[[str], Any] = get_dependency  # This function must be thread-safe!
+        self._name: str = name
+        self._caching_policy: DependencyCachingPolicy = caching_policy
+        self._attribute_name: Optional[str] = None
+        self._slot_name: Optional[str] = None
+        self._class_cache_lock: threading.Lock = _LockRegistry.create_lock("DependencyAttribute._class_cache_lock[{}]".format(name))
+        self._class_cached_dependency: Any = DependencyAttribute._NOTHING_CACHED
+
+    def get_dependency_name(self) -> str:
+        return self._name
+
+    def get_caching_policy(self) -> DependencyCachingPolicy:
+        return self._caching_policy
+
+    def get_attribute_name(self) -> Optional[str]:
+        return self._attribute_name
+
+    def get_slot_name(self) -> Optional[str]:
+        return self._slot_name
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attribute_name = name
+        self._slot_name = DependencyAttribute.SLOT_NAME_PREFIX + name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+
+        caching_policy = self._caching_policy
+        if caching_policy is DependencyCachingPolicy.PER_INSTANCE:
+            return self._get_dependency_cached_per_instance(instance)
+
+        if caching_policy is DependencyCachingPolicy.PER_CLASS:
+            return self._get_dependency_cached_per_class()
+
+        return self._get_dependency(self._name)
+
+    def _get_dependency_cached_per_instance(self, instance: Any) -> Any:
+        slot_name = self._slot_name
+        if slot_name is None:
+            raise DependencyAttributeError("The dependency attribute for '{}' must be assigned in a class body!".format(self._name))
+
+        # Instances of __dict__ classes never get here after the dependency has been stored in their __dict__. The
+        #  instance's attributes are accessed through object's methods, so that the class's custom __getattr__(),
+        #  __getattribute__() or __setattr__() cannot interfere with the caching.
+        try:
+            return object.__getattribute__(instance, slot_name)
+        except AttributeError:
+            pass
+
+        dependency = self._get_dependency(self._name)
+
+        try:
+            object.__getattribute__(instance, "__dict__")[self._attribute_name] = dependency
+        except AttributeError:
+            try:
+                object.__setattr__(instance, slot_name, dependency)
+            except AttributeError:
+                raise DependencyAttributeError("The dependency '{}' cannot be cached in an instance of {}, as it has neither __dict__ nor a slot for it! Decorate the class with inject_dependency_attributes().".format(self._name, type(instance)))
+
+        return dependency
+
+    def _get_dependency_cached_per_class(self) -> Any:
+        dependency = self._class_cached_dependency
+        if dependency is not DependencyAttribute._NOTHING_CACHED:
+            return dependency
+
+        with self._class_cache_lock:
+            dependency = self._class_cached_dependency
+            if dependency is DependencyAttribute._NOTHING_CACHED:
+                dependency = self._get_dependency(self._name)
+                self._class_cached_dependency = dependency
+
+        return dependency
+
+    def __repr__(self) -> str:
+        return "DependencyAttribute({!r}, {})".format(self._name, self._caching_policy)
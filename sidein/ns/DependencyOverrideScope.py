@@ -0,0 +1,81 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Optional, Tuple
+import contextvars
+
+
+@final
+class DependencyOverrideScope:
+    """
+    A context manager returned by NamespaceInterface.override(). While it's entered (using either "with" or "async
+     with"), the namespace returns the overriding dependencies instead of the ones from its dependency provider - but
+     only to the current thread or asyncio task, as the overrides are stored in a context variable.
+
+    Scopes can be nested; the inner scope's overrides take precedence over the outer scope's ones. A scope object can
+     be entered repeatedly, even while it's already entered, and also by multiple threads or asyncio tasks at once.
+    """
+
+    # The context variable tokens needed to leave the scope are stored in a context variable too, so that each thread
+    #  and asyncio task leaves only the scope entries it has made itself: ((scope, token), ...)
+    _ENTERED_SCOPES: contextvars.ContextVar = contextvars.ContextVar("DependencyOverrideScope._ENTERED_SCOPES", default=())
+
+    __slots__ = "_context_var", "_overrides"
+
+    def __init__(self, context_var: contextvars.ContextVar, overrides: Dict[str, Any]):
+        self._context_var: contextvars.ContextVar = context_var
+        self._overrides: Dict[str, Any] = overrides
+
+    def get_overrides(self) -> Dict[str, Any]:
+        return self._overrides.copy()
+
+    def __enter__(self) -> "DependencyOverrideScope":
+        outer_overrides: Optional[Dict[str, Any]] = self._context_var.get()
+        if outer_overrides is None:
+            active_overrides = self._overrides.copy()
+        else:
+            active_overrides = {**outer_overrides, **self._overrides}
+
+        token = self._context_var.set(active_overrides)
+
+        entered_scopes: Tuple[Tuple["DependencyOverrideScope", contextvars.Token], ...] = DependencyOverrideScope._ENTERED_SCOPES.get()
+        DependencyOverrideScope._ENTERED_SCOPES.set(entered_scopes + ((self, token),))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        entered_scopes: Tuple[Tuple["DependencyOverrideScope", contextvars.Token], ...] = DependencyOverrideScope._ENTERED_SCOPES.get()
+
+        # The innermost entry of this scope is left (with properly nested "with" statements, it's the last entry)
+        for index in range(len(entered_scopes) - 1, -1, -1):
+            scope, token = entered_scopes[index]
+            if scope is self:
+                DependencyOverrideScope._ENTERED_SCOPES.set(entered_scopes[:index] + entered_scopes[index + 1:])
+                self._context_var.reset(token)
+                return
+
+        raise RuntimeError("The override scope hasn't been entered in the current thread or asyncio task!")
+
+    async def __aenter__(self) -> "DependencyOverrideScope":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb)
@@ -0,0 +1,67 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Optional
+from sidein.ns.exc.InvalidInjectionMarkerError import InvalidInjectionMarkerError
+
+
+@final
+class Inject:
+    """
+    A marker which tells NamespaceInterface.inject_annotated() to inject a dependency into a parameter. It can be used
+     either as the parameter's default value or in its typing.Annotated annotation:
+
+        @ns.inject_annotated()
+        def handle_request(request, database=Inject(), cache: Annotated[CacheBackend, Inject(by_type=True)] = None):
+            ...
+
+    By default, the injected dependency is named after the parameter. A different name can be specified using the
+     'name' argument; if 'by_type' is True, the dependency is requested by the fully qualified name of the parameter's
+     type annotation (see TypeKeyedContainer.get_dependency_name_for_type()).
+    """
+
+    __slots__ = "_name", "_by_type"
+
+    def __init__(self, name: Optional[str] = None, by_type: bool = False):
+        """
+        :param name: The name of the injected dependency, or None to use the name of the parameter (or of its type).
+        :param by_type: Whether to request the dependency by the fully qualified name of the parameter's type annotation.
+        :raises InvalidInjectionMarkerError: If both 'name' and 'by_type' are specified.
+        """
+
+        if name is not None and by_type:
+            raise InvalidInjectionMarkerError("The dependency can be requested either by name or by type, not both!")
+
+        self._name: Optional[str] = name
+        self._by_type: bool = by_type
+
+    def get_name(self) -> Optional[str]:
+        return self._name
+
+    def is_by_type(self) -> bool:
+        return self._by_type
+
+    def __repr__(self) -> str:
+        if self._by_type:
+            return "Inject(by_type=True)"
+
+        return "Inject({})".format("" if self._name is None else repr(self._name))
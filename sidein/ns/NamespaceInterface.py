@@ -20,18 +20,37 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import Callable, Any, Dict, Optional
+from typing import Callable, Any, Dict, Iterable, Iterator, List, Optional
 import abc
 from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.metrics.MetricsCapableInterface import MetricsCapableInterface
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.ns.DependencyOverrideScope import DependencyOverrideScope
+from sidein.ns.DependencyAttribute import DependencyAttribute
+from sidein.ns.DependencyCachingPolicy import DependencyCachingPolicy
 
 
-class NamespaceInterface(metaclass=abc.ABCMeta):
+class NamespaceInterface(MetricsCapableInterface, metaclass=abc.ABCMeta):
     """
     Namespace objects are responsible for providing dependencies to their users from dependency providers.
+
+    If a metrics recorder is set (see MetricsCapableInterface), the namespace records the number of resolutions and
+     misses of each dependency, the time spent in the dependency provider and the time spent waiting for the
+     namespace's lock.
     """
 
     __slots__ = ()
 
+    @abc.abstractmethod
+    def get_name(self) -> str:
+        """
+        Returns the name under which the namespace is registered in the namespace manager.
+
+        :return: The namespace's name.
+        """
+
+        raise NotImplementedError(NamespaceInterface.get_name.__qualname__)
+
     @abc.abstractmethod
     def get_dependency_provider(self) -> DependencyProviderInterface:
         """
@@ -58,6 +77,32 @@ class NamespaceInterface(metaclass=abc.ABCMeta):
 
         raise NotImplementedError(NamespaceInterface.set_dependency_provider.__qualname__)
 
+    @abc.abstractmethod
+    def get_tracing_hook(self) -> Optional[TracingHookInterface]:
+        """
+        Returns the tracing hook which is notified about the operations performed by this namespace, or None if no
+         tracing hook is set (which is the default).
+
+        :return: The tracing hook used by this namespace, or None.
+        """
+
+        raise NotImplementedError(NamespaceInterface.get_tracing_hook.__qualname__)
+
+    @abc.abstractmethod
+    def set_tracing_hook(self, tracing_hook: Optional[TracingHookInterface]) -> None:
+        """
+        Sets a tracing hook to be notified about the dependency resolutions, dependency injections and replacement
+         function builds (see decorate_with_dependency()) performed by this namespace. See TracingHookInterface's
+         docstring for details. Passing None disables tracing.
+
+        The change also applies to functions which have been decorated by this namespace before the tracing hook was
+         set. While no tracing hook is set, tracing costs a single attribute check per operation.
+
+        :param tracing_hook: The new tracing hook, or None to disable tracing.
+        """
+
+        raise NotImplementedError(NamespaceInterface.set_tracing_hook.__qualname__)
+
     @abc.abstractmethod
     def get_dependency(self, name: str, in_obtainer: bool = False) -> Any:
         """
@@ -65,10 +110,16 @@ class NamespaceInterface(metaclass=abc.ABCMeta):
         If 'in_obtainer' is True, a dependency obtainer object bound to the namespace and the dependency's name is
          returned instead of the "raw" dependency. See DependencyObtainerInterface's docstring for details.
 
+        The dependency provider may request other dependencies from the namespace while it's providing a dependency
+         (e.g. to build an object from its sub-dependencies). Such nested requests made from the same thread are served
+         under the namespace's lock which is already held by the outer request, so they don't deadlock. If a dependency
+         is (indirectly) requested again while it's being provided, CircularDependencyError is raised.
+
         :param name: The requested dependency's name.
         :param in_obtainer: Whether to return a dependency obtainer object instead of the "raw" dependency.
         :return: The requested dependency or, if required, a dependency obtainer object bound to the requested dependency.
         :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+        :raises CircularDependencyError: If the dependency provider (indirectly) requests the dependency it is providing.
         """
 
         raise NotImplementedError(NamespaceInterface.get_dependency.__qualname__)
@@ -88,7 +139,33 @@ class NamespaceInterface(metaclass=abc.ABCMeta):
         raise NotImplementedError(NamespaceInterface.get_dependencies.__qualname__)
 
     @abc.abstractmethod
-    def inject_dependencies(self, *names: str, in_obtainers: bool = False, as_kwargs: bool = True) -> Callable:
+    def override(self, overrides: Optional[Dict[str, Any]] = None, /, **kwargs: Any) -> DependencyOverrideScope:
+        """
+        Returns a context manager which, while entered, makes the namespace return the specified dependencies instead of
+         the ones from its dependency provider. The overrides only apply to the current thread or asyncio task (they
+         are stored in a context variable), so they cannot leak into concurrently running code and they don't need to
+         be undone manually. They apply to all the ways of acquiring a dependency (get_dependency(), injections,
+         obtainers, decorations, ...), but overridden dependencies are not recorded by the metrics recorder and the
+         tracing hook.
+
+        When no override is active, each resolution pays only for a single context variable lookup.
+
+        Example:
+            with ns.override(database=fake_database):
+                ...
+
+            async with ns.override({"cz.vitlabuda.sidein.example.dependency": fake_dependency}):
+                ...
+
+        :param overrides: The overriding dependencies in a {name: dependency} dictionary (useful for names which aren't valid identifiers).
+        :param kwargs: The overriding dependencies passed as keyword arguments; they take precedence over 'overrides'.
+        :return: The context manager (usable both with "with" and "async with").
+        """
+
+        raise NotImplementedError(NamespaceInterface.override.__qualname__)
+
+    @abc.abstractmethod
+    def inject_dependencies(self, *names: str, in_obtainers: bool = False, as_kwargs: bool = True, refresh_every: Optional[int] = None, picklable: bool = False) -> Callable:
         """
         Functions or methods decorated with this  decorator will have their dependencies, specified in this decorator's
          arguments, automatically injected upon their call. This decorator supports both regular functions and
@@ -97,9 +174,32 @@ class NamespaceInterface(metaclass=abc.ABCMeta):
         If 'as_kwargs' is True, the requested dependencies are injected into the decorated function's **kwargs, with the
          arguments' keys being the dependencies' names. Otherwise, the dependencies are going to be appended to *args.
 
+        Generator functions and async generator functions are supported as well. Their dependencies are injected when
+         the generator starts running (i.e. when the first item is requested), not when the generator object is
+         created, and by default they stay the same for the generator's whole lifetime. If 'refresh_every' is set to N,
+         dependency obtainer objects are injected instead of the "raw" dependencies, and the dependencies they return
+         are acquired again (all at once) after every N items yielded by the generator - obtain_dependency() itself
+         doesn't acquire anything, so it can be called for each item cheaply. Values and exceptions passed to the
+         generator using send()/asend() and throw()/athrow(), as well as close()/aclose(), are passed to the decorated
+         generator. A refresh interval cannot be combined with 'in_obtainers', and refreshing generators cannot be passed
+         to bind(), map() and imap().
+
+        The functions returned by this decorator are closures, which cannot be pickled unless they are stored under the
+         decorated function's qualified name (i.e. when the decorator is used at module level). If 'picklable' is
+         True, the returned function is pickled by reference - as this namespace's name, the decorator's arguments and
+         the decorated function's module and qualified name - so it can be submitted to a ProcessPoolExecutor or a
+         multiprocessing.Pool even when it's not. In the unpickling process, the dependencies are acquired from its
+         own namespace of the same name. Only regular functions can be made picklable - the picklable function is a
+         callable object which the inspect module doesn't recognize as a coroutine or generator function, and the
+         coroutines and generators returned by such functions couldn't be sent back from a worker process anyway.
+
         :param names: The requested dependencies' names.
         :param in_obtainers: Whether to inject dependency obtainer objects instead of the "raw" dependencies.
         :param as_kwargs: Whether to inject the dependencies to **kwargs instead of *args.
+        :param refresh_every: If set, the decorated function must be a (async) generator function whose dependencies are acquired again after every 'refresh_every' yielded items (see above).
+        :param picklable: Whether the decorated function should be picklable by reference (see above).
+        :raises InvalidRefreshIntervalError: If 'refresh_every' is not a positive integer, if it's combined with 'in_obtainers' or if it's used to decorate something else than a (async) generator function.
+        :raises NotPicklableFunctionError: If 'picklable' is True and the decorated function is not a regular function, or if it cannot be looked up by its qualified name (e.g. a nested function or a lambda).
 
         Upon calling the decorated function:
             :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
@@ -108,7 +208,192 @@ class NamespaceInterface(metaclass=abc.ABCMeta):
         raise NotImplementedError(NamespaceInterface.inject_dependencies.__qualname__)
 
     @abc.abstractmethod
-    def decorate_with_dependency(self, name: str, decorator_extractor: Optional[Callable[[Any], Callable]] = None) -> Callable:
+    def inject_method_dependencies(self, *names: str, in_obtainers: bool = False, as_kwargs: bool = True) -> Callable:
+        """
+        Works like inject_dependencies(), but it's specialized for methods which are called on instances (i.e. for
+         functions whose first positional argument is "self" or "cls"). The instance is kept apart from the other
+         arguments, so the dependencies are passed to the method without rebuilding the arguments' tuple; apart from
+         that, the injector is specialized at decoration time for a single dependency and for the 'as_kwargs' mode, so
+         that as little work as possible is done on each call.
+
+        Coroutine, generator and async generator methods are decorated by inject_dependencies(), as the overhead saved
+         would be negligible compared to the cost of running them.
+
+        Example:
+            class UserRepository:
+                @ns.inject_method_dependencies("database")
+                def get_user(self, user_id, database):
+                    return database.query(...)
+
+        :param names: The requested dependencies' names.
+        :param in_obtainers: Whether to inject dependency obtainer objects instead of the "raw" dependencies.
+        :param as_kwargs: Whether to inject the dependencies to **kwargs instead of *args.
+        :raises NotAFunctionError: If the decorated object is not a function or method.
+
+        Upon calling the decorated method:
+            :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+        """
+
+        raise NotImplementedError(NamespaceInterface.inject_method_dependencies.__qualname__)
+
+    @abc.abstractmethod
+    def inject_annotated(self, in_obtainers: bool = False) -> Callable:
+        """
+        Works like inject_dependencies(as_kwargs=True), but the injected dependencies are determined from the decorated
+         function's signature instead of being listed in the decorator's arguments - a dependency is injected into
+         each parameter whose default value is an Inject marker or whose annotation is typing.Annotated[..., Inject()].
+         See Inject's docstring for details.
+
+        The signature is analysed only once, at decoration time (the results are cached, so a function decorated in
+         multiple namespaces is analysed only once as well), so calling the decorated function costs the same as
+         calling a function decorated with inject_dependencies().
+
+        Example:
+            @ns.inject_annotated()
+            def handle_request(request, database=Inject(), cache: Annotated[CacheBackend, Inject("redis_cache")] = None):
+                ...
+
+        :param in_obtainers: Whether to inject dependency obtainer objects instead of the "raw" dependencies.
+        :raises InvalidInjectionMarkerError: If a parameter marked with Inject(by_type=True) has no class in its type annotation.
+
+        Upon calling the decorated function:
+            :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+        """
+
+        raise NotImplementedError(NamespaceInterface.inject_annotated.__qualname__)
+
+    @abc.abstractmethod
+    def bind(self, injected_func: Callable) -> Callable:
+        """
+        Resolves the dependencies of a function decorated with this namespace's inject_dependencies() or
+         inject_annotated() method right away and returns the undecorated function with the dependencies bound to it.
+         Calling the returned function doesn't resolve the dependencies again (and therefore doesn't acquire any lock),
+         so it's suitable for calling the function many times in a row, e.g. once per record of a batch job.
+
+        Note that the returned function keeps using the dependencies which have been resolved when this method was
+         called, even if they are replaced in the dependency provider afterwards.
+
+        :param injected_func: A function decorated with this namespace's inject_dependencies() or inject_annotated() method.
+        :return: The undecorated function with the dependencies bound to it.
+        :raises NotAnInjectedFunctionError: If the function hasn't been decorated with this namespace's inject_dependencies() or inject_annotated() method, or if it's a generator function with a refresh interval.
+        :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+        """
+
+        raise NotImplementedError(NamespaceInterface.bind.__qualname__)
+
+    @abc.abstractmethod
+    def map(self, injected_func: Callable, *iterables: Iterable) -> List[Any]:
+        """
+        Works like the built-in map() function, but the dependencies of 'injected_func' (see bind()) are resolved only
+         once for all the calls, and the results are returned in a list.
+
+        :param injected_func: A function decorated with this namespace's inject_dependencies() or inject_annotated() method.
+        :param iterables: The iterables whose items are passed to the function as positional arguments.
+        :return: The results of the calls.
+        :raises NotAnInjectedFunctionError: If the function hasn't been decorated with this namespace's inject_dependencies() or inject_annotated() method, or if it's a generator function with a refresh interval.
+        :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+        """
+
+        raise NotImplementedError(NamespaceInterface.map.__qualname__)
+
+    @abc.abstractmethod
+    def imap(self, injected_func: Callable, *iterables: Iterable) -> Iterator[Any]:
+        """
+        The streaming variant of map() - returns an iterator which calls the function lazily, as the results are
+         consumed, so that the memory usage stays flat no matter how many items the iterables yield. The dependencies
+         are resolved once, when the first result is requested.
+
+        :param injected_func: A function decorated with this namespace's inject_dependencies() or inject_annotated() method.
+        :param iterables: The iterables whose items are passed to the function as positional arguments.
+        :return: An iterator over the results of the calls.
+        :raises NotAnInjectedFunctionError: If the function hasn't been decorated with this namespace's inject_dependencies() or inject_annotated() method, or if it's a generator function with a refresh interval.
+
+        Upon requesting the first result:
+            :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+        """
+
+        raise NotImplementedError(NamespaceInterface.imap.__qualname__)
+
+    @abc.abstractmethod
+    def dependency(self, name: str, caching_policy: DependencyCachingPolicy = DependencyCachingPolicy.PER_INSTANCE) -> DependencyAttribute:
+        """
+        Returns a descriptor which, when assigned to a class attribute, acquires the specified dependency from this
+         namespace upon the first access to the attribute and caches it according to the caching policy (see
+         DependencyCachingPolicy). Unlike decorating each method with inject_dependencies(), the dependency is
+         therefore acquired only once per instance (or class), instead of once per method call.
+
+        Classes whose instances have no __dict__ (i.e. __slots__ classes) must be decorated with
+         inject_dependency_attributes() to be able to cache the dependencies per instance.
+
+        Example:
+            class UserRepository:
+                database = ns.dependency("database")
+                config = ns.dependency("config", DependencyCachingPolicy.PER_CLASS)
+
+                def get_user(self, user_id):
+                    return self.database.query(...)
+
+        :param name: The requested dependency's name.
+        :param caching_policy: How long the acquired dependency is cached.
+        :return: The descriptor.
+        :raises DependencyAttributeError: If the caching policy is not a DependencyCachingPolicy.
+
+        Upon accessing the attribute:
+            :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+            :raises DependencyAttributeError: If the dependency cannot be cached in the instance (see above).
+        """
+
+        raise NotImplementedError(NamespaceInterface.dependency.__qualname__)
+
+    @abc.abstractmethod
+    def inject_dependency_attributes(self) -> Callable:
+        """
+        A class decorator which prepares a class with dependency attributes (see dependency()) to cache the
+         dependencies per instance. Classes whose instances have __dict__ don't need it, and they are returned as they
+         are. For __slots__ classes, a subclass with a hidden slot for each dependency attribute (and the same name,
+         qualified name, module and docstring) is created and returned, as slots cannot be added to an existing class.
+
+        The decorator works with dependency attributes from any namespace.
+
+        Example:
+            @ns.inject_dependency_attributes()
+            class UserRepository:
+                __slots__ = ("_user_cache",)
+
+                database = ns.dependency("database")
+
+        :raises DependencyAttributeError: If the decorated object is not a class.
+        """
+
+        raise NotImplementedError(NamespaceInterface.inject_dependency_attributes.__qualname__)
+
+    @abc.abstractmethod
+    def inject_pooled_dependencies(self, *names: str, as_kwargs: bool = True) -> Callable:
+        """
+        Works like inject_dependencies(), but each of the requested dependencies must be a dependency pool (see
+         DependencyPoolInterface). Each time the decorated function is called, an instance is checked out from each of
+         the pools and injected into the function's arguments instead of the pool itself; the instances are checked
+         back in once the function returns or raises an exception. This decorator supports regular functions,
+         coroutines, generators and async generators - coroutines and async generators wait for a busy pool using
+         DependencyPoolInterface.check_out_async(), which doesn't block the event loop. (Async) generators check the
+         instances out once they start running and keep them until they finish or are closed.
+
+        The pools are resolved under the namespace's lock, but the instances are checked out from them only after the
+         lock has been released, so waiting for a busy pool doesn't block the other users of the namespace.
+
+        :param names: The names of the requested dependency pools.
+        :param as_kwargs: Whether to inject the checked out instances to **kwargs instead of *args.
+
+        Upon calling the decorated function:
+            :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
+            :raises NotADependencyPoolError: If a requested dependency is not a dependency pool.
+            :raises PoolCheckoutTimeoutError: If no instance becomes available in a pool before its checkout timeout expires.
+        """
+
+        raise NotImplementedError(NamespaceInterface.inject_pooled_dependencies.__qualname__)
+
+    @abc.abstractmethod
+    def decorate_with_dependency(self, name: str, decorator_extractor: Optional[Callable[[Any], Callable]] = None, picklable: bool = False) -> Callable:
         """
         This decorator enables one to decorate functions or methods with a dependency which acts like a decorator.
 
@@ -122,12 +407,23 @@ class NamespaceInterface(metaclass=abc.ABCMeta):
          decorated function is called, the acquired dependency is passed to the "decorator extractor" function. The
          return value of that call is going to be used as the non-parametrized decorator instead of the "raw"
          dependency.
+        The replacement function built from a decorator is cached, so as long as the same (equal) decorator is acquired
+         (e.g. the dependency hasn't been replaced in the dependency provider), the decorator is not called again and
+         the previously returned replacement function is reused. Bound methods of the same object are equal, but a
+         decorator created anew on each call (e.g. by a decorator extractor calling a parametrized decorator) is not,
+         so the replacement function is rebuilt on each call in that case.
 
         The purpose and usage of this method might be quite tricky to understand just from the above explanation -
          I strongly recommend you to take a look at the examples if you want to make use of this feature.
 
+        See inject_dependencies() for what the 'picklable' argument does; the decorator extractor must be picklable
+         too in that case.
+
         :param name: The requested dependency's name. If the 'decorator_extractor' optional argument is left empty, the dependency must be a non-parametrized decorator.
         :param decorator_extractor: A function into which the acquired dependency is going to be passed and whose return value is going to be used as the (non-parametrized) decorator.
+        :param picklable: Whether the decorated function should be picklable by reference.
+        :raises InvalidDecoratorExtractorError: If the decorator extractor is not a regular function.
+        :raises NotPicklableFunctionError: If 'picklable' is True and the decorated function is not a regular function, or if it cannot be looked up by its qualified name (e.g. a nested function or a lambda).
 
         Upon calling the decorated function:
             :raises DependencyProviderException: If anything goes wrong in the dependency provider (e.g. if the dependency couldn't be found).
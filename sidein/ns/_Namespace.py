@@ -20,18 +20,32 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Any, Dict, Callable, Optional
+from typing import final, Any, Dict, Callable, Iterable, Iterator, List, Optional, Tuple
 import threading
+import contextvars
+import time
 from sidein.ns.NamespaceInterface import NamespaceInterface
+from sidein.ns.DependencyOverrideScope import DependencyOverrideScope
+from sidein.ns.DependencyAttribute import DependencyAttribute
+from sidein.ns.DependencyCachingPolicy import DependencyCachingPolicy
 from sidein.ns._utils.DependencyInjector import DependencyInjector
+from sidein.ns._utils.PooledDependencyInjector import PooledDependencyInjector
 from sidein.ns._utils.DependencyDecorator import DependencyDecorator
+from sidein.ns._utils.DependencyAttributeClassPreparer import DependencyAttributeClassPreparer
+from sidein.ns._utils.PicklableFunctionWrapper import PicklableFunctionWrapper
 from sidein.ns.exc.DependencyProviderRaisedAnExceptionError import DependencyProviderRaisedAnExceptionError
 from sidein.ns.exc.DuplicateDependencyRequestedError import DuplicateDependencyRequestedError
+from sidein.ns.exc.CircularDependencyError import CircularDependencyError
 from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
 from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
 from sidein.providers.exc.DependencyProviderException import DependencyProviderException
 from sidein.providers.exc.DependencyProviderError import DependencyProviderError
 from sidein.obtainer._DependencyObtainer import _DependencyObtainer
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.tracing.TracingOperation import TracingOperation
+from sidein.tracing.TracingEvent import TracingEvent
+from sidein.lockprofiler._LockRegistry import _LockRegistry
 
 
 @final
@@ -43,19 +57,36 @@ class _Namespace(NamespaceInterface):
     # This class isn't just a thread-safety locking proxy, as it's common in this library, because this class exposes
     # decorators to the outside (inject_deps) which require special handling in relation to locking.
     # (It's not a huge problem though, as the methods of this class which require locking are very simple.)
+    #
+    # The ID of the thread holding the lock while resolving dependencies is stored in _lock_owner, so that dependency
+    #  providers which request other dependencies from the same namespace while providing a dependency (nested
+    #  resolution) don't deadlock - the nested requests are served under the already held lock. The names of the
+    #  dependencies being resolved are stored in _resolution_chain (which is only ever touched by the lock owner) to
+    #  detect circular dependencies.
 
-    __slots__ = "_lock", "_dependency_provider", "_dependency_injector", "_dependency_decorator"
+    __slots__ = "_name", "_lock", "_dependency_provider", "_metrics_recorder", "_tracing_hook", "_is_instrumented", "_lock_owner", "_resolution_chain", "_overrides_context_var", "_dependency_injector", "_pooled_dependency_injector", "_dependency_decorator"
 
-    def __init__(self):
-        self._lock: threading.Lock = threading.Lock()
+    def __init__(self, name: str):
+        self._name: str = name
+        self._lock: threading.Lock = _LockRegistry.create_lock("_Namespace._lock[{}]".format(name))
         self._dependency_provider: DependencyProviderInterface = self._create_default_dependency_provider()
+        self._metrics_recorder: Optional[MetricsRecorder] = None
+        self._tracing_hook: Optional[TracingHookInterface] = None
+        self._is_instrumented: bool = False  # True if either a metrics recorder or a tracing hook is set
+        self._lock_owner: Optional[int] = None
+        self._resolution_chain: List[str] = []
+        self._overrides_context_var: contextvars.ContextVar = contextvars.ContextVar("sidein_overrides_{}".format(name), default=None)
 
-        self._dependency_injector: DependencyInjector = DependencyInjector(self)
-        self._dependency_decorator: DependencyDecorator = DependencyDecorator(self)
+        self._dependency_injector: DependencyInjector = DependencyInjector(self, name)
+        self._pooled_dependency_injector: PooledDependencyInjector = PooledDependencyInjector(self)
+        self._dependency_decorator: DependencyDecorator = DependencyDecorator(self, name)
 
     def _create_default_dependency_provider(self) -> DependencyProviderInterface:
         return GlobalSimpleContainer()  # MUST NOT BE CHANGED!
 
+    def get_name(self) -> str:
+        return self._name  # The name never changes, so there is no need to lock
+
     def get_dependency_provider(self) -> DependencyProviderInterface:
         with self._lock:
             return self._dependency_provider
@@ -64,9 +95,59 @@ class _Namespace(NamespaceInterface):
         with self._lock:
             self._dependency_provider = dependency_provider
 
+    def get_metrics_recorder(self) -> Optional[MetricsRecorder]:
+        with self._lock:
+            return self._metrics_recorder
+
+    def set_metrics_recorder(self, metrics_recorder: Optional[MetricsRecorder]) -> None:
+        with self._lock:
+            self._metrics_recorder = metrics_recorder
+            self._is_instrumented = (self._metrics_recorder is not None or self._tracing_hook is not None)
+
+    def get_tracing_hook(self) -> Optional[TracingHookInterface]:
+        with self._lock:
+            return self._tracing_hook
+
+    def set_tracing_hook(self, tracing_hook: Optional[TracingHookInterface]) -> None:
+        with self._lock:
+            self._tracing_hook = tracing_hook
+            self._is_instrumented = (self._metrics_recorder is not None or self._tracing_hook is not None)
+
+            # The helpers check the tracing hook on each call without locking (see below)
+            self._dependency_injector.set_tracing_hook(tracing_hook)
+            self._dependency_decorator.set_tracing_hook(tracing_hook)
+
+    # The metrics recorder is checked without locking in the methods below, so that the resolutions don't pay for any
+    #  time measurements when metrics recording is disabled. It is checked again once the lock is acquired, so a call
+    #  racing with set_metrics_recorder() can at worst miss its lock wait time measurement.
+
     def get_dependency(self, name: str, in_obtainer: bool = False) -> Any:
+        # The overrides are checked before the lock is acquired, as they are local to the current thread/task
+        #  (obtainers are returned as usual, as they look the overrides up once they are used)
+        overrides = self._overrides_context_var.get()
+        if overrides is not None and not in_obtainer and name in overrides:
+            return overrides[name]
+
+        # Only the current thread could have stored its own ID, so it can be compared without locking
+        if self._lock_owner == threading.get_ident():
+            return self._get_dependency_thread_safe(name, in_obtainer)  # Nested resolution - the lock is already held
+
+        if self._metrics_recorder is None:
+            with self._lock:
+                self._lock_owner = threading.get_ident()
+                try:
+                    return self._get_dependency_thread_safe(name, in_obtainer)
+                finally:
+                    self._lock_owner = None
+
+        wait_start_ns = time.perf_counter_ns()
         with self._lock:
-            return self._get_dependency_thread_safe(name, in_obtainer)
+            self._lock_owner = threading.get_ident()
+            try:
+                self._record_lock_wait_thread_safe((name,), wait_start_ns)
+                return self._get_dependency_thread_safe(name, in_obtainer)
+            finally:
+                self._lock_owner = None
 
     def get_dependencies(self, *names: str, in_obtainers: bool = False) -> Dict[str, Any]:
         if len(names) != len(set(names)):
@@ -74,33 +155,166 @@ class _Namespace(NamespaceInterface):
             #  name was specified multiple times in the arguments
             raise DuplicateDependencyRequestedError("A dependency was requested multiple times!")
 
+        overrides = self._overrides_context_var.get()
+        if overrides is not None and not in_obtainers:
+            return self._get_dependencies_with_overrides(names, overrides)
+
+        return self._get_dependencies_from_provider(names, in_obtainers)
+
+    def _get_dependencies_with_overrides(self, names: Tuple[str, ...], overrides: Dict[str, Any]) -> Dict[str, Any]:
+        dependencies = self._get_dependencies_from_provider(tuple(name for name in names if name not in overrides), False)
+
+        return {name: (overrides[name] if name in overrides else dependencies[name]) for name in names}
+
+    def _get_dependencies_from_provider(self, names: Tuple[str, ...], in_obtainers: bool) -> Dict[str, Any]:
+        if not names:
+            return {}
+
+        if self._lock_owner == threading.get_ident():
+            return {name: self._get_dependency_thread_safe(name, in_obtainers) for name in names}  # Nested resolution
+
         # All the required dependencies must be obtained under a single continuous lock to prevent other threads
         #  from changing the dependency provider halfway through the process (otherwise, it would be possible for the
         #  dependencies from a single injection request to be extracted from more than one dependency provider -->
         #  race condition).
+        if self._metrics_recorder is None:
+            with self._lock:
+                self._lock_owner = threading.get_ident()
+                try:
+                    return {name: self._get_dependency_thread_safe(name, in_obtainers) for name in names}
+                finally:
+                    self._lock_owner = None
+
+        wait_start_ns = time.perf_counter_ns()
         with self._lock:
-            return {name: self._get_dependency_thread_safe(name, in_obtainers) for name in names}
+            self._lock_owner = threading.get_ident()
+            try:
+                self._record_lock_wait_thread_safe(names, wait_start_ns)
+                return {name: self._get_dependency_thread_safe(name, in_obtainers) for name in names}
+            finally:
+                self._lock_owner = None
+
+    # This method must be called in a thread-safe context!
+    def _record_lock_wait_thread_safe(self, names: Tuple[str, ...], wait_start_ns: int) -> None:
+        if self._metrics_recorder is None:
+            return
+
+        # If multiple dependencies were requested at once, all of them had to wait for the lock
+        lock_wait_ns = time.perf_counter_ns() - wait_start_ns
+        for name in names:
+            self._metrics_recorder.record_lock_wait(name, lock_wait_ns)
 
     # This method must be called in a thread-safe context!
     def _get_dependency_thread_safe(self, name: str, in_obtainer: bool) -> Any:
         if in_obtainer:
             return _DependencyObtainer(self, name)
 
+        if not self._is_instrumented:
+            return self._get_dependency_from_provider_thread_safe(name)
+
+        return self._get_dependency_from_provider_instrumented_thread_safe(name)
+
+    # This method must be called in a thread-safe context!
+    def _get_dependency_from_provider_instrumented_thread_safe(self, name: str) -> Any:
+        tracing_event = None
+        if self._tracing_hook is not None:
+            tracing_event = TracingEvent(self._name, TracingOperation.DEPENDENCY_RESOLUTION, (name,))
+            self._tracing_hook.on_operation_start(tracing_event)
+
+        start_ns = time.perf_counter_ns()
+        exception = None
+        try:
+            return self._get_dependency_from_provider_thread_safe(name)
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+
+            if self._metrics_recorder is not None:
+                self._metrics_recorder.record_resolution(name, duration_ns, isinstance(exception, DependencyProviderException))
+
+            if tracing_event is not None:
+                tracing_event.set_outcome(duration_ns, exception)
+                self._tracing_hook.on_operation_finish(tracing_event)
+
+    # This method must be called in a thread-safe context!
+    def _get_dependency_from_provider_thread_safe(self, name: str) -> Any:
+        resolution_chain = self._resolution_chain
+        if name in resolution_chain:
+            raise CircularDependencyError(tuple(resolution_chain) + (name,))
+
+        resolution_chain.append(name)
         try:
             return self._dependency_provider.get_dependency(name)
-        except (DependencyProviderException, DependencyProviderError) as e:
-            raise e
+        except (DependencyProviderException, DependencyProviderError, CircularDependencyError) as e:
+            raise e  # CircularDependencyError might have been raised by a nested resolution
         except Exception as e:
             raise DependencyProviderRaisedAnExceptionError("The dependency provider has raised an unexpected exception!", e)
+        finally:
+            resolution_chain.pop()
+
+    def override(self, overrides: Optional[Dict[str, Any]] = None, /, **kwargs: Any) -> DependencyOverrideScope:
+        return DependencyOverrideScope(self._overrides_context_var, {**(overrides or {}), **kwargs})
 
-    def inject_dependencies(self, *names: str, in_obtainers: bool = False, as_kwargs: bool = True) -> Callable:
+    def inject_dependencies(self, *names: str, in_obtainers: bool = False, as_kwargs: bool = True, refresh_every: Optional[int] = None, picklable: bool = False) -> Callable:
         def _inject_dependencies_decorator(func):
-            return self._dependency_injector.generate_injector_for_function(func, names, in_obtainers, as_kwargs)
+            injector = self._dependency_injector.generate_injector_for_function(func, names, in_obtainers, as_kwargs, refresh_every)
+            if picklable:
+                return PicklableFunctionWrapper(injector, func, self._name, "inject_dependencies", names, {"in_obtainers": in_obtainers, "as_kwargs": as_kwargs, "refresh_every": refresh_every, "picklable": True})
+
+            return injector
 
         return _inject_dependencies_decorator
 
-    def decorate_with_dependency(self, name: str, decorator_extractor: Optional[Callable[[Any], Callable]] = None) -> Callable:
+    def inject_method_dependencies(self, *names: str, in_obtainers: bool = False, as_kwargs: bool = True) -> Callable:
+        def _inject_method_dependencies_decorator(method):
+            return self._dependency_injector.generate_method_injector_for_function(method, names, in_obtainers, as_kwargs)
+
+        return _inject_method_dependencies_decorator
+
+    def inject_annotated(self, in_obtainers: bool = False) -> Callable:
+        def _inject_annotated_decorator(func):
+            return self._dependency_injector.generate_annotated_injector_for_function(func, in_obtainers)
+
+        return _inject_annotated_decorator
+
+    def bind(self, injected_func: Callable) -> Callable:
+        return self._dependency_injector.bind_injected_function(injected_func)
+
+    def map(self, injected_func: Callable, *iterables: Iterable) -> List[Any]:
+        return list(map(self.bind(injected_func), *iterables))
+
+    def imap(self, injected_func: Callable, *iterables: Iterable) -> Iterator[Any]:
+        # The function is checked right away, but its dependencies are resolved only once the iteration starts
+        self._dependency_injector.check_injected_function(injected_func)
+
+        def _imap_generator():
+            yield from map(self.bind(injected_func), *iterables)
+
+        return _imap_generator()
+
+    def dependency(self, name: str, caching_policy: DependencyCachingPolicy = DependencyCachingPolicy.PER_INSTANCE) -> DependencyAttribute:
+        return DependencyAttribute(self.get_dependency, name, caching_policy)
+
+    def inject_dependency_attributes(self) -> Callable:
+        def _inject_dependency_attributes_decorator(class_):
+            return DependencyAttributeClassPreparer.prepare_class(class_)
+
+        return _inject_dependency_attributes_decorator
+
+    def inject_pooled_dependencies(self, *names: str, as_kwargs: bool = True) -> Callable:
+        def _inject_pooled_dependencies_decorator(func):
+            return self._pooled_dependency_injector.generate_pooled_injector_for_function(func, names, as_kwargs)
+
+        return _inject_pooled_dependencies_decorator
+
+    def decorate_with_dependency(self, name: str, decorator_extractor: Optional[Callable[[Any], Callable]] = None, picklable: bool = False) -> Callable:
         def _decorate_with_dependency_decorator(func):
-            return self._dependency_decorator.generate_dependency_decorator_for_function(func, name, decorator_extractor)
+            dependency_decorator = self._dependency_decorator.generate_dependency_decorator_for_function(func, name, decorator_extractor)
+            if picklable:
+                return PicklableFunctionWrapper(dependency_decorator, func, self._name, "decorate_with_dependency", (name, decorator_extractor), {"picklable": True})
+
+            return dependency_decorator
 
         return _decorate_with_dependency_decorator
@@ -0,0 +1,91 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Optional, Tuple
+import inspect
+import typing
+from sidein.ns.Inject import Inject
+from sidein.ns.exc.InvalidInjectionMarkerError import InvalidInjectionMarkerError
+from sidein.providers.typekeyed.TypeKeyedContainer import TypeKeyedContainer
+
+
+@final
+class AnnotatedInjectionAnalyser:
+    """
+    Helper class that finds out which parameters of a function are marked with Inject (see
+     NamespaceInterface.inject_annotated()). The analysis is performed only once, at decoration time, and its results
+     are stored in the decorated function's InjectionSpecification.
+    """
+
+    @classmethod
+    def analyse_function(cls, func: Callable) -> Tuple[Tuple[str, str], ...]:
+        signature = inspect.signature(func)
+
+        # The evaluated type hints are preferred, as the annotations might be postponed (PEP 563); if they cannot be
+        #  evaluated, the annotations are used as they are
+        try:
+            type_hints = typing.get_type_hints(func, include_extras=True)
+        except Exception:
+            type_hints = {}
+
+        injected_parameters = []
+        for parameter in signature.parameters.values():
+            annotation = type_hints.get(parameter.name, parameter.annotation)
+            marker = cls._find_marker(parameter, annotation)
+            if marker is None:
+                continue
+
+            if marker.is_by_type():
+                dependency_name = TypeKeyedContainer.get_dependency_name_for_type(cls._get_annotated_type(parameter.name, annotation))
+            elif marker.get_name() is not None:
+                dependency_name = marker.get_name()
+            else:
+                dependency_name = parameter.name
+
+            injected_parameters.append((parameter.name, dependency_name))
+
+        return tuple(injected_parameters)
+
+    @classmethod
+    def _find_marker(cls, parameter: inspect.Parameter, annotation: Any) -> Optional[Inject]:
+        if isinstance(parameter.default, Inject):
+            return parameter.default
+
+        if typing.get_origin(annotation) is typing.Annotated:
+            for metadata in annotation.__metadata__:
+                if isinstance(metadata, Inject):
+                    return metadata
+
+        return None
+
+    @classmethod
+    def _get_annotated_type(cls, parameter_name: str, annotation: Any) -> type:
+        if typing.get_origin(annotation) is typing.Annotated:
+            annotation = typing.get_args(annotation)[0]
+
+        if not isinstance(annotation, type) or annotation is inspect.Parameter.empty:
+            raise InvalidInjectionMarkerError("The parameter {} is marked with Inject(by_type=True), but it isn't annotated with a class!".format(repr(parameter_name)))
+
+        return annotation
+
+    def __init__(self):
+        raise NotImplementedError("{} is not supposed to be instantiated!".format(AnnotatedInjectionAnalyser.__qualname__))
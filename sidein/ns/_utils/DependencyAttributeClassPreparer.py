@@ -0,0 +1,77 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Dict, Tuple
+import inspect
+from sidein.ns.DependencyAttribute import DependencyAttribute
+from sidein.ns.DependencyCachingPolicy import DependencyCachingPolicy
+from sidein.ns.exc.DependencyAttributeError import DependencyAttributeError
+
+
+@final
+class DependencyAttributeClassPreparer:
+    """
+    Helper class that prepares classes with dependency attributes to cache the dependencies in their instances.
+    Used by _Namespace.inject_dependency_attributes().
+    """
+
+    @classmethod
+    def prepare_class(cls, class_: type) -> type:
+        if not inspect.isclass(class_):
+            raise DependencyAttributeError("Only classes can be decorated with inject_dependency_attributes(), not {}!".format(class_))
+
+        # Instances with __dict__ can store the dependencies under the attributes' names, so nothing has to be done
+        if cls._instances_have_dict(class_):
+            return class_
+
+        missing_slot_names = tuple(slot_name for slot_name in cls._get_required_slot_names(class_) if not cls._has_slot(class_, slot_name))
+        if not missing_slot_names:
+            return class_
+
+        # Slots cannot be added to an existing class, so a subclass which looks the same from the outside is created
+        #  instead (similarly to what dataclasses.dataclass(slots=True) does)
+        return type(class_)(class_.__name__, (class_,), {
+            "__slots__": missing_slot_names,
+            "__module__": class_.__module__,
+            "__qualname__": class_.__qualname__,
+            "__doc__": class_.__doc__,
+        })
+
+    @classmethod
+    def _instances_have_dict(cls, class_: type) -> bool:
+        return any("__dict__" in vars(base) for base in class_.__mro__)
+
+    @classmethod
+    def _get_required_slot_names(cls, class_: type) -> Tuple[str, ...]:
+        attributes: Dict[str, object] = {}
+        for base in reversed(class_.__mro__):
+            attributes.update(vars(base))
+
+        return tuple(
+            attribute.get_slot_name()
+            for attribute in attributes.values()
+            if isinstance(attribute, DependencyAttribute) and attribute.get_slot_name() is not None and attribute.get_caching_policy() is DependencyCachingPolicy.PER_INSTANCE
+        )
+
+    @classmethod
+    def _has_slot(cls, class_: type, slot_name: str) -> bool:
+        return any(slot_name in vars(base) for base in class_.__mro__)
@@ -25,6 +25,10 @@ import inspect
 import functools
 from sidein.ns.NamespaceInterface import NamespaceInterface
 from sidein.ns.exc.NotAFunctionError import NotAFunctionError
+from sidein.ns._utils.ReplacementFunctionCache import ReplacementFunctionCache
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.tracing.TracingOperation import TracingOperation
+from sidein.tracing._TracingUtils import _TracingUtils
 from sidein.ns.exc.decoration.InvalidReplacementFunctionError import InvalidReplacementFunctionError
 from sidein.ns.exc.decoration.InvalidDecoratorExtractorError import InvalidDecoratorExtractorError
 from sidein.ns.exc.decoration.DecoratorExtractorRaisedAnExceptionError import DecoratorExtractorRaisedAnExceptionError
@@ -39,14 +43,24 @@ class DependencyDecorator:
     Used by _Namespace.decorate_with_dependency().
     """
 
-    __slots__ = "_namespace",
+    __slots__ = "_namespace", "_namespace_name", "_tracing_hook"
 
-    def __init__(self, namespace: NamespaceInterface):
+    def __init__(self, namespace: NamespaceInterface, namespace_name: str):
         self._namespace: NamespaceInterface = namespace
+        self._namespace_name: str = namespace_name
+        self._tracing_hook: Optional[TracingHookInterface] = None
+
+    # The tracing hook is read without locking on each call, so that the decorated functions don't need to lock
+    #  anything when no tracing hook is set.
+    def set_tracing_hook(self, tracing_hook: Optional[TracingHookInterface]) -> None:
+        self._tracing_hook = tracing_hook
 
     def generate_dependency_decorator_for_function(self, func: Callable, name: str, decorator_extractor: Optional[Callable[[Any], Callable]]) -> Callable:
+        # The decorator extractor never changes after decoration, so it's validated only once
         if decorator_extractor is None:
             decorator_extractor = self._generate_default_decorator_extractor()
+        elif not inspect.isroutine(decorator_extractor) or inspect.iscoroutinefunction(decorator_extractor):
+            raise InvalidDecoratorExtractorError("The decorator extractor must be a regular function, not {}!".format(decorator_extractor))
 
         if inspect.iscoroutinefunction(func):
             return self._generate_dependency_decorator_for_async_function(func, name, decorator_extractor)
@@ -63,42 +77,46 @@ class DependencyDecorator:
         return _default_decorator_extractor
 
     def _generate_dependency_decorator_for_regular_function(self, func: Callable, name: str, decorator_extractor: Callable[[Any], Callable]) -> Callable:
+        cache = ReplacementFunctionCache()
+
         @functools.wraps(func)
         def _regular_function_dependency_decorator(*args, **kwargs):
-            replacement_function = self._get_replacement_function(func, name, decorator_extractor)
-
-            if not inspect.isroutine(replacement_function) or inspect.iscoroutinefunction(replacement_function):
-                raise InvalidReplacementFunctionError("A regular function can only be decorated with a regular replacement function, not with {}!".format(replacement_function))
-
-            return replacement_function(*args, **kwargs)
+            return self._get_replacement_function(func, name, decorator_extractor, cache, False)(*args, **kwargs)
 
         return _regular_function_dependency_decorator
 
     def _generate_dependency_decorator_for_async_function(self, async_func: Callable, name: str, decorator_extractor: Callable[[Any], Callable]) -> Callable:
+        cache = ReplacementFunctionCache()
+
         @functools.wraps(async_func)
         async def _async_function_dependency_decorator(*args, **kwargs):
-            replacement_function = self._get_replacement_function(async_func, name, decorator_extractor)
+            return await self._get_replacement_function(async_func, name, decorator_extractor, cache, True)(*args, **kwargs)
 
-            if not inspect.isroutine(replacement_function) or not inspect.iscoroutinefunction(replacement_function):
-                raise InvalidReplacementFunctionError("An async function can only be decorated with an async replacement function, not with {}!".format(replacement_function))
+        return _async_function_dependency_decorator
 
-            return await replacement_function(*args, **kwargs)
+    def _get_replacement_function(self, func: Callable, name: str, decorator_extractor: Callable[[Any], Callable], cache: ReplacementFunctionCache, is_async: bool) -> Callable:
+        tracing_hook = self._tracing_hook
+        if tracing_hook is None:
+            return self._build_replacement_function(func, name, decorator_extractor, cache, is_async)
 
-        return _async_function_dependency_decorator
+        return _TracingUtils.call_traced(tracing_hook, self._namespace_name, TracingOperation.REPLACEMENT_FUNCTION_BUILD, (name,), self._build_replacement_function, func, name, decorator_extractor, cache, is_async)
 
-    def _get_replacement_function(self, func: Callable, name: str, decorator_extractor: Callable[[Any], Callable]) -> Callable:
+    def _build_replacement_function(self, func: Callable, name: str, decorator_extractor: Callable[[Any], Callable], cache: ReplacementFunctionCache, is_async: bool) -> Callable:
         # Acquire the requested dependency
         dependency = self._namespace.get_dependency(name, False)  # This method must be thread-safe!
 
         # Acquire the decorator
-        if not inspect.isroutine(decorator_extractor) or inspect.iscoroutinefunction(decorator_extractor):
-            raise InvalidDecoratorExtractorError("The decorator extractor must be a regular function, not {}!".format(decorator_extractor))
-
         try:
             decorator = decorator_extractor(dependency)
         except Exception as e:
             raise DecoratorExtractorRaisedAnExceptionError("The decorator extractor has raised an exception! ({})".format(str(e)), e)
 
+        # If the decorator is the same one as on the previous call, the replacement function built (and validated) back
+        #  then can be reused
+        replacement_function = cache.get_replacement_function(decorator)
+        if replacement_function is not None:
+            return replacement_function
+
         # Acquire the replacement function
         if not inspect.isroutine(decorator) or inspect.iscoroutinefunction(decorator):
             raise InvalidDecoratorError("The extracted decorator must be a regular function, not {}!".format(decorator))
@@ -108,5 +126,12 @@ class DependencyDecorator:
         except Exception as e:
             raise DecoratorRaisedAnExceptionError("The extracted decorator has raised an exception! ({})".format(str(e)), e)
 
-        # Return the replacement function
+        if is_async:
+            if not inspect.isroutine(replacement_function) or not inspect.iscoroutinefunction(replacement_function):
+                raise InvalidReplacementFunctionError("An async function can only be decorated with an async replacement function, not with {}!".format(replacement_function))
+        elif not inspect.isroutine(replacement_function) or inspect.iscoroutinefunction(replacement_function):
+            raise InvalidReplacementFunctionError("A regular function can only be decorated with a regular replacement function, not with {}!".format(replacement_function))
+
+        # Cache & return the replacement function
+        cache.store_replacement_function(decorator, replacement_function)
         return replacement_function
@@ -20,26 +20,61 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Callable, Tuple, Any, Dict
+from typing import final, Callable, Tuple, Any, Dict, Optional
 import inspect
 import functools
 from sidein.ns.NamespaceInterface import NamespaceInterface
 from sidein.ns.exc.NotAFunctionError import NotAFunctionError
+from sidein.ns._utils.AnnotatedInjectionAnalyser import AnnotatedInjectionAnalyser
+from sidein.ns._utils.InjectionSpecification import InjectionSpecification
+from sidein.ns.exc.NotAnInjectedFunctionError import NotAnInjectedFunctionError
+from sidein.ns.exc.InvalidRefreshIntervalError import InvalidRefreshIntervalError
+from sidein.obtainer._RefreshingDependencyObtainer import _RefreshingDependencyObtainer
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.tracing.TracingOperation import TracingOperation
+from sidein.tracing._TracingUtils import _TracingUtils
 
 
 @final
 class DependencyInjector:
     """
     Helper class that handles this library's dependency injection capabilities.
-    Used by _Namespace.inject_dependencies().
+    Used by _Namespace.inject_dependencies(), _Namespace.inject_method_dependencies(), _Namespace.inject_annotated()
+     and _Namespace.bind().
     """
 
-    __slots__ = "_namespace",
+    __slots__ = "_namespace", "_namespace_name", "_tracing_hook"
 
-    def __init__(self, namespace: NamespaceInterface):
+    def __init__(self, namespace: NamespaceInterface, namespace_name: str):
         self._namespace: NamespaceInterface = namespace
+        self._namespace_name: str = namespace_name
+        self._tracing_hook: Optional[TracingHookInterface] = None
+
+    # The tracing hook is read without locking on each call, so that the decorated functions don't need to lock
+    #  anything when no tracing hook is set.
+    def set_tracing_hook(self, tracing_hook: Optional[TracingHookInterface]) -> None:
+        self._tracing_hook = tracing_hook
+
+    def generate_injector_for_function(self, func: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool, refresh_every: Optional[int] = None) -> Callable:
+        if refresh_every is not None:
+            if not isinstance(refresh_every, int) or isinstance(refresh_every, bool) or refresh_every < 1:
+                raise InvalidRefreshIntervalError("The refresh interval must be a positive integer, not {}!".format(refresh_every))
+
+            # Refreshing generators are always injected with (refreshing) obtainers
+            if in_obtainers:
+                raise InvalidRefreshIntervalError("A refresh interval cannot be combined with 'in_obtainers'!")
+
+            if not inspect.isgeneratorfunction(func) and not inspect.isasyncgenfunction(func):
+                raise InvalidRefreshIntervalError("A refresh interval can only be used with generator functions, not with {}!".format(func))
+
+        # Generators (which are routines too) must be checked first, so that their dependencies are resolved when they
+        #  start running, not when the generator objects are created
+        if inspect.isasyncgenfunction(func):
+            return self._generate_injector_for_async_generator_function(func, names, in_obtainers, as_kwargs, refresh_every)
+
+        if inspect.isgeneratorfunction(func):
+            return self._generate_injector_for_generator_function(func, names, in_obtainers, as_kwargs, refresh_every)
 
-    def generate_injector_for_function(self, func: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Callable:
         if inspect.iscoroutinefunction(func):
             return self._generate_injector_for_async_function(func, names, in_obtainers, as_kwargs)
 
@@ -48,6 +83,118 @@ class DependencyInjector:
 
         raise NotAFunctionError("Dependencies can only be injected to functions and methods, not to {}!".format(func))
 
+    def generate_method_injector_for_function(self, method: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Callable:
+        # Only regular methods are specialized - the overhead saved is negligible compared to the cost of awaiting a
+        #  coroutine or of running a generator
+        if not inspect.isroutine(method) or inspect.iscoroutinefunction(method) or inspect.isgeneratorfunction(method) or inspect.isasyncgenfunction(method):
+            return self.generate_injector_for_function(method, names, in_obtainers, as_kwargs)
+
+        # A plain function is used instead of a custom descriptor, as functions are bound to instances natively, which
+        #  is faster than calling a __get__() method written in Python on each attribute access
+        if len(names) == 1:
+            method_injector = self._generate_single_dependency_method_injector(method, names, in_obtainers, as_kwargs)
+        else:
+            method_injector = self._generate_method_injector(method, names, in_obtainers, as_kwargs)
+
+        return InjectionSpecification(self._namespace, method, names, tuple((name, name) for name in names), in_obtainers, as_kwargs).attach_to(method_injector)
+
+    def _generate_single_dependency_method_injector(self, method: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Callable:
+        name = names[0]
+        get_dependency = self._namespace.get_dependency  # This method must be thread-safe!
+
+        # The instance is separated from the other positional arguments, so that the arguments are passed to the
+        #  method without building any intermediate tuple or dictionary
+        if as_kwargs:
+            @functools.wraps(method)
+            def _method_injector(instance, /, *args, **kwargs):
+                if self._tracing_hook is not None:
+                    return self._call_method_traced(method, instance, args, kwargs, names, in_obtainers, as_kwargs)
+
+                kwargs[name] = get_dependency(name, in_obtainers)
+                return method(instance, *args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def _method_injector(instance, /, *args, **kwargs):
+                if self._tracing_hook is not None:
+                    return self._call_method_traced(method, instance, args, kwargs, names, in_obtainers, as_kwargs)
+
+                return method(instance, *args, get_dependency(name, in_obtainers), **kwargs)
+
+        return _method_injector
+
+    def _generate_method_injector(self, method: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Callable:
+        get_dependencies = self._namespace.get_dependencies  # This method must be thread-safe!
+
+        if as_kwargs:
+            @functools.wraps(method)
+            def _method_injector(instance, /, *args, **kwargs):
+                if self._tracing_hook is not None:
+                    return self._call_method_traced(method, instance, args, kwargs, names, in_obtainers, as_kwargs)
+
+                kwargs.update(get_dependencies(*names, in_obtainers=in_obtainers))
+                return method(instance, *args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def _method_injector(instance, /, *args, **kwargs):
+                if self._tracing_hook is not None:
+                    return self._call_method_traced(method, instance, args, kwargs, names, in_obtainers, as_kwargs)
+
+                dependencies = get_dependencies(*names, in_obtainers=in_obtainers)
+                return method(instance, *args, *[dependencies[name] for name in names], **kwargs)
+
+        return _method_injector
+
+    def _call_method_traced(self, method: Callable, instance: Any, args: Tuple[Any, ...], kwargs: Dict[str, Any], names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Any:
+        args, kwargs = self._perform_injection(args, kwargs, names, in_obtainers, as_kwargs)
+
+        return method(instance, *args, **kwargs)
+
+    def generate_annotated_injector_for_function(self, func: Callable, in_obtainers: bool) -> Callable:
+        if not inspect.isroutine(func):
+            raise NotAFunctionError("Dependencies can only be injected to functions and methods, not to {}!".format(func))
+
+        injected_parameters = AnnotatedInjectionAnalyser.analyse_function(func)
+
+        # If each parameter is named after its dependency, the function is handled exactly like a function decorated
+        #  with inject_dependencies(), so the injection costs the same
+        if all(parameter_name == dependency_name for parameter_name, dependency_name in injected_parameters):
+            return self.generate_injector_for_function(func, tuple(parameter_name for parameter_name, _ in injected_parameters), in_obtainers, True)
+
+        # The dependencies must be requested only once each, even if they are injected into multiple parameters
+        names = tuple(dict.fromkeys(dependency_name for _, dependency_name in injected_parameters))
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def _async_function_annotated_injector(*args, **kwargs):
+                kwargs = self._perform_renaming_injection(kwargs, names, injected_parameters, in_obtainers)
+
+                return await func(*args, **kwargs)
+
+            return InjectionSpecification(self._namespace, func, names, injected_parameters, in_obtainers, True).attach_to(_async_function_annotated_injector)
+
+        @functools.wraps(func)
+        def _regular_function_annotated_injector(*args, **kwargs):
+            kwargs = self._perform_renaming_injection(kwargs, names, injected_parameters, in_obtainers)
+
+            return func(*args, **kwargs)
+
+        return InjectionSpecification(self._namespace, func, names, injected_parameters, in_obtainers, True).attach_to(_regular_function_annotated_injector)
+
+    def _perform_renaming_injection(self, kwargs: Dict[str, Any], names: Tuple[str, ...], injected_parameters: Tuple[Tuple[str, str], ...], in_obtainers: bool) -> Dict[str, Any]:
+        tracing_hook = self._tracing_hook
+        if tracing_hook is None:
+            return self._perform_renaming_injection_untraced(kwargs, names, injected_parameters, in_obtainers)
+
+        return _TracingUtils.call_traced(tracing_hook, self._namespace_name, TracingOperation.DEPENDENCY_INJECTION, names, self._perform_renaming_injection_untraced, kwargs, names, injected_parameters, in_obtainers)
+
+    def _perform_renaming_injection_untraced(self, kwargs: Dict[str, Any], names: Tuple[str, ...], injected_parameters: Tuple[Tuple[str, str], ...], in_obtainers: bool) -> Dict[str, Any]:
+        dependencies = self._namespace.get_dependencies(*names, in_obtainers=in_obtainers)  # This method must be thread-safe!
+
+        for parameter_name, dependency_name in injected_parameters:
+            kwargs[parameter_name] = dependencies[dependency_name]
+
+        return kwargs
+
     def _generate_injector_for_regular_function(self, func: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Callable:
         @functools.wraps(func)
         def _regular_function_injector(*args, **kwargs):
@@ -58,7 +205,7 @@ class DependencyInjector:
 
             return func(*args, **kwargs)
 
-        return _regular_function_injector
+        return InjectionSpecification(self._namespace, func, names, tuple((name, name) for name in names), in_obtainers, as_kwargs).attach_to(_regular_function_injector)
 
     def _generate_injector_for_async_function(self, async_func: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Callable:
         @functools.wraps(async_func)
@@ -70,9 +217,118 @@ class DependencyInjector:
 
             return await async_func(*args, **kwargs)
 
-        return _async_function_injector
+        return InjectionSpecification(self._namespace, async_func, names, tuple((name, name) for name in names), in_obtainers, as_kwargs).attach_to(_async_function_injector)
+
+    def _generate_injector_for_generator_function(self, generator_func: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool, refresh_every: Optional[int]) -> Callable:
+        if refresh_every is None:
+            @functools.wraps(generator_func)
+            def _generator_function_injector(*args, **kwargs):
+                # The dependencies are injected once the generator starts running, and they stay the same for its
+                #  whole lifetime; 'yield from' takes care of passing send(), throw() and close() through
+                args, kwargs = self._perform_injection(args, kwargs, names, in_obtainers, as_kwargs)
+
+                return (yield from generator_func(*args, **kwargs))
+        else:
+            @functools.wraps(generator_func)
+            def _generator_function_injector(*args, **kwargs):
+                args, kwargs, obtainers = self._perform_refreshing_injection(args, kwargs, names, as_kwargs)
+                generator = generator_func(*args, **kwargs)
+
+                # The delegation performed by 'yield from' is replicated here, as the yielded items need to be counted
+                try:
+                    item = next(generator)
+                    item_count = 0
+                    while True:
+                        try:
+                            sent_value = yield item
+                        except GeneratorExit:
+                            generator.close()
+                            raise
+                        except BaseException as e:
+                            item = generator.throw(e)
+                        else:
+                            item_count += 1
+                            if item_count % refresh_every == 0:
+                                self._refresh_obtainers(names, obtainers)
+                            item = generator.send(sent_value)
+                except StopIteration as e:
+                    return e.value
+
+        return self._attach_generator_injection_specification(generator_func, _generator_function_injector, names, in_obtainers, as_kwargs, refresh_every)
+
+    def _generate_injector_for_async_generator_function(self, async_generator_func: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool, refresh_every: Optional[int]) -> Callable:
+        @functools.wraps(async_generator_func)
+        async def _async_generator_function_injector(*args, **kwargs):
+            # The dependencies are injected once the async generator starts running; async generators don't support
+            #  'yield from', so asend(), athrow() and aclose() are passed through manually
+            if refresh_every is None:
+                args, kwargs = self._perform_injection(args, kwargs, names, in_obtainers, as_kwargs)
+                obtainers = ()
+            else:
+                args, kwargs, obtainers = self._perform_refreshing_injection(args, kwargs, names, as_kwargs)
+
+            async_generator = async_generator_func(*args, **kwargs)
+            try:
+                item = await async_generator.__anext__()
+                item_count = 0
+                while True:
+                    try:
+                        sent_value = yield item
+                    except GeneratorExit:
+                        await async_generator.aclose()
+                        raise
+                    except BaseException as e:
+                        item = await async_generator.athrow(e)
+                    else:
+                        item_count += 1
+                        if refresh_every is not None and item_count % refresh_every == 0:
+                            self._refresh_obtainers(names, obtainers)
+                        item = await async_generator.asend(sent_value)
+            except StopAsyncIteration:
+                return
+
+        return self._attach_generator_injection_specification(async_generator_func, _async_generator_function_injector, names, in_obtainers, as_kwargs, refresh_every)
+
+    def _attach_generator_injection_specification(self, generator_func: Callable, injector: Callable, names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool, refresh_every: Optional[int]) -> Callable:
+        # Refreshing generators expect refreshing obtainers, which cannot be bound to the generator function once
+        #  (their dependencies are refreshed by the injector while the generator is running), so bind(), map() and
+        #  imap() refuse such generators
+        if refresh_every is not None:
+            return injector
+
+        return InjectionSpecification(self._namespace, generator_func, names, tuple((name, name) for name in names), in_obtainers, as_kwargs).attach_to(injector)
+
+    def _perform_refreshing_injection(self, args: Tuple[Any, ...], kwargs: Dict[str, Any], names: Tuple[str, ...], as_kwargs: bool) -> Tuple[Tuple[Any, ...], Dict[str, Any], Tuple[_RefreshingDependencyObtainer, ...]]:
+        dependencies = self._resolve_dependencies(names)
+        obtainers = tuple(_RefreshingDependencyObtainer(name, dependencies[name]) for name in names)
+
+        if as_kwargs:
+            kwargs.update(zip(names, obtainers))
+        else:
+            args += obtainers
+
+        return args, kwargs, obtainers
+
+    def _refresh_obtainers(self, names: Tuple[str, ...], obtainers: Tuple[_RefreshingDependencyObtainer, ...]) -> None:
+        dependencies = self._resolve_dependencies(names)
+        for obtainer in obtainers:
+            obtainer.refresh_dependency(dependencies[obtainer.get_dependency_name()])
+
+    def _resolve_dependencies(self, names: Tuple[str, ...]) -> Dict[str, Any]:
+        tracing_hook = self._tracing_hook
+        if tracing_hook is None:
+            return self._namespace.get_dependencies(*names)  # This method must be thread-safe!
+
+        return _TracingUtils.call_traced(tracing_hook, self._namespace_name, TracingOperation.DEPENDENCY_INJECTION, names, self._namespace.get_dependencies, *names)
 
     def _perform_injection(self, args: Tuple[Any, ...], kwargs: Dict[str, Any], names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        tracing_hook = self._tracing_hook
+        if tracing_hook is None:
+            return self._perform_injection_untraced(args, kwargs, names, in_obtainers, as_kwargs)
+
+        return _TracingUtils.call_traced(tracing_hook, self._namespace_name, TracingOperation.DEPENDENCY_INJECTION, names, self._perform_injection_untraced, args, kwargs, names, in_obtainers, as_kwargs)
+
+    def _perform_injection_untraced(self, args: Tuple[Any, ...], kwargs: Dict[str, Any], names: Tuple[str, ...], in_obtainers: bool, as_kwargs: bool) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
         dependencies = self._namespace.get_dependencies(*names, in_obtainers=in_obtainers)  # This method must be thread-safe!
 
         if as_kwargs:
@@ -84,3 +340,35 @@ class DependencyInjector:
         # It is not necessary to return the kwargs, because the dictionary containing them is obviously mutable, but
         #  it's done nevertheless due to code consistency and possible future changes
         return args, kwargs
+
+    def check_injected_function(self, injector: Callable) -> InjectionSpecification:
+        specification = InjectionSpecification.get_attached_to(injector)
+        if specification is None or specification.namespace is not self._namespace:
+            raise NotAnInjectedFunctionError("Only functions decorated with inject_dependencies() or inject_annotated() of this namespace can be bound, not {}!".format(injector))
+
+        return specification
+
+    def bind_injected_function(self, injector: Callable) -> Callable:
+        specification = self.check_injected_function(injector)
+
+        # The dependencies are resolved (and traced) exactly as they would be if the decorated function was called
+        tracing_hook = self._tracing_hook
+        if tracing_hook is None:
+            dependencies = self._resolve_specified_dependencies(specification)
+        else:
+            dependencies = _TracingUtils.call_traced(tracing_hook, self._namespace_name, TracingOperation.DEPENDENCY_INJECTION, specification.names, self._resolve_specified_dependencies, specification)
+
+        func = specification.func
+        if specification.as_kwargs:
+            return functools.partial(func, **{parameter_name: dependencies[dependency_name] for parameter_name, dependency_name in specification.injected_parameters})
+
+        injected_args = tuple(dependencies[name] for name in specification.names)
+
+        @functools.wraps(func)
+        def _bound_function(*args, **kwargs):
+            return func(*args, *injected_args, **kwargs)
+
+        return _bound_function
+
+    def _resolve_specified_dependencies(self, specification: InjectionSpecification) -> Dict[str, Any]:
+        return self._namespace.get_dependencies(*specification.names, in_obtainers=specification.in_obtainers)  # This method must be thread-safe!
@@ -0,0 +1,61 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Optional, Tuple
+from sidein.ns.NamespaceInterface import NamespaceInterface
+
+
+@final
+class InjectionSpecification:
+    """
+    Describes what is injected into a function decorated with inject_dependencies() or inject_annotated(). It's
+     attached to the decorated function (see ATTRIBUTE_NAME), so that the namespace can resolve the dependencies once
+     and call the undecorated function repeatedly (see NamespaceInterface.bind()).
+    """
+
+    __slots__ = "namespace", "injector", "func", "names", "injected_parameters", "in_obtainers", "as_kwargs"
+
+    ATTRIBUTE_NAME: str = "_sidein_injection_specification"
+
+    def __init__(self, namespace: NamespaceInterface, func: Callable, names: Tuple[str, ...], injected_parameters: Tuple[Tuple[str, str], ...], in_obtainers: bool, as_kwargs: bool):
+        self.namespace: NamespaceInterface = namespace
+        self.injector: Optional[Callable] = None  # The decorated function this specification is attached to
+        self.func: Callable = func  # The undecorated function
+        self.names: Tuple[str, ...] = names  # The names of the requested dependencies, each of them only once
+        self.injected_parameters: Tuple[Tuple[str, str], ...] = injected_parameters  # ((parameter name, dependency name), ...), only used if as_kwargs is True
+        self.in_obtainers: bool = in_obtainers
+        self.as_kwargs: bool = as_kwargs
+
+    def attach_to(self, injector: Callable) -> Callable:
+        self.injector = injector
+        setattr(injector, InjectionSpecification.ATTRIBUTE_NAME, self)
+        return injector
+
+    # functools.wraps() copies the attribute to the functions wrapping the decorated function, which must not be bound
+    #  (their own behaviour would be skipped), so the specification is only returned for the function it's attached to
+    @staticmethod
+    def get_attached_to(injector: Any) -> Optional["InjectionSpecification"]:
+        specification = getattr(injector, InjectionSpecification.ATTRIBUTE_NAME, None)
+        if not isinstance(specification, InjectionSpecification) or specification.injector is not injector:
+            return None
+
+        return specification
@@ -0,0 +1,103 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Dict, Optional, Tuple
+import types
+import inspect
+import functools
+import importlib
+from sidein.ns._utils.InjectionSpecification import InjectionSpecification
+from sidein.ns.exc.NotPicklableFunctionError import NotPicklableFunctionError
+
+
+@final
+class PicklableFunctionWrapper:
+    """
+    Wraps a function generated by inject_dependencies() or decorate_with_dependency() with 'picklable' set to True.
+     Closures cannot be pickled, so the wrapper is pickled by reference instead - as the namespace's name, the
+     decorator's name and arguments, and the module and qualified name of the decorated function. When it's unpickled
+     (e.g. in a worker process of a ProcessPoolExecutor), the decorated function is looked up and decorated again, so
+     that the dependencies are acquired from the namespace of the same name in the unpickling process.
+
+    If the decorated function's qualified name leads to the wrapper itself (i.e. when it's used as a decorator at
+     module level), the wrapper created when the module was imported in the unpickling process is reused.
+
+    Only regular functions can be wrapped.
+    """
+
+    # Slots are not used, as functools.update_wrapper() needs the __dict__
+
+    def __init__(self, function: Callable, decorated_func: Callable, namespace_name: str, decorator_name: str, decorator_args: Tuple[Any, ...], decorator_kwargs: Dict[str, Any]):
+        # The wrapper isn't a function, so it would be treated as a regular function by the decorators applied on top
+        #  of it (and by inspect in general)
+        if inspect.iscoroutinefunction(decorated_func) or inspect.isgeneratorfunction(decorated_func) or inspect.isasyncgenfunction(decorated_func):
+            raise NotPicklableFunctionError("Only regular functions can be made picklable, not {}!".format(decorated_func))
+
+        module_name = getattr(decorated_func, "__module__", None)
+        qualname = getattr(decorated_func, "__qualname__", None)
+        if not isinstance(module_name, str) or not isinstance(qualname, str) or "<" in qualname:
+            raise NotPicklableFunctionError("Only functions which can be looked up by their qualified name in their module can be made picklable, not {}!".format(decorated_func))
+
+        self._function: Callable = function
+        self._decorated_func: Callable = decorated_func
+        self._reduce_arguments: Tuple[Any, ...] = (namespace_name, decorator_name, decorator_args, decorator_kwargs, module_name, qualname)
+
+        functools.update_wrapper(self, function)
+
+        # The specification is moved to the wrapper, so that it can be passed to bind(), map() and imap()
+        specification = InjectionSpecification.get_attached_to(function)
+        if specification is not None:
+            specification.attach_to(self)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._function(*args, **kwargs)
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+
+        return types.MethodType(self, instance)
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[Any, ...]]:
+        return PicklableFunctionWrapper.restore, self._reduce_arguments
+
+    @staticmethod
+    def restore(namespace_name: str, decorator_name: str, decorator_args: Tuple[Any, ...], decorator_kwargs: Dict[str, Any], module_name: str, qualname: str) -> "PicklableFunctionWrapper":
+        decorated_func = importlib.import_module(module_name)
+        for attribute_name in qualname.split("."):
+            decorated_func = getattr(decorated_func, attribute_name)
+
+        if isinstance(decorated_func, PicklableFunctionWrapper):
+            if decorated_func._reduce_arguments == (namespace_name, decorator_name, decorator_args, decorator_kwargs, module_name, qualname):
+                return decorated_func
+
+            decorated_func = decorated_func._decorated_func
+
+        # The library's gateway class cannot be imported at the top of this module, as it (indirectly) imports this
+        #  module itself
+        sidein_module = importlib.import_module("sidein.Sidein")
+        namespace = sidein_module.Sidein.ns(namespace_name)
+
+        return getattr(namespace, decorator_name)(*decorator_args, **decorator_kwargs)(decorated_func)
+
+    def __repr__(self) -> str:
+        return "<picklable {!r}>".format(self._function)
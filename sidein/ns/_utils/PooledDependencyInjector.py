@@ -0,0 +1,175 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Callable, Tuple, Any, Dict, List
+import inspect
+import functools
+from sidein.ns.NamespaceInterface import NamespaceInterface
+from sidein.ns.exc.NotAFunctionError import NotAFunctionError
+from sidein.ns.exc.NotADependencyPoolError import NotADependencyPoolError
+from sidein.pool.DependencyPoolInterface import DependencyPoolInterface
+
+
+@final
+class PooledDependencyInjector:
+    """
+    Helper class that handles the injection of instances checked out from dependency pools.
+    Used by _Namespace.inject_pooled_dependencies().
+    """
+
+    # The pools are resolved from the namespace under its lock, but the instances are checked out from them only after
+    #  the lock has been released - waiting for a busy pool must not block the other users of the namespace.
+
+    __slots__ = "_namespace",
+
+    def __init__(self, namespace: NamespaceInterface):
+        self._namespace: NamespaceInterface = namespace
+
+    def generate_pooled_injector_for_function(self, func: Callable, names: Tuple[str, ...], as_kwargs: bool) -> Callable:
+        # Generators (which are routines too) must be checked first, so that the instances stay checked out for as long
+        #  as the generator is running, not only while the generator object is being created
+        if inspect.isasyncgenfunction(func):
+            return self._generate_pooled_injector_for_async_generator_function(func, names, as_kwargs)
+
+        if inspect.isgeneratorfunction(func):
+            return self._generate_pooled_injector_for_generator_function(func, names, as_kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            return self._generate_pooled_injector_for_async_function(func, names, as_kwargs)
+
+        if inspect.isroutine(func):
+            return self._generate_pooled_injector_for_regular_function(func, names, as_kwargs)
+
+        raise NotAFunctionError("Pooled dependencies can only be injected to functions and methods, not to {}!".format(func))
+
+    def _generate_pooled_injector_for_regular_function(self, func: Callable, names: Tuple[str, ...], as_kwargs: bool) -> Callable:
+        @functools.wraps(func)
+        def _regular_function_pooled_injector(*args, **kwargs):
+            pools = self._resolve_pools(names)
+
+            checked_out_instances = []
+            try:
+                for pool in pools:
+                    checked_out_instances.append(pool.check_out())
+
+                args, kwargs = self._inject_instances(args, kwargs, names, checked_out_instances, as_kwargs)
+                return func(*args, **kwargs)
+            finally:
+                self._check_in_instances(pools, checked_out_instances)
+
+        return _regular_function_pooled_injector
+
+    def _generate_pooled_injector_for_async_function(self, async_func: Callable, names: Tuple[str, ...], as_kwargs: bool) -> Callable:
+        @functools.wraps(async_func)
+        async def _async_function_pooled_injector(*args, **kwargs):
+            pools = self._resolve_pools(names)
+
+            checked_out_instances = []
+            try:
+                for pool in pools:
+                    checked_out_instances.append(await pool.check_out_async())
+
+                args, kwargs = self._inject_instances(args, kwargs, names, checked_out_instances, as_kwargs)
+                return await async_func(*args, **kwargs)
+            finally:
+                self._check_in_instances(pools, checked_out_instances)
+
+        return _async_function_pooled_injector
+
+    def _generate_pooled_injector_for_generator_function(self, generator_func: Callable, names: Tuple[str, ...], as_kwargs: bool) -> Callable:
+        @functools.wraps(generator_func)
+        def _generator_function_pooled_injector(*args, **kwargs):
+            # The instances are checked out once the generator starts running and checked in once it finishes or is
+            #  closed; 'yield from' takes care of passing send(), throw() and close() through
+            pools = self._resolve_pools(names)
+
+            checked_out_instances = []
+            try:
+                for pool in pools:
+                    checked_out_instances.append(pool.check_out())
+
+                args, kwargs = self._inject_instances(args, kwargs, names, checked_out_instances, as_kwargs)
+                return (yield from generator_func(*args, **kwargs))
+            finally:
+                self._check_in_instances(pools, checked_out_instances)
+
+        return _generator_function_pooled_injector
+
+    def _generate_pooled_injector_for_async_generator_function(self, async_generator_func: Callable, names: Tuple[str, ...], as_kwargs: bool) -> Callable:
+        @functools.wraps(async_generator_func)
+        async def _async_generator_function_pooled_injector(*args, **kwargs):
+            # The instances are checked out once the async generator starts running and checked in once it finishes or
+            #  is closed; async generators don't support 'yield from', so asend(), athrow() and aclose() are passed
+            #  through manually
+            pools = self._resolve_pools(names)
+
+            checked_out_instances = []
+            try:
+                for pool in pools:
+                    checked_out_instances.append(await pool.check_out_async())
+
+                args, kwargs = self._inject_instances(args, kwargs, names, checked_out_instances, as_kwargs)
+                async_generator = async_generator_func(*args, **kwargs)
+                try:
+                    item = await async_generator.__anext__()
+                    while True:
+                        try:
+                            sent_value = yield item
+                        except GeneratorExit:
+                            await async_generator.aclose()
+                            raise
+                        except BaseException as e:
+                            item = await async_generator.athrow(e)
+                        else:
+                            item = await async_generator.asend(sent_value)
+                except StopAsyncIteration:
+                    return
+            finally:
+                self._check_in_instances(pools, checked_out_instances)
+
+        return _async_generator_function_pooled_injector
+
+    def _resolve_pools(self, names: Tuple[str, ...]) -> List[DependencyPoolInterface]:
+        dependencies = self._namespace.get_dependencies(*names)  # This method must be thread-safe!
+
+        pools = []
+        for name in names:
+            pool = dependencies[name]
+            if not isinstance(pool, DependencyPoolInterface):
+                raise NotADependencyPoolError("The dependency {} is not a dependency pool, but {}!".format(repr(name), pool))
+
+            pools.append(pool)
+
+        return pools
+
+    def _inject_instances(self, args: Tuple[Any, ...], kwargs: Dict[str, Any], names: Tuple[str, ...], instances: List[Any], as_kwargs: bool) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        if as_kwargs:
+            kwargs.update(zip(names, instances))
+        else:
+            args += tuple(instances)
+
+        return args, kwargs
+
+    def _check_in_instances(self, pools: List[DependencyPoolInterface], instances: List[Any]) -> None:
+        # zip() stops at the shorter list, so only the instances which have actually been checked out are checked in
+        for pool, instance in zip(pools, instances):
+            pool.check_in(instance)
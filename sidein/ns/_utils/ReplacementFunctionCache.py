@@ -0,0 +1,57 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Callable, Optional, Tuple, Any
+
+
+@final
+class ReplacementFunctionCache:
+    """
+    Remembers the replacement function which has been built from the most recently used decorator of a function
+     decorated with decorate_with_dependency(), so that the replacement function doesn't need to be rebuilt (and
+     revalidated) each time the decorated function is called, as long as the decorator stays the same.
+    Decorators are compared by equality, so bound methods of the same object are considered the same decorator even
+     though a new bound method object is created on each attribute access. However, decorators which are created anew
+     on each acquisition (e.g. closures returned by a parametrized decorator called from a decorator extractor) are
+     never equal to each other, so the replacement function is rebuilt on each call in that case.
+    Used by DependencyDecorator.
+    """
+
+    # The decorator and its replacement function are stored in a single tuple which is always replaced as a whole, so
+    #  the cache can be used from multiple threads without locking. A reference to the decorator is kept, so that its
+    #  identity cannot be reused by a different object while it's cached. The identity is checked first, as it's the
+    #  common case and it's cheaper than calling __eq__().
+
+    __slots__ = "_entry",
+
+    def __init__(self):
+        self._entry: Optional[Tuple[Any, Callable]] = None
+
+    def get_replacement_function(self, decorator: Any) -> Optional[Callable]:
+        entry = self._entry
+        if entry is None or (entry[0] is not decorator and entry[0] != decorator):
+            return None
+
+        return entry[1]
+
+    def store_replacement_function(self, decorator: Any, replacement_function: Callable) -> None:
+        self._entry = (decorator, replacement_function)
@@ -20,7 +20,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import Dict
+from typing import Dict, Mapping
 import abc
 from sidein.ns.NamespaceInterface import NamespaceInterface
 
@@ -69,6 +69,20 @@ class NamespaceManagerInterface(metaclass=abc.ABCMeta):
 
         raise NotImplementedError(NamespaceManagerInterface.get_all_namespaces.__qualname__)
 
+    @abc.abstractmethod
+    def get_all_namespaces_view(self) -> Mapping[str, NamespaceInterface]:
+        """
+        Returns a read-only snapshot of all the namespaces stored in the namespace manager in a {name: namespace}
+         mapping. Unlike get_all_namespaces(), the namespaces are not copied into a new dictionary on each call - the
+         snapshot is taken once after each change of the namespace manager and shared by all the callers until the
+         namespace manager changes again. The snapshot never changes, so it's safe to iterate over it while other
+         threads add or remove namespaces.
+
+        :return: A read-only snapshot of all the namespaces stored in the namespace manager.
+        """
+
+        raise NotImplementedError(NamespaceManagerInterface.get_all_namespaces_view.__qualname__)
+
     @abc.abstractmethod
     def add_namespace(self, name: str) -> None:
         """
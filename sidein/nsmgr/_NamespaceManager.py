@@ -20,11 +20,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Dict
+from typing import final, Dict, Mapping, Optional
 import threading
 from sidein.ns.NamespaceInterface import NamespaceInterface
 from sidein.nsmgr.NamespaceManagerInterface import NamespaceManagerInterface
 from sidein.nsmgr._ThreadSafeNamespaceManager import _ThreadSafeNamespaceManager
+from sidein.lockprofiler._LockRegistry import _LockRegistry
 
 
 @final
@@ -35,14 +36,21 @@ class _NamespaceManager(NamespaceManagerInterface):
 
     # DP: Proxy
 
-    __slots__ = "_nsmgr_lock", "_thread_safe_nsmgr"
+    __slots__ = "_nsmgr_lock", "_thread_safe_nsmgr", "_published_namespaces_view"
 
     def __init__(self):
-        self._nsmgr_lock: threading.Lock = threading.Lock()
+        self._nsmgr_lock: threading.Lock = _LockRegistry.create_lock("_NamespaceManager._nsmgr_lock")
         self._thread_safe_nsmgr: NamespaceManagerInterface = _ThreadSafeNamespaceManager()
+        self._published_namespaces_view: Optional[Mapping[str, NamespaceInterface]] = None  # Cleared under the lock on each change
 
     def add_namespace_if_not_exists_and_get_it(self, name: str) -> NamespaceInterface:
         with self._nsmgr_lock:
+            # The published snapshot (if any) is up to date while the lock is held, so it tells whether the namespace
+            #  is going to be inserted - getting an existing namespace must not discard the snapshot
+            namespaces_view = self._published_namespaces_view
+            if namespaces_view is not None and name not in namespaces_view:
+                self._published_namespaces_view = None
+
             return self._thread_safe_nsmgr.add_namespace_if_not_exists_and_get_it(name)
 
     def get_namespace(self, name: str) -> NamespaceInterface:
@@ -53,14 +61,28 @@ class _NamespaceManager(NamespaceManagerInterface):
         with self._nsmgr_lock:
             return self._thread_safe_nsmgr.get_all_namespaces()
 
+    def get_all_namespaces_view(self) -> Mapping[str, NamespaceInterface]:
+        # The published snapshot is immutable, so it can be returned without locking
+        namespaces_view = self._published_namespaces_view
+        if namespaces_view is not None:
+            return namespaces_view
+
+        with self._nsmgr_lock:
+            namespaces_view = self._thread_safe_nsmgr.get_all_namespaces_view()
+            self._published_namespaces_view = namespaces_view
+            return namespaces_view
+
     def add_namespace(self, name: str) -> None:
         with self._nsmgr_lock:
+            self._published_namespaces_view = None
             return self._thread_safe_nsmgr.add_namespace(name)
 
     def remove_namespace(self, name: str) -> None:
         with self._nsmgr_lock:
+            self._published_namespaces_view = None
             return self._thread_safe_nsmgr.remove_namespace(name)
 
     def remove_all_namespaces(self) -> None:
         with self._nsmgr_lock:
+            self._published_namespaces_view = None
             return self._thread_safe_nsmgr.remove_all_namespaces()
@@ -20,7 +20,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Dict
+from typing import final, Dict, Mapping
+import types
 from sidein.ns.NamespaceInterface import NamespaceInterface
 from sidein.ns._Namespace import _Namespace
 from sidein.nsmgr.NamespaceManagerInterface import NamespaceManagerInterface
@@ -59,6 +60,10 @@ class _ThreadSafeNamespaceManager(NamespaceManagerInterface):
         # Shallow-copy the dict to prevent (accidental) modification of this this class's internal members
         return self._namespaces.copy()
 
+    def get_all_namespaces_view(self) -> Mapping[str, NamespaceInterface]:
+        # The snapshot is published (and reused until the next change) by the thread-safety locking proxy
+        return types.MappingProxyType(self._namespaces.copy())
+
     def add_namespace(self, name: str) -> None:
         if self._namespace_exists(name):
             raise NamespaceExistsException(name)
@@ -66,7 +71,7 @@ class _ThreadSafeNamespaceManager(NamespaceManagerInterface):
         self._add_namespace_checkless(name)
 
     def _add_namespace_checkless(self, name: str) -> None:
-        self._namespaces[name] = self._create_new_namespace()
+        self._namespaces[name] = self._create_new_namespace(name)
 
     def remove_namespace(self, name: str) -> None:
         if not self._namespace_exists(name):
@@ -80,8 +85,8 @@ class _ThreadSafeNamespaceManager(NamespaceManagerInterface):
     def remove_all_namespaces(self) -> None:
         self._namespaces.clear()
 
-    def _create_new_namespace(self) -> NamespaceInterface:
-        return _Namespace()
+    def _create_new_namespace(self, name: str) -> NamespaceInterface:
+        return _Namespace(name)
 
     def _namespace_exists(self, name: str) -> bool:
         return name in self._namespaces
@@ -0,0 +1,48 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any
+from sidein.obtainer.DependencyObtainerInterface import DependencyObtainerInterface
+
+
+@final
+class _RefreshingDependencyObtainer(DependencyObtainerInterface):
+    """
+    A dependency obtainer which is injected into generators decorated with inject_dependencies(refresh_every=N).
+     Instead of acquiring the dependency from the namespace on each call, it returns the dependency acquired by the
+     generator's injector, which acquires the dependencies again after every N items yielded by the generator.
+    """
+
+    __slots__ = ("_dependency_name", "_dependency")
+
+    def __init__(self, dependency_name: str, dependency: Any):
+        self._dependency_name: str = dependency_name
+        self._dependency: Any = dependency
+
+    def get_dependency_name(self) -> str:
+        return self._dependency_name
+
+    def obtain_dependency(self) -> Any:
+        return self._dependency
+
+    def refresh_dependency(self, dependency: Any) -> None:
+        self._dependency = dependency
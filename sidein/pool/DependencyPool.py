@@ -0,0 +1,279 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Deque, Dict, List, Optional, Tuple
+import threading
+import time
+import asyncio
+import collections
+from sidein.pool.DependencyPoolInterface import DependencyPoolInterface
+from sidein.pool.exc.InvalidPoolSizeError import InvalidPoolSizeError
+from sidein.pool.exc.PoolCheckoutTimeoutError import PoolCheckoutTimeoutError
+from sidein.pool.exc.PoolFactoryRaisedAnExceptionError import PoolFactoryRaisedAnExceptionError
+from sidein.pool.exc.InstanceNotCheckedOutError import InstanceNotCheckedOutError
+from sidein.pool.exc.PoolClosedError import PoolClosedError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class DependencyPool(DependencyPoolInterface):
+    """
+    A thread-safe implementation of dependency pool.
+
+    The pool creates 'min_size' instances right away and grows on demand up to 'max_size' instances. The most recently
+     checked in instance is checked out first, so rarely needed surplus instances stay idle. New instances are created
+     outside of the pool's lock, so a slow factory doesn't block check-ins.
+
+    Coroutines waiting in check_out_async() are woken by the check-ins through a future of their event loop, so they
+     don't occupy any threads while waiting.
+    """
+
+    # Each check-in wakes up one waiting thread and one waiting coroutine (the pool cannot know which one is going to
+    #  use the instance) - the one which doesn't get the instance starts waiting again. A coroutine which gives up
+    #  waiting after it has been woken up passes the wakeup on to the next waiting coroutine, so that it isn't lost.
+
+    __slots__ = "_pool_lock", "_instance_available", "_async_waiters", "_factory", "_min_size", "_max_size", "_checkout_timeout_seconds", \
+                "_disposal_callback", "_idle_instances", "_checked_out_instances", "_size", "_is_closed", \
+                "_checkout_count", "_checkout_timeout_count", "_total_checkout_wait_ns", "_max_checkout_wait_ns"
+
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int,
+                 min_size: int = 0,
+                 checkout_timeout_seconds: Optional[float] = None,
+                 disposal_callback: Optional[Callable[[Any], None]] = None):
+        """
+        :param factory: A function which creates a new instance (it's called without arguments).
+        :param max_size: The maximum number of instances.
+        :param min_size: The number of instances created right away.
+        :param checkout_timeout_seconds: The default checkout timeout, or None to wait for an instance indefinitely.
+        :param disposal_callback: A function which is called with each instance disposed of when the pool is closed. It must not raise any exceptions.
+        :raises InvalidPoolSizeError: If 'max_size' isn't positive, or if 'min_size' is negative or greater than 'max_size'.
+        :raises PoolFactoryRaisedAnExceptionError: If the factory raises an exception while creating the initial instances.
+        """
+
+        if max_size <= 0 or min_size < 0 or min_size > max_size:
+            raise InvalidPoolSizeError("The maximum pool size must be positive and the minimum pool size must be between 0 and the maximum size (min: {}, max: {})!".format(min_size, max_size))
+
+        self._pool_lock: threading.Lock = _LockRegistry.create_lock("DependencyPool._pool_lock[{}]".format(hex(id(self))))
+        self._instance_available: threading.Condition = threading.Condition(self._pool_lock)
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = collections.deque()
+        self._factory: Callable[[], Any] = factory
+        self._min_size: int = min_size
+        self._max_size: int = max_size
+        self._checkout_timeout_seconds: Optional[float] = checkout_timeout_seconds
+        self._disposal_callback: Optional[Callable[[Any], None]] = disposal_callback
+
+        self._idle_instances: List[Any] = [self._create_instance() for _ in range(min_size)]
+        self._checked_out_instances: Dict[int, Any] = {}  # {id(instance): instance}
+        self._size: int = min_size  # Includes the instances which are being created
+        self._is_closed: bool = False
+
+        self._checkout_count: int = 0
+        self._checkout_timeout_count: int = 0
+        self._total_checkout_wait_ns: int = 0
+        self._max_checkout_wait_ns: int = 0
+
+    def check_out(self, timeout_seconds: Optional[float] = None) -> Any:
+        if timeout_seconds is None:
+            timeout_seconds = self._checkout_timeout_seconds
+
+        wait_start_ns = time.perf_counter_ns()
+        with self._pool_lock:
+            if not self._instance_available.wait_for(self._can_check_out_thread_safe, timeout_seconds):
+                self._checkout_timeout_count += 1
+                raise PoolCheckoutTimeoutError("No instance has become available in the pool within {} seconds!".format(timeout_seconds))
+
+            self._record_checkout_thread_safe(time.perf_counter_ns() - wait_start_ns)
+            if self._idle_instances:
+                return self._check_out_idle_instance_thread_safe()
+
+            self._size += 1  # A slot for the new instance is reserved, so that the pool doesn't grow over its limits
+
+        return self._check_out_new_instance()
+
+    async def check_out_async(self, timeout_seconds: Optional[float] = None) -> Any:
+        if timeout_seconds is None:
+            timeout_seconds = self._checkout_timeout_seconds
+
+        loop = asyncio.get_running_loop()
+        deadline = (None if timeout_seconds is None else loop.time() + timeout_seconds)
+        wait_start_ns = time.perf_counter_ns()
+        while True:
+            with self._pool_lock:
+                if self._can_check_out_thread_safe():
+                    self._record_checkout_thread_safe(time.perf_counter_ns() - wait_start_ns)
+                    if self._idle_instances:
+                        return self._check_out_idle_instance_thread_safe()
+
+                    self._size += 1
+                    break
+
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            try:
+                await asyncio.wait_for(waiter, (None if deadline is None else max(deadline - loop.time(), 0)))
+            except asyncio.TimeoutError:
+                with self._pool_lock:
+                    self._remove_async_waiter_thread_safe(waiter)
+                    self._checkout_timeout_count += 1
+                raise PoolCheckoutTimeoutError("No instance has become available in the pool within {} seconds!".format(timeout_seconds))
+            except asyncio.CancelledError:
+                with self._pool_lock:
+                    self._remove_async_waiter_thread_safe(waiter)
+                    if waiter.done() and not waiter.cancelled():
+                        self._wake_async_waiter_thread_safe()  # The wakeup this coroutine has received is passed on
+                raise
+
+        return self._check_out_new_instance()
+
+    # This method must be called in a thread-safe context!
+    def _remove_async_waiter_thread_safe(self, waiter: asyncio.Future) -> None:
+        for index, (_, registered_waiter) in enumerate(self._async_waiters):
+            if registered_waiter is waiter:
+                del self._async_waiters[index]
+                return
+
+    # This method must be called in a thread-safe context!
+    def _wake_async_waiter_thread_safe(self) -> None:
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self._resolve_async_waiter, waiter)
+                return
+            except RuntimeError:  # The waiter's event loop has been closed
+                continue
+
+    def _resolve_async_waiter(self, waiter: asyncio.Future) -> None:
+        # Called in the waiter's event loop
+        if waiter.done():  # The waiter has already given up waiting, so the wakeup is passed on
+            with self._pool_lock:
+                self._wake_async_waiter_thread_safe()
+            return
+
+        waiter.set_result(None)
+
+    def try_check_out(self) -> Tuple[bool, Any]:
+        with self._pool_lock:
+            if not self._can_check_out_thread_safe():
+                return False, None
+
+            self._record_checkout_thread_safe(0)
+            if self._idle_instances:
+                return True, self._check_out_idle_instance_thread_safe()
+
+            self._size += 1
+
+        return True, self._check_out_new_instance()
+
+    # This method must be called in a thread-safe context!
+    def _can_check_out_thread_safe(self) -> bool:
+        if self._is_closed:
+            raise PoolClosedError("Instances cannot be checked out from a closed pool!")
+
+        return bool(self._idle_instances) or (self._size < self._max_size)
+
+    # This method must be called in a thread-safe context!
+    def _record_checkout_thread_safe(self, wait_ns: int) -> None:
+        self._checkout_count += 1
+        self._total_checkout_wait_ns += wait_ns
+        self._max_checkout_wait_ns = max(self._max_checkout_wait_ns, wait_ns)
+
+    # This method must be called in a thread-safe context!
+    def _check_out_idle_instance_thread_safe(self) -> Any:
+        instance = self._idle_instances.pop()
+        self._checked_out_instances[id(instance)] = instance
+
+        return instance
+
+    def _check_out_new_instance(self) -> Any:
+        try:
+            instance = self._create_instance()
+        except PoolFactoryRaisedAnExceptionError:
+            with self._pool_lock:
+                self._size -= 1  # The reserved slot is released
+                self._instance_available.notify()
+                self._wake_async_waiter_thread_safe()
+            raise
+
+        with self._pool_lock:
+            self._checked_out_instances[id(instance)] = instance
+
+        return instance
+
+    def _create_instance(self) -> Any:
+        try:
+            return self._factory()
+        except Exception as e:
+            raise PoolFactoryRaisedAnExceptionError("The pool's factory has raised an exception! ({})".format(str(e)), e)
+
+    def check_in(self, instance: Any) -> None:
+        with self._pool_lock:
+            if self._checked_out_instances.pop(id(instance), None) is None:
+                raise InstanceNotCheckedOutError("The instance {} is not checked out from this pool!".format(instance))
+
+            if self._is_closed:
+                self._size -= 1
+            else:
+                self._idle_instances.append(instance)
+                self._instance_available.notify()
+                self._wake_async_waiter_thread_safe()
+                return
+
+        self._dispose_instances([instance])
+
+    def close(self) -> None:
+        with self._pool_lock:
+            idle_instances = self._idle_instances
+            self._idle_instances = []
+            self._size -= len(idle_instances)
+            self._is_closed = True
+            self._instance_available.notify_all()  # The waiting threads and coroutines will raise PoolClosedError
+            while self._async_waiters:
+                self._wake_async_waiter_thread_safe()
+
+        self._dispose_instances(idle_instances)
+
+    def _dispose_instances(self, instances: List[Any]) -> None:
+        if self._disposal_callback is None:
+            return
+
+        for instance in instances:
+            self._disposal_callback(instance)
+
+    def export_statistics(self) -> Dict[str, Any]:
+        with self._pool_lock:
+            in_use = len(self._checked_out_instances)
+
+            return {
+                "min_size": self._min_size,
+                "max_size": self._max_size,
+                "size": self._size,
+                "idle": len(self._idle_instances),
+                "in_use": in_use,
+                "utilization": in_use / self._max_size,
+                "checkouts": self._checkout_count,
+                "checkout_timeouts": self._checkout_timeout_count,
+                "total_checkout_wait_seconds": self._total_checkout_wait_ns / 1_000_000_000,
+                "max_checkout_wait_seconds": self._max_checkout_wait_ns / 1_000_000_000,
+            }
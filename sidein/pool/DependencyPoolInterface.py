@@ -0,0 +1,112 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Dict, Optional, Tuple
+
+
+class DependencyPoolInterface(metaclass=abc.ABCMeta):
+    """
+    A pool of interchangeable instances of a dependency which must not be used by multiple threads at the same time
+     (e.g. database connections or parser instances). An instance is checked out for exclusive use and checked back in
+     once it's not needed anymore.
+
+    A pool is stored in a dependency provider like any other dependency; functions decorated with
+     NamespaceInterface.inject_pooled_dependencies() are then injected with an instance checked out from it for the
+     duration of their call.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def check_out(self, timeout_seconds: Optional[float] = None) -> Any:
+        """
+        Checks out an idle instance from the pool, creating a new one if there is no idle instance and the pool hasn't
+         reached its maximum size yet. Otherwise, it waits until an instance is checked in.
+
+        :param timeout_seconds: How long to wait for an instance, or None to use the pool's default checkout timeout.
+        :return: The checked out instance.
+        :raises PoolCheckoutTimeoutError: If no instance becomes available before the timeout expires.
+        :raises PoolFactoryRaisedAnExceptionError: If a new instance had to be created and the pool's factory has raised an exception.
+        :raises PoolClosedError: If the pool has been closed.
+        """
+
+        raise NotImplementedError(DependencyPoolInterface.check_out.__qualname__)
+
+    @abc.abstractmethod
+    async def check_out_async(self, timeout_seconds: Optional[float] = None) -> Any:
+        """
+        The same as check_out(), but it waits for an instance without blocking the running event loop (or occupying
+         a thread of its executor).
+
+        :param timeout_seconds: How long to wait for an instance, or None to use the pool's default checkout timeout.
+        :return: The checked out instance.
+        :raises PoolCheckoutTimeoutError: If no instance becomes available before the timeout expires.
+        :raises PoolFactoryRaisedAnExceptionError: If a new instance had to be created and the pool's factory has raised an exception.
+        :raises PoolClosedError: If the pool has been closed.
+        """
+
+        raise NotImplementedError(DependencyPoolInterface.check_out_async.__qualname__)
+
+    @abc.abstractmethod
+    def try_check_out(self) -> Tuple[bool, Any]:
+        """
+        Checks out an instance from the pool if it's possible without waiting.
+
+        :return: (True, the checked out instance) if an instance has been checked out, (False, None) otherwise.
+        :raises PoolFactoryRaisedAnExceptionError: If a new instance had to be created and the pool's factory has raised an exception.
+        :raises PoolClosedError: If the pool has been closed.
+        """
+
+        raise NotImplementedError(DependencyPoolInterface.try_check_out.__qualname__)
+
+    @abc.abstractmethod
+    def check_in(self, instance: Any) -> None:
+        """
+        Returns a checked out instance to the pool.
+
+        :param instance: The instance to return.
+        :raises InstanceNotCheckedOutError: If the instance isn't currently checked out from this pool.
+        """
+
+        raise NotImplementedError(DependencyPoolInterface.check_in.__qualname__)
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """
+        Closes the pool - the idle instances are disposed of right away, the checked out ones once they are checked in.
+         No instances can be checked out from a closed pool.
+        """
+
+        raise NotImplementedError(DependencyPoolInterface.close.__qualname__)
+
+    @abc.abstractmethod
+    def export_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the pool's utilization statistics in a dictionary with the keys "min_size", "max_size", "size" (the
+         number of existing instances), "idle", "in_use", "utilization" (the ratio of in-use instances to the maximum
+         size), "checkouts", "checkout_timeouts", "total_checkout_wait_seconds" and "max_checkout_wait_seconds".
+
+        :return: The pool's statistics.
+        """
+
+        raise NotImplementedError(DependencyPoolInterface.export_statistics.__qualname__)
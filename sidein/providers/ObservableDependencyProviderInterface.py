@@ -0,0 +1,59 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import Callable, Optional
+import abc
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class ObservableDependencyProviderInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency provider which notifies registered listeners whenever its set of dependencies changes.
+    Providers which cache the results of other providers (e.g. CompositeFallbackProvider) use this to invalidate their
+     caches.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def add_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """
+        Registers a listener which is called after each change of the provider's dependencies, with the name of the
+         changed dependency, or with None if any of the dependencies may have changed.
+
+        The listeners are called synchronously from the thread which has made the change, after the provider's lock (if
+         any) has been released. They should return quickly and they must not raise any exceptions.
+
+        :param listener: The registered listener.
+        """
+
+        raise NotImplementedError(ObservableDependencyProviderInterface.add_mutation_listener.__qualname__)
+
+    @abc.abstractmethod
+    def remove_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """
+        Unregisters a previously registered listener. Unregistering a listener which isn't registered has no effect.
+
+        :param listener: The unregistered listener.
+        """
+
+        raise NotImplementedError(ObservableDependencyProviderInterface.remove_mutation_listener.__qualname__)
@@ -0,0 +1,69 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Hashable
+import threading
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class _BoundedCache:
+    """
+    A dictionary-backed cache holding at most 'max_size' entries; once it's full, the oldest entry is evicted to make
+     room for a new one.
+    Used by the providers which remember the results of their lookups (e.g. RoutingProvider, CompositeFallbackProvider
+     and TypeKeyedContainer).
+    """
+
+    # The reads are performed without locking - reading a single dictionary item is atomic. The writes are serialized,
+    #  so that the eviction cannot race with another write.
+
+    __slots__ = "_bc_lock", "_max_size", "_entries"
+
+    DEFAULT_MAX_SIZE: int = 4096
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self._bc_lock: threading.Lock = _LockRegistry.create_lock("_BoundedCache._bc_lock[{}]".format(hex(id(self))))  # Guards the writes
+        self._max_size: int = max_size
+        self._entries: Dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._entries.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._bc_lock:
+            entries = self._entries
+            if key not in entries and len(entries) >= self._max_size:
+                del entries[next(iter(entries))]  # Dictionaries preserve the insertion order
+
+            entries[key] = value
+
+    def pop(self, key: Hashable) -> None:
+        with self._bc_lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._bc_lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,304 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+import threading
+import collections
+import inspect
+import typing
+from sidein.providers.autowiring.AutoWiringProviderInterface import AutoWiringProviderInterface
+from sidein.providers.autowiring._FactoryRegistration import _FactoryRegistration
+from sidein.providers.autowiring.exc.FactoryInAWPExistsException import FactoryInAWPExistsException
+from sidein.providers.autowiring.exc.FactoryInAWPNotFoundException import FactoryInAWPNotFoundException
+from sidein.providers.autowiring.exc.UnsatisfiedFactoryDependencyException import UnsatisfiedFactoryDependencyException
+from sidein.providers.autowiring.exc.InvalidFactoryError import InvalidFactoryError
+from sidein.providers.autowiring.exc.FactoryDependencyCycleError import FactoryDependencyCycleError
+from sidein.providers.autowiring.exc.AutoWiredFactoryRaisedAnExceptionError import AutoWiredFactoryRaisedAnExceptionError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class AutoWiringProvider(AutoWiringProviderInterface):
+    """
+    A thread-safe implementation of auto-wiring provider.
+
+    The factories' signatures are inspected only once, when they are registered. Each change of the registered
+     factories recomputes the resolution plans (topologically ordered names of the dependencies each dependency
+     (indirectly) depends on) which the change affects, so a request only walks the precomputed plan - once backwards, to find out which
+     dependencies actually need to be built (the subgraphs below cached singletons are skipped), and once forwards, to
+     build them.
+
+    The factories are called while the provider's (reentrant) lock is held, so that each singleton is built only once,
+     even if it's requested by multiple threads at the same time.
+    """
+
+    __slots__ = "_awp_lock", "_registrations", "_resolution_plans", "_unsatisfied_dependencies", "_singletons"
+
+    _MISSING: Any = object()
+
+    def __init__(self):
+        self._awp_lock: threading.RLock = _LockRegistry.create_rlock("AutoWiringProvider._awp_lock[{}]".format(hex(id(self))))
+        self._registrations: Dict[str, _FactoryRegistration] = {}
+        self._resolution_plans: Dict[str, Tuple[str, ...]] = {}  # Only contains the names whose dependencies are all registered
+        self._unsatisfied_dependencies: Dict[str, str] = {}  # {name: the name of an unregistered dependency it (indirectly) depends on}
+        self._singletons: Dict[str, Any] = {}
+
+    def get_dependency(self, name: str) -> Any:
+        with self._awp_lock:
+            dependency = self._singletons.get(name, AutoWiringProvider._MISSING)
+            if dependency is not AutoWiringProvider._MISSING:
+                return dependency
+
+            resolution_plan = self._get_resolution_plan_thread_safe(name)
+
+            # Find out which dependencies need to be built - the plan is walked backwards, i.e. each dependency is
+            #  visited before the dependencies it depends on
+            needed_names = {name}
+            for planned_name in reversed(resolution_plan):
+                if planned_name in needed_names and planned_name not in self._singletons:
+                    needed_names.update(self._registrations[planned_name].dependency_names)
+
+            built_dependencies = {}
+            for planned_name in resolution_plan:
+                if planned_name not in needed_names:
+                    continue
+
+                dependency = self._singletons.get(planned_name, AutoWiringProvider._MISSING)
+                if dependency is AutoWiringProvider._MISSING:
+                    dependency = self._call_factory_thread_safe(planned_name, built_dependencies)
+
+                built_dependencies[planned_name] = dependency
+
+            return built_dependencies[name]
+
+    # This method must be called in a thread-safe context!
+    def _call_factory_thread_safe(self, name: str, built_dependencies: Dict[str, Any]) -> Any:
+        registration = self._registrations[name]
+
+        args = []
+        kwargs = {}
+        for parameter_name, dependency_name in registration.arguments:
+            if parameter_name is None:
+                args.append(built_dependencies[dependency_name])
+            else:
+                kwargs[parameter_name] = built_dependencies[dependency_name]
+
+        try:
+            dependency = registration.factory(*args, **kwargs)
+        except Exception as e:
+            raise AutoWiredFactoryRaisedAnExceptionError("The factory of the dependency {} has raised an exception! ({})".format(repr(name), str(e)), e)
+
+        if registration.is_singleton:
+            self._singletons[name] = dependency
+
+        return dependency
+
+    def add_factory(self, name: str, factory: Callable[..., Any], dependency_names: Optional[Union[Sequence[str], Dict[str, str]]] = None, singleton: bool = True) -> None:
+        # The signature is inspected before the lock is acquired
+        registration = _FactoryRegistration(factory, self._analyse_factory_arguments(factory, dependency_names), singleton)
+
+        with self._awp_lock:
+            if name in self._registrations:
+                raise FactoryInAWPExistsException(name)
+
+            self._registrations[name] = registration
+
+            # The graph was acyclic before the factory was added, so any cycle must pass through the new factory
+            cycle = self._find_cycle_thread_safe(name)
+            if cycle is not None:
+                del self._registrations[name]
+                raise FactoryDependencyCycleError(cycle)
+
+            # Before the factory was added, every name depending on it was unsatisfied, and the first unregistered
+            #  dependency found for it is still unregistered unless it's the added name - so only the plans of those
+            #  names and of the added name itself can change
+            self._recompute_resolution_plans_thread_safe((name,) + tuple(unsatisfied_name for unsatisfied_name, unsatisfied_dependency in self._unsatisfied_dependencies.items() if unsatisfied_dependency == name))
+
+    def _analyse_factory_arguments(self, factory: Callable[..., Any], dependency_names: Optional[Union[Sequence[str], Dict[str, str]]]) -> Tuple[Tuple[Optional[str], str], ...]:
+        if not callable(factory):
+            raise InvalidFactoryError("The factory must be callable, not {}!".format(factory))
+
+        if isinstance(dependency_names, dict):
+            return tuple((parameter_name, dependency_name) for parameter_name, dependency_name in dependency_names.items())
+
+        if dependency_names is not None:
+            if isinstance(dependency_names, str):
+                raise InvalidFactoryError("The dependency names must be a sequence or a dictionary of names, not a string!")
+
+            return tuple((None, dependency_name) for dependency_name in dependency_names)
+
+        try:
+            signature = inspect.signature(factory)
+        except (TypeError, ValueError) as e:
+            raise InvalidFactoryError("The signature of the factory {} cannot be inspected - its dependency names must be declared explicitly! ({})".format(factory, str(e)))
+
+        type_hints = self._get_type_hints(factory)
+
+        arguments = []
+        for parameter in signature.parameters.values():
+            if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD) or parameter.default is not inspect.Parameter.empty:
+                continue
+
+            dependency_name = self._get_dependency_name_from_annotation(type_hints.get(parameter.name, parameter.annotation))
+            if dependency_name is None:
+                dependency_name = parameter.name
+
+            if parameter.kind == inspect.Parameter.POSITIONAL_ONLY:
+                arguments.append((None, dependency_name))
+            else:
+                arguments.append((parameter.name, dependency_name))
+
+        return tuple(arguments)
+
+    def _get_type_hints(self, factory: Callable[..., Any]) -> Dict[str, Any]:
+        # The evaluated type hints are preferred, as the annotations might be postponed (PEP 563); if they cannot be
+        #  evaluated, the annotations are used as they are. The signature of a class is the signature of its
+        #  constructor, whereas the type hints of a class are the ones of its attributes.
+        if inspect.isclass(factory):
+            annotated_function = factory.__init__
+        elif inspect.isroutine(factory):
+            annotated_function = factory
+        else:
+            annotated_function = getattr(factory, "__call__", factory)
+
+        try:
+            return typing.get_type_hints(annotated_function, include_extras=True)
+        except Exception:
+            return {}
+
+    def _get_dependency_name_from_annotation(self, annotation: Any) -> Optional[str]:
+        if typing.get_origin(annotation) is not typing.Annotated:
+            return None
+
+        for metadata in annotation.__metadata__:
+            if isinstance(metadata, str):
+                return metadata
+
+        return None
+
+    # This method must be called in a thread-safe context!
+    # Finds out whether 'start_name' can be reached from its dependencies using a breadth-first search, which visits
+    #  each name only once (so the shortest cycle is found)
+    def _find_cycle_thread_safe(self, start_name: str) -> Optional[Tuple[str, ...]]:
+        parent_names: Dict[str, str] = {}  # {name: the name it has been reached from}
+        queue = collections.deque((start_name,))
+        while queue:
+            name = queue.popleft()
+            registration = self._registrations.get(name)
+            if registration is None:
+                continue
+
+            for dependency_name in registration.dependency_names:
+                if dependency_name == start_name:
+                    chain = [name]
+                    while chain[-1] != start_name:
+                        chain.append(parent_names[chain[-1]])
+
+                    return tuple(reversed(chain)) + (start_name,)
+
+                if dependency_name not in parent_names:
+                    parent_names[dependency_name] = name
+                    queue.append(dependency_name)
+
+        return None
+
+    # This method must be called in a thread-safe context!
+    def _recompute_resolution_plans_thread_safe(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._resolution_plans.pop(name, None)
+            self._unsatisfied_dependencies.pop(name, None)
+
+            resolution_plan: List[str] = []
+            unsatisfied_dependency = self._build_resolution_plan_thread_safe(name, resolution_plan, set())
+            if unsatisfied_dependency is None:
+                self._resolution_plans[name] = tuple(resolution_plan)
+            else:
+                self._unsatisfied_dependencies[name] = unsatisfied_dependency
+
+    # This method must be called in a thread-safe context!
+    # Appends the names to the plan in a depth-first post-order, i.e. each name after the names it depends on
+    def _build_resolution_plan_thread_safe(self, name: str, resolution_plan: List[str], visited_names: Set[str]) -> Optional[str]:
+        visited_names.add(name)
+
+        registration = self._registrations.get(name)
+        if registration is None:
+            return name
+
+        for dependency_name in registration.dependency_names:
+            if dependency_name in visited_names:
+                continue
+
+            unsatisfied_dependency = self._build_resolution_plan_thread_safe(dependency_name, resolution_plan, visited_names)
+            if unsatisfied_dependency is not None:
+                return unsatisfied_dependency
+
+        resolution_plan.append(name)
+        return None
+
+    def remove_factory(self, name: str) -> None:
+        with self._awp_lock:
+            if name not in self._registrations:
+                raise FactoryInAWPNotFoundException(name)
+
+            # The plans are still the old ones, so they can be used to find the dependents; the names which are already
+            #  unsatisfied stay unsatisfied (because of the same unregistered dependency), so only the plans of the
+            #  dependents can change
+            dependent_names = tuple(dependent_name for dependent_name, resolution_plan in self._resolution_plans.items() if name in resolution_plan and dependent_name != name)
+            for dependent_name in dependent_names:
+                self._singletons.pop(dependent_name, None)
+            self._singletons.pop(name, None)
+
+            del self._registrations[name]
+            self._resolution_plans.pop(name, None)
+            self._unsatisfied_dependencies.pop(name, None)
+            self._recompute_resolution_plans_thread_safe(dependent_names)
+
+    def get_all_factory_names(self) -> Tuple[str, ...]:
+        with self._awp_lock:
+            return tuple(sorted(self._registrations.keys()))
+
+    def get_factory_dependency_names(self, name: str) -> Tuple[str, ...]:
+        with self._awp_lock:
+            registration = self._registrations.get(name)
+            if registration is None:
+                raise FactoryInAWPNotFoundException(name)
+
+            return registration.dependency_names
+
+    def get_resolution_plan(self, name: str) -> Tuple[str, ...]:
+        with self._awp_lock:
+            return self._get_resolution_plan_thread_safe(name)
+
+    # This method must be called in a thread-safe context!
+    def _get_resolution_plan_thread_safe(self, name: str) -> Tuple[str, ...]:
+        resolution_plan = self._resolution_plans.get(name)
+        if resolution_plan is not None:
+            return resolution_plan
+
+        if name in self._unsatisfied_dependencies:
+            raise UnsatisfiedFactoryDependencyException("The dependency {} (indirectly) depends on the dependency {}, which has no registered factory!".format(repr(name), repr(self._unsatisfied_dependencies[name])))
+
+        raise FactoryInAWPNotFoundException(name)
+
+    def discard_singletons(self) -> None:
+        with self._awp_lock:
+            self._singletons.clear()
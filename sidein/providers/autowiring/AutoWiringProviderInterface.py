@@ -0,0 +1,125 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class AutoWiringProviderInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency provider which builds whole object graphs (e.g. config -> pool -> repository -> service) from
+     factories. Each factory declares the names of the dependencies it needs (or they are inferred from its
+     parameters), and when a dependency is requested, the factories of the dependencies it (indirectly) depends on are
+     called in the right order, with their results passed to the factories which need them.
+
+    The factories can be registered in any order. The order in which the factories are called (the resolution plan)
+     is computed when the factories are registered, not when the dependencies are requested.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the dependency named 'name', building it (and the dependencies it needs) using the registered factories.
+
+        :param name: The requested dependency's name.
+        :return: The dependency named 'name'.
+        :raises FactoryInAWPNotFoundException: If no factory is registered under the name. (FactoryInAWPNotFoundException is a subclass of DependencyProviderException!)
+        :raises UnsatisfiedFactoryDependencyException: If no factory is registered for one of the dependencies the dependency (indirectly) depends on. (UnsatisfiedFactoryDependencyException is a subclass of DependencyProviderException!)
+        :raises AutoWiredFactoryRaisedAnExceptionError: If a factory raises an exception.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def add_factory(self, name: str, factory: Callable[..., Any], dependency_names: Optional[Union[Sequence[str], Dict[str, str]]] = None, singleton: bool = True) -> None:
+        """
+        Registers the factory 'factory' which builds the dependency named 'name'.
+
+        The dependencies the factory needs can be declared in 'dependency_names' either as a sequence of names, in
+         which case the dependencies are passed to the factory as positional arguments, or as a {parameter name:
+         dependency name} dictionary, in which case they are passed as keyword arguments. If 'dependency_names' is
+         None, the dependencies are inferred from the factory's signature - each parameter without a default value
+         (except *args and **kwargs) receives the dependency named after the parameter, or, if the parameter is
+         annotated with typing.Annotated[..., "name"], the dependency named by the first string in its metadata.
+
+        :param name: The name of the dependency built by the factory.
+        :param factory: A callable (e.g. a function or a class) which builds the dependency.
+        :param dependency_names: The names of the dependencies the factory needs, or None to infer them from its signature.
+        :param singleton: Whether the built dependency is cached and returned by all the later requests; if False, the factory is called for each get_dependency() call (but at most once per call, even if multiple dependencies depend on it).
+        :raises FactoryInAWPExistsException: If a factory is already registered under the name.
+        :raises InvalidFactoryError: If the factory is not callable or if its signature cannot be inspected.
+        :raises FactoryDependencyCycleError: If the factory would (indirectly) depend on itself.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.add_factory.__qualname__)
+
+    @abc.abstractmethod
+    def remove_factory(self, name: str) -> None:
+        """
+        Unregisters the factory which builds the dependency named 'name'. The cached singletons of the dependency and
+         of the dependencies which (indirectly) depend on it are discarded.
+
+        :param name: The name of the dependency whose factory should be removed.
+        :raises FactoryInAWPNotFoundException: If no factory is registered under the name.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.remove_factory.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_factory_names(self) -> Tuple[str, ...]:
+        """
+        :return: The sorted names under which factories are registered.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.get_all_factory_names.__qualname__)
+
+    @abc.abstractmethod
+    def get_factory_dependency_names(self, name: str) -> Tuple[str, ...]:
+        """
+        :param name: The name of a dependency built by a registered factory.
+        :return: The names of the dependencies the factory needs (declared or inferred), in the order of its arguments.
+        :raises FactoryInAWPNotFoundException: If no factory is registered under the name.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.get_factory_dependency_names.__qualname__)
+
+    @abc.abstractmethod
+    def get_resolution_plan(self, name: str) -> Tuple[str, ...]:
+        """
+        :param name: The name of a dependency built by a registered factory.
+        :return: The names of the dependency and of all the dependencies it (indirectly) depends on, in the order in which their factories are called (the requested dependency is the last one).
+        :raises FactoryInAWPNotFoundException: If no factory is registered under the name.
+        :raises UnsatisfiedFactoryDependencyException: If no factory is registered for one of the dependencies the dependency (indirectly) depends on.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.get_resolution_plan.__qualname__)
+
+    @abc.abstractmethod
+    def discard_singletons(self) -> None:
+        """
+        Discards all the cached singletons, so that they are built again when they are requested next time.
+        """
+
+        raise NotImplementedError(AutoWiringProviderInterface.discard_singletons.__qualname__)
@@ -0,0 +1,137 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Optional, Sequence, Tuple
+import threading
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.ObservableDependencyProviderInterface import ObservableDependencyProviderInterface
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.providers.composite.exc.DependencyNotFoundInAnyChildException import DependencyNotFoundInAnyChildException
+from sidein.providers._BoundedCache import _BoundedCache
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class CompositeFallbackProvider(DependencyProviderInterface):
+    """
+    A dependency provider which chains other (child) providers - a requested dependency is acquired from the first child
+     which provides it, i.e. which doesn't raise DependencyProviderException.
+
+    The provider remembers which child has served each name and goes straight to it next time. A remembered route is
+     only reliable if none of the children preceding the serving one can start providing the name without anyone
+     noticing, so names are only remembered if all the preceding children are observable (see
+     ObservableDependencyProviderInterface); the remembered routes are forgotten when an observable child changes.
+     Similarly, a name which isn't provided by any child is only remembered if all the children are observable.
+    If the remembered child stops providing a name, the children are scanned again.
+
+    The remembered routes are read without locking.
+    """
+
+    # The provider registers itself as a mutation listener of its observable children - call detach_from_children()
+    #  when it's not going to be used anymore, so that the children don't keep it alive.
+
+    __slots__ = "_cfp_lock", "_children", "_observable_prefix_length", "_routes", "_generation"
+
+    _NOT_FOUND: int = -1
+
+    def __init__(self, children: Sequence[DependencyProviderInterface]):
+        """
+        :param children: The child providers, in the order in which they should be tried.
+        """
+
+        self._cfp_lock: threading.Lock = _LockRegistry.create_lock("CompositeFallbackProvider._cfp_lock[{}]".format(hex(id(self))))  # Guards the writes to the routes
+        self._children: Tuple[DependencyProviderInterface, ...] = tuple(children)
+        self._routes: _BoundedCache = _BoundedCache()  # {name: index of the child which provides it, or _NOT_FOUND}
+        self._generation: int = 0  # Incremented whenever the routes are invalidated
+
+        # The number of leading children which are observable - the routes to them (and to the next child) can be remembered
+        self._observable_prefix_length: int = 0
+        for child in self._children:
+            if not isinstance(child, ObservableDependencyProviderInterface):
+                break
+            self._observable_prefix_length += 1
+
+        for child in self._children:
+            if isinstance(child, ObservableDependencyProviderInterface):
+                child.add_mutation_listener(self._invalidate_routes)
+
+    def get_children(self) -> Tuple[DependencyProviderInterface, ...]:
+        return self._children
+
+    def get_dependency(self, name: str) -> Any:
+        child_index = self._routes.get(name)
+        if child_index is not None:
+            if child_index == CompositeFallbackProvider._NOT_FOUND:
+                raise DependencyNotFoundInAnyChildException(name)
+
+            try:
+                return self._children[child_index].get_dependency(name)
+            except DependencyProviderException:
+                self._forget_route(name)  # The child doesn't provide the dependency anymore
+
+        return self._scan_children(name)
+
+    def _scan_children(self, name: str) -> Any:
+        generation = self._generation
+
+        for child_index, child in enumerate(self._children):
+            try:
+                dependency = child.get_dependency(name)
+            except DependencyProviderException:
+                continue
+
+            if child_index <= self._observable_prefix_length:
+                self._remember_route(name, child_index, generation)
+            return dependency
+
+        if self._observable_prefix_length == len(self._children):
+            self._remember_route(name, CompositeFallbackProvider._NOT_FOUND, generation)
+        raise DependencyNotFoundInAnyChildException(name)
+
+    def _remember_route(self, name: str, child_index: int, scan_generation: int) -> None:
+        with self._cfp_lock:
+            # If the routes have been invalidated during the scan, its result might already be stale
+            if self._generation == scan_generation:
+                self._routes.put(name, child_index)
+
+    def _forget_route(self, name: str) -> None:
+        with self._cfp_lock:
+            self._generation += 1
+            self._routes.pop(name)
+
+    def _invalidate_routes(self, name: Optional[str]) -> None:
+        with self._cfp_lock:
+            self._generation += 1
+            if name is None:
+                self._routes.clear()
+            else:
+                self._routes.pop(name)
+
+    def detach_from_children(self) -> None:
+        """
+        Unregisters this provider from its observable children's mutation listeners. The provider must not be used
+         afterwards.
+        """
+
+        for child in self._children:
+            if isinstance(child, ObservableDependencyProviderInterface):
+                child.remove_mutation_listener(self._invalidate_routes)
@@ -0,0 +1,306 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Dict, Optional, Tuple, List
+import threading
+from sidein.providers.keyedfactory.KeyedFactoryProviderInterface import KeyedFactoryProviderInterface
+from sidein.providers.keyedfactory._KeyedFactoryBuild import _KeyedFactoryBuild
+from sidein.providers.keyedfactory.eviction.EvictionPolicyInterface import EvictionPolicyInterface
+from sidein.providers.keyedfactory.eviction.LRUEvictionPolicy import LRUEvictionPolicy
+from sidein.providers.keyedfactory.exc.PrefixInKFPExistsException import PrefixInKFPExistsException
+from sidein.providers.keyedfactory.exc.PrefixInKFPNotFoundException import PrefixInKFPNotFoundException
+from sidein.providers.keyedfactory.exc.InvalidKFPConfigurationError import InvalidKFPConfigurationError
+from sidein.providers.keyedfactory.exc.KeyedFactoryRaisedAnExceptionError import KeyedFactoryRaisedAnExceptionError
+from sidein.providers.keyedfactory.exc.SizeFunctionRaisedAnExceptionError import SizeFunctionRaisedAnExceptionError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class KeyedFactoryProvider(KeyedFactoryProviderInterface):
+    """
+    A thread-safe implementation of keyed factory provider.
+
+    The cache can be bounded by the maximum number of entries and/or by the maximum total size of the entries (as
+     measured by a size function). Before a newly built dependency is cached, entries selected by the eviction policy
+     (LRU by default) are evicted until there is room for it; a dependency which alone exceeds the maximum total size is
+     returned without being cached. Evicted dependencies are passed to the disposal callback (if any) after the
+     provider's lock has been released.
+
+    The factories and the size function are called outside of the provider's lock, so a slow build doesn't block
+     requests for the other dependencies. Each dependency is built only once, even if it's requested by multiple
+     threads at the same time - the other threads wait for the build in progress to finish (and if it fails, one of
+     them retries it). A factory may request other dependencies from the same provider; if waiting for a build would
+     cause a deadlock (e.g. a factory requesting the dependency it is building), the dependency is built again instead.
+    """
+
+    # This class isn't a thread-safety locking proxy, as the factories, the size function and the disposal callback
+    #  must be called outside of the lock.
+    # Before a thread starts waiting for a build in progress, it follows the chain "dependency -> the thread building
+    #  it -> the dependency that thread is waiting for -> ..."; if the chain leads back to the thread itself, waiting
+    #  would cause a deadlock.
+
+    __slots__ = "_kfp_lock", "_separator", "_eviction_policy", "_max_entries", "_max_total_size", "_size_function", \
+                "_disposal_callback", "_factories", "_cache", "_total_size", "_builds_in_progress", "_awaited_builds", \
+                "_hit_count", "_miss_count", "_eviction_count"
+
+    def __init__(self,
+                 eviction_policy: Optional[EvictionPolicyInterface] = None,
+                 max_entries: Optional[int] = None,
+                 max_total_size: Optional[int] = None,
+                 size_function: Optional[Callable[[Any], int]] = None,
+                 disposal_callback: Optional[Callable[[str, Any], None]] = None,
+                 separator: str = ":"):
+        """
+        :param eviction_policy: The eviction policy to use (a new LRUEvictionPolicy if None); it must not be shared with other providers.
+        :param max_entries: The maximum number of cached entries, or None for no limit.
+        :param max_total_size: The maximum total size of the cached entries, or None for no limit; requires 'size_function'.
+        :param size_function: A function which returns the size of a dependency (e.g. in bytes).
+        :param disposal_callback: A function which is called with the name and the dependency of each entry removed from the cache. It must not raise any exceptions.
+        :param separator: The string separating a dependency name's prefix from its key.
+        :raises InvalidKFPConfigurationError: If the bounds are not positive, if 'max_total_size' is specified without 'size_function', or if the separator is empty.
+        """
+
+        if (max_entries is not None and max_entries <= 0) or (max_total_size is not None and max_total_size <= 0):
+            raise InvalidKFPConfigurationError("The maximum number of entries and the maximum total size must be positive!")
+
+        if max_total_size is not None and size_function is None:
+            raise InvalidKFPConfigurationError("The maximum total size can only be used together with a size function!")
+
+        if not separator:
+            raise InvalidKFPConfigurationError("The separator must not be empty!")
+
+        self._kfp_lock: threading.RLock = _LockRegistry.create_rlock("KeyedFactoryProvider._kfp_lock[{}]".format(hex(id(self))))
+        self._separator: str = separator
+        self._eviction_policy: EvictionPolicyInterface = (eviction_policy if eviction_policy is not None else LRUEvictionPolicy())
+        self._max_entries: Optional[int] = max_entries
+        self._max_total_size: Optional[int] = max_total_size
+        self._size_function: Optional[Callable[[Any], int]] = size_function
+        self._disposal_callback: Optional[Callable[[str, Any], None]] = disposal_callback
+
+        self._factories: Dict[str, Callable[[str], Any]] = {}
+        self._cache: Dict[str, Tuple[Any, int]] = {}  # {name: (dependency, size)}
+        self._total_size: int = 0
+        self._builds_in_progress: Dict[str, _KeyedFactoryBuild] = {}
+        self._awaited_builds: Dict[int, str] = {}  # {thread identifier: the name of the dependency whose build it's waiting for}
+
+        self._hit_count: int = 0
+        self._miss_count: int = 0
+        self._eviction_count: int = 0
+
+    def get_dependency(self, name: str) -> Any:
+        thread_id = threading.get_ident()
+
+        while True:
+            with self._kfp_lock:
+                cached_entry = self._cache.get(name)
+                if cached_entry is not None:
+                    self._hit_count += 1
+                    self._eviction_policy.record_access(name)
+                    return cached_entry[0]
+
+                prefix, separator, key = name.partition(self._separator)
+                factory = (self._factories.get(prefix) if separator else None)
+                if factory is None:
+                    raise PrefixInKFPNotFoundException(name)
+
+                build = self._builds_in_progress.get(name)
+                if build is None:
+                    build = _KeyedFactoryBuild(thread_id)
+                    self._builds_in_progress[name] = build
+                    self._miss_count += 1
+                elif self._would_waiting_for_build_deadlock_thread_safe(name, thread_id):
+                    self._miss_count += 1
+                    build = None  # The dependency is built again, without being cached
+                else:
+                    self._awaited_builds[thread_id] = name
+
+            if build is None:
+                return self._build_dependency(prefix, factory, key)[0]
+
+            if build.builder_thread_id == thread_id:
+                return self._build_and_publish_dependency(name, prefix, factory, key, build)
+
+            try:
+                build.finished_event.wait()
+            finally:
+                with self._kfp_lock:
+                    del self._awaited_builds[thread_id]
+
+            if build.has_succeeded:
+                with self._kfp_lock:
+                    self._hit_count += 1
+
+                return build.dependency
+
+            # The build has failed; the loop makes this thread retry it (unless another thread has already done so)
+
+    # This method must be called in a thread-safe context!
+    def _would_waiting_for_build_deadlock_thread_safe(self, name: str, thread_id: int) -> bool:
+        visited_names = {name}
+        builder_thread_id = self._builds_in_progress[name].builder_thread_id
+        while builder_thread_id != thread_id:
+            awaited_name = self._awaited_builds.get(builder_thread_id)
+            if awaited_name is None or awaited_name in visited_names:
+                return False  # The building thread is not blocked (or the cycle it's part of doesn't involve this thread)
+
+            awaited_build = self._builds_in_progress.get(awaited_name)
+            if awaited_build is None:
+                return False  # The build the thread is waiting for has just finished
+
+            visited_names.add(awaited_name)
+            builder_thread_id = awaited_build.builder_thread_id
+
+        return True
+
+    def _build_and_publish_dependency(self, name: str, prefix: str, factory: Callable[[str], Any], key: str, build: _KeyedFactoryBuild) -> Any:
+        try:
+            dependency, size = self._build_dependency(prefix, factory, key)
+        except BaseException:
+            with self._kfp_lock:
+                del self._builds_in_progress[name]
+
+            build.finished_event.set()
+            raise
+
+        evicted_entries = []
+        with self._kfp_lock:
+            del self._builds_in_progress[name]
+
+            # The dependency isn't cached if it's too large, or if its factory has been removed while it was being built
+            if (self._max_total_size is None or size <= self._max_total_size) and self._factories.get(prefix) is factory:
+                evicted_entries = self._make_room_for_entry(size)
+                self._cache[name] = (dependency, size)
+                self._total_size += size
+                self._eviction_policy.record_insertion(name)
+
+        build.dependency = dependency
+        build.has_succeeded = True
+        build.finished_event.set()
+
+        self._dispose_entries(evicted_entries)
+        return dependency
+
+    def _build_dependency(self, prefix: str, factory: Callable[[str], Any], key: str) -> Tuple[Any, int]:
+        try:
+            dependency = factory(key)
+        except Exception as e:
+            raise KeyedFactoryRaisedAnExceptionError("The factory registered under the prefix {} has raised an exception! ({})".format(repr(prefix), str(e)), e)
+
+        if self._size_function is None:
+            return dependency, 0
+
+        try:
+            size = self._size_function(dependency)
+        except Exception as e:
+            raise SizeFunctionRaisedAnExceptionError("The size function has raised an exception while measuring a dependency built by the factory registered under the prefix {}! ({})".format(repr(prefix), str(e)), e)
+
+        return dependency, size
+
+    # This method must be called in a thread-safe context!
+    def _make_room_for_entry(self, size: int) -> List[Tuple[str, Any]]:
+        evicted_entries = []
+        while self._cache and self._is_over_bounds(len(self._cache) + 1, self._total_size + size):
+            victim_name = self._eviction_policy.select_victim()
+            evicted_entries.append((victim_name, self._remove_cached_entry_checkless(victim_name)))
+
+        return evicted_entries
+
+    def _is_over_bounds(self, entry_count: int, total_size: int) -> bool:
+        if self._max_entries is not None and entry_count > self._max_entries:
+            return True
+
+        return self._max_total_size is not None and total_size > self._max_total_size
+
+    # This method must be called in a thread-safe context!
+    def _remove_cached_entry_checkless(self, name: str) -> Any:
+        dependency, size = self._cache.pop(name)
+        self._total_size -= size
+        self._eviction_policy.record_removal(name)
+        self._eviction_count += 1
+
+        return dependency
+
+    def _dispose_entries(self, entries: List[Tuple[str, Any]]) -> None:
+        if self._disposal_callback is None:
+            return
+
+        for name, dependency in entries:
+            self._disposal_callback(name, dependency)
+
+    def add_factory(self, prefix: str, factory: Callable[[str], Any]) -> None:
+        with self._kfp_lock:
+            if prefix in self._factories:
+                raise PrefixInKFPExistsException(prefix)
+
+            self._factories[prefix] = factory
+
+    def remove_factory(self, prefix: str) -> None:
+        with self._kfp_lock:
+            if prefix not in self._factories:
+                raise PrefixInKFPNotFoundException(prefix)
+
+            del self._factories[prefix]
+
+            name_prefix = prefix + self._separator
+            evicted_entries = [(name, self._remove_cached_entry_checkless(name)) for name in list(self._cache) if name.startswith(name_prefix)]
+
+        self._dispose_entries(evicted_entries)
+
+    def get_all_prefixes(self) -> Tuple[str, ...]:
+        with self._kfp_lock:
+            return tuple(sorted(self._factories))
+
+    def get_cached_names(self) -> Tuple[str, ...]:
+        with self._kfp_lock:
+            return tuple(sorted(self._cache))
+
+    def evict(self, name: str) -> bool:
+        with self._kfp_lock:
+            if name not in self._cache:
+                return False
+
+            dependency = self._remove_cached_entry_checkless(name)
+
+        self._dispose_entries([(name, dependency)])
+        return True
+
+    def evict_all(self) -> None:
+        with self._kfp_lock:
+            evicted_entries = [(name, self._remove_cached_entry_checkless(name)) for name in list(self._cache)]
+
+        self._dispose_entries(evicted_entries)
+
+    def export_statistics(self) -> Dict[str, int]:
+        with self._kfp_lock:
+            return {
+                "hits": self._hit_count,
+                "misses": self._miss_count,
+                "evictions": self._eviction_count,
+                "entries": len(self._cache),
+                "total_size": self._total_size,
+            }
+
+    def reset_statistics(self) -> None:
+        with self._kfp_lock:
+            self._hit_count = 0
+            self._miss_count = 0
+            self._eviction_count = 0
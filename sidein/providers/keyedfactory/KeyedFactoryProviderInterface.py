@@ -0,0 +1,131 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Callable, Dict, Tuple
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class KeyedFactoryProviderInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency provider for keyed (parametrized) dependencies, e.g. per-tenant clients.
+
+    Dependency names consist of a prefix and a key separated by a separator (e.g. "client:tenant42"). A factory is
+     registered for each prefix; when a dependency is requested for the first time, the factory registered for its
+     prefix is called with its key, and the returned dependency is stored in a bounded cache. When the cache exceeds its
+     bounds, entries are evicted from it according to an eviction policy (see EvictionPolicyInterface).
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the dependency named 'name' from the cache, building it using the factory registered for its prefix if
+         it isn't cached.
+
+        :param name: The requested dependency's name, i.e. a prefix and a key separated by the separator.
+        :return: The dependency named 'name'.
+        :raises PrefixInKFPNotFoundException: If no factory is registered for the name's prefix. (PrefixInKFPNotFoundException is a subclass of DependencyProviderException!)
+        :raises KeyedFactoryRaisedAnExceptionError: If the factory raises an exception.
+        :raises SizeFunctionRaisedAnExceptionError: If the size function raises an exception while measuring the newly built dependency.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def add_factory(self, prefix: str, factory: Callable[[str], Any]) -> None:
+        """
+        Registers the factory 'factory' under the prefix 'prefix'.
+
+        :param prefix: The prefix of the dependencies built by the factory. It must not contain the separator.
+        :param factory: A function which is called with the key of a requested dependency and returns the dependency.
+        :raises PrefixInKFPExistsException: If a factory is already registered under the prefix.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.add_factory.__qualname__)
+
+    @abc.abstractmethod
+    def remove_factory(self, prefix: str) -> None:
+        """
+        Unregisters the factory registered under the prefix 'prefix' and evicts all the cached dependencies built by it.
+
+        :param prefix: The prefix whose factory should be removed.
+        :raises PrefixInKFPNotFoundException: If no factory is registered under the prefix.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.remove_factory.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_prefixes(self) -> Tuple[str, ...]:
+        """
+        :return: The sorted prefixes under which factories are registered.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.get_all_prefixes.__qualname__)
+
+    @abc.abstractmethod
+    def get_cached_names(self) -> Tuple[str, ...]:
+        """
+        :return: The sorted names of the currently cached dependencies.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.get_cached_names.__qualname__)
+
+    @abc.abstractmethod
+    def evict(self, name: str) -> bool:
+        """
+        Evicts the dependency named 'name' from the cache, if it's cached.
+
+        :param name: The evicted dependency's name.
+        :return: True if the dependency has been evicted, False if it wasn't cached.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.evict.__qualname__)
+
+    @abc.abstractmethod
+    def evict_all(self) -> None:
+        """
+        Evicts all the cached dependencies.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.evict_all.__qualname__)
+
+    @abc.abstractmethod
+    def export_statistics(self) -> Dict[str, int]:
+        """
+        Returns the cache statistics in a dictionary with the keys "hits", "misses", "evictions" (the number of entries
+         removed from the cache for any reason), "entries" (the number of currently cached entries) and "total_size"
+         (their total size, or 0 if no size function is used).
+
+        :return: The cache statistics.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.export_statistics.__qualname__)
+
+    @abc.abstractmethod
+    def reset_statistics(self) -> None:
+        """
+        Resets the hit, miss and eviction counters to zero.
+        """
+
+        raise NotImplementedError(KeyedFactoryProviderInterface.reset_statistics.__qualname__)
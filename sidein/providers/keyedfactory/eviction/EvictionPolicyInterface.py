@@ -0,0 +1,77 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+
+
+class EvictionPolicyInterface(metaclass=abc.ABCMeta):
+    """
+    Decides which cached entry of a keyed factory provider is evicted when the cache exceeds its bounds.
+
+    The provider notifies the policy about each insertion, access and removal of a cached entry. Eviction policies are
+     always used while the provider's lock is being held, so they don't need to be thread-safe themselves, but a single
+     policy object must not be shared by multiple providers.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def record_insertion(self, name: str) -> None:
+        """
+        Called when an entry is added to the cache.
+
+        :param name: The added entry's name.
+        """
+
+        raise NotImplementedError(EvictionPolicyInterface.record_insertion.__qualname__)
+
+    @abc.abstractmethod
+    def record_access(self, name: str) -> None:
+        """
+        Called when a cached entry is requested (i.e. on a cache hit).
+
+        :param name: The accessed entry's name.
+        """
+
+        raise NotImplementedError(EvictionPolicyInterface.record_access.__qualname__)
+
+    @abc.abstractmethod
+    def record_removal(self, name: str) -> None:
+        """
+        Called when an entry is removed from the cache, no matter whether it has been selected for eviction by this
+         policy or removed explicitly.
+
+        :param name: The removed entry's name.
+        """
+
+        raise NotImplementedError(EvictionPolicyInterface.record_removal.__qualname__)
+
+    @abc.abstractmethod
+    def select_victim(self) -> str:
+        """
+        Returns the name of the entry which should be evicted next. The entry is not removed from the policy's records
+         until record_removal() is called. Never called when the cache is empty.
+
+        :return: The name of the entry to evict.
+        """
+
+        raise NotImplementedError(EvictionPolicyInterface.select_victim.__qualname__)
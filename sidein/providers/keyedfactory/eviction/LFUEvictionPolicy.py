@@ -0,0 +1,71 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Dict
+import collections
+from sidein.providers.keyedfactory.eviction.EvictionPolicyInterface import EvictionPolicyInterface
+
+
+@final
+class LFUEvictionPolicy(EvictionPolicyInterface):
+    """
+    Evicts the least frequently used entry; ties are broken by evicting the least recently used one of them.
+    The entries are kept in per-frequency buckets, so insertions, accesses and victim selections are O(1).
+    """
+
+    __slots__ = "_frequencies", "_buckets", "_min_frequency"
+
+    def __init__(self):
+        self._frequencies: Dict[str, int] = {}
+        self._buckets: Dict[int, collections.OrderedDict] = {}  # {frequency: entries (least recently used first)}
+        self._min_frequency: int = 0
+
+    def record_insertion(self, name: str) -> None:
+        self._frequencies[name] = 1
+        self._buckets.setdefault(1, collections.OrderedDict())[name] = None
+        self._min_frequency = 1
+
+    def record_access(self, name: str) -> None:
+        frequency = self._frequencies[name]
+        self._remove_from_bucket(name, frequency)
+        if self._min_frequency == frequency and frequency not in self._buckets:
+            self._min_frequency = frequency + 1
+
+        self._frequencies[name] = frequency + 1
+        self._buckets.setdefault(frequency + 1, collections.OrderedDict())[name] = None
+
+    def record_removal(self, name: str) -> None:
+        frequency = self._frequencies.pop(name)
+        self._remove_from_bucket(name, frequency)
+
+        # Explicit removals (unlike evictions) may remove the last entry with the minimum frequency
+        if self._min_frequency == frequency and frequency not in self._buckets:
+            self._min_frequency = min(self._buckets, default=0)
+
+    def _remove_from_bucket(self, name: str, frequency: int) -> None:
+        bucket = self._buckets[frequency]
+        del bucket[name]
+        if not bucket:
+            del self._buckets[frequency]
+
+    def select_victim(self) -> str:
+        return next(iter(self._buckets[self._min_frequency]))
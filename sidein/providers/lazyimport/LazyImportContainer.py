@@ -0,0 +1,192 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Tuple, List
+import threading
+import importlib
+import re
+from sidein.providers.lazyimport.LazyImportContainerInterface import LazyImportContainerInterface
+from sidein.providers.lazyimport._LazyImportEntry import _LazyImportEntry
+from sidein.providers.lazyimport.exc.DependencyInLICExistsException import DependencyInLICExistsException
+from sidein.providers.lazyimport.exc.DependencyInLICNotFoundException import DependencyInLICNotFoundException
+from sidein.providers.lazyimport.exc.InvalidImportPathError import InvalidImportPathError
+from sidein.providers.lazyimport.exc.DependencyLoadingFailedError import DependencyLoadingFailedError
+from sidein.providers.lazyimport.exc.DependencyLoadingCycleError import DependencyLoadingCycleError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class LazyImportContainer(LazyImportContainerInterface):
+    """
+    A thread-safe implementation of lazy import container.
+
+    Each dependency is loaded at most once, even if it's requested by multiple threads at the same time - the loading
+     is guarded by a per-dependency lock, so loading one dependency doesn't block requests for the other ones. Once a
+     dependency has been loaded, it's returned without acquiring its loading lock.
+
+    The factories may request other dependencies directly from this container. A factory which (indirectly) requests
+     the dependency it is creating causes DependencyLoadingCycleError to be raised instead of a deadlock - both when
+     the cycle is closed by the same thread, and when it spans multiple threads (e.g. thread 1 loads A, which needs B,
+     while thread 2 loads B, which needs A).
+    """
+
+    # This class isn't a thread-safety locking proxy, as the dependencies must be loaded outside of the container's
+    #  lock (a factory may request other dependencies from the container while it's running).
+    # Before a thread blocks on a loading lock, it follows the chain "dependency -> the thread loading it -> the
+    #  dependency that thread is waiting for -> ..." (similarly to importlib's module locks); if the chain leads back
+    #  to the thread itself, blocking would cause a deadlock.
+
+    __slots__ = "_lic_lock", "_entries", "_loading_state", "_loading_threads", "_awaited_dependencies"
+
+    _IMPORT_PATH_REGEX: re.Pattern = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*:[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*$')
+
+    def __init__(self):
+        self._lic_lock: threading.Lock = _LockRegistry.create_lock("LazyImportContainer._lic_lock[{}]".format(hex(id(self))))
+        self._entries: Dict[str, _LazyImportEntry] = {}
+        self._loading_state: threading.local = threading.local()  # The names of the dependencies being loaded by the current thread
+        self._loading_threads: Dict[str, int] = {}  # {name: the identifier of the thread loading it}; guarded by _lic_lock
+        self._awaited_dependencies: Dict[int, str] = {}  # {thread identifier: the name of the dependency whose loading it's waiting for}; guarded by _lic_lock
+
+    def get_dependency(self, name: str) -> Any:
+        with self._lic_lock:
+            entry = self._entries.get(name)
+
+        if entry is None:
+            raise DependencyInLICNotFoundException(name)
+
+        # DP: Double-checked locking
+        if entry.is_loaded:
+            return entry.dependency
+
+        loading_chain = self._get_loading_chain_of_current_thread()
+        if name in loading_chain:
+            raise DependencyLoadingCycleError(tuple(loading_chain[loading_chain.index(name):]) + (name,))
+
+        thread_id = threading.get_ident()
+        with self._lic_lock:
+            self._check_cross_thread_cycle_thread_safe(name, thread_id, loading_chain)
+            self._awaited_dependencies[thread_id] = name
+
+        try:
+            entry.loading_lock.acquire()
+        finally:
+            with self._lic_lock:
+                del self._awaited_dependencies[thread_id]
+
+        try:
+            if not entry.is_loaded:
+                with self._lic_lock:
+                    self._loading_threads[name] = thread_id
+
+                loading_chain.append(name)
+                try:
+                    entry.dependency = self._load_dependency(name, entry.import_path)
+                    entry.is_loaded = True
+                finally:
+                    loading_chain.pop()
+                    with self._lic_lock:
+                        del self._loading_threads[name]
+
+            return entry.dependency
+        finally:
+            entry.loading_lock.release()
+
+    # This method must be called in a thread-safe context!
+    def _check_cross_thread_cycle_thread_safe(self, name: str, thread_id: int, loading_chain: List[str]) -> None:
+        awaited_names = [name]
+        loading_thread_id = self._loading_threads.get(name)
+        while loading_thread_id is not None:
+            if loading_thread_id == thread_id:
+                # The chain has led back to a dependency which is being loaded by the current thread
+                reached_name = awaited_names.pop()
+                raise DependencyLoadingCycleError(tuple(loading_chain[loading_chain.index(reached_name):]) + tuple(awaited_names) + (reached_name,))
+
+            awaited_name = self._awaited_dependencies.get(loading_thread_id)
+            if awaited_name is None or awaited_name in awaited_names:
+                return  # The loading thread is not blocked (or the cycle it's part of doesn't involve this thread)
+
+            awaited_names.append(awaited_name)
+            loading_thread_id = self._loading_threads.get(awaited_name)
+
+    def _get_loading_chain_of_current_thread(self) -> List[str]:
+        try:
+            return self._loading_state.chain
+        except AttributeError:
+            self._loading_state.chain = []
+            return self._loading_state.chain
+
+    def _load_dependency(self, name: str, import_path: str) -> Any:
+        module_name, factory_path = import_path.split(":")
+
+        try:
+            factory = importlib.import_module(module_name)
+            for attribute_name in factory_path.split("."):
+                factory = getattr(factory, attribute_name)
+        except Exception as e:
+            raise DependencyLoadingFailedError("The factory of the dependency {} cannot be imported from {}! ({})".format(repr(name), repr(import_path), str(e)), e)
+
+        if not callable(factory):
+            raise DependencyLoadingFailedError("The factory of the dependency {} ({}) is not callable!".format(repr(name), repr(import_path)), TypeError(factory))
+
+        try:
+            return factory()
+        except DependencyLoadingCycleError:
+            raise
+        except Exception as e:
+            raise DependencyLoadingFailedError("The factory of the dependency {} ({}) has raised an exception! ({})".format(repr(name), repr(import_path), str(e)), e)
+
+    def get_all_import_paths(self) -> Dict[str, str]:
+        with self._lic_lock:
+            return {name: entry.import_path for name, entry in self._entries.items()}
+
+    def add_import_path(self, name: str, import_path: str) -> None:
+        self._validate_import_path(import_path)
+
+        with self._lic_lock:
+            if name in self._entries:
+                raise DependencyInLICExistsException(name)
+
+            self._entries[name] = _LazyImportEntry(import_path)
+
+    def replace_import_path(self, name: str, import_path: str) -> None:
+        self._validate_import_path(import_path)
+
+        with self._lic_lock:
+            if name not in self._entries:
+                raise DependencyInLICNotFoundException(name)
+
+            self._entries[name] = _LazyImportEntry(import_path)
+
+    def remove_import_path(self, name: str) -> None:
+        with self._lic_lock:
+            if name not in self._entries:
+                raise DependencyInLICNotFoundException(name)
+
+            del self._entries[name]
+
+    def get_never_loaded_names(self) -> Tuple[str, ...]:
+        with self._lic_lock:
+            return tuple(sorted(name for name, entry in self._entries.items() if not entry.is_loaded))
+
+    def _validate_import_path(self, import_path: str) -> None:
+        if not isinstance(import_path, str) or not LazyImportContainer._IMPORT_PATH_REGEX.match(import_path):
+            raise InvalidImportPathError("The import path must be in the \"package.module:factory\" format, not {}!".format(repr(import_path)))
@@ -0,0 +1,113 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Dict, Tuple
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class LazyImportContainerInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency provider which maps dependency names to import paths in the "package.module:factory" format (the
+     factory may also be a dotted path to an attribute, e.g. "package.module:SomeClass.create").
+
+    The module is imported and the factory is called (without arguments) when the dependency is requested for the
+     first time; its return value is then cached and returned on each subsequent request. This makes it possible to
+     register dependencies living in heavy modules without importing those modules in processes which never use them.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the dependency named 'name', importing its module and calling its factory if it hasn't been loaded yet.
+
+        :param name: The requested dependency's name.
+        :return: The dependency named 'name'.
+        :raises DependencyInLICNotFoundException: If the requested dependency isn't registered in the container. (DependencyInLICNotFoundException is a subclass of DependencyProviderException!)
+        :raises DependencyLoadingFailedError: If the dependency's module cannot be imported, its factory cannot be found or the factory raises an exception.
+        :raises DependencyLoadingCycleError: If the dependency's factory (indirectly) requests the dependency itself from this container, even if the cycle spans multiple threads.
+        """
+
+        raise NotImplementedError(LazyImportContainerInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_import_paths(self) -> Dict[str, str]:
+        """
+        Returns the import paths of all the registered dependencies in a {name: import path} dictionary.
+        No modules are imported by this method.
+
+        :return: The import paths of all the registered dependencies.
+        """
+
+        raise NotImplementedError(LazyImportContainerInterface.get_all_import_paths.__qualname__)
+
+    @abc.abstractmethod
+    def add_import_path(self, name: str, import_path: str) -> None:
+        """
+        Registers the dependency named 'name' which is going to be loaded from 'import_path' when it's first requested.
+
+        :param name: The added dependency's name.
+        :param import_path: The dependency's import path in the "package.module:factory" format.
+        :raises InvalidImportPathError: If the import path isn't in the "package.module:factory" format.
+        :raises DependencyInLICExistsException: If the added dependency is already registered in the container.
+        """
+
+        raise NotImplementedError(LazyImportContainerInterface.add_import_path.__qualname__)
+
+    @abc.abstractmethod
+    def replace_import_path(self, name: str, import_path: str) -> None:
+        """
+        Replaces the import path of the already registered dependency named 'name'. If the dependency has already been
+         loaded, the cached instance is discarded and the dependency is loaded again from the new import path when it's
+         requested next time.
+
+        :param name: The replaced dependency's name.
+        :param import_path: The dependency's new import path in the "package.module:factory" format.
+        :raises InvalidImportPathError: If the import path isn't in the "package.module:factory" format.
+        :raises DependencyInLICNotFoundException: If the replaced dependency isn't registered in the container.
+        """
+
+        raise NotImplementedError(LazyImportContainerInterface.replace_import_path.__qualname__)
+
+    @abc.abstractmethod
+    def remove_import_path(self, name: str) -> None:
+        """
+        Unregisters the dependency named 'name' (and discards its cached instance, if it has been loaded).
+
+        :param name: The removed dependency's name.
+        :raises DependencyInLICNotFoundException: If the removed dependency isn't registered in the container.
+        """
+
+        raise NotImplementedError(LazyImportContainerInterface.remove_import_path.__qualname__)
+
+    @abc.abstractmethod
+    def get_never_loaded_names(self) -> Tuple[str, ...]:
+        """
+        Returns the names of the registered dependencies which have never been loaded, i.e. whose modules have possibly
+         been registered for nothing. Useful for finding dead registrations.
+
+        :return: The sorted names of the never loaded dependencies.
+        """
+
+        raise NotImplementedError(LazyImportContainerInterface.get_never_loaded_names.__qualname__)
@@ -0,0 +1,250 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Dict, Mapping, Optional, Tuple
+import threading
+import types
+import weakref
+from sidein.providers.simplecontainer.SimpleContainerInterface import SimpleContainerInterface
+from sidein.providers.ObservableDependencyProviderInterface import ObservableDependencyProviderInterface
+from sidein.providers.simplecontainer.exc.DependencyInSCExistsException import DependencyInSCExistsException
+from sidein.providers.simplecontainer.exc.DependencyInSCNotFoundException import DependencyInSCNotFoundException
+from sidein.providers.overlay._OverlayGeneration import _OverlayGeneration
+from sidein.providers.overlay.exc.InvalidBaseContainerError import InvalidBaseContainerError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class OverlayContainer(SimpleContainerInterface, ObservableDependencyProviderInterface):
+    """
+    A simple container which stores only its own dependencies (overrides) and falls through to a shared base container
+     for the other ones, e.g. a per-tenant container on top of a large set of dependencies shared by all tenants.
+     Overlays can be layered - the base container may be another overlay container.
+
+    A lookup costs the same no matter how many overlays are stacked: the overrides of all the overlay layers are
+     flattened into a single dictionary, and the dependencies which aren't overridden are looked up in the published
+     view of the non-overlay container at the bottom of the stack (see get_all_dependencies_view()), so no lock is
+     acquired either. Nothing from the bottom container is copied into the overlays; its changes are visible to all
+     the overlays on top of it right away, without it having to notify them.
+    The flattened overrides are rebuilt lazily after any overlay in the stack changes - all the overlays on top of the
+     same overlay placed on a non-overlay container share a generation (see _OverlayGeneration), which is advanced on
+     each change, so that the validity of the flattened overrides is checked with a single comparison.
+
+    An overlay registers itself as a mutation listener of its base container only while it has listeners of its own
+     (to forward the base container's changes to them), and only through a weak reference, so creating many overlays
+     doesn't slow down the base container's changes, and overlays which are no longer used can be garbage-collected.
+
+    The methods which change the container only affect the overrides:
+     - add_dependency() raises DependencyInSCExistsException only if the dependency is already overridden (adding an
+       override of a base dependency is the whole point of this class),
+     - replace_dependency() overrides a dependency present either in the overlay or in its base,
+     - remove_dependency() and remove_all_dependencies() remove overrides, revealing the base dependencies again.
+    """
+
+    # The lookups are performed without locking - the flattened overrides are never modified after they have been
+    #  published, and reading a single dictionary item is atomic. The overrides are always changed before the
+    #  generation is advanced, and the generation is always read before the overrides are flattened, so flattened
+    #  overrides which might be stale are never published under the current generation.
+
+    __slots__ = "_oc_lock", "_base_container", "_bottom_container", "_layers", "_generation", "_overrides", \
+                "_flattened_overrides", "_mutation_listeners", "_dependencies_view_cache", "_base_listener_finalizer", "__weakref__"
+
+    _MISSING: Any = object()
+
+    def __init__(self, base_container: SimpleContainerInterface):
+        """
+        :param base_container: The base container; it must be a simple container which is also an observable dependency provider.
+        :raises InvalidBaseContainerError: If the base container is not observable.
+        """
+
+        if not isinstance(base_container, SimpleContainerInterface) or not isinstance(base_container, ObservableDependencyProviderInterface):
+            raise InvalidBaseContainerError("The base container must be an observable simple container (e.g. GlobalSimpleContainer or OverlayContainer), not {}!".format(base_container))
+
+        self._oc_lock: threading.Lock = _LockRegistry.create_lock("OverlayContainer._oc_lock[{}]".format(hex(id(self))))  # Guards the writes
+        self._base_container: SimpleContainerInterface = base_container
+        if isinstance(base_container, OverlayContainer):
+            self._bottom_container: SimpleContainerInterface = base_container._bottom_container
+            self._layers: Tuple[OverlayContainer, ...] = base_container._layers + (self,)  # From the bottom to the top
+            self._generation: _OverlayGeneration = base_container._generation
+        else:
+            self._bottom_container: SimpleContainerInterface = base_container
+            self._layers: Tuple[OverlayContainer, ...] = (self,)
+            self._generation: _OverlayGeneration = _OverlayGeneration()
+        self._overrides: Dict[str, Any] = {}
+        self._flattened_overrides: Optional[Tuple[int, Dict[str, Any]]] = None  # (generation, the overrides of all the layers)
+        self._mutation_listeners: Tuple[Callable[[Optional[str]], None], ...] = ()
+        self._dependencies_view_cache: Optional[Tuple[Mapping[str, Any], int, Mapping[str, Any]]] = None  # (the bottom container's view, generation, the merged view)
+        self._base_listener_finalizer: Optional[weakref.finalize] = None  # Set while this overlay listens to the base container
+
+    def get_base_container(self) -> SimpleContainerInterface:
+        return self._base_container
+
+    def get_dependency(self, name: str) -> Any:
+        dependency = self._get_flattened_overrides().get(name, OverlayContainer._MISSING)
+        if dependency is not OverlayContainer._MISSING:
+            return dependency
+
+        # The bottom container's view is immutable and it's only replaced when the bottom container changes
+        dependency = self._bottom_container.get_all_dependencies_view().get(name, OverlayContainer._MISSING)
+        if dependency is OverlayContainer._MISSING:
+            raise DependencyInSCNotFoundException(name)
+
+        return dependency
+
+    def _get_flattened_overrides(self) -> Dict[str, Any]:
+        flattened_overrides = self._flattened_overrides
+        generation = self._generation.value
+        if flattened_overrides is not None and flattened_overrides[0] == generation:
+            return flattened_overrides[1]
+
+        # The upper layers' overrides take precedence
+        overrides = {}
+        for layer in self._layers:
+            overrides.update(layer._overrides)
+
+        self._flattened_overrides = (generation, overrides)
+        return overrides
+
+    def get_all_dependencies(self) -> Dict[str, Any]:
+        dependencies = self._bottom_container.get_all_dependencies()
+        dependencies.update(self._get_flattened_overrides())
+
+        return dependencies
+
+    def get_all_dependencies_view(self) -> Mapping[str, Any]:
+        bottom_dependencies_view = self._bottom_container.get_all_dependencies_view()
+        generation = self._generation.value
+
+        dependencies_view_cache = self._dependencies_view_cache
+        if dependencies_view_cache is not None and dependencies_view_cache[0] is bottom_dependencies_view and dependencies_view_cache[1] == generation:
+            return dependencies_view_cache[2]
+
+        dependencies_view = types.MappingProxyType({**bottom_dependencies_view, **self._get_flattened_overrides()})
+        self._dependencies_view_cache = (bottom_dependencies_view, generation, dependencies_view)
+
+        return dependencies_view
+
+    def get_all_overrides(self) -> Dict[str, Any]:
+        """
+        Returns only the dependencies stored in the overlay itself in a {name: dependency} dictionary.
+        """
+
+        with self._oc_lock:
+            return self._overrides.copy()
+
+    def add_dependency(self, name: str, dependency: Any) -> None:
+        with self._oc_lock:
+            if name in self._overrides:
+                raise DependencyInSCExistsException(name)
+
+            self._overrides[name] = dependency
+            self._generation.advance()
+
+        self._notify_mutation_listeners(name)
+
+    def replace_dependency(self, name: str, dependency: Any) -> None:
+        with self._oc_lock:
+            is_overridden = name in self._overrides
+
+        if not is_overridden:
+            self._base_container.get_dependency(name)  # Raises DependencyInSCNotFoundException if the base doesn't contain it either
+
+        with self._oc_lock:
+            self._overrides[name] = dependency
+            self._generation.advance()
+
+        self._notify_mutation_listeners(name)
+
+    def add_or_replace_dependency(self, name: str, dependency: Any) -> bool:
+        with self._oc_lock:
+            is_replaced = name in self._overrides
+            self._overrides[name] = dependency
+            self._generation.advance()
+
+        self._notify_mutation_listeners(name)
+        return is_replaced
+
+    def remove_dependency(self, name: str) -> None:
+        with self._oc_lock:
+            if name not in self._overrides:
+                raise DependencyInSCNotFoundException(name)
+
+            del self._overrides[name]
+            self._generation.advance()
+
+        self._notify_mutation_listeners(name)
+
+    def remove_all_dependencies(self) -> None:
+        with self._oc_lock:
+            self._overrides.clear()
+            self._generation.advance()
+
+        self._notify_mutation_listeners(None)
+
+    def add_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        with self._oc_lock:
+            self._mutation_listeners = self._mutation_listeners + (listener,)
+
+            # The base container's changes need to be forwarded to this overlay's listeners
+            if self._base_listener_finalizer is None:
+                base_listener = self._create_base_container_listener()
+                self._base_container.add_mutation_listener(base_listener)
+                self._base_listener_finalizer = weakref.finalize(self, self._base_container.remove_mutation_listener, base_listener)
+
+    def _create_base_container_listener(self) -> Callable[[Optional[str]], None]:
+        # The listener mustn't keep this overlay alive; if the overlay is garbage-collected, its finalizer unregisters
+        #  the listener from the base container
+        weak_self = weakref.ref(self)
+
+        def _base_container_listener(name: Optional[str]) -> None:
+            overlay = weak_self()
+            if overlay is not None:
+                overlay._notify_mutation_listeners(name)
+
+        return _base_container_listener
+
+    def remove_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        with self._oc_lock:
+            self._mutation_listeners = tuple(registered_listener for registered_listener in self._mutation_listeners if registered_listener != listener)
+
+            if not self._mutation_listeners:
+                self._stop_listening_to_base_container_thread_safe()
+
+    # This method must be called in a thread-safe context!
+    def _stop_listening_to_base_container_thread_safe(self) -> None:
+        if self._base_listener_finalizer is not None:
+            self._base_listener_finalizer()  # Unregisters the listener from the base container
+            self._base_listener_finalizer = None
+
+    def _notify_mutation_listeners(self, name: Optional[str]) -> None:
+        for listener in self._mutation_listeners:
+            listener(name)
+
+    def detach_from_base_container(self) -> None:
+        """
+        Stops forwarding the base container's changes to this overlay's mutation listeners (the overlay's own changes
+         are still reported to them). Overlays are never kept alive by their base container, so this method doesn't
+         need to be called when an overlay is no longer used.
+        """
+
+        with self._oc_lock:
+            self._stop_listening_to_base_container_thread_safe()
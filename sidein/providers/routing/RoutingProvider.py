@@ -0,0 +1,107 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Tuple
+import threading
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.routing.RoutingProviderInterface import RoutingProviderInterface
+from sidein.providers.routing._RoutingTable import _RoutingTable
+from sidein.providers.routing.exc.DependencyNotRoutedException import DependencyNotRoutedException
+from sidein.providers.routing.exc.MountPointExistsException import MountPointExistsException
+from sidein.providers.routing.exc.MountPointNotFoundException import MountPointNotFoundException
+from sidein.providers.routing.exc.InvalidMountPointError import InvalidMountPointError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class RoutingProvider(RoutingProviderInterface):
+    """
+    A thread-safe implementation of routing provider.
+
+    The mounts are compiled into an immutable routing table (see _RoutingTable) which is replaced as a whole whenever
+     they change, so requesting a dependency doesn't acquire any lock. Resolved routes are cached in the table.
+    """
+
+    # This class isn't a thread-safety locking proxy, as its readers must not acquire any lock (see above).
+
+    __slots__ = "_rp_lock", "_prefix_mounts", "_pattern_mounts", "_routing_table"
+
+    def __init__(self):
+        self._rp_lock: threading.Lock = _LockRegistry.create_lock("RoutingProvider._rp_lock[{}]".format(hex(id(self))))  # Guards the mounts
+        self._prefix_mounts: Dict[str, Tuple[DependencyProviderInterface, bool]] = {}
+        self._pattern_mounts: Dict[str, DependencyProviderInterface] = {}
+        self._routing_table: _RoutingTable = _RoutingTable({}, {})
+
+    def get_dependency(self, name: str) -> Any:
+        route = self._routing_table.resolve_route(name)
+        if route is None:
+            raise DependencyNotRoutedException(name)
+
+        provider, routed_name = route
+        return provider.get_dependency(routed_name)
+
+    def mount_prefix(self, prefix: str, provider: DependencyProviderInterface, strip_prefix: bool = False) -> None:
+        if prefix and "" in prefix.split("."):
+            raise InvalidMountPointError("The prefix {} contains an empty segment!".format(repr(prefix)))
+
+        with self._rp_lock:
+            if prefix in self._prefix_mounts:
+                raise MountPointExistsException(prefix)
+
+            self._prefix_mounts[prefix] = (provider, strip_prefix)
+            self._rebuild_routing_table_thread_safe()
+
+    def mount_pattern(self, pattern: str, provider: DependencyProviderInterface) -> None:
+        with self._rp_lock:
+            if pattern in self._pattern_mounts:
+                raise MountPointExistsException(pattern)
+
+            self._pattern_mounts[pattern] = provider
+            self._rebuild_routing_table_thread_safe()
+
+    def unmount_prefix(self, prefix: str) -> None:
+        with self._rp_lock:
+            if prefix not in self._prefix_mounts:
+                raise MountPointNotFoundException(prefix)
+
+            del self._prefix_mounts[prefix]
+            self._rebuild_routing_table_thread_safe()
+
+    def unmount_pattern(self, pattern: str) -> None:
+        with self._rp_lock:
+            if pattern not in self._pattern_mounts:
+                raise MountPointNotFoundException(pattern)
+
+            del self._pattern_mounts[pattern]
+            self._rebuild_routing_table_thread_safe()
+
+    # This method must be called in a thread-safe context!
+    def _rebuild_routing_table_thread_safe(self) -> None:
+        self._routing_table = _RoutingTable(self._prefix_mounts, self._pattern_mounts)
+
+    def get_all_prefix_mounts(self) -> Dict[str, DependencyProviderInterface]:
+        with self._rp_lock:
+            return {prefix: provider for prefix, (provider, _) in self._prefix_mounts.items()}
+
+    def get_all_pattern_mounts(self) -> Dict[str, DependencyProviderInterface]:
+        with self._rp_lock:
+            return self._pattern_mounts.copy()
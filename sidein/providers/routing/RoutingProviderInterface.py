@@ -0,0 +1,111 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Dict
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class RoutingProviderInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency provider which routes dependency requests to other dependency providers, based on the requested
+     dependency's dotted, hierarchical name (e.g. "cz.vitlabuda.sidein.example.dependency").
+
+    Providers can be mounted on prefixes (a prefix matches the names equal to it, and the names starting with it
+     followed by a dot) or on glob patterns (e.g. "*.repository", see the fnmatch module). A name is routed to the
+     provider mounted on the longest matching prefix; the patterns are only consulted if no prefix matches, in the
+     order in which they have been mounted.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the dependency named 'name' from the provider which the name is routed to.
+
+        :param name: The requested dependency's name.
+        :return: The dependency named 'name'.
+        :raises DependencyNotRoutedException: If the name doesn't match any mounted prefix or pattern. (DependencyNotRoutedException is a subclass of DependencyProviderException!)
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def mount_prefix(self, prefix: str, provider: DependencyProviderInterface, strip_prefix: bool = False) -> None:
+        """
+        Mounts the provider 'provider' on the prefix 'prefix'. An empty prefix matches all names.
+
+        :param prefix: The dotted prefix, e.g. "cz.vitlabuda".
+        :param provider: The mounted provider.
+        :param strip_prefix: Whether to strip the prefix (and the dot following it) from the names passed to the provider.
+        :raises InvalidMountPointError: If the prefix contains an empty segment.
+        :raises MountPointExistsException: If a provider is already mounted on the prefix.
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.mount_prefix.__qualname__)
+
+    @abc.abstractmethod
+    def mount_pattern(self, pattern: str, provider: DependencyProviderInterface) -> None:
+        """
+        Mounts the provider 'provider' on the glob pattern 'pattern' (case-sensitive, see fnmatch.fnmatchcase()).
+
+        :param pattern: The glob pattern, e.g. "*.repository".
+        :param provider: The mounted provider.
+        :raises MountPointExistsException: If a provider is already mounted on the pattern.
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.mount_pattern.__qualname__)
+
+    @abc.abstractmethod
+    def unmount_prefix(self, prefix: str) -> None:
+        """
+        :param prefix: The prefix whose provider should be unmounted.
+        :raises MountPointNotFoundException: If no provider is mounted on the prefix.
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.unmount_prefix.__qualname__)
+
+    @abc.abstractmethod
+    def unmount_pattern(self, pattern: str) -> None:
+        """
+        :param pattern: The pattern whose provider should be unmounted.
+        :raises MountPointNotFoundException: If no provider is mounted on the pattern.
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.unmount_pattern.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_prefix_mounts(self) -> Dict[str, DependencyProviderInterface]:
+        """
+        :return: The providers mounted on prefixes in a {prefix: provider} dictionary.
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.get_all_prefix_mounts.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_pattern_mounts(self) -> Dict[str, DependencyProviderInterface]:
+        """
+        :return: The providers mounted on patterns in a {pattern: provider} dictionary (in the order of mounting).
+        """
+
+        raise NotImplementedError(RoutingProviderInterface.get_all_pattern_mounts.__qualname__)
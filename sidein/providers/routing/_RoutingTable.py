@@ -0,0 +1,113 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, List, Optional, Tuple
+import re
+import fnmatch
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.routing._PrefixTrieNode import _PrefixTrieNode
+from sidein.providers._BoundedCache import _BoundedCache
+
+
+@final
+class _RoutingTable:
+    """
+    An immutable index of the mounts of a routing provider, plus a cache of the routes it has resolved.
+    Used by RoutingProvider, which replaces the whole table whenever its mounts change (this also invalidates the
+     route cache).
+
+    The prefixes are stored in a trie keyed by the names' dotted segments, so the cost of a lookup depends only on the
+     number of segments of the requested name, not on the number of mounts. The patterns are compiled into a single
+     regular expression.
+    """
+
+    # The route cache is the only mutable part of the table. The worst a race can cause is that a route is resolved
+    #  twice.
+
+    __slots__ = "_trie_root", "_pattern_regex", "_pattern_group_names", "_pattern_providers", "_route_cache"
+
+    _NO_ROUTE: Any = object()
+
+    def __init__(self, prefix_mounts: Dict[str, Tuple[DependencyProviderInterface, bool]], pattern_mounts: Dict[str, DependencyProviderInterface]):
+        self._trie_root: _PrefixTrieNode = _PrefixTrieNode()
+        for prefix, (provider, strip_prefix) in prefix_mounts.items():
+            self._add_prefix_to_trie(prefix, provider, strip_prefix)
+
+        self._pattern_group_names: List[str] = ["sidein_pattern_{}".format(index) for index in range(len(pattern_mounts))]
+        self._pattern_providers: Dict[str, DependencyProviderInterface] = dict(zip(self._pattern_group_names, pattern_mounts.values()))
+        self._pattern_regex: Optional[re.Pattern] = None
+        if pattern_mounts:
+            self._pattern_regex = re.compile("|".join(
+                "(?P<{}>{})".format(group_name, fnmatch.translate(pattern)) for group_name, pattern in zip(self._pattern_group_names, pattern_mounts)
+            ))
+
+        self._route_cache: _BoundedCache = _BoundedCache()
+
+    def _add_prefix_to_trie(self, prefix: str, provider: DependencyProviderInterface, strip_prefix: bool) -> None:
+        node = self._trie_root
+        if prefix:
+            for segment in prefix.split("."):
+                node = node.children.setdefault(segment, _PrefixTrieNode())
+
+        strip_length = ((len(prefix) + 1) if (strip_prefix and prefix) else 0)
+        node.route = (provider, strip_length)
+
+    def resolve_route(self, name: str) -> Optional[Tuple[DependencyProviderInterface, str]]:
+        """
+        Returns the provider which the name is routed to and the name which should be passed to it, or None if the
+         name cannot be routed anywhere.
+        """
+
+        route = self._route_cache.get(name, _RoutingTable._NO_ROUTE)
+        if route is not _RoutingTable._NO_ROUTE:
+            return route
+
+        route = self._resolve_route_uncached(name)
+        self._route_cache.put(name, route)
+
+        return route
+
+    def _resolve_route_uncached(self, name: str) -> Optional[Tuple[DependencyProviderInterface, str]]:
+        # The longest matching prefix wins
+        node = self._trie_root
+        longest_prefix_route = node.route
+        for segment in name.split("."):
+            node = node.children.get(segment)
+            if node is None:
+                break
+
+            if node.route is not None:
+                longest_prefix_route = node.route
+
+        if longest_prefix_route is not None:
+            provider, strip_length = longest_prefix_route
+            return provider, name[strip_length:]
+
+        # The patterns are consulted in the order in which they have been mounted
+        if self._pattern_regex is not None:
+            match = self._pattern_regex.match(name)
+            if match is not None:
+                for group_name in self._pattern_group_names:
+                    if match.group(group_name) is not None:
+                        return self._pattern_providers[group_name], name
+
+        return None
@@ -20,50 +20,133 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Any, Dict
+from typing import final, Any, Dict, Mapping, Optional, Tuple, Callable
 import threading
+import time
 from sidein.providers.simplecontainer.SimpleContainerInterface import SimpleContainerInterface
+from sidein.providers.ObservableDependencyProviderInterface import ObservableDependencyProviderInterface
 from sidein.providers.simplecontainer._ThreadSafeGlobalSimpleContainer import _ThreadSafeGlobalSimpleContainer
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.metrics.MetricsCapableInterface import MetricsCapableInterface
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+from sidein.lockprofiler._LockRegistry import _LockRegistry
 
 
 @final
-class GlobalSimpleContainer(SimpleContainerInterface):
+class GlobalSimpleContainer(SimpleContainerInterface, MetricsCapableInterface, ObservableDependencyProviderInterface):
     """
     A thread-safety locking proxy to the "true" simple container implementation.
+
+    If a metrics recorder is set, the container records the number of lookups and misses of each dependency, the
+     time spent looking it up and the time spent waiting for the container's lock.
+
+    Mutation listeners (see ObservableDependencyProviderInterface) are notified after each change of the container.
     """
 
     # DP: Proxy
 
-    __slots__ = "_sc_lock", "_thread_safe_sc"
+    __slots__ = "_sc_lock", "_thread_safe_sc", "_metrics_recorder", "_mutation_listeners", "_published_dependencies_view"
 
     def __init__(self):
-        self._sc_lock: threading.Lock = threading.Lock()
+        self._sc_lock: threading.Lock = _LockRegistry.create_lock("GlobalSimpleContainer._sc_lock[{}]".format(hex(id(self))))
         self._thread_safe_sc: SimpleContainerInterface = _ThreadSafeGlobalSimpleContainer()
+        self._metrics_recorder: Optional[MetricsRecorder] = None
+        self._mutation_listeners: Tuple[Callable[[Optional[str]], None], ...] = ()
+        self._published_dependencies_view: Optional[Mapping[str, Any]] = None  # Cleared under the lock on each change
+
+    def get_metrics_recorder(self) -> Optional[MetricsRecorder]:
+        with self._sc_lock:
+            return self._metrics_recorder
+
+    def set_metrics_recorder(self, metrics_recorder: Optional[MetricsRecorder]) -> None:
+        with self._sc_lock:
+            self._metrics_recorder = metrics_recorder
 
     def get_dependency(self, name: str) -> Any:
+        # The metrics recorder is checked without locking, so that lookups don't pay for any time measurements when
+        #  metrics recording is disabled (see _Namespace.get_dependency())
+        if self._metrics_recorder is None:
+            with self._sc_lock:
+                return self._thread_safe_sc.get_dependency(name)
+
+        wait_start_ns = time.perf_counter_ns()
         with self._sc_lock:
-            return self._thread_safe_sc.get_dependency(name)
+            lookup_start_ns = time.perf_counter_ns()
+            metrics_recorder = self._metrics_recorder
+            if metrics_recorder is None:
+                return self._thread_safe_sc.get_dependency(name)
+
+            metrics_recorder.record_lock_wait(name, lookup_start_ns - wait_start_ns)
+            is_miss = False
+            try:
+                return self._thread_safe_sc.get_dependency(name)
+            except DependencyProviderException:
+                is_miss = True
+                raise
+            finally:
+                metrics_recorder.record_resolution(name, time.perf_counter_ns() - lookup_start_ns, is_miss)
 
     def get_all_dependencies(self) -> Dict[str, Any]:
         with self._sc_lock:
             return self._thread_safe_sc.get_all_dependencies()
 
+    def get_all_dependencies_view(self) -> Mapping[str, Any]:
+        # The published snapshot is immutable, so it can be returned without locking
+        dependencies_view = self._published_dependencies_view
+        if dependencies_view is not None:
+            return dependencies_view
+
+        with self._sc_lock:
+            dependencies_view = self._thread_safe_sc.get_all_dependencies_view()
+            self._published_dependencies_view = dependencies_view
+            return dependencies_view
+
     def add_dependency(self, name: str, dependency: Any) -> None:
         with self._sc_lock:
-            return self._thread_safe_sc.add_dependency(name, dependency)
+            self._thread_safe_sc.add_dependency(name, dependency)
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
 
     def replace_dependency(self, name: str, dependency: Any) -> None:
         with self._sc_lock:
-            return self._thread_safe_sc.replace_dependency(name, dependency)
+            self._thread_safe_sc.replace_dependency(name, dependency)
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
 
     def add_or_replace_dependency(self, name: str, dependency: Any) -> bool:
         with self._sc_lock:
-            return self._thread_safe_sc.add_or_replace_dependency(name, dependency)
+            is_replaced = self._thread_safe_sc.add_or_replace_dependency(name, dependency)
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
+        return is_replaced
 
     def remove_dependency(self, name: str) -> None:
         with self._sc_lock:
-            return self._thread_safe_sc.remove_dependency(name)
+            self._thread_safe_sc.remove_dependency(name)
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
 
     def remove_all_dependencies(self) -> None:
         with self._sc_lock:
-            return self._thread_safe_sc.remove_all_dependencies()
+            self._thread_safe_sc.remove_all_dependencies()
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(None)
+
+    def add_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        with self._sc_lock:
+            self._mutation_listeners = self._mutation_listeners + (listener,)
+
+    def remove_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        with self._sc_lock:
+            self._mutation_listeners = tuple(registered_listener for registered_listener in self._mutation_listeners if registered_listener != listener)
+
+    # The listeners are stored in a tuple which is replaced as a whole when it changes, so that they can be notified
+    #  without holding the lock.
+    def _notify_mutation_listeners(self, name: Optional[str]) -> None:
+        for listener in self._mutation_listeners:
+            listener(name)
@@ -21,7 +21,7 @@
 
 
 import abc
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
 
 
@@ -71,6 +71,19 @@ class SimpleContainerInterface(DependencyProviderInterface, metaclass=abc.ABCMet
 
         raise NotImplementedError(SimpleContainerInterface.get_all_dependencies.__qualname__)
 
+    @abc.abstractmethod
+    def get_all_dependencies_view(self) -> Mapping[str, Any]:
+        """
+        Returns a read-only snapshot of all the dependencies stored in the dependency container in a {name: dependency}
+         mapping. Unlike get_all_dependencies(), the dependencies are not copied on each call - the snapshot is taken
+         once after each change of the container and shared by all the callers until the container changes again.
+         The snapshot never changes, so it's safe to iterate over it while other threads modify the container.
+
+        :return: A read-only snapshot of all the dependencies stored in the dependency container.
+        """
+
+        raise NotImplementedError(SimpleContainerInterface.get_all_dependencies_view.__qualname__)
+
     @abc.abstractmethod
     def add_dependency(self, name: str, dependency: Any) -> None:
         """
@@ -0,0 +1,237 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Mapping, Optional, Tuple, Callable
+import threading
+import time
+import types
+from sidein.providers.simplecontainer.SimpleContainerInterface import SimpleContainerInterface
+from sidein.providers.ObservableDependencyProviderInterface import ObservableDependencyProviderInterface
+from sidein.providers.simplecontainer.exc.DependencyInSCExistsException import DependencyInSCExistsException
+from sidein.providers.simplecontainer.exc.DependencyInSCNotFoundException import DependencyInSCNotFoundException
+from sidein.providers.simplecontainer.exc.InvalidStripeCountError import InvalidStripeCountError
+from sidein.metrics.MetricsCapableInterface import MetricsCapableInterface
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class StripedGlobalSimpleContainer(SimpleContainerInterface, MetricsCapableInterface, ObservableDependencyProviderInterface):
+    """
+    A global simple container which behaves like GlobalSimpleContainer, but splits its dependencies into several
+     stripes, each of them guarded by its own lock. A dependency's stripe is determined by the hash of its name, so
+     the operations on different dependencies rarely contend with each other - e.g. a thread replacing a dependency
+     doesn't block the threads looking up other dependencies.
+
+    The operations which concern the whole container (get_all_dependencies(), get_all_dependencies_view() and
+     remove_all_dependencies()) acquire the locks of all the stripes (always in the same order), so they stay
+     consistent - they never observe or produce a state in which only some of the stripes have been changed.
+
+    If a metrics recorder is set, the container records the number of lookups and misses of each dependency, the
+     time spent looking it up and the time spent waiting for the stripe's lock.
+
+    Mutation listeners (see ObservableDependencyProviderInterface) are notified after each change of the container.
+    """
+
+    __slots__ = "_stripe_count", "_stripe_locks", "_stripes", "_meta_lock", "_metrics_recorder", "_mutation_listeners", "_published_dependencies_view"
+
+    DEFAULT_STRIPE_COUNT: int = 16
+
+    def __init__(self, stripe_count: int = DEFAULT_STRIPE_COUNT):
+        """
+        :param stripe_count: The number of stripes (and therefore locks) the dependencies are split into.
+        :raises InvalidStripeCountError: If the stripe count is not a positive integer.
+        """
+
+        if not isinstance(stripe_count, int) or isinstance(stripe_count, bool) or stripe_count < 1:
+            raise InvalidStripeCountError("The stripe count must be a positive integer, not {}!".format(stripe_count))
+
+        self._stripe_count: int = stripe_count
+        self._stripe_locks: Tuple[threading.Lock, ...] = tuple(
+            _LockRegistry.create_lock("StripedGlobalSimpleContainer._stripe_locks[{}][{}]".format(hex(id(self)), index)) for index in range(stripe_count)
+        )
+        self._stripes: Tuple[Dict[str, Any], ...] = tuple({} for _ in range(stripe_count))
+        self._meta_lock: threading.Lock = _LockRegistry.create_lock("StripedGlobalSimpleContainer._meta_lock[{}]".format(hex(id(self))))  # Guards the metrics recorder & the mutation listeners
+        self._metrics_recorder: Optional[MetricsRecorder] = None
+        self._mutation_listeners: Tuple[Callable[[Optional[str]], None], ...] = ()
+        self._published_dependencies_view: Optional[Mapping[str, Any]] = None  # Cleared under a stripe lock on each change
+
+    def get_stripe_count(self) -> int:
+        return self._stripe_count
+
+    def get_metrics_recorder(self) -> Optional[MetricsRecorder]:
+        with self._meta_lock:
+            return self._metrics_recorder
+
+    def set_metrics_recorder(self, metrics_recorder: Optional[MetricsRecorder]) -> None:
+        with self._meta_lock:
+            self._metrics_recorder = metrics_recorder
+
+    def _get_stripe_index(self, name: str) -> int:
+        return hash(name) % self._stripe_count
+
+    def get_dependency(self, name: str) -> Any:
+        stripe_index = self._get_stripe_index(name)
+        stripe = self._stripes[stripe_index]
+
+        # The metrics recorder is checked without locking, so that lookups don't pay for any time measurements when
+        #  metrics recording is disabled (see GlobalSimpleContainer.get_dependency())
+        metrics_recorder = self._metrics_recorder
+        if metrics_recorder is None:
+            with self._stripe_locks[stripe_index]:
+                if name not in stripe:
+                    raise DependencyInSCNotFoundException(name)
+
+                return stripe[name]
+
+        wait_start_ns = time.perf_counter_ns()
+        with self._stripe_locks[stripe_index]:
+            lookup_start_ns = time.perf_counter_ns()
+            metrics_recorder.record_lock_wait(name, lookup_start_ns - wait_start_ns)
+
+            is_miss = name not in stripe
+            metrics_recorder.record_resolution(name, time.perf_counter_ns() - lookup_start_ns, is_miss)
+            if is_miss:
+                raise DependencyInSCNotFoundException(name)
+
+            return stripe[name]
+
+    def get_all_dependencies(self) -> Dict[str, Any]:
+        stripe_locks = self._acquire_all_stripe_locks()
+        try:
+            return self._merge_stripes_all_locked()
+        finally:
+            self._release_all_stripe_locks(stripe_locks)
+
+    def get_all_dependencies_view(self) -> Mapping[str, Any]:
+        # The published snapshot is immutable, so it can be returned without locking
+        dependencies_view = self._published_dependencies_view
+        if dependencies_view is not None:
+            return dependencies_view
+
+        stripe_locks = self._acquire_all_stripe_locks()
+        try:
+            dependencies_view = types.MappingProxyType(self._merge_stripes_all_locked())
+            self._published_dependencies_view = dependencies_view
+            return dependencies_view
+        finally:
+            self._release_all_stripe_locks(stripe_locks)
+
+    def add_dependency(self, name: str, dependency: Any) -> None:
+        stripe_index = self._get_stripe_index(name)
+        with self._stripe_locks[stripe_index]:
+            stripe = self._stripes[stripe_index]
+            if name in stripe:
+                raise DependencyInSCExistsException(name)
+
+            stripe[name] = dependency
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
+
+    def replace_dependency(self, name: str, dependency: Any) -> None:
+        stripe_index = self._get_stripe_index(name)
+        with self._stripe_locks[stripe_index]:
+            stripe = self._stripes[stripe_index]
+            if name not in stripe:
+                raise DependencyInSCNotFoundException(name)
+
+            stripe[name] = dependency
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
+
+    def add_or_replace_dependency(self, name: str, dependency: Any) -> bool:
+        stripe_index = self._get_stripe_index(name)
+        with self._stripe_locks[stripe_index]:
+            stripe = self._stripes[stripe_index]
+            is_replaced = name in stripe
+
+            stripe[name] = dependency
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
+        return is_replaced
+
+    def remove_dependency(self, name: str) -> None:
+        stripe_index = self._get_stripe_index(name)
+        with self._stripe_locks[stripe_index]:
+            stripe = self._stripes[stripe_index]
+            if name not in stripe:
+                raise DependencyInSCNotFoundException(name)
+
+            del stripe[name]
+            self._published_dependencies_view = None
+
+        self._notify_mutation_listeners(name)
+
+    def remove_all_dependencies(self) -> None:
+        stripe_locks = self._acquire_all_stripe_locks()
+        try:
+            for stripe in self._stripes:
+                stripe.clear()
+            self._published_dependencies_view = None
+        finally:
+            self._release_all_stripe_locks(stripe_locks)
+
+        self._notify_mutation_listeners(None)
+
+    # The locks are always acquired in the same order, so that two whole-container operations cannot deadlock
+    #  (the acquired locks are returned, so that the same lock objects are released even if the lock profiler replaces
+    #  them in the meantime).
+    def _acquire_all_stripe_locks(self) -> Tuple[threading.Lock, ...]:
+        stripe_locks = self._stripe_locks
+        for index, stripe_lock in enumerate(stripe_locks):
+            try:
+                stripe_lock.acquire()
+            except BaseException:
+                for acquired_stripe_lock in reversed(stripe_locks[:index]):
+                    acquired_stripe_lock.release()
+                raise
+
+        return stripe_locks
+
+    def _release_all_stripe_locks(self, stripe_locks: Tuple[threading.Lock, ...]) -> None:
+        for stripe_lock in reversed(stripe_locks):
+            stripe_lock.release()
+
+    # This method must be called in a thread-safe context!
+    def _merge_stripes_all_locked(self) -> Dict[str, Any]:
+        dependencies = {}
+        for stripe in self._stripes:
+            dependencies.update(stripe)
+
+        return dependencies
+
+    def add_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        with self._meta_lock:
+            self._mutation_listeners = self._mutation_listeners + (listener,)
+
+    def remove_mutation_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        with self._meta_lock:
+            self._mutation_listeners = tuple(registered_listener for registered_listener in self._mutation_listeners if registered_listener != listener)
+
+    # The listeners are stored in a tuple which is replaced as a whole when it changes, so that they can be notified
+    #  without holding any lock.
+    def _notify_mutation_listeners(self, name: Optional[str]) -> None:
+        for listener in self._mutation_listeners:
+            listener(name)
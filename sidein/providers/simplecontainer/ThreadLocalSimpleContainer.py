@@ -20,25 +20,62 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Any, Dict
+from typing import final, Any, Dict, Mapping, Optional
 import threading
+import time
 from sidein.providers.simplecontainer._SimpleContainerImplementationBase import _SimpleContainerImplementationBase
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.metrics.MetricsCapableInterface import MetricsCapableInterface
+from sidein.metrics.MetricsRecorder import MetricsRecorder
 
 
 @final
-class ThreadLocalSimpleContainer(_SimpleContainerImplementationBase):
+class ThreadLocalSimpleContainer(_SimpleContainerImplementationBase, MetricsCapableInterface):
     """
     An implementation of simple container which stores dependencies in a thread-local dictionary.
+
+    If a metrics recorder is set (note that, unlike the dependencies, it is shared between threads), the container
+     records the number of lookups and misses of each dependency and the time spent looking it up. As the container
+     doesn't use any lock, no lock wait times are recorded.
     """
 
     # This container obviously doesn't need inter-thread locking, as its dependency storage is thread-local
 
-    __slots__ = "_thread_local_dependencies",
+    __slots__ = "_thread_local_dependencies", "_thread_local_dependencies_view", "_metrics_recorder"
 
     def __init__(self):
         _SimpleContainerImplementationBase.__init__(self)
 
         self._thread_local_dependencies: threading.local = threading.local()
+        self._thread_local_dependencies_view: threading.local = threading.local()  # Holds each thread's cached snapshot in its 'view' attribute
+        self._metrics_recorder: Optional[MetricsRecorder] = None
+
+    def get_metrics_recorder(self) -> Optional[MetricsRecorder]:
+        return self._metrics_recorder
+
+    def set_metrics_recorder(self, metrics_recorder: Optional[MetricsRecorder]) -> None:
+        self._metrics_recorder = metrics_recorder
+
+    def get_dependency(self, name: str) -> Any:
+        metrics_recorder = self._metrics_recorder
+        if metrics_recorder is None:
+            return _SimpleContainerImplementationBase.get_dependency(self, name)
+
+        lookup_start_ns = time.perf_counter_ns()
+        is_miss = False
+        try:
+            return _SimpleContainerImplementationBase.get_dependency(self, name)
+        except DependencyProviderException:
+            is_miss = True
+            raise
+        finally:
+            metrics_recorder.record_resolution(name, time.perf_counter_ns() - lookup_start_ns, is_miss)
 
     def _get_dependency_storage_dict(self) -> Dict[str, Any]:
         return self._thread_local_dependencies.__dict__
+
+    def _get_dependencies_view_cache(self) -> Optional[Mapping[str, Any]]:
+        return getattr(self._thread_local_dependencies_view, "view", None)
+
+    def _set_dependencies_view_cache(self, dependencies_view: Optional[Mapping[str, Any]]) -> None:
+        self._thread_local_dependencies_view.view = dependencies_view
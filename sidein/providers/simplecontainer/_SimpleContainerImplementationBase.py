@@ -20,8 +20,9 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
 import abc
+import types
 from sidein.providers.simplecontainer.SimpleContainerInterface import SimpleContainerInterface
 from sidein.providers.simplecontainer.exc.DependencyInSCNotFoundException import DependencyInSCNotFoundException
 from sidein.providers.simplecontainer.exc.DependencyInSCExistsException import DependencyInSCExistsException
@@ -38,6 +39,15 @@ class _SimpleContainerImplementationBase(SimpleContainerInterface, metaclass=abc
     def _get_dependency_storage_dict(self) -> Dict[str, Any]:
         raise NotImplementedError(_SimpleContainerImplementationBase._get_dependency_storage_dict.__qualname__)
 
+    # The snapshot returned by get_all_dependencies_view() is cached until the dependency storage dict changes
+    @abc.abstractmethod
+    def _get_dependencies_view_cache(self) -> Optional[Mapping[str, Any]]:
+        raise NotImplementedError(_SimpleContainerImplementationBase._get_dependencies_view_cache.__qualname__)
+
+    @abc.abstractmethod
+    def _set_dependencies_view_cache(self, dependencies_view: Optional[Mapping[str, Any]]) -> None:
+        raise NotImplementedError(_SimpleContainerImplementationBase._set_dependencies_view_cache.__qualname__)
+
     def get_dependency(self, name: str) -> Any:
         if not self._dependency_exists(name):
             raise DependencyInSCNotFoundException(name)
@@ -51,6 +61,14 @@ class _SimpleContainerImplementationBase(SimpleContainerInterface, metaclass=abc
         # Shallow-copy the dict to prevent (accidental) modification of this this class's internal members
         return self._get_dependency_storage_dict().copy()
 
+    def get_all_dependencies_view(self) -> Mapping[str, Any]:
+        dependencies_view = self._get_dependencies_view_cache()
+        if dependencies_view is None:
+            dependencies_view = types.MappingProxyType(self._get_dependency_storage_dict().copy())
+            self._set_dependencies_view_cache(dependencies_view)
+
+        return dependencies_view
+
     def add_dependency(self, name: str, dependency: Any) -> None:
         if self._dependency_exists(name):
             raise DependencyInSCExistsException(name)
@@ -73,6 +91,7 @@ class _SimpleContainerImplementationBase(SimpleContainerInterface, metaclass=abc
     # There is nothing to check in this method, but it has "checkless" in its name nevertheless due to code consistency.
     def _add_or_replace_dependency_checkless(self, name: str, dependency: Any) -> None:
         self._get_dependency_storage_dict()[name] = dependency
+        self._set_dependencies_view_cache(None)
 
     def remove_dependency(self, name: str) -> None:
         if not self._dependency_exists(name):
@@ -82,9 +101,11 @@ class _SimpleContainerImplementationBase(SimpleContainerInterface, metaclass=abc
 
     def _remove_dependency_checkless(self, name: str) -> None:
         del self._get_dependency_storage_dict()[name]
+        self._set_dependencies_view_cache(None)
 
     def remove_all_dependencies(self) -> None:
         self._get_dependency_storage_dict().clear()
+        self._set_dependencies_view_cache(None)
 
     def _dependency_exists(self, name: str) -> bool:
         return name in self._get_dependency_storage_dict()
@@ -18,7 +18,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from typing import final, Any, Dict
+from typing import final, Any, Dict, Mapping, Optional
 from sidein.providers.simplecontainer._SimpleContainerImplementationBase import _SimpleContainerImplementationBase
 
 
@@ -29,12 +29,19 @@ class _ThreadSafeGlobalSimpleContainer(_SimpleContainerImplementationBase):
     For it to work properly in multi-threaded programs, it needs to be behind a thread-safety locking proxy.
     """
 
-    __slots__ = "_dependencies",
+    __slots__ = "_dependencies", "_dependencies_view"
 
     def __init__(self):
         _SimpleContainerImplementationBase.__init__(self)
 
         self._dependencies: Dict[str, Any] = {}
+        self._dependencies_view: Optional[Mapping[str, Any]] = None
 
     def _get_dependency_storage_dict(self) -> Dict[str, Any]:
         return self._dependencies
+
+    def _get_dependencies_view_cache(self) -> Optional[Mapping[str, Any]]:
+        return self._dependencies_view
+
+    def _set_dependencies_view_cache(self, dependencies_view: Optional[Mapping[str, Any]]) -> None:
+        self._dependencies_view = dependencies_view
@@ -0,0 +1,252 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Mapping, Optional, Tuple
+import os
+import sys
+import mmap
+import pickle
+import struct
+from multiprocessing import shared_memory
+from sidein.providers.snapshot.exc.InvalidSnapshotError import InvalidSnapshotError
+from sidein.providers.snapshot.exc.SnapshotSerializationError import SnapshotSerializationError
+
+
+@final
+class DependencySnapshot:
+    """
+    A read-only snapshot of serializable (picklable) dependencies stored in a multiprocessing.shared_memory block or in
+     a memory-mapped file, e.g. big lookup tables or parsed schemas which are needed by all the workers of a process
+     pool. The snapshot is exported once by the parent process, and the workers attach to it instead of building the
+     dependencies themselves; each dependency is serialized separately, so it can be deserialized only when (and if)
+     a worker needs it (see SnapshotContainer).
+
+    Snapshot objects are picklable - an unpickled snapshot is attached to the same shared memory block or file, so a
+     snapshot can be passed to a process pool's initializer as an argument. Attached snapshots must be closed when
+     they are no longer needed, and the shared memory block or file must be unlinked by the process which exported
+     it once no process needs it anymore.
+
+    The layout of the snapshot is: the magic bytes, the length of the index, the index ({name: (offset, length)}
+     pickled) and the serialized dependencies, whose offsets are relative to the end of the index.
+    """
+
+    _MAGIC: bytes = b"SIDEIN\x00\x01"
+    _HEADER_STRUCT: struct.Struct = struct.Struct("<8sQ")
+
+    __slots__ = "_shared_memory", "_mmap", "_file_path", "_buffer", "_index", "_data_offset"
+
+    def __init__(self, shared_memory_block: Optional[shared_memory.SharedMemory], mmap_: Optional[mmap.mmap], file_path: Optional[str]):
+        # Use the export_*() and attach_to_*() class methods instead of instantiating this class directly
+        self._shared_memory: Optional[shared_memory.SharedMemory] = shared_memory_block
+        self._mmap: Optional[mmap.mmap] = mmap_
+        self._file_path: Optional[str] = file_path
+        self._buffer: Optional[memoryview] = (shared_memory_block.buf if shared_memory_block is not None else memoryview(mmap_))
+
+        try:
+            self._index, self._data_offset = self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def export_to_shared_memory(cls, dependencies: Mapping[str, Any]) -> "DependencySnapshot":
+        """
+        Serializes the dependencies into a new shared memory block and returns the snapshot attached to it. The block
+         must be unlinked using unlink() once no process needs it anymore.
+
+        :param dependencies: The exported dependencies in a {name: dependency} mapping, e.g. a simple container's get_all_dependencies_view().
+        :return: The snapshot.
+        :raises SnapshotSerializationError: If a dependency cannot be pickled.
+        """
+
+        data = cls._serialize_dependencies(dependencies)
+
+        shared_memory_block = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            shared_memory_block.buf[:len(data)] = data
+        except BaseException:
+            shared_memory_block.close()
+            shared_memory_block.unlink()
+            raise
+
+        return cls(shared_memory_block, None, None)
+
+    @classmethod
+    def export_to_file(cls, dependencies: Mapping[str, Any], file_path: str) -> "DependencySnapshot":
+        """
+        Serializes the dependencies into a new file (an existing file is overwritten) and returns the snapshot attached
+         to it (the file is memory-mapped). For the snapshot not to be copied into each process's memory, the file
+         should reside on a filesystem backed by the page cache or by memory (e.g. /dev/shm).
+
+        :param dependencies: The exported dependencies in a {name: dependency} mapping, e.g. a simple container's get_all_dependencies_view().
+        :param file_path: The path of the file.
+        :return: The snapshot.
+        :raises SnapshotSerializationError: If a dependency cannot be pickled.
+        """
+
+        data = cls._serialize_dependencies(dependencies)
+
+        with open(file_path, "wb") as file:
+            file.write(data)
+
+        return cls.attach_to_file(file_path)
+
+    @classmethod
+    def attach_to_shared_memory(cls, name: str) -> "DependencySnapshot":
+        """
+        :param name: The name of the shared memory block (see get_shared_memory_name()).
+        :return: The snapshot attached to an existing shared memory block.
+        :raises InvalidSnapshotError: If the shared memory block doesn't contain a valid snapshot.
+        """
+
+        # Since Python 3.13, the blocks attached to can be excluded from the resource tracker, which would otherwise
+        #  unlink them when an unrelated process exits
+        if sys.version_info >= (3, 13):
+            shared_memory_block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shared_memory_block = shared_memory.SharedMemory(name=name)
+
+        return cls(shared_memory_block, None, None)
+
+    @classmethod
+    def attach_to_file(cls, file_path: str) -> "DependencySnapshot":
+        """
+        :param file_path: The path of the file (see get_file_path()).
+        :return: The snapshot attached to an existing file, which is memory-mapped read-only.
+        :raises InvalidSnapshotError: If the file doesn't contain a valid snapshot.
+        """
+
+        with open(file_path, "rb") as file:
+            mmap_ = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(None, mmap_, file_path)
+
+    @classmethod
+    def _serialize_dependencies(cls, dependencies: Mapping[str, Any]) -> bytes:
+        serialized_dependencies = []
+        index: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for name, dependency in dependencies.items():
+            try:
+                serialized_dependency = pickle.dumps(dependency, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                raise SnapshotSerializationError("The dependency {} cannot be serialized! ({})".format(repr(name), str(e)), e)
+
+            serialized_dependencies.append(serialized_dependency)
+            index[name] = (offset, len(serialized_dependency))
+            offset += len(serialized_dependency)
+
+        serialized_index = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return b"".join((cls._HEADER_STRUCT.pack(cls._MAGIC, len(serialized_index)), serialized_index, *serialized_dependencies))
+
+    def _read_index(self) -> Tuple[Dict[str, Tuple[int, int]], int]:
+        buffer = self._buffer
+        header_size = DependencySnapshot._HEADER_STRUCT.size
+        if len(buffer) < header_size:
+            raise InvalidSnapshotError("The snapshot is too short!")
+
+        magic, index_length = DependencySnapshot._HEADER_STRUCT.unpack_from(buffer, 0)
+        if magic != DependencySnapshot._MAGIC or header_size + index_length > len(buffer):
+            raise InvalidSnapshotError("The shared memory block or file doesn't contain a valid snapshot!")
+
+        with buffer[header_size:header_size + index_length] as serialized_index:
+            index = pickle.loads(serialized_index)
+
+        return index, header_size + index_length
+
+    def get_shared_memory_name(self) -> Optional[str]:
+        return None if self._shared_memory is None else self._shared_memory.name
+
+    def get_file_path(self) -> Optional[str]:
+        return self._file_path
+
+    def get_dependency_names(self) -> Tuple[str, ...]:
+        return tuple(self._index.keys())
+
+    def has_dependency(self, name: str) -> bool:
+        return name in self._index
+
+    def load_dependency(self, name: str) -> Any:
+        """
+        Deserializes the dependency each time it's called - the dependencies are cached by SnapshotContainer.
+        This method can be called from multiple threads at once, but not while the snapshot is being closed.
+
+        :param name: The dependency's name.
+        :return: The deserialized dependency.
+        :raises KeyError: If the dependency isn't contained in the snapshot.
+        :raises InvalidSnapshotError: If the snapshot has been closed.
+        :raises SnapshotSerializationError: If the dependency cannot be unpickled (e.g. if its class cannot be imported).
+        """
+
+        offset, length = self._index[name]
+
+        buffer = self._buffer
+        if buffer is None:
+            raise InvalidSnapshotError("The snapshot has been closed!")
+
+        start = self._data_offset + offset
+        with buffer[start:start + length] as serialized_dependency:
+            try:
+                return pickle.loads(serialized_dependency)
+            except Exception as e:
+                raise SnapshotSerializationError("The dependency {} cannot be deserialized! ({})".format(repr(name), str(e)), e)
+
+    def close(self) -> None:
+        """
+        Detaches this snapshot from its shared memory block or file; the dependencies which have already been loaded
+         stay usable.
+        """
+
+        if self._buffer is None:
+            return
+
+        if self._shared_memory is not None:
+            self._buffer = None
+            self._shared_memory.close()
+        else:
+            self._buffer.release()
+            self._buffer = None
+            self._mmap.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys the shared memory block or deletes the file. The processes which are attached to the snapshot can
+         keep using it until they close it.
+        """
+
+        if self._shared_memory is not None:
+            self._shared_memory.unlink()
+        else:
+            os.remove(self._file_path)
+
+    def __enter__(self) -> "DependencySnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        if self._shared_memory is not None:
+            return DependencySnapshot.attach_to_shared_memory, (self._shared_memory.name,)
+
+        return DependencySnapshot.attach_to_file, (self._file_path,)
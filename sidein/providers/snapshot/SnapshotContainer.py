@@ -0,0 +1,80 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Tuple
+import threading
+from sidein.providers.snapshot.SnapshotContainerInterface import SnapshotContainerInterface
+from sidein.providers.snapshot.DependencySnapshot import DependencySnapshot
+from sidein.providers.snapshot.exc.DependencyInSnapshotNotFoundException import DependencyInSnapshotNotFoundException
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class SnapshotContainer(SnapshotContainerInterface):
+    """
+    A thread-safe implementation of snapshot container.
+
+    Each dependency is deserialized at most once. The loaded dependencies are published in an immutable dictionary
+     which is replaced (not modified) when a dependency is loaded, so the dependencies which have already been loaded
+     are returned without acquiring any lock. Deserializations are guarded by a single lock, as they are CPU-bound
+     (and hold the GIL), so they wouldn't run in parallel anyway.
+    """
+
+    __slots__ = "_snapshot", "_loading_lock", "_loaded_dependencies"
+
+    def __init__(self, snapshot: DependencySnapshot):
+        self._snapshot: DependencySnapshot = snapshot
+        self._loading_lock: threading.Lock = _LockRegistry.create_lock("SnapshotContainer._loading_lock[{}]".format(hex(id(self))))
+        self._loaded_dependencies: Dict[str, Any] = {}  # Never modified once published!
+
+    def get_dependency(self, name: str) -> Any:
+        # DP: Double-checked locking
+        try:
+            return self._loaded_dependencies[name]
+        except KeyError:
+            pass
+
+        with self._loading_lock:
+            loaded_dependencies = self._loaded_dependencies
+            try:
+                return loaded_dependencies[name]
+            except KeyError:
+                pass
+
+            if not self._snapshot.has_dependency(name):
+                raise DependencyInSnapshotNotFoundException(name)
+
+            dependency = self._snapshot.load_dependency(name)
+            self._loaded_dependencies = {**loaded_dependencies, name: dependency}
+
+            return dependency
+
+    def get_snapshot(self) -> DependencySnapshot:
+        return self._snapshot
+
+    def get_all_dependency_names(self) -> Tuple[str, ...]:
+        return self._snapshot.get_dependency_names()
+
+    def get_never_loaded_names(self) -> Tuple[str, ...]:
+        loaded_dependencies = self._loaded_dependencies
+
+        return tuple(sorted(name for name in self._snapshot.get_dependency_names() if name not in loaded_dependencies))
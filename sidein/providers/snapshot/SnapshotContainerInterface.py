@@ -0,0 +1,81 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Tuple
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.snapshot.DependencySnapshot import DependencySnapshot
+
+
+class SnapshotContainerInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A read-only dependency provider which serves the dependencies contained in a dependency snapshot (see
+     DependencySnapshot), typically in a worker process of a process pool.
+
+    Each dependency is deserialized when it's requested for the first time; it's then cached and returned on each
+     subsequent request. Dependencies which are never requested are therefore never deserialized in the process.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the dependency named 'name', deserializing it from the snapshot if it hasn't been loaded yet.
+
+        :param name: The requested dependency's name.
+        :return: The dependency named 'name'.
+        :raises DependencyInSnapshotNotFoundException: If the requested dependency isn't contained in the snapshot. (DependencyInSnapshotNotFoundException is a subclass of DependencyProviderException!)
+        :raises SnapshotSerializationError: If the dependency cannot be deserialized.
+        :raises InvalidSnapshotError: If the dependency hasn't been loaded yet and the snapshot has been closed.
+        """
+
+        raise NotImplementedError(SnapshotContainerInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def get_snapshot(self) -> DependencySnapshot:
+        """
+        :return: The snapshot the dependencies are served from.
+        """
+
+        raise NotImplementedError(SnapshotContainerInterface.get_snapshot.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_dependency_names(self) -> Tuple[str, ...]:
+        """
+        Returns the names of all the dependencies contained in the snapshot.
+        No dependencies are deserialized by this method.
+
+        :return: The names of all the dependencies.
+        """
+
+        raise NotImplementedError(SnapshotContainerInterface.get_all_dependency_names.__qualname__)
+
+    @abc.abstractmethod
+    def get_never_loaded_names(self) -> Tuple[str, ...]:
+        """
+        Returns the names of the dependencies which haven't been deserialized yet, sorted alphabetically.
+
+        :return: The names of the dependencies which haven't been deserialized yet.
+        """
+
+        raise NotImplementedError(SnapshotContainerInterface.get_never_loaded_names.__qualname__)
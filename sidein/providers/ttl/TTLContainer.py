@@ -0,0 +1,239 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Dict, Optional, List, Tuple
+import threading
+import asyncio
+import time
+from sidein.providers.ttl.TTLContainerInterface import TTLContainerInterface
+from sidein.providers.ttl._TTLEntry import _TTLEntry
+from sidein.providers.ttl.exc.DependencyInTTLCExistsException import DependencyInTTLCExistsException
+from sidein.providers.ttl.exc.DependencyInTTLCNotFoundException import DependencyInTTLCNotFoundException
+from sidein.providers.ttl.exc.InvalidTTLError import InvalidTTLError
+from sidein.providers.ttl.exc.DependencyFactoryFailedError import DependencyFactoryFailedError
+from sidein.providers.ttl.exc.BackgroundRefreshAlreadyRunningError import BackgroundRefreshAlreadyRunningError
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class TTLContainer(TTLContainerInterface):
+    """
+    A thread-safe implementation of TTL container.
+
+    Requesting a dependency which hasn't expired doesn't acquire any lock: the {name: entry} dictionary is never
+     modified in place (a modified copy replaces it whenever a dependency is added or removed), and each entry
+     publishes its current instance as an immutable tuple along with its expiry time, which is checked on each read.
+     Refreshes are guarded by a per-dependency lock, so a slow factory only delays other refreshes of the same
+     dependency (and the readers of the same dependency once it has expired).
+    A reader which finds a dependency due for a refresh (but not expired yet) starts refreshing it in a new daemon
+     thread, unless it's being refreshed already, and returns the current instance without waiting.
+    """
+
+    # This class isn't a thread-safety locking proxy, as its readers must not block on writers (see above).
+
+    __slots__ = "_ttlc_lock", "_entries", "_clock", "_refresh_thread", "_refresh_thread_stop_event"
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        :param clock: The function used to get the current time in seconds (it must be monotonic).
+        """
+
+        self._ttlc_lock: threading.Lock = _LockRegistry.create_lock("TTLContainer._ttlc_lock[{}]".format(hex(id(self))))  # Guards the writers & the refresh thread
+        self._entries: Dict[str, _TTLEntry] = {}  # Copy-on-write!
+        self._clock: Callable[[], float] = clock
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_thread_stop_event: threading.Event = threading.Event()
+
+    def get_dependency(self, name: str) -> Any:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise DependencyInTTLCNotFoundException(name)
+
+        return self._get_unexpired_dependency(name, entry)
+
+    def get_all_dependencies(self) -> Dict[str, Any]:
+        return {name: self._get_unexpired_dependency(name, entry) for name, entry in self._entries.items()}
+
+    def _get_unexpired_dependency(self, name: str, entry: _TTLEntry) -> Any:
+        dependency, expires_at = entry.published
+        now = self._clock()
+        if now < expires_at:
+            if now >= (expires_at - entry.refresh_ahead_seconds):
+                self._start_asynchronous_refresh(name, entry)  # The current instance is still valid
+
+            return dependency
+
+        # The TTL is enforced here - an expired instance is never returned; instead, the dependency is refreshed right
+        #  away (or, if another thread is refreshing it at the moment, the refreshed instance is waited for)
+        with entry.refresh_lock:
+            dependency, expires_at = entry.published
+            if self._clock() < expires_at:
+                return dependency  # Refreshed by another thread in the meantime
+
+            self._refresh_entry(name, entry)
+            return entry.published[0]
+
+    def add_dependency(self, name: str, factory: Callable[[], Any], ttl_seconds: float, refresh_ahead_seconds: Optional[float] = None) -> None:
+        if refresh_ahead_seconds is None:
+            refresh_ahead_seconds = ttl_seconds * TTLContainerInterface.DEFAULT_REFRESH_AHEAD_FRACTION
+
+        if ttl_seconds <= 0 or refresh_ahead_seconds <= 0 or refresh_ahead_seconds >= ttl_seconds:
+            raise InvalidTTLError("The TTL and the refresh-ahead time must be positive and the refresh-ahead time must be shorter than the TTL (TTL: {}, refresh-ahead time: {})!".format(ttl_seconds, refresh_ahead_seconds))
+
+        # The factory is called outside of the lock, so that a slow factory doesn't block the other writers
+        if name in self._entries:
+            raise DependencyInTTLCExistsException(name)
+
+        dependency, expires_at = self._create_dependency(name, factory, ttl_seconds)
+
+        with self._ttlc_lock:
+            if name in self._entries:
+                raise DependencyInTTLCExistsException(name)
+
+            new_entries = self._entries.copy()
+            new_entries[name] = _TTLEntry(factory, ttl_seconds, refresh_ahead_seconds, dependency, expires_at)
+            self._entries = new_entries
+
+    def remove_dependency(self, name: str) -> None:
+        with self._ttlc_lock:
+            if name not in self._entries:
+                raise DependencyInTTLCNotFoundException(name)
+
+            new_entries = self._entries.copy()
+            del new_entries[name]
+            self._entries = new_entries
+
+    def refresh_dependency(self, name: str) -> None:
+        entry = self._get_entry(name)
+
+        with entry.refresh_lock:
+            self._refresh_entry(name, entry)
+
+    def get_last_refresh_error(self, name: str) -> Optional[Exception]:
+        return self._get_entry(name).last_refresh_error
+
+    def refresh_due_dependencies(self) -> int:
+        refreshed_count = 0
+        for name, entry in self._get_entries_due_for_refresh():
+            if self._try_refreshing_entry(name, entry):
+                refreshed_count += 1
+
+        return refreshed_count
+
+    def _start_asynchronous_refresh(self, name: str, entry: _TTLEntry) -> None:
+        # If the entry is being refreshed at the moment, there's no need to refresh it again; otherwise, the refresh
+        #  lock is handed over to the refreshing thread, which releases it once it's done
+        if not entry.refresh_lock.acquire(blocking=False):
+            return
+
+        try:
+            threading.Thread(target=self._asynchronous_refresh_thread, args=(name, entry), name="sidein-ttl-refresh[{}]".format(name), daemon=True).start()
+        except BaseException:
+            entry.refresh_lock.release()
+            raise
+
+    def _asynchronous_refresh_thread(self, name: str, entry: _TTLEntry) -> None:
+        try:
+            self._refresh_entry(name, entry)
+        except DependencyFactoryFailedError:
+            pass  # The current instance is kept & the refresh is retried by the next reader
+        finally:
+            entry.refresh_lock.release()
+
+    def _get_entries_due_for_refresh(self) -> List[Tuple[str, _TTLEntry]]:
+        now = self._clock()
+
+        return [(name, entry) for name, entry in self._entries.items() if entry.is_due_for_refresh(now)]
+
+    def _try_refreshing_entry(self, name: str, entry: _TTLEntry) -> bool:
+        # If the entry is being refreshed by another thread, there's no need to refresh it again
+        if not entry.refresh_lock.acquire(blocking=False):
+            return False
+
+        try:
+            self._refresh_entry(name, entry)
+        except DependencyFactoryFailedError:
+            return False  # The stale dependency is kept & the refresh is retried next time
+        finally:
+            entry.refresh_lock.release()
+
+        return True
+
+    # This method must be called while the entry's refresh lock is held!
+    def _refresh_entry(self, name: str, entry: _TTLEntry) -> None:
+        try:
+            entry.published = self._create_dependency(name, entry.factory, entry.ttl_seconds)
+        except DependencyFactoryFailedError as e:
+            entry.last_refresh_error = e.get_raised_exception()
+            raise
+
+        entry.last_refresh_error = None
+
+    def _create_dependency(self, name: str, factory: Callable[[], Any], ttl_seconds: float) -> Tuple[Any, float]:
+        try:
+            dependency = factory()
+        except Exception as e:
+            raise DependencyFactoryFailedError("The factory of the dependency {} has raised an exception! ({})".format(repr(name), str(e)), e)
+
+        return dependency, (self._clock() + ttl_seconds)
+
+    def _get_entry(self, name: str) -> _TTLEntry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise DependencyInTTLCNotFoundException(name)
+
+        return entry
+
+    def start_background_refresh(self, check_interval_seconds: float = 1.0) -> None:
+        with self._ttlc_lock:
+            if self._refresh_thread is not None:
+                raise BackgroundRefreshAlreadyRunningError("The background refresh thread is already running!")
+
+            # Each thread gets its own stop event, so that a thread which is still stopping cannot be revived
+            self._refresh_thread_stop_event = threading.Event()
+            self._refresh_thread = threading.Thread(target=self._background_refresh_thread, args=(check_interval_seconds, self._refresh_thread_stop_event), name="sidein-ttl-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        with self._ttlc_lock:
+            refresh_thread = self._refresh_thread
+            self._refresh_thread = None
+
+            if refresh_thread is None:
+                return
+
+            self._refresh_thread_stop_event.set()
+
+        refresh_thread.join()  # The lock mustn't be held while waiting for the thread
+
+    def _background_refresh_thread(self, check_interval_seconds: float, stop_event: threading.Event) -> None:
+        while not stop_event.wait(check_interval_seconds):
+            self.refresh_due_dependencies()
+
+    async def run_refresh_loop(self, check_interval_seconds: float = 1.0) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            for name, entry in self._get_entries_due_for_refresh():
+                await loop.run_in_executor(None, self._try_refreshing_entry, name, entry)
+
+            await asyncio.sleep(check_interval_seconds)
@@ -0,0 +1,169 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Callable, Dict, Optional
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class TTLContainerInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency provider whose dependencies are created by factories and expire after a TTL (time to live), e.g.
+     short-lived credentials or feature flag snapshots.
+
+    The dependencies are refreshed (i.e. their factories are called again) ahead of their expiry - by a background
+     thread, by an asyncio task, or in the background on the first request which finds a dependency due for a refresh.
+     Requesting a dependency which hasn't expired yet never waits for a refresh - the current instance is returned
+     until the refreshed one is published. If a background refresh fails, the current instance is kept and the refresh
+     is retried later.
+    The TTL is enforced when a dependency is requested: an expired instance is never returned - if the dependency
+     hasn't been refreshed before its expiry (e.g. because no background refresh is running or because the refreshes
+     have been failing), it's refreshed synchronously by the requesting thread.
+    """
+
+    __slots__ = ()
+
+    DEFAULT_REFRESH_AHEAD_FRACTION: float = 0.1  # The default refresh-ahead time, as a fraction of the TTL
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the currently published instance of the dependency named 'name', refreshing it first if it has expired.
+
+        :param name: The requested dependency's name.
+        :return: The dependency named 'name'.
+        :raises DependencyInTTLCNotFoundException: If the requested dependency isn't present in the container. (DependencyInTTLCNotFoundException is a subclass of DependencyProviderException!)
+        :raises DependencyFactoryFailedError: If the dependency has expired and its factory raises an exception while it's being refreshed.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_dependencies(self) -> Dict[str, Any]:
+        """
+        Returns the currently published instances of all the dependencies in a {name: dependency} dictionary,
+         refreshing the expired ones first.
+
+        :return: All the dependencies stored in the container.
+        :raises DependencyFactoryFailedError: If a dependency has expired and its factory raises an exception while it's being refreshed.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.get_all_dependencies.__qualname__)
+
+    @abc.abstractmethod
+    def add_dependency(self, name: str, factory: Callable[[], Any], ttl_seconds: float, refresh_ahead_seconds: Optional[float] = None) -> None:
+        """
+        Adds a dependency created by 'factory' to the container under the name 'name'. The factory is called right away,
+         so the dependency is available as soon as this method returns.
+
+        :param name: The added dependency's name.
+        :param factory: A function which creates the dependency (it's called without arguments).
+        :param ttl_seconds: How long each created instance of the dependency is valid.
+        :param refresh_ahead_seconds: How long before the expiry the dependency becomes due for a refresh; DEFAULT_REFRESH_AHEAD_FRACTION of the TTL if None.
+        :raises InvalidTTLError: If the TTL or the refresh-ahead time is not positive, or if the refresh-ahead time is not shorter than the TTL.
+        :raises DependencyInTTLCExistsException: If the added dependency is already present in the container.
+        :raises DependencyFactoryFailedError: If the factory raises an exception.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.add_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def remove_dependency(self, name: str) -> None:
+        """
+        Removes the dependency named 'name' from the container.
+
+        :param name: The removed dependency's name.
+        :raises DependencyInTTLCNotFoundException: If the removed dependency isn't present in the container.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.remove_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def refresh_dependency(self, name: str) -> None:
+        """
+        Refreshes the dependency named 'name' right away, no matter whether it's due for a refresh or not.
+        If the dependency is being refreshed by another thread at the moment, this method waits for that refresh to finish.
+
+        :param name: The refreshed dependency's name.
+        :raises DependencyInTTLCNotFoundException: If the refreshed dependency isn't present in the container.
+        :raises DependencyFactoryFailedError: If the factory raises an exception (the stale dependency is kept in such case).
+        """
+
+        raise NotImplementedError(TTLContainerInterface.refresh_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def refresh_due_dependencies(self) -> int:
+        """
+        Refreshes the dependencies which are due for a refresh. Dependencies which are being refreshed by another thread
+         at the moment are skipped, and factory failures are not raised (the stale dependencies are kept and refreshing
+         them is retried on the next call).
+        This method is called periodically by the background refresh thread and the asyncio refresh loop.
+
+        :return: The number of successfully refreshed dependencies.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.refresh_due_dependencies.__qualname__)
+
+    @abc.abstractmethod
+    def get_last_refresh_error(self, name: str) -> Optional[Exception]:
+        """
+        Returns the exception raised by the factory of the dependency named 'name' during its last refresh, or None if
+         the last refresh has succeeded (or if the dependency hasn't been refreshed yet).
+
+        :param name: The dependency's name.
+        :return: The exception raised during the last refresh, or None.
+        :raises DependencyInTTLCNotFoundException: If the dependency isn't present in the container.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.get_last_refresh_error.__qualname__)
+
+    @abc.abstractmethod
+    def start_background_refresh(self, check_interval_seconds: float = 1.0) -> None:
+        """
+        Starts a daemon thread which calls refresh_due_dependencies() every 'check_interval_seconds' seconds.
+
+        :param check_interval_seconds: How often the thread checks for dependencies due for a refresh.
+        :raises BackgroundRefreshAlreadyRunningError: If the background refresh thread is already running.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.start_background_refresh.__qualname__)
+
+    @abc.abstractmethod
+    def stop_background_refresh(self) -> None:
+        """
+        Stops the background refresh thread (and waits for it to finish), if it's running.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.stop_background_refresh.__qualname__)
+
+    @abc.abstractmethod
+    async def run_refresh_loop(self, check_interval_seconds: float = 1.0) -> None:
+        """
+        An asyncio alternative to the background refresh thread, meant to be run as a task (e.g. using
+         asyncio.create_task()) and stopped by cancelling it. Every 'check_interval_seconds' seconds, the dependencies
+         due for a refresh are refreshed; their factories are run in the event loop's default executor, so that they
+         don't block the event loop.
+
+        :param check_interval_seconds: How often the loop checks for dependencies due for a refresh.
+        """
+
+        raise NotImplementedError(TTLContainerInterface.run_refresh_loop.__qualname__)
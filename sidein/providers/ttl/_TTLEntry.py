@@ -0,0 +1,48 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Callable, Tuple, Optional
+import threading
+
+
+@final
+class _TTLEntry:
+    """
+    A dependency stored in a TTL container.
+    Used by TTLContainer.
+    """
+
+    # The dependency instance and its expiry time are published as a single tuple which is always replaced as a whole,
+    #  so that readers can access them without locking.
+
+    __slots__ = "factory", "ttl_seconds", "refresh_ahead_seconds", "refresh_lock", "published", "last_refresh_error"
+
+    def __init__(self, factory: Callable[[], Any], ttl_seconds: float, refresh_ahead_seconds: float, dependency: Any, expires_at: float):
+        self.factory: Callable[[], Any] = factory
+        self.ttl_seconds: float = ttl_seconds
+        self.refresh_ahead_seconds: float = refresh_ahead_seconds
+        self.refresh_lock: threading.Lock = threading.Lock()
+        self.published: Tuple[Any, float] = (dependency, expires_at)  # (dependency, expiry time)
+        self.last_refresh_error: Optional[Exception] = None
+
+    def is_due_for_refresh(self, now: float) -> bool:
+        return now >= (self.published[1] - self.refresh_ahead_seconds)
@@ -0,0 +1,204 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Any, Dict, Tuple, Union
+import threading
+from sidein.providers.typekeyed.TypeKeyedContainerInterface import TypeKeyedContainerInterface
+from sidein.providers.typekeyed._AmbiguousTypeMatch import _AmbiguousTypeMatch
+from sidein.providers.typekeyed.exc.DependencyInTKCExistsException import DependencyInTKCExistsException
+from sidein.providers.typekeyed.exc.DependencyInTKCNotFoundException import DependencyInTKCNotFoundException
+from sidein.providers.typekeyed.exc.AmbiguousDependencyTypeException import AmbiguousDependencyTypeException
+from sidein.providers.typekeyed.exc.InvalidDependencyTypeError import InvalidDependencyTypeError
+from sidein.providers._BoundedCache import _BoundedCache
+from sidein.lockprofiler._LockRegistry import _LockRegistry
+
+
+@final
+class TypeKeyedContainer(TypeKeyedContainerInterface):
+    """
+    A thread-safe implementation of type-keyed container.
+
+    Each change of the registrations rebuilds the resolution indexes, which map every class in the MRO of every
+     registered type (and the fully qualified name of every such class) directly to the dependency it resolves to, so a
+     lookup costs a single dictionary access instead of walking the MRO. The types which are not in the indexes (e.g.
+     abstract base classes whose registered subclasses are only virtual) are resolved using issubclass() and cached
+     until the registrations change.
+
+    The lookups are performed without locking - the registrations and the indexes are never modified after they have
+     been published, they are replaced as a whole when the registrations change.
+    """
+
+    __slots__ = "_tkc_lock", "_registrations", "_index_by_type", "_index_by_name", "_virtual_resolution_cache", "_generation"
+
+    _MISSING: Any = object()
+
+    def __init__(self):
+        self._tkc_lock: threading.Lock = _LockRegistry.create_lock("TypeKeyedContainer._tkc_lock[{}]".format(hex(id(self))))  # Guards the writes
+        self._registrations: Dict[type, Any] = {}
+        self._index_by_type: Dict[type, Any] = {}  # {type: dependency or _AmbiguousTypeMatch}
+        self._index_by_name: Dict[str, Any] = {}  # {fully qualified type name: dependency or _AmbiguousTypeMatch}
+        self._virtual_resolution_cache: _BoundedCache = _BoundedCache()  # {type: dependency, _AmbiguousTypeMatch or _MISSING}
+        self._generation: int = 0
+
+    @staticmethod
+    def get_dependency_name_for_type(type_: type) -> str:
+        """
+        Returns the name under which the dependency registered under the type 'type_' (or under its only subclass) can
+         be requested by name, e.g. using a namespace.
+
+        :param type_: The type.
+        :return: The fully qualified name of the type ("module.QualifiedName").
+        """
+
+        return "{}.{}".format(type_.__module__, type_.__qualname__)
+
+    def get_dependency(self, name: str) -> Any:
+        return self._unwrap_indexed_dependency(self._index_by_name.get(name, TypeKeyedContainer._MISSING), name)
+
+    def get_dependency_by_type(self, type_: type) -> Any:
+        indexed_dependency = self._index_by_type.get(type_, TypeKeyedContainer._MISSING)
+        if indexed_dependency is TypeKeyedContainer._MISSING:
+            indexed_dependency = self._resolve_virtual_subclass(type_)
+
+        return self._unwrap_indexed_dependency(indexed_dependency, type_)
+
+    def _unwrap_indexed_dependency(self, indexed_dependency: Any, requested: Union[type, str]) -> Any:
+        if indexed_dependency is TypeKeyedContainer._MISSING:
+            raise DependencyInTKCNotFoundException(requested if isinstance(requested, str) else TypeKeyedContainer.get_dependency_name_for_type(requested))
+
+        if isinstance(indexed_dependency, _AmbiguousTypeMatch):
+            raise AmbiguousDependencyTypeException(requested if isinstance(requested, str) else TypeKeyedContainer.get_dependency_name_for_type(requested), indexed_dependency.matching_types)
+
+        return indexed_dependency
+
+    def _resolve_virtual_subclass(self, type_: type) -> Any:
+        indexed_dependency = self._virtual_resolution_cache.get(type_, TypeKeyedContainer._MISSING)
+        if indexed_dependency is not TypeKeyedContainer._MISSING:
+            return indexed_dependency
+
+        generation = self._generation
+        registrations = self._registrations
+
+        try:
+            matching_types = tuple(registered_type for registered_type in registrations.keys() if issubclass(registered_type, type_))
+        except TypeError:
+            matching_types = ()  # 'type_' is not a class
+
+        if not matching_types:
+            indexed_dependency = TypeKeyedContainer._MISSING
+        elif len(matching_types) == 1:
+            indexed_dependency = registrations[matching_types[0]]
+        else:
+            indexed_dependency = _AmbiguousTypeMatch(matching_types)
+
+        # A generation counter, incremented on each change, prevents a resolution racing with a change from caching a
+        #  stale result
+        with self._tkc_lock:
+            if self._generation == generation:
+                self._virtual_resolution_cache.put(type_, indexed_dependency)
+
+        return indexed_dependency
+
+    def get_all_dependencies(self) -> Dict[type, Any]:
+        return self._registrations.copy()
+
+    def add_dependency(self, type_: type, dependency: Any) -> None:
+        self._check_type(type_)
+
+        with self._tkc_lock:
+            if type_ in self._registrations:
+                raise DependencyInTKCExistsException(TypeKeyedContainer.get_dependency_name_for_type(type_))
+
+            self._publish_registrations_thread_safe({**self._registrations, type_: dependency})
+
+    def replace_dependency(self, type_: type, dependency: Any) -> None:
+        self._check_type(type_)
+
+        with self._tkc_lock:
+            if type_ not in self._registrations:
+                raise DependencyInTKCNotFoundException(TypeKeyedContainer.get_dependency_name_for_type(type_))
+
+            self._publish_registrations_thread_safe({**self._registrations, type_: dependency})
+
+    def add_or_replace_dependency(self, type_: type, dependency: Any) -> bool:
+        self._check_type(type_)
+
+        with self._tkc_lock:
+            is_replaced = type_ in self._registrations
+            self._publish_registrations_thread_safe({**self._registrations, type_: dependency})
+
+        return is_replaced
+
+    def remove_dependency(self, type_: type) -> None:
+        with self._tkc_lock:
+            if type_ not in self._registrations:
+                raise DependencyInTKCNotFoundException(TypeKeyedContainer.get_dependency_name_for_type(type_) if isinstance(type_, type) else repr(type_))
+
+            registrations = self._registrations.copy()
+            del registrations[type_]
+            self._publish_registrations_thread_safe(registrations)
+
+    def remove_all_dependencies(self) -> None:
+        with self._tkc_lock:
+            self._publish_registrations_thread_safe({})
+
+    def _check_type(self, type_: Any) -> None:
+        if not isinstance(type_, type):
+            raise InvalidDependencyTypeError("Dependencies can only be registered under classes, not under {}!".format(type_))
+
+    # This method must be called in a thread-safe context!
+    def _publish_registrations_thread_safe(self, registrations: Dict[type, Any]) -> None:
+        # {class: the registered types which are its subclasses}
+        matching_types: Dict[type, Tuple[type, ...]] = {}
+        for registered_type in registrations.keys():
+            for mro_class in registered_type.__mro__:
+                matching_types[mro_class] = matching_types.get(mro_class, ()) + (registered_type,)
+
+        index_by_type = {}
+        for requested_type, requested_type_matches in matching_types.items():
+            if requested_type in registrations:
+                index_by_type[requested_type] = registrations[requested_type]  # The type itself takes precedence over its subclasses
+            elif len(requested_type_matches) == 1:
+                index_by_type[requested_type] = registrations[requested_type_matches[0]]
+            else:
+                index_by_type[requested_type] = _AmbiguousTypeMatch(requested_type_matches)
+
+        index_by_name = {}
+        for requested_type, indexed_dependency in index_by_type.items():
+            name = TypeKeyedContainer.get_dependency_name_for_type(requested_type)
+            if name in index_by_name:
+                # Two different classes with the same fully qualified name (e.g. defined in a function called
+                #  repeatedly) cannot be told apart by name
+                previous_dependency = index_by_name[name]
+                previous_matches = (previous_dependency.matching_types if isinstance(previous_dependency, _AmbiguousTypeMatch) else ())
+                current_matches = (indexed_dependency.matching_types if isinstance(indexed_dependency, _AmbiguousTypeMatch) else matching_types[requested_type])
+                indexed_dependency = _AmbiguousTypeMatch(previous_matches + current_matches)
+
+            index_by_name[name] = indexed_dependency
+
+        # The generation is incremented only after the new registrations have been published (see
+        #  _resolve_virtual_subclass())
+        self._registrations = registrations
+        self._index_by_type = index_by_type
+        self._index_by_name = index_by_name
+        self._virtual_resolution_cache.clear()
+        self._generation += 1
@@ -0,0 +1,138 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from typing import Any, Dict
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class TypeKeyedContainerInterface(DependencyProviderInterface, metaclass=abc.ABCMeta):
+    """
+    A dependency container whose dependencies are registered under types (classes) instead of names, e.g. an instance
+     of RedisCacheBackend registered under the RedisCacheBackend class.
+
+    A dependency can be requested either by the type it's registered under or by any of that type's base classes (e.g.
+     by an abstract CacheBackend class) - in the latter case, the dependency registered under the only subclass of the
+     requested type is returned. If the requested type itself is registered, its dependency always takes precedence
+     over the dependencies registered under its subclasses.
+
+    As the container is a dependency provider, the dependencies can also be requested by name, through namespaces -
+     the name of a type is its fully qualified name as returned by get_dependency_name_for_type() (e.g.
+     "package.module.CacheBackend").
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get_dependency(self, name: str) -> Any:
+        """
+        Returns the dependency registered under the type whose fully qualified name is 'name' or under its only subclass.
+
+        :param name: The fully qualified name of the requested type (see get_dependency_name_for_type()).
+        :return: The dependency registered under the type or under its only subclass.
+        :raises DependencyInTKCNotFoundException: If neither the type nor any of its subclasses are registered. (DependencyInTKCNotFoundException is a subclass of DependencyProviderException!)
+        :raises AmbiguousDependencyTypeException: If the type isn't registered, but multiple of its subclasses are. (AmbiguousDependencyTypeException is a subclass of DependencyProviderException!)
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.get_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def get_dependency_by_type(self, type_: type) -> Any:
+        """
+        Returns the dependency registered under the type 'type_' or under its only subclass.
+        Unlike get_dependency(), this method also takes virtual subclasses (see abc.ABCMeta.register()) into account.
+
+        :param type_: The requested type.
+        :return: The dependency registered under the type or under its only subclass.
+        :raises DependencyInTKCNotFoundException: If neither the type nor any of its subclasses are registered. (DependencyInTKCNotFoundException is a subclass of DependencyProviderException!)
+        :raises AmbiguousDependencyTypeException: If the type isn't registered, but multiple of its subclasses are. (AmbiguousDependencyTypeException is a subclass of DependencyProviderException!)
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.get_dependency_by_type.__qualname__)
+
+    @abc.abstractmethod
+    def get_all_dependencies(self) -> Dict[type, Any]:
+        """
+        Returns all the dependencies stored in the container in a {type: dependency} dictionary.
+
+        :return: All the dependencies stored in the container.
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.get_all_dependencies.__qualname__)
+
+    @abc.abstractmethod
+    def add_dependency(self, type_: type, dependency: Any) -> None:
+        """
+        Registers the dependency 'dependency' under the type 'type_'.
+
+        :param type_: The type under which the dependency is registered.
+        :param dependency: The registered dependency.
+        :raises InvalidDependencyTypeError: If 'type_' is not a class.
+        :raises DependencyInTKCExistsException: If a dependency is already registered under the type.
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.add_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def replace_dependency(self, type_: type, dependency: Any) -> None:
+        """
+        Replaces the dependency registered under the type 'type_'.
+
+        :param type_: The type under which the dependency is registered.
+        :param dependency: The new dependency.
+        :raises InvalidDependencyTypeError: If 'type_' is not a class.
+        :raises DependencyInTKCNotFoundException: If no dependency is registered under the type.
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.replace_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def add_or_replace_dependency(self, type_: type, dependency: Any) -> bool:
+        """
+        Registers the dependency 'dependency' under the type 'type_', replacing the already registered one, if any.
+
+        :param type_: The type under which the dependency is registered.
+        :param dependency: The registered dependency.
+        :return: True if a dependency has been replaced, False if it has been added.
+        :raises InvalidDependencyTypeError: If 'type_' is not a class.
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.add_or_replace_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def remove_dependency(self, type_: type) -> None:
+        """
+        Removes the dependency registered under the type 'type_'.
+
+        :param type_: The type under which the dependency is registered.
+        :raises DependencyInTKCNotFoundException: If no dependency is registered under the type.
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.remove_dependency.__qualname__)
+
+    @abc.abstractmethod
+    def remove_all_dependencies(self) -> None:
+        """
+        Removes all the dependencies from the container.
+        """
+
+        raise NotImplementedError(TypeKeyedContainerInterface.remove_all_dependencies.__qualname__)
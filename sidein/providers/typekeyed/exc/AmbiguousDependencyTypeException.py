@@ -0,0 +1,45 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import Tuple
+from sidein.providers.typekeyed.exc.TypeKeyedContainerException import TypeKeyedContainerException
+
+
+class AmbiguousDependencyTypeException(TypeKeyedContainerException):
+    """
+    Raised when a dependency is requested by a type which isn't registered in the type-keyed container itself, but
+     multiple of its subclasses are.
+    """
+
+    def __init__(self, requested_type_name: str, matching_types: Tuple[type, ...]):
+        TypeKeyedContainerException.__init__(self, "The type {} matches multiple registered types: {}".format(
+            requested_type_name, ", ".join("{}.{}".format(matching_type.__module__, matching_type.__qualname__) for matching_type in matching_types)
+        ))
+
+        self._matching_types: Tuple[type, ...] = matching_types
+
+    def get_matching_types(self) -> Tuple[type, ...]:
+        """
+        Returns the registered types which match the requested type.
+        """
+
+        return self._matching_types
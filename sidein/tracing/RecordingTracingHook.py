@@ -0,0 +1,55 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, List
+import threading
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.tracing.TracingEvent import TracingEvent
+
+
+@final
+class RecordingTracingHook(TracingHookInterface):
+    """
+    A tracing hook which stores the finished events in memory.
+    Useful in tests, or as a stand-in for a "real" span recorder.
+    """
+
+    __slots__ = "_lock", "_recorded_events"
+
+    def __init__(self):
+        self._lock: threading.Lock = threading.Lock()
+        self._recorded_events: List[TracingEvent] = []
+
+    def on_operation_start(self, event: TracingEvent) -> None:
+        pass
+
+    def on_operation_finish(self, event: TracingEvent) -> None:
+        with self._lock:
+            self._recorded_events.append(event)
+
+    def get_recorded_events(self) -> List[TracingEvent]:
+        with self._lock:
+            return self._recorded_events.copy()
+
+    def clear_recorded_events(self) -> None:
+        with self._lock:
+            self._recorded_events.clear()
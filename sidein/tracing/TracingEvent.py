@@ -0,0 +1,82 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Tuple, Optional, Any
+from sidein.tracing.TracingOperation import TracingOperation
+
+
+@final
+class TracingEvent:
+    """
+    Describes a single traced operation. The same event object is passed to both the on_operation_start() and the
+     on_operation_finish() method of a tracing hook - its duration and exception are only available in the latter.
+
+    Tracing hooks may attach arbitrary data (e.g. a span object) to the event using set_hook_data() when the operation
+     starts, and retrieve it using get_hook_data() when it finishes.
+    """
+
+    __slots__ = "_namespace_name", "_operation", "_dependency_names", "_duration_ns", "_exception", "_hook_data"
+
+    def __init__(self, namespace_name: str, operation: TracingOperation, dependency_names: Tuple[str, ...]):
+        self._namespace_name: str = namespace_name
+        self._operation: TracingOperation = operation
+        self._dependency_names: Tuple[str, ...] = dependency_names
+        self._duration_ns: Optional[int] = None
+        self._exception: Optional[BaseException] = None
+        self._hook_data: Any = None
+
+    def get_namespace_name(self) -> str:
+        return self._namespace_name
+
+    def get_operation(self) -> TracingOperation:
+        return self._operation
+
+    def get_dependency_names(self) -> Tuple[str, ...]:
+        return self._dependency_names
+
+    def get_duration_ns(self) -> Optional[int]:
+        """
+        Returns the duration of the operation in nanoseconds, or None if the operation hasn't finished yet.
+        """
+
+        return self._duration_ns
+
+    def get_exception(self) -> Optional[BaseException]:
+        """
+        Returns the exception which the operation has ended with, or None if it has succeeded (or hasn't finished yet).
+        """
+
+        return self._exception
+
+    def get_hook_data(self) -> Any:
+        return self._hook_data
+
+    def set_hook_data(self, hook_data: Any) -> None:
+        self._hook_data = hook_data
+
+    def set_outcome(self, duration_ns: int, exception: Optional[BaseException]) -> None:
+        """
+        Called by the library when the operation finishes, right before the event is passed to on_operation_finish().
+        """
+
+        self._duration_ns = duration_ns
+        self._exception = exception
@@ -0,0 +1,57 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import abc
+from sidein.tracing.TracingEvent import TracingEvent
+
+
+class TracingHookInterface(metaclass=abc.ABCMeta):
+    """
+    Tracing hooks are notified when a namespace starts and finishes an operation (see TracingOperation), which makes it
+     possible to find out how much time is spent inside the library (e.g. by recording a span for each operation).
+
+    The hook's methods are called synchronously from the thread performing the operation - dependency resolutions are
+     even reported while the namespace's lock is being held. Therefore, they should return quickly and they must not
+     raise any exceptions.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def on_operation_start(self, event: TracingEvent) -> None:
+        """
+        Called right before a traced operation starts.
+
+        :param event: The event describing the operation.
+        """
+
+        raise NotImplementedError(TracingHookInterface.on_operation_start.__qualname__)
+
+    @abc.abstractmethod
+    def on_operation_finish(self, event: TracingEvent) -> None:
+        """
+        Called right after a traced operation finishes, no matter whether it has succeeded or not.
+
+        :param event: The same event object which has been passed to on_operation_start(), with its outcome (duration and exception) filled in.
+        """
+
+        raise NotImplementedError(TracingHookInterface.on_operation_finish.__qualname__)
@@ -0,0 +1,53 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from typing import final, Tuple, Callable, Any
+import time
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.tracing.TracingOperation import TracingOperation
+from sidein.tracing.TracingEvent import TracingEvent
+
+
+@final
+class _TracingUtils:
+    """
+    Helper functions used by the parts of the library which report their operations to tracing hooks.
+    """
+
+    @staticmethod
+    def call_traced(tracing_hook: TracingHookInterface, namespace_name: str, operation: TracingOperation, dependency_names: Tuple[str, ...], func: Callable, *args) -> Any:
+        event = TracingEvent(namespace_name, operation, dependency_names)
+        tracing_hook.on_operation_start(event)
+
+        start_ns = time.perf_counter_ns()
+        exception = None
+        try:
+            return func(*args)
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            event.set_outcome(time.perf_counter_ns() - start_ns, exception)
+            tracing_hook.on_operation_finish(event)
+
+    def __init__(self):
+        raise NotImplementedError("{} is not supposed to be instantiated!".format(_TracingUtils.__qualname__))
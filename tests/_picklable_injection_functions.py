@@ -0,0 +1,73 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Module-level functions used by test_028_picklable_injection.py. They are kept in a separate module, so that the test
+#  can reload it once the namespace they are bound to exists (other tests remove all the namespaces).
+
+from sidein.Sidein import Sidein
+
+
+NAMESPACE_NAME = "cz.vitlabuda.sidein.tests.picklable_injection"
+
+
+@Sidein.ns(NAMESPACE_NAME).inject_dependencies("multiplier", picklable=True)
+def multiply(number, multiplier):
+    return number * multiplier
+
+
+def add(number, addend):
+    return number + addend
+
+
+add_injected = Sidein.ns(NAMESPACE_NAME).inject_dependencies("addend", as_kwargs=False, picklable=True)(add)
+
+
+@Sidein.ns(NAMESPACE_NAME).inject_dependencies("addend")
+@Sidein.ns(NAMESPACE_NAME).inject_dependencies("multiplier", picklable=True)
+def multiply_and_add(number, multiplier, addend):
+    return number * multiplier + addend
+
+
+def negating_decorator(func):
+    def _replacement_function(*args, **kwargs):
+        return -func(*args, **kwargs)
+
+    return _replacement_function
+
+
+def extract_decorator(dependency):
+    return dependency["decorator"]
+
+
+@Sidein.ns(NAMESPACE_NAME).decorate_with_dependency("decorators", extract_decorator, picklable=True)
+def identity(number):
+    return number
+
+
+class Calculator:
+    @Sidein.ns(NAMESPACE_NAME).inject_dependencies("multiplier", picklable=True)
+    def multiply(self, number, multiplier):
+        return number * multiplier
+
+
+def initialize_worker():
+    Sidein.ns(NAMESPACE_NAME).get_dependency_provider().replace_dependency("multiplier", 100)
@@ -292,12 +292,59 @@ def test_dependency_decoration_with_invalid_decorator(ns, dep_name):
 
 @pytest.mark.parametrize("parametrized_decorator_dep_name", parametrized_decorator_dependency_names)
 def test_dependency_decoration_with_invalid_extractor(ns, parametrized_decorator_dep_name):
-    @ns.decorate_with_dependency(parametrized_decorator_dep_name, "invalid extractor")
+    with pytest.raises(InvalidDecoratorExtractorError):
+        @ns.decorate_with_dependency(parametrized_decorator_dep_name, "invalid extractor")
+        def _decorate_this():
+            pytest.fail("The decoration was supposed to fail and this statement should've never got executed!")
+
+
+def test_dependency_decoration_replacement_function_caching(ns):
+    built_replacement_functions = []
+
+    def _decorator(func):
+        built_replacement_functions.append(func)
+        return lambda *args, **kwargs: len(built_replacement_functions)
+
+    container = GlobalSimpleContainer()
+    container.add_dependency("decorator", _decorator)
+    ns.set_dependency_provider(container)
+
+    @ns.decorate_with_dependency("decorator")
     def _decorate_this():
-        pytest.fail("The decoration was supposed to fail and this statement should've never got executed!")
+        pytest.fail("The dummy decorator should not call the decorated method!")
 
-    with pytest.raises(InvalidDecoratorExtractorError):
-        _decorate_this()
+    assert _decorate_this() == 1
+    assert _decorate_this() == 1
+
+    container.replace_dependency("decorator", lambda func: _decorator(func))
+    assert _decorate_this() == 2
+    assert _decorate_this() == 2
+
+
+def test_dependency_decoration_replacement_function_caching_with_bound_methods(ns):
+    class _DecoratorHolder:
+        def __init__(self):
+            self.built_replacement_functions = []
+
+        def decorator(self, func):
+            self.built_replacement_functions.append(func)
+            return lambda *args, **kwargs: len(self.built_replacement_functions)
+
+    container = GlobalSimpleContainer()
+    container.add_dependency("decorator_holder", _DecoratorHolder())
+    ns.set_dependency_provider(container)
+
+    # A new bound method object is created on each call of the extractor, but it's equal to the previous one
+    @ns.decorate_with_dependency("decorator_holder", lambda holder: holder.decorator)
+    def _decorate_this():
+        pytest.fail("The dummy decorator should not call the decorated method!")
+
+    assert _decorate_this() == 1
+    assert _decorate_this() == 1
+
+    container.replace_dependency("decorator_holder", _DecoratorHolder())
+    assert _decorate_this() == 1
+    assert container.get_dependency("decorator_holder").built_replacement_functions != []
 
 
 def test_default_dependency_provider_implementation():
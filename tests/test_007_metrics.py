@@ -0,0 +1,143 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+from sidein.Sidein import Sidein
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.ThreadLocalSimpleContainer import ThreadLocalSimpleContainer
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+
+
+dependency_names = (
+    "com.example.dependency",
+    "dependency with spaces",
+    "řeřicha",
+    "\"quoted\\dependency\"\n",
+)
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.set_dependency_provider(GlobalSimpleContainer())
+    for dep_name in dependency_names:
+        ns_.get_dependency_provider().add_dependency(dep_name, dep_name + " value")
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_metrics_disabled_by_default(ns):
+    assert ns.get_metrics_recorder() is None
+    assert ns.get_dependency_provider().get_metrics_recorder() is None
+
+
+@pytest.mark.parametrize("dep_name", dependency_names)
+def test_namespace_resolution_metrics(ns, dep_name):
+    recorder = MetricsRecorder()
+    ns.set_metrics_recorder(recorder)
+    assert ns.get_metrics_recorder() is recorder
+
+    ns.get_dependency(dep_name)
+    ns.get_dependencies(dep_name)
+    with pytest.raises(DependencyProviderException):
+        ns.get_dependency(dep_name + " missing")
+
+    metrics = recorder.export_as_dict()
+    assert metrics[dep_name]["resolution_count"] == 2
+    assert metrics[dep_name]["miss_count"] == 0
+    assert metrics[dep_name]["provider_latency"]["count"] == 2
+    assert metrics[dep_name]["provider_latency"]["buckets"]["+Inf"] == 2
+    assert metrics[dep_name]["lock_wait"]["count"] == 2
+    assert metrics[dep_name + " missing"]["resolution_count"] == 1
+    assert metrics[dep_name + " missing"]["miss_count"] == 1
+
+
+def test_obtainers_are_not_counted_as_resolutions(ns):
+    recorder = MetricsRecorder()
+    ns.set_metrics_recorder(recorder)
+
+    obtainer = ns.get_dependency(dependency_names[0], in_obtainer=True)
+    assert recorder.export_as_dict()[dependency_names[0]]["resolution_count"] == 0
+
+    obtainer.obtain_dependency()
+    assert recorder.export_as_dict()[dependency_names[0]]["resolution_count"] == 1
+
+
+def test_metrics_recording_disablement(ns):
+    recorder = MetricsRecorder()
+    ns.set_metrics_recorder(recorder)
+    ns.get_dependency(dependency_names[0])
+
+    ns.set_metrics_recorder(None)
+    ns.get_dependency(dependency_names[0])
+    assert recorder.export_as_dict()[dependency_names[0]]["resolution_count"] == 1
+
+    recorder.reset()
+    assert recorder.export_as_dict() == {}
+
+
+@pytest.mark.parametrize("container", (GlobalSimpleContainer(), ThreadLocalSimpleContainer()))
+def test_container_metrics(container):
+    recorder = MetricsRecorder()
+    container.set_metrics_recorder(recorder)
+    container.add_or_replace_dependency("dependency", "value")
+
+    container.get_dependency("dependency")
+    with pytest.raises(DependencyProviderException):
+        container.get_dependency("missing dependency")
+
+    metrics = recorder.export_as_dict()
+    assert metrics["dependency"]["resolution_count"] == 1
+    assert metrics["missing dependency"]["miss_count"] == 1
+    assert metrics["dependency"]["lock_wait"]["count"] == (1 if isinstance(container, GlobalSimpleContainer) else 0)
+
+
+def test_prometheus_text_export(ns):
+    recorder = MetricsRecorder()
+    ns.set_metrics_recorder(recorder)
+    for dep_name in dependency_names:
+        ns.get_dependency(dep_name)
+
+    text = recorder.export_as_prometheus_text(labels={"namespace": "test"})
+    assert text.endswith("\n")
+    assert "# TYPE sidein_dependency_resolutions_total counter" in text
+    assert "# TYPE sidein_dependency_provider_latency_seconds histogram" in text
+    assert "sidein_dependency_resolutions_total{dependency=\"řeřicha\",namespace=\"test\"} 1" in text
+    assert "sidein_dependency_lock_wait_seconds_bucket{dependency=\"řeřicha\",namespace=\"test\",le=\"+Inf\"} 1" in text
+    assert "dependency=\"\\\"quoted\\\\dependency\\\"\\n\"" in text
+    for line in text.splitlines():
+        assert line.startswith("#") or len(line.rsplit(" ", 1)) == 2
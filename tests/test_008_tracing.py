@@ -0,0 +1,151 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+from sidein.Sidein import Sidein
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.tracing.TracingHookInterface import TracingHookInterface
+from sidein.tracing.RecordingTracingHook import RecordingTracingHook
+from sidein.tracing.TracingOperation import TracingOperation
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.get_dependency_provider().add_dependency("dependency", "value")
+    ns_.get_dependency_provider().add_dependency("decorator", lambda func: (lambda *args, **kwargs: "decorated"))
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+@pytest.fixture
+def hook(ns):
+    hook_ = RecordingTracingHook()
+    ns.set_tracing_hook(hook_)
+    yield hook_
+
+
+def test_namespace_name(ns):
+    assert ns.get_name() == __file__
+
+
+def test_tracing_disabled_by_default(ns):
+    assert ns.get_tracing_hook() is None
+
+
+def test_resolution_tracing(ns, hook):
+    assert ns.get_tracing_hook() is hook
+    ns.get_dependency("dependency")
+
+    events = hook.get_recorded_events()
+    assert len(events) == 1
+    assert events[0].get_namespace_name() == __file__
+    assert events[0].get_operation() == TracingOperation.DEPENDENCY_RESOLUTION
+    assert events[0].get_dependency_names() == ("dependency",)
+    assert events[0].get_duration_ns() >= 0
+    assert events[0].get_exception() is None
+
+
+def test_failing_resolution_tracing(ns, hook):
+    with pytest.raises(DependencyProviderException):
+        ns.get_dependency("missing dependency")
+
+    events = hook.get_recorded_events()
+    assert len(events) == 1
+    assert isinstance(events[0].get_exception(), DependencyProviderException)
+
+
+def test_injection_tracing(ns, hook):
+    @ns.inject_dependencies("dependency")
+    def _inject_here(dependency):
+        return dependency
+
+    assert _inject_here() == "value"
+    operations = [event.get_operation() for event in hook.get_recorded_events()]
+    assert operations == [TracingOperation.DEPENDENCY_RESOLUTION, TracingOperation.DEPENDENCY_INJECTION]
+
+
+def test_async_injection_tracing(ns, hook):
+    @ns.inject_dependencies("dependency")
+    async def _inject_here_async(dependency):
+        return dependency
+
+    assert asyncio.run(_inject_here_async()) == "value"
+    assert hook.get_recorded_events()[-1].get_operation() == TracingOperation.DEPENDENCY_INJECTION
+
+
+def test_replacement_function_build_tracing(ns, hook):
+    @ns.decorate_with_dependency("decorator")
+    def _decorate_this():
+        pytest.fail("The dummy decorator should not call the decorated method!")
+
+    assert _decorate_this() == "decorated"
+    event = hook.get_recorded_events()[-1]
+    assert event.get_operation() == TracingOperation.REPLACEMENT_FUNCTION_BUILD
+    assert event.get_dependency_names() == ("decorator",)
+
+
+def test_hook_set_after_decoration(ns):
+    @ns.inject_dependencies("dependency")
+    def _inject_here(dependency):
+        return dependency
+
+    hook = RecordingTracingHook()
+    ns.set_tracing_hook(hook)
+    _inject_here()
+    assert len(hook.get_recorded_events()) == 2
+
+    ns.set_tracing_hook(None)
+    _inject_here()
+    assert len(hook.get_recorded_events()) == 2
+
+
+def test_hook_data_is_preserved(ns, hook):
+    class _SpanHook(TracingHookInterface):
+        def __init__(self):
+            self.finished_spans = []
+
+        def on_operation_start(self, event):
+            event.set_hook_data("span")
+
+        def on_operation_finish(self, event):
+            self.finished_spans.append(event.get_hook_data())
+
+    span_hook = _SpanHook()
+    ns.set_tracing_hook(span_hook)
+    ns.get_dependency("dependency")
+    assert span_hook.finished_spans == ["span"]
@@ -0,0 +1,166 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+import time
+from sidein.Sidein import Sidein
+from sidein.lockprofiler.LockProfiler import LockProfiler
+from sidein.lockprofiler.InstrumentedLock import InstrumentedLock
+
+
+@pytest.fixture
+def profiler():
+    LockProfiler.enable()
+    LockProfiler.reset()
+    yield LockProfiler
+
+    LockProfiler.disable()
+    LockProfiler.reset()
+
+
+@pytest.fixture
+def ns(profiler):
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.get_dependency_provider().add_dependency("dependency", "value")
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def _get_lock_stats(report, lock_name):
+    for stats in report.get_ranked_lock_statistics():
+        if stats["lock_name"] == lock_name:
+            return stats
+
+    raise KeyError(lock_name)
+
+
+def test_profiler_disabled_by_default():
+    assert not LockProfiler.is_enabled()
+    assert not isinstance(Sidein._SIDEIN_LOCK, InstrumentedLock)
+
+
+def test_profiler_not_instantiable():
+    with pytest.raises(NotImplementedError):
+        LockProfiler()
+
+
+def test_locks_are_swapped(ns):
+    assert LockProfiler.is_enabled()
+    assert isinstance(Sidein._SIDEIN_LOCK, InstrumentedLock)
+    assert isinstance(ns._lock, InstrumentedLock)
+    assert isinstance(ns.get_dependency_provider()._sc_lock, InstrumentedLock)
+
+    LockProfiler.disable()
+    assert not isinstance(Sidein._SIDEIN_LOCK, InstrumentedLock)
+    assert not isinstance(ns._lock, InstrumentedLock)
+    assert not isinstance(ns.get_dependency_provider()._sc_lock, InstrumentedLock)
+    assert ns.get_dependency("dependency") == "value"
+
+
+def test_acquisitions_are_recorded(ns):
+    LockProfiler.reset()
+    for _ in range(10):
+        assert ns.get_dependency("dependency") == "value"
+    assert Sidein.ns(__file__) is ns
+
+    report = LockProfiler.generate_report()
+    ns_lock_stats = _get_lock_stats(report, "_Namespace._lock[{}]".format(__file__))
+    assert ns_lock_stats["acquisition_count"] == 10
+    assert ns_lock_stats["total_hold_ns"] >= ns_lock_stats["max_hold_ns"] > 0
+    assert ns_lock_stats["total_wait_ns"] >= ns_lock_stats["max_wait_ns"] >= 0
+    assert sum(call_site["hold_count"] for call_site in ns_lock_stats["call_sites"].values()) == 10
+
+    assert _get_lock_stats(report, "Sidein._SIDEIN_LOCK")["acquisition_count"] >= 1
+    assert _get_lock_stats(report, "_NamespaceManager._nsmgr_lock")["acquisition_count"] >= 1
+
+
+def test_hottest_lock_and_longest_holding_call_site():
+    lock = InstrumentedLock(threading.Lock(), "test_lock")
+    holding = threading.Event()
+
+    def hold_lock():
+        with lock:
+            holding.set()
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    holding.wait()
+    with lock:
+        pass
+    thread.join()
+
+    stats = lock.export_statistics()
+    assert stats["acquisition_count"] == 2
+    assert stats["contended_acquisition_count"] == 1
+    assert stats["max_wait_ns"] > 0
+
+    longest_call_site = max(stats["call_sites"].items(), key=lambda item: item[1]["total_hold_ns"])
+    assert "hold_lock" in longest_call_site[0]
+    assert longest_call_site[1]["max_hold_ns"] >= 0.04 * 1_000_000_000
+
+
+def test_report_ranking(ns):
+    ns.get_dependency("dependency")
+
+    report = LockProfiler.generate_report()
+    ranked = report.get_ranked_lock_statistics()
+    assert [stats["total_wait_ns"] for stats in ranked] == sorted((stats["total_wait_ns"] for stats in ranked), reverse=True)
+    assert len(report.get_longest_holding_call_sites("_Namespace._lock[{}]".format(__file__), limit=1)) == 1
+    assert "_Namespace._lock" in report.export_as_text()
+    assert report.export_as_dict()["locks"] == ranked
+
+
+def test_recursive_lock_holds():
+    lock = InstrumentedLock(threading.RLock(), "test_rlock")
+    with lock:
+        with lock:
+            pass
+
+    stats = lock.export_statistics()
+    assert stats["acquisition_count"] == 2
+    assert sum(call_site["hold_count"] for call_site in stats["call_sites"].values()) == 1
+
+
+def test_non_blocking_acquisition():
+    lock = InstrumentedLock(threading.Lock(), "test_lock")
+    assert lock.acquire()
+    assert lock.locked()
+    assert not lock.acquire(blocking=False)
+    lock.release()
+
+    assert lock.export_statistics()["acquisition_count"] == 1
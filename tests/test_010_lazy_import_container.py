@@ -0,0 +1,279 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import sys
+import threading
+import importlib
+import collections
+from sidein.Sidein import Sidein
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.providers.lazyimport.LazyImportContainer import LazyImportContainer
+from sidein.providers.lazyimport.exc.DependencyInLICExistsException import DependencyInLICExistsException
+from sidein.providers.lazyimport.exc.DependencyInLICNotFoundException import DependencyInLICNotFoundException
+from sidein.providers.lazyimport.exc.InvalidImportPathError import InvalidImportPathError
+from sidein.providers.lazyimport.exc.DependencyLoadingFailedError import DependencyLoadingFailedError
+from sidein.providers.lazyimport.exc.DependencyLoadingCycleError import DependencyLoadingCycleError
+
+
+_TEST_MODULE_NAME = "_sidein_test_lazily_imported_module"
+_TEST_MODULE_SOURCE = """
+import threading
+
+container = None
+creation_count = 0
+creation_lock = threading.Lock()
+
+
+class Service:
+    @classmethod
+    def create(cls):
+        return cls()
+
+
+def create_service():
+    global creation_count
+    with creation_lock:
+        creation_count += 1
+    return Service()
+
+
+def create_first():
+    return container.get_dependency("second")
+
+
+def create_second():
+    return container.get_dependency("first")
+
+
+cross_thread_barrier = None
+entered_factories = set()
+
+
+def _enter_cross_thread_factory(name):
+    # Both threads must be loading their dependency before they request the other one
+    if name not in entered_factories:
+        entered_factories.add(name)
+        cross_thread_barrier.wait(timeout=10)
+
+
+def create_left():
+    _enter_cross_thread_factory("left")
+    return container.get_dependency("right")
+
+
+def create_right():
+    _enter_cross_thread_factory("right")
+    return container.get_dependency("left")
+
+
+def fail():
+    raise ValueError("Failure requested.")
+
+
+not_callable = 123
+"""
+
+invalid_import_paths = ("", "module", "module:", ":factory", "module:factory:extra", "module.:factory", "1module:factory", "module:factory()")
+
+
+@pytest.fixture
+def test_module(tmp_path, monkeypatch):
+    (tmp_path / (_TEST_MODULE_NAME + ".py")).write_text(_TEST_MODULE_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    yield _TEST_MODULE_NAME
+
+    sys.modules.pop(_TEST_MODULE_NAME, None)
+
+
+@pytest.fixture
+def container():
+    yield LazyImportContainer()
+
+
+def test_module_imported_on_first_resolution(container, test_module):
+    container.add_import_path("service", test_module + ":create_service")
+    assert test_module not in sys.modules
+
+    service = container.get_dependency("service")
+    assert test_module in sys.modules
+    assert type(service).__name__ == "Service"
+    assert container.get_dependency("service") is service
+    assert sys.modules[test_module].creation_count == 1
+
+
+def test_dotted_factory_path(container, test_module):
+    container.add_import_path("service", test_module + ":Service.create")
+    assert type(container.get_dependency("service")).__name__ == "Service"
+
+
+def test_stdlib_factory(container):
+    container.add_import_path("ordered_dict", "collections:OrderedDict")
+    assert isinstance(container.get_dependency("ordered_dict"), collections.OrderedDict)
+
+
+def test_never_loaded_names(container, test_module):
+    container.add_import_path("b", test_module + ":create_service")
+    container.add_import_path("a", test_module + ":create_service")
+    container.add_import_path("c", "collections:OrderedDict")
+    assert container.get_never_loaded_names() == ("a", "b", "c")
+
+    container.get_dependency("b")
+    assert container.get_never_loaded_names() == ("a", "c")
+
+
+def test_concurrent_loading_creates_single_instance(container, test_module):
+    container.add_import_path("service", test_module + ":create_service")
+
+    results = []
+    barrier = threading.Barrier(8)
+
+    def _resolve():
+        barrier.wait()
+        results.append(container.get_dependency("service"))
+
+    threads = [threading.Thread(target=_resolve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+    assert sys.modules[test_module].creation_count == 1
+
+
+def test_loading_cycle(container, test_module):
+    container.add_import_path("first", test_module + ":create_first")
+    container.add_import_path("second", test_module + ":create_second")
+    importlib.import_module(test_module).container = container
+
+    with pytest.raises(DependencyLoadingCycleError) as exc_info:
+        container.get_dependency("first")
+
+    assert exc_info.value.get_loading_chain() == ("first", "second", "first")
+    assert container.get_never_loaded_names() == ("first", "second")
+
+
+def test_cross_thread_loading_cycle(container, test_module):
+    container.add_import_path("left", test_module + ":create_left")
+    container.add_import_path("right", test_module + ":create_right")
+    module = importlib.import_module(test_module)
+    module.container = container
+    module.cross_thread_barrier = threading.Barrier(2)
+
+    loading_chains = collections.deque()
+
+    def _resolve(name):
+        try:
+            container.get_dependency(name)
+        except DependencyLoadingCycleError as e:
+            loading_chains.append(e.get_loading_chain())
+
+    threads = [threading.Thread(target=_resolve, args=(name,)) for name in ("left", "right")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(loading_chains) == 2
+    assert all(chain in (("left", "right", "left"), ("right", "left", "right")) for chain in loading_chains)
+    assert container.get_never_loaded_names() == ("left", "right")
+
+
+@pytest.mark.parametrize("factory_name", ("fail", "not_callable", "nonexistent"))
+def test_loading_failure(container, test_module, factory_name):
+    container.add_import_path("dependency", test_module + ":" + factory_name)
+
+    with pytest.raises(DependencyLoadingFailedError):
+        container.get_dependency("dependency")
+
+    assert container.get_never_loaded_names() == ("dependency",)
+
+
+def test_nonexistent_module(container):
+    container.add_import_path("dependency", "_sidein_nonexistent_module:factory")
+
+    with pytest.raises(DependencyLoadingFailedError) as exc_info:
+        container.get_dependency("dependency")
+
+    assert isinstance(exc_info.value.get_raised_exception(), ImportError)
+
+
+@pytest.mark.parametrize("import_path", invalid_import_paths)
+def test_invalid_import_path(container, import_path):
+    with pytest.raises(InvalidImportPathError):
+        container.add_import_path("dependency", import_path)
+
+
+def test_import_path_management(container, test_module):
+    container.add_import_path("dependency", test_module + ":create_service")
+    with pytest.raises(DependencyInLICExistsException):
+        container.add_import_path("dependency", "collections:OrderedDict")
+
+    service = container.get_dependency("dependency")
+    container.replace_import_path("dependency", "collections:OrderedDict")
+    assert container.get_all_import_paths() == {"dependency": "collections:OrderedDict"}
+    assert container.get_never_loaded_names() == ("dependency",)
+    assert container.get_dependency("dependency") is not service
+
+    container.remove_import_path("dependency")
+    assert container.get_all_import_paths() == {}
+
+    for func in (container.get_dependency, container.remove_import_path):
+        with pytest.raises(DependencyInLICNotFoundException):
+            func("dependency")
+    with pytest.raises(DependencyInLICNotFoundException):
+        container.replace_import_path("dependency", "collections:OrderedDict")
+
+
+def test_namespace_integration(container, test_module):
+    ns_name = __file__
+
+    ns = Sidein.ns(ns_name)
+    try:
+        ns.set_dependency_provider(container)
+        container.add_import_path("service", test_module + ":create_service")
+
+        @ns.inject_dependencies("service")
+        def _inject_here(service):
+            return service
+
+        assert _inject_here() is container.get_dependency("service")
+
+        with pytest.raises(DependencyProviderException):
+            ns.get_dependency("nonexistent")
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
@@ -0,0 +1,283 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+import threading
+import time
+from sidein.Sidein import Sidein
+from sidein.providers.ttl.TTLContainer import TTLContainer
+from sidein.providers.ttl.exc.DependencyInTTLCExistsException import DependencyInTTLCExistsException
+from sidein.providers.ttl.exc.DependencyInTTLCNotFoundException import DependencyInTTLCNotFoundException
+from sidein.providers.ttl.exc.InvalidTTLError import InvalidTTLError
+from sidein.providers.ttl.exc.DependencyFactoryFailedError import DependencyFactoryFailedError
+from sidein.providers.ttl.exc.BackgroundRefreshAlreadyRunningError import BackgroundRefreshAlreadyRunningError
+
+
+invalid_ttls = ((0, None), (-1, None), (10, 0), (10, -1), (10, 10), (10, 11))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFactory:
+    def __init__(self):
+        self.call_count = 0
+        self.fail = False
+
+    def __call__(self):
+        if self.fail:
+            raise ValueError("Failure requested.")
+
+        self.call_count += 1
+        return "instance {}".format(self.call_count)
+
+
+@pytest.fixture
+def clock():
+    yield FakeClock()
+
+
+@pytest.fixture
+def container(clock):
+    container_ = TTLContainer(clock)
+    yield container_
+
+    container_.stop_background_refresh()
+
+
+def test_dependency_created_on_registration(container):
+    factory = CountingFactory()
+    container.add_dependency("credentials", factory, 60)
+
+    assert factory.call_count == 1
+    assert container.get_dependency("credentials") == "instance 1"
+    assert container.get_all_dependencies() == {"credentials": "instance 1"}
+
+
+def test_refresh_ahead_of_expiry(container, clock):
+    factory = CountingFactory()
+    container.add_dependency("credentials", factory, 60, 10)
+
+    clock.now += 49
+    assert container.refresh_due_dependencies() == 0
+    assert container.get_dependency("credentials") == "instance 1"
+
+    clock.now += 1
+    assert container.refresh_due_dependencies() == 1
+    assert container.get_dependency("credentials") == "instance 2"
+
+    clock.now += 49
+    assert container.refresh_due_dependencies() == 0
+
+
+def test_stale_dependency_kept_on_refresh_failure(container, clock):
+    factory = CountingFactory()
+    container.add_dependency("credentials", factory, 60, 10)
+
+    factory.fail = True
+    clock.now += 55
+    assert container.refresh_due_dependencies() == 0
+    assert container.get_dependency("credentials") == "instance 1"
+    assert isinstance(container.get_last_refresh_error("credentials"), ValueError)
+
+    with pytest.raises(DependencyFactoryFailedError):
+        container.refresh_dependency("credentials")
+
+    factory.fail = False
+    assert container.refresh_due_dependencies() == 1
+    assert container.get_dependency("credentials") == "instance 2"
+    assert container.get_last_refresh_error("credentials") is None
+
+
+def test_expired_dependency_is_not_returned(container, clock):
+    factory = CountingFactory()
+    container.add_dependency("credentials", factory, 60)
+
+    clock.now += 60
+    assert container.get_dependency("credentials") == "instance 2"
+    assert container.get_dependency("credentials") == "instance 2"
+
+    clock.now += 60
+    assert container.get_all_dependencies() == {"credentials": "instance 3"}
+
+    factory.fail = True
+    clock.now += 60
+    with pytest.raises(DependencyFactoryFailedError):
+        container.get_dependency("credentials")
+    assert isinstance(container.get_last_refresh_error("credentials"), ValueError)
+
+    factory.fail = False
+    assert container.get_dependency("credentials") == "instance 4"
+    assert factory.call_count == 4
+
+
+def test_readers_do_not_wait_for_refresh_due_dependency(container, clock):
+    refresh_started = threading.Event()
+    refresh_may_finish = threading.Event()
+    refreshed = threading.Event()
+    values = iter(("old", "new"))
+
+    def _slow_factory():
+        value = next(values)
+        if value == "new":
+            refresh_started.set()
+            refresh_may_finish.wait(5)
+            refreshed.set()
+        return value
+
+    container.add_dependency("flags", _slow_factory, 60)  # Due for a refresh 6 seconds before the expiry by default
+    clock.now += 55
+    assert container.get_dependency("flags") == "old"
+    assert refresh_started.wait(5)
+    assert container.get_dependency("flags") == "old"  # Doesn't wait for the refresh which is in progress
+
+    refresh_may_finish.set()
+    assert refreshed.wait(5)
+    for _ in range(5000):
+        if container.get_dependency("flags") == "new":
+            break
+        time.sleep(0.001)
+    assert container.get_dependency("flags") == "new"
+
+
+def test_readers_do_not_block_on_refresh(container):
+    refresh_started = threading.Event()
+    refresh_may_finish = threading.Event()
+    values = iter(("old", "new"))
+
+    def _slow_factory():
+        value = next(values)
+        if value == "new":
+            refresh_started.set()
+            refresh_may_finish.wait()
+        return value
+
+    container.add_dependency("flags", _slow_factory, 60)
+    refresher = threading.Thread(target=container.refresh_dependency, args=("flags",))
+    refresher.start()
+    refresh_started.wait()
+
+    assert container.get_dependency("flags") == "old"
+    assert container.refresh_due_dependencies() == 0  # Not due yet
+
+    refresh_may_finish.set()
+    refresher.join()
+    assert container.get_dependency("flags") == "new"
+
+
+def test_background_refresh_thread(container, clock):
+    refreshed = threading.Event()
+    factory = CountingFactory()
+
+    def _factory():
+        value = factory()
+        if factory.call_count > 1:
+            refreshed.set()
+        return value
+
+    container.add_dependency("credentials", _factory, 60, 10)
+    clock.now += 55
+    container.start_background_refresh(0.001)
+    with pytest.raises(BackgroundRefreshAlreadyRunningError):
+        container.start_background_refresh(0.001)
+
+    assert refreshed.wait(5)
+    container.stop_background_refresh()
+    assert container.get_dependency("credentials") != "instance 1"
+    container.stop_background_refresh()
+
+
+def test_asyncio_refresh_loop(container, clock):
+    factory = CountingFactory()
+    container.add_dependency("credentials", factory, 60, 10)
+    clock.now += 55
+
+    async def _run():
+        task = asyncio.create_task(container.run_refresh_loop(0.001))
+        while factory.call_count == 1:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(_run(), 5))
+    assert container.get_dependency("credentials") == "instance 2"
+
+
+@pytest.mark.parametrize("ttl_seconds, refresh_ahead_seconds", invalid_ttls)
+def test_invalid_ttl(container, ttl_seconds, refresh_ahead_seconds):
+    with pytest.raises(InvalidTTLError):
+        container.add_dependency("dependency", CountingFactory(), ttl_seconds, refresh_ahead_seconds)
+
+
+def test_dependency_management(container):
+    factory = CountingFactory()
+    container.add_dependency("dependency", factory, 60)
+    with pytest.raises(DependencyInTTLCExistsException):
+        container.add_dependency("dependency", factory, 60)
+
+    factory.fail = True
+    with pytest.raises(DependencyFactoryFailedError):
+        container.add_dependency("failing", factory, 60)
+
+    container.remove_dependency("dependency")
+    assert container.get_all_dependencies() == {}
+
+    for func in (container.get_dependency, container.remove_dependency, container.refresh_dependency, container.get_last_refresh_error):
+        with pytest.raises(DependencyInTTLCNotFoundException):
+            func("dependency")
+
+
+def test_namespace_integration(container):
+    ns_name = __file__
+
+    ns = Sidein.ns(ns_name)
+    try:
+        ns.set_dependency_provider(container)
+        container.add_dependency("credentials", CountingFactory(), 60)
+
+        @ns.inject_dependencies("credentials")
+        def _inject_here(credentials):
+            return credentials
+
+        assert _inject_here() == "instance 1"
+        container.refresh_dependency("credentials")
+        assert _inject_here() == "instance 2"
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
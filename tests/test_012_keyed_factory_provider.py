@@ -0,0 +1,347 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+from sidein.Sidein import Sidein
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.providers.keyedfactory.KeyedFactoryProvider import KeyedFactoryProvider
+from sidein.providers.keyedfactory.eviction.LRUEvictionPolicy import LRUEvictionPolicy
+from sidein.providers.keyedfactory.eviction.LFUEvictionPolicy import LFUEvictionPolicy
+from sidein.providers.keyedfactory.exc.PrefixInKFPExistsException import PrefixInKFPExistsException
+from sidein.providers.keyedfactory.exc.PrefixInKFPNotFoundException import PrefixInKFPNotFoundException
+from sidein.providers.keyedfactory.exc.InvalidKFPConfigurationError import InvalidKFPConfigurationError
+from sidein.providers.keyedfactory.exc.KeyedFactoryRaisedAnExceptionError import KeyedFactoryRaisedAnExceptionError
+from sidein.providers.keyedfactory.exc.SizeFunctionRaisedAnExceptionError import SizeFunctionRaisedAnExceptionError
+
+
+invalid_configurations = (
+    {"max_entries": 0},
+    {"max_entries": -1},
+    {"max_total_size": 0, "size_function": len},
+    {"max_total_size": 10},
+    {"separator": ""},
+)
+
+
+class Client:
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+
+
+@pytest.fixture
+def disposed():
+    yield []
+
+
+def _create_provider(disposed, **kwargs):
+    provider = KeyedFactoryProvider(disposal_callback=lambda name, dependency: disposed.append(name), **kwargs)
+    provider.add_factory("client", Client)
+    return provider
+
+
+def test_entries_built_on_demand_and_cached(disposed):
+    provider = _create_provider(disposed)
+
+    client = provider.get_dependency("client:tenant42")
+    assert isinstance(client, Client)
+    assert client.tenant == "tenant42"
+    assert provider.get_dependency("client:tenant42") is client
+    assert provider.get_dependency("client:") is not client
+    assert provider.get_cached_names() == ("client:", "client:tenant42")
+    assert provider.export_statistics() == {"hits": 1, "misses": 2, "evictions": 0, "entries": 2, "total_size": 0}
+
+
+def test_lru_eviction(disposed):
+    provider = _create_provider(disposed, eviction_policy=LRUEvictionPolicy(), max_entries=2)
+
+    provider.get_dependency("client:a")
+    provider.get_dependency("client:b")
+    provider.get_dependency("client:a")
+    provider.get_dependency("client:c")
+
+    assert provider.get_cached_names() == ("client:a", "client:c")
+    assert disposed == ["client:b"]
+    assert provider.export_statistics()["evictions"] == 1
+
+
+def test_lfu_eviction(disposed):
+    provider = _create_provider(disposed, eviction_policy=LFUEvictionPolicy(), max_entries=2)
+
+    provider.get_dependency("client:a")
+    provider.get_dependency("client:a")
+    provider.get_dependency("client:b")
+    provider.get_dependency("client:c")  # "b" is used less frequently than "a"
+    provider.get_dependency("client:c")
+    provider.get_dependency("client:c")
+    provider.get_dependency("client:d")  # "a" is now used less frequently than "c"
+
+    assert provider.get_cached_names() == ("client:c", "client:d")
+    assert disposed == ["client:b", "client:a"]
+
+
+def test_lfu_explicit_removal():
+    policy = LFUEvictionPolicy()
+    for name in ("a", "b"):
+        policy.record_insertion(name)
+    policy.record_access("b")
+    policy.record_removal("a")
+    assert policy.select_victim() == "b"
+
+
+def test_size_based_eviction(disposed):
+    provider = KeyedFactoryProvider(max_total_size=10, size_function=len, disposal_callback=lambda name, dependency: disposed.append(name))
+    provider.add_factory("blob", lambda key: "x" * int(key))
+
+    provider.get_dependency("blob:4")
+    provider.get_dependency("blob:5")
+    assert provider.export_statistics()["total_size"] == 9
+
+    provider.get_dependency("blob:3")
+    assert provider.get_cached_names() == ("blob:3", "blob:5")
+    assert provider.export_statistics()["total_size"] == 8
+    assert disposed == ["blob:4"]
+
+    assert provider.get_dependency("blob:11") == "x" * 11  # Too large to be cached
+    assert provider.get_cached_names() == ("blob:3", "blob:5")
+
+
+def test_factory_removal_and_eviction(disposed):
+    provider = _create_provider(disposed)
+    provider.add_factory("other", Client)
+    for name in ("client:a", "client:b", "other:a"):
+        provider.get_dependency(name)
+
+    assert provider.evict("client:a")
+    assert not provider.evict("client:a")
+    provider.remove_factory("client")
+    assert provider.get_cached_names() == ("other:a",)
+    assert provider.get_all_prefixes() == ("other",)
+
+    provider.evict_all()
+    assert provider.get_cached_names() == ()
+    assert sorted(disposed) == ["client:a", "client:b", "other:a"]
+
+    provider.reset_statistics()
+    assert provider.export_statistics() == {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "total_size": 0}
+
+
+@pytest.mark.parametrize("name", ("nonexistent:key", "client", ""))
+def test_unknown_prefix(disposed, name):
+    provider = _create_provider(disposed)
+
+    with pytest.raises(PrefixInKFPNotFoundException):
+        provider.get_dependency(name)
+
+
+def test_factory_management(disposed):
+    provider = _create_provider(disposed)
+
+    with pytest.raises(PrefixInKFPExistsException):
+        provider.add_factory("client", Client)
+    with pytest.raises(PrefixInKFPNotFoundException):
+        provider.remove_factory("nonexistent")
+
+
+def test_failing_factory():
+    provider = KeyedFactoryProvider()
+    provider.add_factory("failing", lambda key: 1 / 0)
+
+    with pytest.raises(KeyedFactoryRaisedAnExceptionError) as exc_info:
+        provider.get_dependency("failing:key")
+
+    assert isinstance(exc_info.value.get_raised_exception(), ZeroDivisionError)
+    assert provider.get_cached_names() == ()
+
+
+def test_failing_size_function(disposed):
+    def _size_function(client):
+        if client.tenant == "broken":
+            raise ValueError(client.tenant)
+        return 1
+
+    provider = _create_provider(disposed, max_total_size=10, size_function=_size_function)
+
+    with pytest.raises(SizeFunctionRaisedAnExceptionError) as exc_info:
+        provider.get_dependency("client:broken")
+
+    assert isinstance(exc_info.value.get_raised_exception(), ValueError)
+    assert provider.get_cached_names() == ()
+    assert provider.export_statistics()["total_size"] == 0
+
+    # The failed build must not be left in progress
+    assert provider.get_dependency("client:tenant").tenant == "tenant"
+    with pytest.raises(SizeFunctionRaisedAnExceptionError):
+        provider.get_dependency("client:broken")
+    assert provider.get_cached_names() == ("client:tenant",)
+
+
+@pytest.mark.parametrize("configuration", invalid_configurations)
+def test_invalid_configuration(configuration):
+    with pytest.raises(InvalidKFPConfigurationError):
+        KeyedFactoryProvider(**configuration)
+
+
+def test_concurrent_resolution_builds_once(disposed):
+    build_count = []
+    provider = KeyedFactoryProvider()
+    provider.add_factory("client", lambda key: build_count.append(key) or Client(key))
+
+    results = []
+    barrier = threading.Barrier(8)
+
+    def _resolve():
+        barrier.wait()
+        results.append(provider.get_dependency("client:tenant"))
+
+    threads = [threading.Thread(target=_resolve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(build_count) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_slow_build_does_not_block_other_dependencies(disposed):
+    build_started = threading.Event()
+    build_released = threading.Event()
+
+    def _slow_factory(key):
+        build_started.set()
+        assert build_released.wait(10)
+        return Client(key)
+
+    provider = _create_provider(disposed)
+    provider.add_factory("slow", _slow_factory)
+    cached_client = provider.get_dependency("client:cached")
+
+    slow_results = []
+    slow_threads = [threading.Thread(target=lambda: slow_results.append(provider.get_dependency("slow:tenant"))) for _ in range(4)]
+    for thread in slow_threads:
+        thread.start()
+    assert build_started.wait(10)
+
+    try:
+        assert provider.get_dependency("client:cached") is cached_client
+        assert provider.get_dependency("client:other").tenant == "other"
+    finally:
+        build_released.set()
+        for thread in slow_threads:
+            thread.join()
+
+    assert len(slow_results) == 4
+    assert all(result is slow_results[0] for result in slow_results)
+    assert provider.export_statistics()["misses"] == 3
+
+
+def test_concurrent_resolution_retries_failed_build():
+    build_count = []
+    build_started = threading.Event()
+    build_released = threading.Event()
+
+    def _factory(key):
+        build_count.append(key)
+        if len(build_count) == 1:
+            build_started.set()
+            assert build_released.wait(10)
+            raise ValueError(key)
+        return Client(key)
+
+    provider = KeyedFactoryProvider()
+    provider.add_factory("client", _factory)
+
+    errors = []
+    first_thread = threading.Thread(target=lambda: errors.append(pytest.raises(KeyedFactoryRaisedAnExceptionError, provider.get_dependency, "client:tenant")))
+    first_thread.start()
+    assert build_started.wait(10)
+
+    results = []
+    second_thread = threading.Thread(target=lambda: results.append(provider.get_dependency("client:tenant")))
+    second_thread.start()
+    build_released.set()
+    first_thread.join()
+    second_thread.join()
+
+    assert len(errors) == 1
+    assert len(build_count) == 2
+    assert results[0].tenant == "tenant"
+    assert provider.get_cached_names() == ("client:tenant",)
+
+
+def test_cross_thread_factory_cycle_does_not_deadlock():
+    # Thread 1 builds A, which needs B, while thread 2 builds B, which needs A
+    barrier = threading.Barrier(2, timeout=10)
+    entered_factories = set()
+
+    def _factory(prefix, other_prefix, key):
+        if prefix not in entered_factories:
+            entered_factories.add(prefix)
+            barrier.wait()
+        return provider.get_dependency(other_prefix + ":" + key)
+
+    provider = KeyedFactoryProvider()
+    provider.add_factory("a", lambda key: _factory("a", "b", key))
+    provider.add_factory("b", lambda key: _factory("b", "a", key))
+
+    errors = []
+    threads = [threading.Thread(target=lambda name=name: errors.append(pytest.raises(KeyedFactoryRaisedAnExceptionError, provider.get_dependency, name))) for name in ("a:x", "b:x")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    # The cycle is infinite, so the builds fail, but they must not wait for each other forever
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(errors) == 2
+    assert provider.get_cached_names() == ()
+
+
+def test_namespace_integration(disposed):
+    ns_name = __file__
+
+    ns = Sidein.ns(ns_name)
+    try:
+        ns.set_dependency_provider(_create_provider(disposed))
+
+        @ns.inject_dependencies("client:tenant42", as_kwargs=False)
+        def _inject_here(client):
+            return client
+
+        assert _inject_here().tenant == "tenant42"
+
+        with pytest.raises(DependencyProviderException):
+            ns.get_dependency("nonexistent:key")
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
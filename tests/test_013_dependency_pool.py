@@ -0,0 +1,368 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+import threading
+import collections
+import concurrent.futures
+import itertools
+from sidein.Sidein import Sidein
+from sidein.ns.exc.NotAFunctionError import NotAFunctionError
+from sidein.ns.exc.NotADependencyPoolError import NotADependencyPoolError
+from sidein.pool.DependencyPool import DependencyPool
+from sidein.pool.exc.InvalidPoolSizeError import InvalidPoolSizeError
+from sidein.pool.exc.PoolCheckoutTimeoutError import PoolCheckoutTimeoutError
+from sidein.pool.exc.PoolFactoryRaisedAnExceptionError import PoolFactoryRaisedAnExceptionError
+from sidein.pool.exc.InstanceNotCheckedOutError import InstanceNotCheckedOutError
+from sidein.pool.exc.PoolClosedError import PoolClosedError
+
+
+invalid_pool_sizes = ((0, 0), (-1, 0), (1, -1), (1, 2))
+
+
+class Connection:
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(Connection._ids)
+
+
+@pytest.fixture
+def pool():
+    yield DependencyPool(Connection, max_size=2, checkout_timeout_seconds=0.05)
+
+
+@pytest.fixture
+def ns(pool):
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.get_dependency_provider().add_dependency("connection", pool)
+    ns_.get_dependency_provider().add_dependency("not a pool", "value")
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_check_out_and_in(pool):
+    first = pool.check_out()
+    second = pool.check_out()
+    assert isinstance(first, Connection) and isinstance(second, Connection)
+    assert first is not second
+
+    with pytest.raises(PoolCheckoutTimeoutError):
+        pool.check_out()
+    assert pool.try_check_out() == (False, None)
+
+    pool.check_in(first)
+    assert pool.check_out() is first
+
+    statistics = pool.export_statistics()
+    assert statistics["size"] == 2
+    assert statistics["in_use"] == 2
+    assert statistics["idle"] == 0
+    assert statistics["utilization"] == 1.0
+    assert statistics["checkouts"] == 3
+    assert statistics["checkout_timeouts"] == 1
+
+
+def test_min_size():
+    pool = DependencyPool(Connection, max_size=3, min_size=2)
+    statistics = pool.export_statistics()
+    assert statistics["size"] == 2
+    assert statistics["idle"] == 2
+    assert statistics["utilization"] == 0.0
+
+
+@pytest.mark.parametrize("max_size, min_size", invalid_pool_sizes)
+def test_invalid_pool_size(max_size, min_size):
+    with pytest.raises(InvalidPoolSizeError):
+        DependencyPool(Connection, max_size=max_size, min_size=min_size)
+
+
+def test_waiting_for_check_in(pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    timer = threading.Timer(0.01, pool.check_in, args=(instances[0],))
+    timer.start()
+    assert pool.check_out(timeout_seconds=5) is instances[0]
+    timer.join()
+
+
+def test_waiting_for_check_in_asynchronously(pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    async def _run():
+        timer = threading.Timer(0.01, pool.check_in, args=(instances[0],))
+        timer.start()
+        try:
+            return await pool.check_out_async(timeout_seconds=5)
+        finally:
+            timer.join()
+
+    assert asyncio.run(_run()) is instances[0]
+
+
+def test_asynchronous_waiters_do_not_occupy_executor(pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    async def _use_connection():
+        connection = await pool.check_out_async(timeout_seconds=5)
+        await asyncio.sleep(0)
+        pool.check_in(connection)
+        return connection
+
+    async def _run():
+        asyncio.get_running_loop().set_default_executor(concurrent.futures.ThreadPoolExecutor(max_workers=1))
+        waiters = [asyncio.ensure_future(_use_connection()) for _ in range(50)]
+        await asyncio.sleep(0.01)
+
+        # The waiting coroutines don't block the executor
+        assert await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(None, lambda: "executor works"), 5) == "executor works"
+
+        for instance in instances:
+            pool.check_in(instance)
+        return await asyncio.gather(*waiters)
+
+    connections = asyncio.run(_run())
+    assert len(connections) == 50
+    assert {connection.id for connection in connections} == {instance.id for instance in instances}
+    assert pool.export_statistics()["in_use"] == 0
+
+
+def test_asynchronous_checkout_timeout(pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    with pytest.raises(PoolCheckoutTimeoutError):
+        asyncio.run(pool.check_out_async())
+
+    assert pool._async_waiters == collections.deque()
+    assert pool.export_statistics()["checkout_timeouts"] == 1
+    pool.check_in(instances[0])
+
+
+def test_cancelled_asynchronous_waiter_passes_wakeup_on(pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    async def _run():
+        cancelled_waiter = asyncio.ensure_future(pool.check_out_async(timeout_seconds=5))
+        waiter = asyncio.ensure_future(pool.check_out_async(timeout_seconds=5))
+        await asyncio.sleep(0.01)
+
+        cancelled_waiter.cancel()  # The first waiter gives up...
+        pool.check_in(instances[0])  # ... before it's woken up
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled_waiter
+
+        return await waiter
+
+    assert asyncio.run(_run()) is instances[0]
+
+
+def test_close_wakes_asynchronous_waiters(pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    async def _run():
+        waiter = asyncio.ensure_future(pool.check_out_async(timeout_seconds=5))
+        await asyncio.sleep(0.01)
+        pool.close()
+        await waiter
+
+    with pytest.raises(PoolClosedError):
+        asyncio.run(_run())
+
+    for instance in instances:
+        pool.check_in(instance)
+
+
+def test_invalid_check_in(pool):
+    with pytest.raises(InstanceNotCheckedOutError):
+        pool.check_in(Connection())
+
+    instance = pool.check_out()
+    pool.check_in(instance)
+    with pytest.raises(InstanceNotCheckedOutError):
+        pool.check_in(instance)
+
+
+def test_failing_factory():
+    pool = DependencyPool(lambda: 1 / 0, max_size=1)
+
+    with pytest.raises(PoolFactoryRaisedAnExceptionError):
+        pool.check_out()
+    assert pool.export_statistics()["size"] == 0
+
+
+def test_close():
+    disposed = []
+    pool = DependencyPool(Connection, max_size=2, min_size=1, disposal_callback=disposed.append)
+    idle = pool.check_out()
+    pool.check_in(idle)
+    checked_out = pool.check_out()
+
+    pool.close()
+    with pytest.raises(PoolClosedError):
+        pool.check_out()
+    assert disposed == []
+
+    pool.check_in(checked_out)
+    assert disposed == [checked_out]
+    assert pool.export_statistics()["size"] == 0
+
+
+def test_pooled_injection(ns, pool):
+    @ns.inject_pooled_dependencies("connection")
+    def _inject_here(connection):
+        assert isinstance(connection, Connection)
+        assert pool.export_statistics()["in_use"] == 1
+        return connection
+
+    first = _inject_here()
+    assert _inject_here() is first
+    assert pool.export_statistics()["in_use"] == 0
+
+
+def test_pooled_injection_as_args(ns, pool):
+    @ns.inject_pooled_dependencies("connection", as_kwargs=False)
+    def _inject_here(*args):
+        assert len(args) == 2
+        assert args[0] == "argument"
+        return args[1]
+
+    assert isinstance(_inject_here("argument"), Connection)
+
+
+def test_instance_returned_on_exception(ns, pool):
+    @ns.inject_pooled_dependencies("connection")
+    def _inject_here(connection):
+        raise ValueError(connection)
+
+    with pytest.raises(ValueError):
+        _inject_here()
+    assert pool.export_statistics()["in_use"] == 0
+
+
+def test_pooled_injection_to_async_function(ns, pool):
+    @ns.inject_pooled_dependencies("connection")
+    async def _inject_here_async(connection):
+        await asyncio.sleep(0.01)
+        return connection
+
+    async def _run():
+        return await asyncio.gather(*(_inject_here_async() for _ in range(4)))
+
+    connections = asyncio.run(_run())
+    assert all(isinstance(connection, Connection) for connection in connections)
+    assert len({connection.id for connection in connections}) == 2
+    assert pool.export_statistics()["in_use"] == 0
+
+
+def test_pooled_injection_to_generator(ns, pool):
+    @ns.inject_pooled_dependencies("connection")
+    def _inject_here(connection):
+        for index in range(3):
+            yield connection.id, index
+
+    generator = _inject_here()
+    assert pool.export_statistics()["in_use"] == 0  # The generator hasn't started running yet
+
+    connection_id, _ = next(generator)
+    assert pool.export_statistics()["in_use"] == 1
+    other_connection = pool.check_out()
+    assert other_connection.id != connection_id
+    assert pool.try_check_out() == (False, None)  # The generator's instance is still checked out
+
+    assert [item[1] for item in generator] == [1, 2]
+    assert pool.export_statistics()["in_use"] == 1
+    pool.check_in(other_connection)
+
+    generator = _inject_here()
+    next(generator)
+    generator.close()
+    assert pool.export_statistics()["in_use"] == 0
+
+
+def test_pooled_injection_to_async_generator(ns, pool):
+    @ns.inject_pooled_dependencies("connection")
+    async def _inject_here(connection):
+        for index in range(3):
+            yield connection.id, index
+
+    async def _run():
+        async_generator = _inject_here()
+        connection_id, _ = await async_generator.__anext__()
+        other_connection = pool.check_out()
+        assert other_connection.id != connection_id
+        assert pool.try_check_out() == (False, None)
+
+        assert [item[1] async for item in async_generator] == [1, 2]
+        assert pool.export_statistics()["in_use"] == 1
+        pool.check_in(other_connection)
+
+        async_generator = _inject_here()
+        await async_generator.__anext__()
+        await async_generator.aclose()
+
+    asyncio.run(_run())
+    assert pool.export_statistics()["in_use"] == 0
+
+
+def test_pooled_injection_timeout(ns, pool):
+    instances = [pool.check_out(), pool.check_out()]
+
+    @ns.inject_pooled_dependencies("connection")
+    def _inject_here(connection):
+        pytest.fail("The checkout was supposed to time out and this statement should've never got executed!")
+
+    with pytest.raises(PoolCheckoutTimeoutError):
+        _inject_here()
+
+    for instance in instances:
+        pool.check_in(instance)
+
+
+def test_pooled_injection_of_non_pool(ns):
+    @ns.inject_pooled_dependencies("not a pool")
+    def _inject_here(value):
+        pytest.fail("The injection was supposed to fail and this statement should've never got executed!")
+
+    with pytest.raises(NotADependencyPoolError):
+        _inject_here()
+
+
+def test_pooled_injection_to_class(ns):
+    with pytest.raises(NotAFunctionError):
+        @ns.inject_pooled_dependencies("connection")
+        class _InjectHere:
+            pass
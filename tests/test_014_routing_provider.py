@@ -0,0 +1,174 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+from sidein.Sidein import Sidein
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.exc.DependencyInSCNotFoundException import DependencyInSCNotFoundException
+from sidein.providers.routing.RoutingProvider import RoutingProvider
+from sidein.providers.routing.exc.DependencyNotRoutedException import DependencyNotRoutedException
+from sidein.providers.routing.exc.MountPointExistsException import MountPointExistsException
+from sidein.providers.routing.exc.MountPointNotFoundException import MountPointNotFoundException
+from sidein.providers.routing.exc.InvalidMountPointError import InvalidMountPointError
+
+
+invalid_prefixes = (".", "cz.", ".cz", "cz..sidein")
+
+
+class NameEchoingProvider(DependencyProviderInterface):
+    def __init__(self, label):
+        self.label = label
+        self.request_count = 0
+
+    def get_dependency(self, name):
+        self.request_count += 1
+        return self.label, name
+
+
+@pytest.fixture
+def router():
+    yield RoutingProvider()
+
+
+def test_longest_prefix_wins(router):
+    router.mount_prefix("cz", NameEchoingProvider("cz"))
+    router.mount_prefix("cz.vitlabuda", NameEchoingProvider("vitlabuda"))
+    router.mount_prefix("cz.vitlabuda.sidein.example", NameEchoingProvider("example"))
+
+    assert router.get_dependency("cz.other") == ("cz", "cz.other")
+    assert router.get_dependency("cz.vitlabuda") == ("vitlabuda", "cz.vitlabuda")
+    assert router.get_dependency("cz.vitlabuda.sidein.dependency") == ("vitlabuda", "cz.vitlabuda.sidein.dependency")
+    assert router.get_dependency("cz.vitlabuda.sidein.example.dependency") == ("example", "cz.vitlabuda.sidein.example.dependency")
+
+    with pytest.raises(DependencyNotRoutedException):
+        router.get_dependency("czech.dependency")  # Prefixes match whole segments only
+
+
+def test_root_prefix(router):
+    router.mount_prefix("", NameEchoingProvider("root"))
+    router.mount_prefix("cz", NameEchoingProvider("cz"))
+
+    assert router.get_dependency("com.example") == ("root", "com.example")
+    assert router.get_dependency("cz.example") == ("cz", "cz.example")
+
+
+def test_strip_prefix(router):
+    container = GlobalSimpleContainer()
+    container.add_dependency("dependency", "value")
+    router.mount_prefix("cz.vitlabuda", container, strip_prefix=True)
+
+    assert router.get_dependency("cz.vitlabuda.dependency") == "value"
+    with pytest.raises(DependencyInSCNotFoundException):
+        router.get_dependency("cz.vitlabuda.nonexistent")
+
+
+def test_patterns(router):
+    router.mount_pattern("*.repository", NameEchoingProvider("repository"))
+    router.mount_pattern("*.user.*", NameEchoingProvider("user"))
+    router.mount_prefix("cz", NameEchoingProvider("cz"))
+
+    assert router.get_dependency("com.user.repository") == ("repository", "com.user.repository")
+    assert router.get_dependency("com.user.service") == ("user", "com.user.service")
+    assert router.get_dependency("cz.user.repository") == ("cz", "cz.user.repository")  # Prefixes take precedence
+
+    with pytest.raises(DependencyNotRoutedException):
+        router.get_dependency("com.service")
+
+
+def test_route_cache_invalidation(router):
+    router.mount_prefix("cz", NameEchoingProvider("cz"))
+    assert router.get_dependency("cz.vitlabuda.dependency") == ("cz", "cz.vitlabuda.dependency")
+    with pytest.raises(DependencyNotRoutedException):
+        router.get_dependency("com.dependency")
+
+    router.mount_prefix("cz.vitlabuda", NameEchoingProvider("vitlabuda"))
+    router.mount_pattern("com.*", NameEchoingProvider("com"))
+    assert router.get_dependency("cz.vitlabuda.dependency") == ("vitlabuda", "cz.vitlabuda.dependency")
+    assert router.get_dependency("com.dependency") == ("com", "com.dependency")
+
+    router.unmount_prefix("cz.vitlabuda")
+    router.unmount_pattern("com.*")
+    assert router.get_dependency("cz.vitlabuda.dependency") == ("cz", "cz.vitlabuda.dependency")
+    with pytest.raises(DependencyNotRoutedException):
+        router.get_dependency("com.dependency")
+
+
+def test_route_cache_size_is_bounded(router):
+    router.mount_pattern("*", NameEchoingProvider("all"))
+    for index in range(10000):
+        assert router.get_dependency(str(index)) == ("all", str(index))
+
+    assert len(router._routing_table._route_cache) <= 4096
+
+
+def test_mount_management(router):
+    provider = NameEchoingProvider("provider")
+    router.mount_prefix("cz", provider)
+    router.mount_pattern("*.repository", provider)
+
+    with pytest.raises(MountPointExistsException):
+        router.mount_prefix("cz", provider)
+    with pytest.raises(MountPointExistsException):
+        router.mount_pattern("*.repository", provider)
+
+    assert router.get_all_prefix_mounts() == {"cz": provider}
+    assert router.get_all_pattern_mounts() == {"*.repository": provider}
+
+    router.unmount_prefix("cz")
+    router.unmount_pattern("*.repository")
+    with pytest.raises(MountPointNotFoundException):
+        router.unmount_prefix("cz")
+    with pytest.raises(MountPointNotFoundException):
+        router.unmount_pattern("*.repository")
+
+
+@pytest.mark.parametrize("prefix", invalid_prefixes)
+def test_invalid_prefix(router, prefix):
+    with pytest.raises(InvalidMountPointError):
+        router.mount_prefix(prefix, NameEchoingProvider("provider"))
+
+
+def test_namespace_integration(router):
+    ns_name = __file__
+
+    ns = Sidein.ns(ns_name)
+    try:
+        ns.set_dependency_provider(router)
+        router.mount_prefix("cz.vitlabuda", NameEchoingProvider("vitlabuda"), strip_prefix=True)
+
+        assert ns.get_dependency("cz.vitlabuda.dependency") == ("vitlabuda", "dependency")
+        with pytest.raises(DependencyNotRoutedException):
+            ns.get_dependency("com.dependency")
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
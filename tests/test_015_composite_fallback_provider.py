@@ -0,0 +1,153 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+from sidein.Sidein import Sidein
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.ThreadLocalSimpleContainer import ThreadLocalSimpleContainer
+from sidein.providers.composite.CompositeFallbackProvider import CompositeFallbackProvider
+from sidein.providers.composite.exc.DependencyNotFoundInAnyChildException import DependencyNotFoundInAnyChildException
+
+
+class CountingContainer(DependencyProviderInterface):
+    def __init__(self, container):
+        self.container = container
+        self.request_count = 0
+
+    def get_dependency(self, name):
+        self.request_count += 1
+        return self.container.get_dependency(name)
+
+
+@pytest.fixture
+def containers():
+    overrides, base = GlobalSimpleContainer(), GlobalSimpleContainer()
+    base.add_dependency("dependency", "base value")
+    yield overrides, base
+
+
+def test_fallback_and_route_memo(containers):
+    overrides, base = containers
+    legacy = CountingContainer(GlobalSimpleContainer())
+    legacy.container.add_dependency("legacy dependency", "legacy value")
+    composite = CompositeFallbackProvider((overrides, base, legacy))
+
+    assert composite.get_dependency("dependency") == "base value"
+    assert composite.get_dependency("legacy dependency") == "legacy value"
+    assert composite.get_dependency("legacy dependency") == "legacy value"
+    assert legacy.request_count == 2
+    assert composite._routes._entries == {"dependency": 1, "legacy dependency": 2}
+
+
+def test_memo_invalidated_on_mutation(containers):
+    overrides, base = containers
+    composite = CompositeFallbackProvider((overrides, base))
+    assert composite.get_dependency("dependency") == "base value"
+
+    overrides.add_dependency("dependency", "overridden value")
+    assert composite.get_dependency("dependency") == "overridden value"
+
+    overrides.remove_dependency("dependency")
+    assert composite.get_dependency("dependency") == "base value"
+
+    overrides.add_dependency("dependency", "overridden value")
+    overrides.remove_all_dependencies()
+    assert composite.get_dependency("dependency") == "base value"
+
+
+def test_not_found(containers):
+    overrides, base = containers
+    composite = CompositeFallbackProvider((overrides, base))
+
+    for _ in range(2):
+        with pytest.raises(DependencyNotFoundInAnyChildException):
+            composite.get_dependency("nonexistent")
+
+    base.add_dependency("nonexistent", "value")
+    assert composite.get_dependency("nonexistent") == "value"
+
+
+def test_non_observable_children_are_not_memoized(containers):
+    overrides, base = containers
+    thread_local = ThreadLocalSimpleContainer()
+    composite = CompositeFallbackProvider((thread_local, base))
+
+    assert composite.get_dependency("dependency") == "base value"
+    assert composite._routes._entries == {}
+
+    thread_local.add_dependency("dependency", "thread-local value")
+    assert composite.get_dependency("dependency") == "thread-local value"
+
+    other_thread_results = []
+    thread = threading.Thread(target=lambda: other_thread_results.append(composite.get_dependency("dependency")))
+    thread.start()
+    thread.join()
+    assert other_thread_results == ["base value"]
+
+
+def test_rescan_when_memoized_child_stops_providing(containers):
+    overrides, base = containers
+    unobserved_base = CountingContainer(base)
+    composite = CompositeFallbackProvider((overrides, unobserved_base, GlobalSimpleContainer()))
+    composite._children[2].add_dependency("dependency", "last value")
+
+    assert composite.get_dependency("dependency") == "base value"
+    base.remove_dependency("dependency")
+    assert composite.get_dependency("dependency") == "last value"
+
+
+def test_detach_from_children(containers):
+    overrides, base = containers
+    composite = CompositeFallbackProvider((overrides, base))
+    composite.detach_from_children()
+
+    assert overrides._mutation_listeners == ()
+    assert base._mutation_listeners == ()
+    assert composite.get_children() == (overrides, base)
+
+
+def test_namespace_integration(containers):
+    overrides, base = containers
+    ns_name = __file__
+
+    ns = Sidein.ns(ns_name)
+    try:
+        ns.set_dependency_provider(CompositeFallbackProvider((overrides, base)))
+        assert ns.get_dependency("dependency") == "base value"
+
+        overrides.add_dependency("dependency", "overridden value")
+        assert ns.get_dependency("dependency") == "overridden value"
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
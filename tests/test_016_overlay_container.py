@@ -0,0 +1,233 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import gc
+import weakref
+import pytest
+from sidein.Sidein import Sidein
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.ThreadLocalSimpleContainer import ThreadLocalSimpleContainer
+from sidein.providers.simplecontainer.exc.DependencyInSCExistsException import DependencyInSCExistsException
+from sidein.providers.simplecontainer.exc.DependencyInSCNotFoundException import DependencyInSCNotFoundException
+from sidein.providers.overlay.OverlayContainer import OverlayContainer
+from sidein.providers.overlay.exc.InvalidBaseContainerError import InvalidBaseContainerError
+
+
+@pytest.fixture
+def base():
+    base_ = GlobalSimpleContainer()
+    base_.add_dependency("shared", "shared value")
+    base_.add_dependency("overridden", "base value")
+    yield base_
+
+
+@pytest.fixture
+def overlay(base):
+    overlay_ = OverlayContainer(base)
+    overlay_.add_dependency("overridden", "tenant value")
+    yield overlay_
+
+
+def test_overrides_and_fall_through(base, overlay):
+    assert overlay.get_dependency("overridden") == "tenant value"
+    assert overlay.get_dependency("shared") == "shared value"
+    assert base.get_dependency("overridden") == "base value"
+
+    assert overlay.get_all_dependencies() == {"shared": "shared value", "overridden": "tenant value"}
+    assert overlay.get_all_overrides() == {"overridden": "tenant value"}
+
+    with pytest.raises(DependencyInSCNotFoundException):
+        overlay.get_dependency("nonexistent")
+
+
+def test_base_mutations_are_visible(base, overlay):
+    assert overlay.get_dependency("shared") == "shared value"
+
+    base.replace_dependency("shared", "new shared value")
+    assert overlay.get_dependency("shared") == "new shared value"
+
+    base.remove_dependency("shared")
+    with pytest.raises(DependencyInSCNotFoundException):
+        overlay.get_dependency("shared")
+
+    base.add_dependency("shared", "re-added value")
+    assert overlay.get_dependency("shared") == "re-added value"
+
+    base.remove_all_dependencies()
+    with pytest.raises(DependencyInSCNotFoundException):
+        overlay.get_dependency("shared")
+    assert overlay.get_dependency("overridden") == "tenant value"
+
+
+def test_layers(base, overlay):
+    top = OverlayContainer(overlay)
+    assert top.get_dependency("overridden") == "tenant value"
+    assert top.get_dependency("shared") == "shared value"
+
+    base.replace_dependency("shared", "new shared value")
+    overlay.remove_dependency("overridden")
+    assert top.get_dependency("shared") == "new shared value"
+    assert top.get_dependency("overridden") == "base value"
+
+    top.add_dependency("shared", "top value")
+    assert top.get_dependency("shared") == "top value"
+    assert overlay.get_dependency("shared") == "new shared value"
+
+
+def test_deep_stack(base):
+    class _LookupCountingContainer(GlobalSimpleContainer):
+        lookup_count = 0
+
+        def get_dependency(self, name):
+            _LookupCountingContainer.lookup_count += 1
+            return GlobalSimpleContainer.get_dependency(self, name)
+
+    bottom = _LookupCountingContainer()
+    bottom.add_dependency("shared", "shared value")
+
+    layers = [OverlayContainer(bottom)]
+    for index in range(100):
+        layers.append(OverlayContainer(layers[-1]))
+        layers[-1].add_dependency("layer {}".format(index), index)
+    top = layers[-1]
+
+    assert top.get_dependency("shared") == "shared value"
+    assert top.get_dependency("layer 0") == 0
+    assert _LookupCountingContainer.lookup_count == 0  # The bottom container's published view is used instead
+
+    bottom.replace_dependency("shared", "new shared value")
+    layers[50].add_dependency("shared", "layer value")
+    assert top.get_dependency("shared") == "layer value"
+    assert layers[49].get_dependency("shared") == "new shared value"
+
+    layers[50].remove_dependency("shared")
+    assert top.get_dependency("shared") == "new shared value"
+
+
+def test_override_management(base, overlay):
+    with pytest.raises(DependencyInSCExistsException):
+        overlay.add_dependency("overridden", "value")
+
+    overlay.replace_dependency("shared", "replaced value")
+    assert overlay.get_dependency("shared") == "replaced value"
+    assert base.get_dependency("shared") == "shared value"
+    with pytest.raises(DependencyInSCNotFoundException):
+        overlay.replace_dependency("nonexistent", "value")
+
+    assert overlay.add_or_replace_dependency("shared", "value") is True
+    assert overlay.add_or_replace_dependency("new", "value") is False
+
+    overlay.remove_dependency("shared")
+    assert overlay.get_dependency("shared") == "shared value"
+    with pytest.raises(DependencyInSCNotFoundException):
+        overlay.remove_dependency("shared")
+
+    overlay.remove_all_dependencies()
+    assert overlay.get_all_overrides() == {}
+    assert overlay.get_dependency("overridden") == "base value"
+
+
+def test_mutation_listeners(base, overlay):
+    notifications = []
+    overlay.add_mutation_listener(notifications.append)
+
+    overlay.add_dependency("new", "value")
+    base.add_dependency("base dependency", "value")
+    overlay.remove_all_dependencies()
+    overlay.remove_mutation_listener(notifications.append)
+    overlay.add_dependency("ignored", "value")
+
+    assert notifications == ["new", "base dependency", None]
+
+
+def test_detach_from_base_container(base, overlay):
+    notifications = []
+    overlay.add_mutation_listener(notifications.append)
+    assert len(base._mutation_listeners) == 1
+
+    overlay.detach_from_base_container()
+    assert base._mutation_listeners == ()
+    assert overlay.get_base_container() is base
+
+    base.add_dependency("base dependency", "value")
+    overlay.add_dependency("new", "value")
+    assert notifications == ["new"]
+
+
+def test_overlays_do_not_listen_to_base_without_listeners(base):
+    overlays = [OverlayContainer(base) for _ in range(1000)]
+    assert base._mutation_listeners == ()
+    assert all(overlay_.get_dependency("shared") == "shared value" for overlay_ in overlays)
+
+
+def test_unused_overlays_are_garbage_collected(base):
+    overlay = OverlayContainer(base)
+    notifications = []
+    overlay.add_mutation_listener(notifications.append)
+    overlay_ref = weakref.ref(overlay)
+    assert len(base._mutation_listeners) == 1
+
+    del overlay
+    gc.collect()
+    assert overlay_ref() is None
+    assert base._mutation_listeners == ()
+
+
+def test_dependencies_view(base, overlay):
+    view = overlay.get_all_dependencies_view()
+    assert dict(view) == {"shared": "shared value", "overridden": "tenant value"}
+    assert overlay.get_all_dependencies_view() is view
+
+    base.replace_dependency("shared", "new shared value")
+    view = overlay.get_all_dependencies_view()
+    assert dict(view) == {"shared": "new shared value", "overridden": "tenant value"}
+    assert overlay.get_all_dependencies_view() is view
+
+    overlay.add_dependency("new", "value")
+    assert dict(overlay.get_all_dependencies_view()) == {"shared": "new shared value", "overridden": "tenant value", "new": "value"}
+
+
+def test_invalid_base_container():
+    with pytest.raises(InvalidBaseContainerError):
+        OverlayContainer(ThreadLocalSimpleContainer())
+
+
+def test_namespace_integration(overlay):
+    ns_name = __file__
+
+    ns = Sidein.ns(ns_name)
+    try:
+        ns.set_dependency_provider(overlay)
+        assert ns.get_dependencies("shared", "overridden") == {"shared": "shared value", "overridden": "tenant value"}
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
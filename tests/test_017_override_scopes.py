@@ -0,0 +1,205 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+import threading
+from sidein.Sidein import Sidein
+from sidein.ns.DependencyOverrideScope import DependencyOverrideScope
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.get_dependency_provider().add_dependency("dependency", "value")
+    ns_.get_dependency_provider().add_dependency("other_dependency", "other value")
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_override(ns):
+    scope = ns.override(dependency="overridden")
+    assert isinstance(scope, DependencyOverrideScope)
+    assert scope.get_overrides() == {"dependency": "overridden"}
+
+    with scope:
+        assert ns.get_dependency("dependency") == "overridden"
+        assert ns.get_dependency("other_dependency") == "other value"
+        assert ns.get_dependencies("other_dependency", "dependency") == {"other_dependency": "other value", "dependency": "overridden"}
+        assert list(ns.get_dependencies("other_dependency", "dependency").keys()) == ["other_dependency", "dependency"]
+
+    assert ns.get_dependency("dependency") == "value"
+
+
+def test_override_with_mapping(ns):
+    with ns.override({"cz.vitlabuda.dependency": 1, "dependency": 2}, dependency=3):
+        assert ns.get_dependency("cz.vitlabuda.dependency") == 1
+        assert ns.get_dependency("dependency") == 3
+
+
+def test_nested_overrides(ns):
+    with ns.override(dependency="outer", other_dependency="outer other"):
+        with ns.override(dependency="inner"):
+            assert ns.get_dependencies("dependency", "other_dependency") == {"dependency": "inner", "other_dependency": "outer other"}
+
+        assert ns.get_dependency("dependency") == "outer"
+
+    assert ns.get_dependency("dependency") == "value"
+
+
+def test_reentered_scope(ns):
+    scope = ns.override(dependency="overridden")
+    with scope:
+        with ns.override(dependency="inner"):
+            with scope:
+                assert ns.get_dependency("dependency") == "overridden"
+            assert ns.get_dependency("dependency") == "inner"
+
+    assert ns.get_dependency("dependency") == "value"
+
+
+def test_override_of_missing_dependency(ns):
+    with ns.override(missing_dependency="overridden"):
+        assert ns.get_dependency("missing_dependency") == "overridden"
+
+
+def test_injection_and_obtainers(ns):
+    @ns.inject_dependencies("dependency")
+    def _inject_here(dependency):
+        return dependency
+
+    @ns.inject_dependencies("dependency", in_obtainers=True)
+    def _inject_obtainer_here(dependency):
+        return dependency.obtain_dependency()
+
+    with ns.override(dependency="overridden"):
+        assert _inject_here() == "overridden"
+        assert _inject_obtainer_here() == "overridden"
+
+    assert _inject_here() == "value"
+
+
+def test_override_is_thread_local(ns):
+    results = []
+
+    def _thread_func():
+        results.append(ns.get_dependency("dependency"))
+
+    with ns.override(dependency="overridden"):
+        thread = threading.Thread(target=_thread_func)
+        thread.start()
+        thread.join()
+
+    assert results == ["value"]
+
+
+def test_override_is_task_local(ns):
+    async def _overriding_task(started_event, checked_event):
+        async with ns.override(dependency="overridden"):
+            started_event.set()
+            await checked_event.wait()
+            return ns.get_dependency("dependency")
+
+    async def _main():
+        started_event, checked_event = asyncio.Event(), asyncio.Event()
+        task = asyncio.create_task(_overriding_task(started_event, checked_event))
+        await started_event.wait()
+        value_outside = ns.get_dependency("dependency")
+        checked_event.set()
+        return value_outside, await task
+
+    assert asyncio.run(_main()) == ("value", "overridden")
+
+
+def test_shared_scope_entered_by_concurrent_tasks(ns):
+    scope = ns.override(dependency="overridden")
+
+    async def _task(entered_event, other_entered_event, exit_first):
+        async with scope:
+            entered_event.set()
+            await other_entered_event.wait()
+            if not exit_first:
+                await asyncio.sleep(0.01)
+            value_inside = ns.get_dependency("dependency")
+
+        return value_inside, ns.get_dependency("dependency")
+
+    async def _main():
+        first_event, second_event = asyncio.Event(), asyncio.Event()
+        return await asyncio.gather(_task(first_event, second_event, False), _task(second_event, first_event, True))
+
+    assert asyncio.run(_main()) == [("overridden", "value"), ("overridden", "value")]
+    assert ns.get_dependency("dependency") == "value"
+
+
+def test_shared_scope_entered_by_concurrent_threads(ns):
+    scope = ns.override(dependency="overridden")
+    barrier = threading.Barrier(4, timeout=10)
+    results = []
+
+    def _thread_func(thread_index):
+        with scope:
+            barrier.wait()
+            value_inside = ns.get_dependency("dependency")
+            if thread_index % 2:
+                barrier.wait()
+        if not thread_index % 2:
+            barrier.wait()
+        results.append((value_inside, ns.get_dependency("dependency")))
+
+    threads = [threading.Thread(target=_thread_func, args=(thread_index,)) for thread_index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [("overridden", "value")] * 4
+
+
+def test_exiting_scope_not_entered(ns):
+    with pytest.raises(RuntimeError):
+        ns.override(dependency="overridden").__exit__(None, None, None)
+
+
+def test_overrides_are_per_namespace(ns):
+    other_ns = Sidein.ns(__file__ + "_other")
+    other_ns.get_dependency_provider().add_dependency("dependency", "other namespace value")
+
+    try:
+        with ns.override(dependency="overridden"):
+            assert other_ns.get_dependency("dependency") == "other namespace value"
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(__file__ + "_other")
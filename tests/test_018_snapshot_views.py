@@ -0,0 +1,177 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+from sidein.Sidein import Sidein
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+from sidein.providers.simplecontainer.ThreadLocalSimpleContainer import ThreadLocalSimpleContainer
+from sidein.providers.overlay.OverlayContainer import OverlayContainer
+
+
+@pytest.fixture(params=[GlobalSimpleContainer, ThreadLocalSimpleContainer])
+def container(request):
+    container_ = request.param()
+    container_.add_dependency("dependency", "value")
+    yield container_
+
+
+def test_view_contents(container):
+    view = container.get_all_dependencies_view()
+    assert dict(view) == {"dependency": "value"}
+    assert dict(view) == container.get_all_dependencies()
+
+
+def test_view_is_read_only(container):
+    view = container.get_all_dependencies_view()
+    with pytest.raises(TypeError):
+        view["dependency"] = "another value"
+
+    assert container.get_dependency("dependency") == "value"
+
+
+def test_view_is_shared_until_change(container):
+    view = container.get_all_dependencies_view()
+    assert container.get_all_dependencies_view() is view
+
+    container.add_dependency("another_dependency", "another value")
+    new_view = container.get_all_dependencies_view()
+    assert new_view is not view
+    assert dict(view) == {"dependency": "value"}
+    assert dict(new_view) == {"dependency": "value", "another_dependency": "another value"}
+
+    for change in (lambda: container.replace_dependency("dependency", 1), lambda: container.add_or_replace_dependency("dependency", 2), lambda: container.remove_dependency("dependency"), container.remove_all_dependencies):
+        view = container.get_all_dependencies_view()
+        change()
+        assert container.get_all_dependencies_view() is not view
+        assert dict(container.get_all_dependencies_view()) == container.get_all_dependencies()
+
+
+def test_view_iteration_during_writes():
+    container = GlobalSimpleContainer()
+    for i in range(1000):
+        container.add_dependency(str(i), i)
+
+    stop_event = threading.Event()
+
+    def _writer():
+        i = 1000
+        while not stop_event.is_set():
+            container.add_dependency(str(i), i)
+            container.remove_dependency(str(i))
+            i += 1
+
+    writer = threading.Thread(target=_writer)
+    writer.start()
+    try:
+        for _ in range(100):
+            view = container.get_all_dependencies_view()
+            assert sum(1 for _ in view.items()) == len(view)
+    finally:
+        stop_event.set()
+        writer.join()
+
+
+def test_thread_local_views_are_separate():
+    container = ThreadLocalSimpleContainer()
+    container.add_dependency("dependency", "value")
+    container.get_all_dependencies_view()
+
+    views = []
+    thread = threading.Thread(target=lambda: views.append(container.get_all_dependencies_view()))
+    thread.start()
+    thread.join()
+
+    assert dict(views[0]) == {}
+
+
+def test_overlay_view():
+    base_container = GlobalSimpleContainer()
+    base_container.add_dependency("dependency", "base value")
+    base_container.add_dependency("another_dependency", "base value")
+    overlay = OverlayContainer(base_container)
+    overlay.add_dependency("dependency", "overlay value")
+
+    view = overlay.get_all_dependencies_view()
+    assert dict(view) == {"dependency": "overlay value", "another_dependency": "base value"}
+    assert overlay.get_all_dependencies_view() is view
+
+    base_container.add_dependency("third_dependency", "base value")
+    assert overlay.get_all_dependencies_view()["third_dependency"] == "base value"
+
+    overlay.remove_dependency("dependency")
+    assert overlay.get_all_dependencies_view()["dependency"] == "base value"
+
+
+def test_namespaces_view():
+    nsmgr = Sidein.get_namespace_manager()
+    ns_name = __file__
+
+    Sidein.ns(ns_name)
+    try:
+        view = nsmgr.get_all_namespaces_view()
+        assert view[ns_name] is Sidein.ns(ns_name)
+        assert nsmgr.get_all_namespaces_view() is view
+        assert dict(view) == nsmgr.get_all_namespaces()
+
+        with pytest.raises(TypeError):
+            view["another namespace"] = None
+    finally:
+        nsmgr.remove_namespace(ns_name)
+
+    assert ns_name not in nsmgr.get_all_namespaces_view()
+    assert ns_name in view
+
+
+def test_namespaces_view_survives_getting_existing_namespace():
+    nsmgr = Sidein.get_namespace_manager()
+    ns_name = __file__
+
+    Sidein.ns(ns_name)
+    try:
+        view = nsmgr.get_all_namespaces_view()
+        for _ in range(3):
+            Sidein.ns(ns_name)
+            assert nsmgr.get_all_namespaces_view() is view
+
+        new_ns_name = ns_name + ".new"
+        new_ns = Sidein.ns(new_ns_name)
+        try:
+            new_view = nsmgr.get_all_namespaces_view()
+            assert new_view is not view
+            assert new_view[new_ns_name] is new_ns
+            assert new_ns_name not in view
+        finally:
+            nsmgr.remove_namespace(new_ns_name)
+    finally:
+        nsmgr.remove_namespace(ns_name)
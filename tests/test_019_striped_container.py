@@ -0,0 +1,174 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+from sidein.Sidein import Sidein
+from sidein.providers.simplecontainer.StripedGlobalSimpleContainer import StripedGlobalSimpleContainer
+from sidein.providers.simplecontainer.exc.DependencyInSCExistsException import DependencyInSCExistsException
+from sidein.providers.simplecontainer.exc.DependencyInSCNotFoundException import DependencyInSCNotFoundException
+from sidein.providers.simplecontainer.exc.InvalidStripeCountError import InvalidStripeCountError
+from sidein.providers.overlay.OverlayContainer import OverlayContainer
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+from sidein.lockprofiler.LockProfiler import LockProfiler
+
+
+@pytest.fixture(params=[1, 4, StripedGlobalSimpleContainer.DEFAULT_STRIPE_COUNT])
+def container(request):
+    yield StripedGlobalSimpleContainer(request.param)
+
+
+@pytest.mark.parametrize("stripe_count", [0, -1, 1.5, True, "16"])
+def test_invalid_stripe_count(stripe_count):
+    with pytest.raises(InvalidStripeCountError):
+        StripedGlobalSimpleContainer(stripe_count)
+
+
+def test_basic_operations(container):
+    for i in range(100):
+        container.add_dependency("dependency{}".format(i), i)
+
+    assert container.get_dependency("dependency42") == 42
+    assert container.get_all_dependencies() == {"dependency{}".format(i): i for i in range(100)}
+
+    with pytest.raises(DependencyInSCExistsException):
+        container.add_dependency("dependency42", 0)
+
+    container.replace_dependency("dependency42", "replaced")
+    assert container.get_dependency("dependency42") == "replaced"
+    assert container.add_or_replace_dependency("dependency42", "replaced again") is True
+    assert container.add_or_replace_dependency("new_dependency", "new") is False
+
+    container.remove_dependency("dependency42")
+    with pytest.raises(DependencyInSCNotFoundException):
+        container.get_dependency("dependency42")
+    with pytest.raises(DependencyInSCNotFoundException):
+        container.replace_dependency("dependency42", 0)
+    with pytest.raises(DependencyInSCNotFoundException):
+        container.remove_dependency("dependency42")
+
+    container.remove_all_dependencies()
+    assert container.get_all_dependencies() == {}
+
+
+def test_view(container):
+    container.add_dependency("dependency", "value")
+    view = container.get_all_dependencies_view()
+    assert dict(view) == {"dependency": "value"}
+    assert container.get_all_dependencies_view() is view
+
+    container.add_dependency("another_dependency", "another value")
+    assert dict(container.get_all_dependencies_view()) == {"dependency": "value", "another_dependency": "another value"}
+    assert dict(view) == {"dependency": "value"}
+
+
+def test_mutation_listeners(container):
+    notifications = []
+    container.add_mutation_listener(notifications.append)
+    container.add_dependency("dependency", "value")
+    container.remove_all_dependencies()
+    assert notifications == ["dependency", None]
+
+
+def test_as_overlay_base(container):
+    container.add_dependency("dependency", "base value")
+    overlay = OverlayContainer(container)
+    assert overlay.get_dependency("dependency") == "base value"
+
+    container.replace_dependency("dependency", "new base value")
+    assert overlay.get_dependency("dependency") == "new base value"
+
+
+def test_metrics(container):
+    recorder = MetricsRecorder()
+    container.set_metrics_recorder(recorder)
+    container.add_dependency("dependency", "value")
+    container.get_dependency("dependency")
+    with pytest.raises(DependencyInSCNotFoundException):
+        container.get_dependency("missing")
+
+    metrics = recorder.export_as_dict()
+    assert metrics["dependency"]["resolution_count"] == 1
+    assert metrics["dependency"]["lock_wait"]["count"] == 1
+    assert metrics["missing"]["miss_count"] == 1
+
+
+def test_consistency_under_concurrent_writes():
+    container = StripedGlobalSimpleContainer(8)
+    stop_event = threading.Event()
+
+    # Each writer keeps the pair of its dependencies equal; a whole-container snapshot must never see them differ
+    #  for longer than the single replacement in progress (i.e. the values may differ by at most one)
+    def _writer(index):
+        value = 0
+        while not stop_event.is_set():
+            value += 1
+            container.add_or_replace_dependency("a{}".format(index), value)
+            container.add_or_replace_dependency("b{}".format(index), value)
+
+    writers = [threading.Thread(target=_writer, args=(index,)) for index in range(4)]
+    for writer in writers:
+        writer.start()
+    try:
+        for _ in range(200):
+            dependencies = container.get_all_dependencies()
+            for index in range(4):
+                if "b{}".format(index) in dependencies:
+                    assert dependencies["a{}".format(index)] - dependencies["b{}".format(index)] in (0, 1)
+    finally:
+        stop_event.set()
+        for writer in writers:
+            writer.join()
+
+
+def test_lock_profiler_swaps_stripe_locks():
+    ns_name = __file__
+    ns = Sidein.ns(ns_name)
+    container = StripedGlobalSimpleContainer(2)
+    ns.set_dependency_provider(container)
+    container.add_dependency("dependency", "value")
+
+    try:
+        LockProfiler.reset()
+        LockProfiler.enable()
+        try:
+            assert ns.get_dependency("dependency") == "value"
+            assert container.get_all_dependencies() == {"dependency": "value"}
+            lock_names = [lock_statistics["lock_name"] for lock_statistics in LockProfiler.generate_report().export_as_dict()["locks"]]
+            assert any(lock_name.startswith("StripedGlobalSimpleContainer._stripe_locks") for lock_name in lock_names)
+        finally:
+            LockProfiler.disable()
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+    assert container.get_all_dependencies() == {"dependency": "value"}
@@ -0,0 +1,154 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+from sidein.Sidein import Sidein
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.ns.exc.CircularDependencyError import CircularDependencyError
+from sidein.tracing.RecordingTracingHook import RecordingTracingHook
+from sidein.metrics.MetricsRecorder import MetricsRecorder
+
+
+class _FactoryProvider(DependencyProviderInterface):
+    def __init__(self, factories):
+        self.factories = factories
+
+    def get_dependency(self, name):
+        if name not in self.factories:
+            raise DependencyProviderException(name)
+
+        return self.factories[name]()
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_nested_resolution(ns):
+    ns.set_dependency_provider(_FactoryProvider({
+        "config": lambda: {"url": "db://"},
+        "pool": lambda: ("pool", ns.get_dependency("config")["url"]),
+        "repository": lambda: ("repository", ns.get_dependency("pool")),
+        "service": lambda: ("service", ns.get_dependencies("repository", "config")),
+    }))
+
+    assert ns.get_dependency("repository") == ("repository", ("pool", "db://"))
+    assert ns.get_dependency("service") == ("service", {"repository": ("repository", ("pool", "db://")), "config": {"url": "db://"}})
+
+    @ns.inject_dependencies("pool")
+    def _inject_here(pool):
+        return pool
+
+    assert _inject_here() == ("pool", "db://")
+
+
+def test_nested_obtainer(ns):
+    ns.set_dependency_provider(_FactoryProvider({
+        "config": lambda: "config",
+        "service": lambda: ns.get_dependency("config", in_obtainer=True),
+    }))
+
+    assert ns.get_dependency("service").obtain_dependency() == "config"
+
+
+def test_circular_dependency(ns):
+    ns.set_dependency_provider(_FactoryProvider({
+        "a": lambda: ns.get_dependency("b"),
+        "b": lambda: ns.get_dependency("c"),
+        "c": lambda: ns.get_dependency("b"),
+    }))
+
+    with pytest.raises(CircularDependencyError) as exc_info:
+        ns.get_dependency("a")
+    assert exc_info.value.get_resolution_chain() == ("a", "b", "c", "b")
+
+    # The namespace must stay usable after the error
+    ns.set_dependency_provider(_FactoryProvider({"a": lambda: "value"}))
+    assert ns.get_dependency("a") == "value"
+
+
+def test_nested_missing_dependency(ns):
+    ns.set_dependency_provider(_FactoryProvider({"a": lambda: ns.get_dependency("missing")}))
+
+    with pytest.raises(DependencyProviderException):
+        ns.get_dependency("a")
+
+
+def test_other_threads_are_not_nested(ns):
+    results = []
+    entered_event, release_event = threading.Event(), threading.Event()
+
+    def _slow_factory():
+        entered_event.set()
+        release_event.wait()
+        return "slow"
+
+    ns.set_dependency_provider(_FactoryProvider({"slow": _slow_factory, "fast": lambda: "fast"}))
+
+    slow_thread = threading.Thread(target=lambda: results.append(ns.get_dependency("slow")))
+    slow_thread.start()
+    entered_event.wait()
+
+    # The other thread must wait for the lock held by the slow thread instead of entering the nested path
+    fast_thread = threading.Thread(target=lambda: results.append(ns.get_dependency("fast")))
+    fast_thread.start()
+    fast_thread.join(0.1)
+    assert fast_thread.is_alive()
+
+    release_event.set()
+    slow_thread.join()
+    fast_thread.join()
+    assert results == ["slow", "fast"]
+
+
+def test_nested_resolution_instrumented(ns):
+    hook = RecordingTracingHook()
+    recorder = MetricsRecorder()
+    ns.set_tracing_hook(hook)
+    ns.set_metrics_recorder(recorder)
+    ns.set_dependency_provider(_FactoryProvider({
+        "config": lambda: "config",
+        "service": lambda: ("service", ns.get_dependency("config")),
+    }))
+
+    assert ns.get_dependency("service") == ("service", "config")
+    assert [event.get_dependency_names() for event in hook.get_recorded_events()] == [("config",), ("service",)]
+    assert recorder.export_as_dict()["config"]["resolution_count"] == 1
@@ -0,0 +1,295 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+import __future__
+from typing import Annotated
+from sidein.Sidein import Sidein
+from sidein.providers.autowiring.AutoWiringProvider import AutoWiringProvider
+from sidein.providers.autowiring.exc.FactoryInAWPExistsException import FactoryInAWPExistsException
+from sidein.providers.autowiring.exc.FactoryInAWPNotFoundException import FactoryInAWPNotFoundException
+from sidein.providers.autowiring.exc.UnsatisfiedFactoryDependencyException import UnsatisfiedFactoryDependencyException
+from sidein.providers.autowiring.exc.InvalidFactoryError import InvalidFactoryError
+from sidein.providers.autowiring.exc.FactoryDependencyCycleError import FactoryDependencyCycleError
+from sidein.providers.autowiring.exc.AutoWiredFactoryRaisedAnExceptionError import AutoWiredFactoryRaisedAnExceptionError
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+
+
+class _Pool:
+    def __init__(self, config):
+        self.config = config
+
+
+class _Repository:
+    def __init__(self, pool: Annotated[_Pool, "pool"], table_name="table"):
+        self.pool = pool
+        self.table_name = table_name
+
+
+@pytest.fixture
+def provider():
+    provider_ = AutoWiringProvider()
+    provider_.add_factory("service", lambda repository, config: ("service", repository, config))
+    provider_.add_factory("repository", _Repository)
+    provider_.add_factory("pool", _Pool)
+    provider_.add_factory("config", lambda: {"url": "db://"})
+    yield provider_
+
+
+def test_resolution(provider):
+    service = provider.get_dependency("service")
+    assert service[0] == "service"
+    assert isinstance(service[1], _Repository)
+    assert service[1].table_name == "table"
+    assert service[1].pool is provider.get_dependency("pool")
+    assert service[1].pool.config is service[2] is provider.get_dependency("config")
+    assert provider.get_dependency("service") is service
+
+
+def test_resolution_plan(provider):
+    assert provider.get_resolution_plan("config") == ("config",)
+    assert provider.get_resolution_plan("service") == ("config", "pool", "repository", "service")
+    assert provider.get_factory_dependency_names("service") == ("repository", "config")
+    assert provider.get_factory_dependency_names("repository") == ("pool",)
+    assert provider.get_all_factory_names() == ("config", "pool", "repository", "service")
+
+
+def test_explicit_dependency_names():
+    provider = AutoWiringProvider()
+    provider.add_factory("a", lambda: 1)
+    provider.add_factory("b", lambda: 2)
+    provider.add_factory("positional", lambda *args: args, ["a", "b"])
+    provider.add_factory("keyword", lambda **kwargs: kwargs, {"first": "a", "second": "b"})
+    provider.add_factory("builtin", dict, {"x": "a"})
+
+    assert provider.get_dependency("positional") == (1, 2)
+    assert provider.get_dependency("keyword") == {"first": 1, "second": 2}
+    assert provider.get_dependency("builtin") == {"x": 1}
+
+
+def test_postponed_annotations():
+    # The factories are compiled as if the module began with "from __future__ import annotations" (PEP 563)
+    module_globals = {"Annotated": Annotated, "_Pool": _Pool}
+    exec(compile(
+        "def create_repository(pool: Annotated[_Pool, 'main_pool']):\n"
+        "    return ('repository', pool)\n"
+        "\n"
+        "class Repository:\n"
+        "    def __init__(self, pool: Annotated[_Pool, 'main_pool'], cache: Annotated[dict, 'main_cache']):\n"
+        "        self.pool = pool\n",
+        "<postponed>", "exec", flags=__future__.annotations.compiler_flag, dont_inherit=True
+    ), module_globals)
+    assert isinstance(module_globals["create_repository"].__annotations__["pool"], str)
+
+    provider = AutoWiringProvider()
+    provider.add_factory("repository", module_globals["create_repository"])
+    provider.add_factory("repository_object", module_globals["Repository"])
+    assert provider.get_factory_dependency_names("repository") == ("main_pool",)
+    assert provider.get_factory_dependency_names("repository_object") == ("main_pool", "main_cache")
+
+
+def test_positional_only_inference():
+    def _factory(a, /, b):
+        return a, b
+
+    provider = AutoWiringProvider()
+    provider.add_factory("a", lambda: 1)
+    provider.add_factory("b", lambda: 2)
+    provider.add_factory("pair", _factory)
+    assert provider.get_dependency("pair") == (1, 2)
+
+
+def test_non_singletons():
+    calls = []
+    provider = AutoWiringProvider()
+    provider.add_factory("counter", lambda: calls.append(None) or len(calls), singleton=False)
+    provider.add_factory("pair", lambda first, second: (first, second), {"first": "counter", "second": "counter"}, singleton=False)
+
+    assert provider.get_dependency("pair") == (1, 1)  # A non-singleton is built at most once per request
+    assert provider.get_dependency("pair") == (2, 2)
+    assert provider.get_dependency("counter") == 3
+
+
+def test_singletons_skip_subgraphs(provider):
+    calls = []
+    provider.remove_factory("config")
+    provider.add_factory("config", lambda: calls.append(None) or {}, singleton=False)
+
+    provider.get_dependency("pool")
+    provider.get_dependency("repository")  # The pool is a cached singleton, so the config isn't needed
+    assert len(calls) == 1
+
+    provider.discard_singletons()
+    provider.get_dependency("repository")
+    assert len(calls) == 2
+
+
+def test_removal_discards_dependents(provider):
+    service = provider.get_dependency("service")
+    config = provider.get_dependency("config")
+    provider.remove_factory("pool")
+
+    with pytest.raises(UnsatisfiedFactoryDependencyException):
+        provider.get_dependency("service")
+    with pytest.raises(UnsatisfiedFactoryDependencyException):
+        provider.get_resolution_plan("repository")
+    assert provider.get_dependency("config") is config
+
+    provider.add_factory("pool", _Pool)
+    assert provider.get_dependency("service") is not service
+
+    with pytest.raises(FactoryInAWPNotFoundException):
+        provider.remove_factory("pool2")
+
+
+def test_missing_factories(provider):
+    with pytest.raises(FactoryInAWPNotFoundException):
+        provider.get_dependency("missing")
+    with pytest.raises(FactoryInAWPNotFoundException):
+        provider.get_factory_dependency_names("missing")
+
+    provider.add_factory("incomplete", lambda missing: missing)
+    with pytest.raises(UnsatisfiedFactoryDependencyException) as exc_info:
+        provider.get_dependency("incomplete")
+    assert isinstance(exc_info.value, DependencyProviderException)
+
+
+def test_duplicate_factory(provider):
+    with pytest.raises(FactoryInAWPExistsException):
+        provider.add_factory("config", lambda: None)
+
+
+def test_invalid_factories(provider):
+    with pytest.raises(InvalidFactoryError):
+        provider.add_factory("invalid", "not callable")
+    with pytest.raises(InvalidFactoryError):
+        provider.add_factory("invalid", lambda x: x, "x")
+
+
+def test_cycles():
+    provider = AutoWiringProvider()
+    provider.add_factory("a", lambda b: b)
+    provider.add_factory("b", lambda c: c)
+
+    with pytest.raises(FactoryDependencyCycleError) as exc_info:
+        provider.add_factory("c", lambda a: a)
+    assert exc_info.value.get_dependency_chain() == ("c", "a", "b", "c")
+    assert provider.get_all_factory_names() == ("a", "b")
+
+    with pytest.raises(FactoryDependencyCycleError):
+        provider.add_factory("self", lambda self: self)
+
+
+def test_cycle_detection_on_diamond_graph():
+    # Each layer's two factories depend on both factories of the layer below; the number of paths through the graph
+    #  grows exponentially with the number of layers, so a search walking every path would never finish
+    provider = AutoWiringProvider()
+    below = ("bottom",)
+    for layer in range(60):
+        names = ("left{}".format(layer), "right{}".format(layer))
+        for name in names:
+            provider.add_factory(name, lambda *dependencies: sum(dependencies) + 1, below)
+        below = names
+
+    with pytest.raises(FactoryDependencyCycleError) as exc_info:
+        provider.add_factory("bottom", lambda top: top, ("left59",))
+    assert len(exc_info.value.get_dependency_chain()) == 62
+    assert exc_info.value.get_dependency_chain()[:2] == ("bottom", "left59")
+    assert exc_info.value.get_dependency_chain()[-2:] == ("left0", "bottom")
+
+    provider.add_factory("bottom", lambda: 0)
+    assert len(provider.get_resolution_plan("left59")) == 120
+    assert provider.get_dependency("left1") == 3
+
+
+def test_plans_updated_incrementally():
+    provider = AutoWiringProvider()
+    provider.add_factory("service", lambda repository, config: (repository, config))
+    provider.add_factory("repository", lambda pool: pool)
+    provider.add_factory("unrelated", lambda: "unrelated")
+    with pytest.raises(UnsatisfiedFactoryDependencyException):
+        provider.get_resolution_plan("service")
+
+    provider.add_factory("pool", lambda config: config)
+    with pytest.raises(UnsatisfiedFactoryDependencyException):
+        provider.get_resolution_plan("service")
+
+    provider.add_factory("config", lambda: "config")
+    assert provider.get_resolution_plan("service") == ("config", "pool", "repository", "service")
+    assert provider.get_dependency("service") == ("config", "config")
+
+    provider.remove_factory("pool")
+    with pytest.raises(UnsatisfiedFactoryDependencyException):
+        provider.get_resolution_plan("service")
+    with pytest.raises(UnsatisfiedFactoryDependencyException):
+        provider.get_resolution_plan("repository")
+    assert provider.get_resolution_plan("config") == ("config",)
+    assert provider.get_resolution_plan("unrelated") == ("unrelated",)
+
+
+def test_factory_exception(provider):
+    provider.add_factory("failing", lambda config: 1 / 0)
+    with pytest.raises(AutoWiredFactoryRaisedAnExceptionError) as exc_info:
+        provider.get_dependency("failing")
+    assert isinstance(exc_info.value.get_raised_exception(), ZeroDivisionError)
+
+
+def test_singleton_built_once_concurrently():
+    calls = []
+    provider = AutoWiringProvider()
+    provider.add_factory("dependency", lambda: calls.append(None) or object())
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.get_dependency("dependency"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+
+
+def test_namespace_integration(provider):
+    ns_name = __file__
+    ns = Sidein.ns(ns_name)
+    ns.set_dependency_provider(provider)
+    try:
+        @ns.inject_dependencies("repository")
+        def _inject_here(repository):
+            return repository
+
+        assert _inject_here() is provider.get_dependency("repository")
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
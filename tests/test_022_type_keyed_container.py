@@ -0,0 +1,170 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import abc
+from sidein.Sidein import Sidein
+from sidein.providers.typekeyed.TypeKeyedContainer import TypeKeyedContainer
+from sidein.providers.typekeyed.exc.DependencyInTKCExistsException import DependencyInTKCExistsException
+from sidein.providers.typekeyed.exc.DependencyInTKCNotFoundException import DependencyInTKCNotFoundException
+from sidein.providers.typekeyed.exc.AmbiguousDependencyTypeException import AmbiguousDependencyTypeException
+from sidein.providers.typekeyed.exc.InvalidDependencyTypeError import InvalidDependencyTypeError
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+
+
+class CacheBackend(metaclass=abc.ABCMeta):
+    pass
+
+
+class RedisCacheBackend(CacheBackend):
+    pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    pass
+
+
+class Database:
+    pass
+
+
+class VirtualCacheBackend:
+    pass
+
+
+CacheBackend.register(VirtualCacheBackend)
+
+
+@pytest.fixture
+def container():
+    container_ = TypeKeyedContainer()
+    container_.add_dependency(RedisCacheBackend, "redis")
+    container_.add_dependency(Database, "database")
+    yield container_
+
+
+def test_exact_and_base_class_resolution(container):
+    assert container.get_dependency_by_type(RedisCacheBackend) == "redis"
+    assert container.get_dependency_by_type(CacheBackend) == "redis"
+    assert container.get_dependency_by_type(Database) == "database"
+
+
+def test_resolution_by_name(container):
+    assert TypeKeyedContainer.get_dependency_name_for_type(CacheBackend) == __name__ + ".CacheBackend"
+    assert container.get_dependency(TypeKeyedContainer.get_dependency_name_for_type(CacheBackend)) == "redis"
+    assert container.get_dependency(TypeKeyedContainer.get_dependency_name_for_type(Database)) == "database"
+
+    with pytest.raises(DependencyInTKCNotFoundException):
+        container.get_dependency("missing.Type")
+
+
+def test_ambiguity(container):
+    container.add_dependency(MemoryCacheBackend, "memory")
+
+    with pytest.raises(AmbiguousDependencyTypeException) as exc_info:
+        container.get_dependency_by_type(CacheBackend)
+    assert set(exc_info.value.get_matching_types()) == {RedisCacheBackend, MemoryCacheBackend}
+    assert isinstance(exc_info.value, DependencyProviderException)
+
+    with pytest.raises(AmbiguousDependencyTypeException):
+        container.get_dependency(TypeKeyedContainer.get_dependency_name_for_type(CacheBackend))
+
+    # The requested type itself takes precedence over its subclasses
+    container.add_dependency(CacheBackend, "default")
+    assert container.get_dependency_by_type(CacheBackend) == "default"
+    assert container.get_dependency_by_type(MemoryCacheBackend) == "memory"
+
+
+def test_object_is_ambiguous(container):
+    with pytest.raises(AmbiguousDependencyTypeException):
+        container.get_dependency_by_type(object)
+
+
+def test_index_invalidation(container):
+    assert container.get_dependency_by_type(CacheBackend) == "redis"
+
+    container.replace_dependency(RedisCacheBackend, "new redis")
+    assert container.get_dependency_by_type(CacheBackend) == "new redis"
+
+    container.remove_dependency(RedisCacheBackend)
+    with pytest.raises(DependencyInTKCNotFoundException):
+        container.get_dependency_by_type(CacheBackend)
+
+    assert container.add_or_replace_dependency(MemoryCacheBackend, "memory") is False
+    assert container.get_dependency_by_type(CacheBackend) == "memory"
+    assert container.add_or_replace_dependency(MemoryCacheBackend, "new memory") is True
+    assert container.get_dependency_by_type(CacheBackend) == "new memory"
+
+    container.remove_all_dependencies()
+    assert container.get_all_dependencies() == {}
+    with pytest.raises(DependencyInTKCNotFoundException):
+        container.get_dependency_by_type(Database)
+
+
+def test_virtual_subclasses(container):
+    container.remove_dependency(RedisCacheBackend)
+    container.add_dependency(VirtualCacheBackend, "virtual")
+
+    assert container.get_dependency_by_type(CacheBackend) == "virtual"
+    assert container.get_dependency_by_type(CacheBackend) == "virtual"  # Cached
+
+    container.remove_dependency(VirtualCacheBackend)
+    with pytest.raises(DependencyInTKCNotFoundException):
+        container.get_dependency_by_type(CacheBackend)
+
+
+def test_registration_errors(container):
+    with pytest.raises(DependencyInTKCExistsException):
+        container.add_dependency(Database, "another database")
+    with pytest.raises(DependencyInTKCNotFoundException):
+        container.replace_dependency(MemoryCacheBackend, "memory")
+    with pytest.raises(DependencyInTKCNotFoundException):
+        container.remove_dependency(MemoryCacheBackend)
+    with pytest.raises(InvalidDependencyTypeError):
+        container.add_dependency("Database", "database")
+
+    assert container.get_all_dependencies() == {RedisCacheBackend: "redis", Database: "database"}
+
+
+def test_namespace_integration(container):
+    ns_name = __file__
+    ns = Sidein.ns(ns_name)
+    ns.set_dependency_provider(container)
+    try:
+        @ns.inject_dependencies(TypeKeyedContainer.get_dependency_name_for_type(CacheBackend), as_kwargs=False)
+        def _inject_here(cache_backend):
+            return cache_backend
+
+        assert _inject_here() == "redis"
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(ns_name)
@@ -0,0 +1,149 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+from typing import Annotated
+from sidein.Sidein import Sidein
+from sidein.ns.Inject import Inject
+from sidein.ns.exc.InvalidInjectionMarkerError import InvalidInjectionMarkerError
+from sidein.ns.exc.NotAFunctionError import NotAFunctionError
+from sidein.ns._utils.AnnotatedInjectionAnalyser import AnnotatedInjectionAnalyser
+from sidein.ns._utils.InjectionSpecification import InjectionSpecification
+from sidein.providers.typekeyed.TypeKeyedContainer import TypeKeyedContainer
+from sidein.tracing.RecordingTracingHook import RecordingTracingHook
+
+
+class CacheBackend:
+    pass
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.get_dependency_provider().add_dependency("database", "database value")
+    ns_.get_dependency_provider().add_dependency("redis_cache", "redis value")
+    ns_.get_dependency_provider().add_dependency(TypeKeyedContainer.get_dependency_name_for_type(CacheBackend), "cache backend value")
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_default_markers(ns):
+    @ns.inject_annotated()
+    def _inject_here(request, database=Inject(), cache=Inject("redis_cache"), other=None):
+        return request, database, cache, other
+
+    assert _inject_here("request") == ("request", "database value", "redis value", None)
+
+
+def test_annotated_markers(ns):
+    @ns.inject_annotated()
+    def _inject_here(request, *, database: Annotated[str, Inject()], cache: Annotated[CacheBackend, Inject(by_type=True)], another_cache: Annotated[str, "metadata", Inject("redis_cache")]):
+        return request, database, cache, another_cache
+
+    assert _inject_here("request") == ("request", "database value", "cache backend value", "redis value")
+
+
+def test_by_type_default_marker(ns):
+    @ns.inject_annotated()
+    def _inject_here(cache: CacheBackend = Inject(by_type=True)):
+        return cache
+
+    assert _inject_here() == "cache backend value"
+
+
+def test_same_dependency_in_multiple_parameters(ns):
+    @ns.inject_annotated()
+    def _inject_here(first=Inject("database"), second=Inject("database")):
+        return first, second
+
+    assert _inject_here() == ("database value", "database value")
+
+
+def test_async_function(ns):
+    @ns.inject_annotated()
+    async def _inject_here(database=Inject(), cache=Inject("redis_cache")):
+        return database, cache
+
+    assert asyncio.run(_inject_here()) == ("database value", "redis value")
+
+
+def test_obtainers(ns):
+    @ns.inject_annotated(in_obtainers=True)
+    def _inject_here(cache=Inject("redis_cache")):
+        return cache.obtain_dependency()
+
+    assert _inject_here() == "redis value"
+
+
+def test_analysis():
+    def _function(database=Inject(), cache: Annotated[object, Inject("redis_cache")] = None, other=None):
+        pass
+
+    assert AnnotatedInjectionAnalyser.analyse_function(_function) == (("database", "database"), ("cache", "redis_cache"))
+
+
+def test_analysis_is_stored_in_injection_specification(ns):
+    @ns.inject_annotated()
+    def _inject_here(database=Inject(), cache=Inject("redis_cache")):
+        return database, cache
+
+    assert InjectionSpecification.get_attached_to(_inject_here).injected_parameters == (("database", "database"), ("cache", "redis_cache"))
+
+
+def test_tracing(ns):
+    hook = RecordingTracingHook()
+    ns.set_tracing_hook(hook)
+
+    @ns.inject_annotated()
+    def _inject_here(cache=Inject("redis_cache")):
+        return cache
+
+    assert _inject_here() == "redis value"
+    assert hook.get_recorded_events()[-1].get_dependency_names() == ("redis_cache",)
+
+
+def test_invalid_markers(ns):
+    with pytest.raises(InvalidInjectionMarkerError):
+        Inject("name", by_type=True)
+
+    with pytest.raises(InvalidInjectionMarkerError):
+        @ns.inject_annotated()
+        def _inject_here(cache=Inject(by_type=True)):
+            pass
+
+    with pytest.raises(NotAFunctionError):
+        ns.inject_annotated()("not a function")
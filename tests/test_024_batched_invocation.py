@@ -0,0 +1,168 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+import functools
+from sidein.Sidein import Sidein
+from sidein.ns.Inject import Inject
+from sidein.ns.exc.NotAnInjectedFunctionError import NotAnInjectedFunctionError
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+
+
+class _CountingProvider(DependencyProviderInterface):
+    def __init__(self):
+        self.resolution_count = 0
+
+    def get_dependency(self, name):
+        if name == "missing":
+            raise DependencyProviderException(name)
+
+        self.resolution_count += 1
+        return name + " value"
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.set_dependency_provider(_CountingProvider())
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_bind(ns):
+    @ns.inject_dependencies("database", "cache")
+    def _function(record, database, cache):
+        return record, database, cache
+
+    bound_function = ns.bind(_function)
+    assert ns.get_dependency_provider().resolution_count == 2
+
+    assert bound_function(1) == (1, "database value", "cache value")
+    assert bound_function(record=2) == (2, "database value", "cache value")
+    assert ns.get_dependency_provider().resolution_count == 2
+
+
+def test_bind_positional(ns):
+    @ns.inject_dependencies("database", "cache", as_kwargs=False)
+    def _function(record, database, cache):
+        return record, database, cache
+
+    assert ns.bind(_function)(1) == (1, "database value", "cache value")
+
+
+def test_bind_annotated(ns):
+    @ns.inject_annotated()
+    def _function(record, db=Inject("database"), cache=Inject()):
+        return record, db, cache
+
+    assert ns.bind(_function)(1) == (1, "database value", "cache value")
+
+
+def test_bind_obtainers(ns):
+    @ns.inject_dependencies("database", in_obtainers=True)
+    def _function(database):
+        return database.obtain_dependency()
+
+    assert ns.bind(_function)() == "database value"
+
+
+def test_bind_async(ns):
+    @ns.inject_dependencies("database")
+    async def _function(record, database):
+        return record, database
+
+    assert asyncio.run(ns.bind(_function)(1)) == (1, "database value")
+
+
+def test_map(ns):
+    @ns.inject_dependencies("database")
+    def _function(record, multiplier, database):
+        return record * multiplier, database
+
+    assert ns.map(_function, range(1000), [2] * 1000) == [(i * 2, "database value") for i in range(1000)]
+    assert ns.get_dependency_provider().resolution_count == 1
+
+
+def test_imap(ns):
+    @ns.inject_dependencies("database")
+    def _function(record, database):
+        return record, database
+
+    def _infinite_records():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    results = ns.imap(_function, _infinite_records())
+    assert ns.get_dependency_provider().resolution_count == 0
+    assert next(results) == (0, "database value")
+    assert next(results) == (1, "database value")
+    assert ns.get_dependency_provider().resolution_count == 1
+
+
+def test_imap_resolution_error(ns):
+    @ns.inject_dependencies("missing")
+    def _function(record, missing):
+        pass
+
+    results = ns.imap(_function, [1])
+    with pytest.raises(DependencyProviderException):
+        next(results)
+
+
+def test_not_injected_functions(ns):
+    def _function():
+        pass
+
+    with pytest.raises(NotAnInjectedFunctionError):
+        ns.bind(_function)
+    with pytest.raises(NotAnInjectedFunctionError):
+        ns.imap(_function, [])
+
+    other_ns = Sidein.ns(__file__ + "_other")
+    try:
+        with pytest.raises(NotAnInjectedFunctionError):
+            ns.bind(other_ns.inject_dependencies("database")(_function))
+    finally:
+        Sidein.get_namespace_manager().remove_namespace(__file__ + "_other")
+
+    # A wrapper of an injected function must not be bound, as its own behaviour would be skipped
+    injected_function = ns.inject_dependencies("database")(_function)
+    with pytest.raises(NotAnInjectedFunctionError):
+        ns.bind(functools.wraps(injected_function)(lambda: None))
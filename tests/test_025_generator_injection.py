@@ -0,0 +1,252 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+from sidein.Sidein import Sidein
+from sidein.ns.exc.InvalidRefreshIntervalError import InvalidRefreshIntervalError
+from sidein.ns.exc.NotAnInjectedFunctionError import NotAnInjectedFunctionError
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+
+
+class _VersionedProvider(DependencyProviderInterface):
+    def __init__(self):
+        self.version = 0
+        self.resolution_count = 0
+
+    def get_dependency(self, name):
+        self.resolution_count += 1
+        return "{} v{}".format(name, self.version)
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.set_dependency_provider(_VersionedProvider())
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_generator_resolved_lazily(ns):
+    @ns.inject_dependencies("config")
+    def _generator(count, config):
+        for _ in range(count):
+            yield config
+
+    generator = _generator(2)
+    assert ns.get_dependency_provider().resolution_count == 0
+
+    ns.get_dependency_provider().version = 1
+    assert list(generator) == ["config v1", "config v1"]
+    assert ns.get_dependency_provider().resolution_count == 1
+
+
+def test_generator_return_value_and_send(ns):
+    @ns.inject_dependencies("config", as_kwargs=False)
+    def _generator(config):
+        received = yield config
+        return received
+
+    generator = _generator()
+    assert next(generator) == "config v0"
+    with pytest.raises(StopIteration) as exc_info:
+        generator.send("sent")
+    assert exc_info.value.value == "sent"
+
+
+def test_generator_refresh_every(ns):
+    @ns.inject_dependencies("config", refresh_every=2)
+    def _generator(config):
+        while True:
+            yield config.obtain_dependency()
+
+    generator = _generator()
+    items = []
+    for version in range(3):
+        items.append(next(generator))
+        items.append(next(generator))
+        ns.get_dependency_provider().version = version + 1
+
+    assert items == ["config v0", "config v0", "config v1", "config v1", "config v2", "config v2"]
+    assert ns.get_dependency_provider().resolution_count == 3
+
+
+def test_generator_refresh_send_throw_close(ns):
+    closed = []
+
+    @ns.inject_dependencies("config", refresh_every=1)
+    def _generator(config):
+        try:
+            while True:
+                try:
+                    received = yield config.obtain_dependency()
+                except ValueError:
+                    received = "thrown"
+                if received is not None:
+                    yield received
+        finally:
+            closed.append(True)
+
+    generator = _generator()
+    assert next(generator) == "config v0"
+    assert generator.send("sent") == "sent"
+    ns.get_dependency_provider().version = 1
+    assert next(generator) == "config v1"
+    assert generator.throw(ValueError()) == "thrown"
+    generator.close()
+    assert closed == [True]
+
+
+def test_generator_refresh_propagates_exception(ns):
+    @ns.inject_dependencies("config", refresh_every=1)
+    def _generator(config):
+        yield config.obtain_dependency()
+
+    generator = _generator()
+    next(generator)
+    with pytest.raises(KeyError):
+        generator.throw(KeyError())
+
+
+def test_async_generator(ns):
+    @ns.inject_dependencies("config")
+    async def _async_generator(count, config):
+        for _ in range(count):
+            yield config
+
+    async def _main():
+        async_generator = _async_generator(2)
+        assert ns.get_dependency_provider().resolution_count == 0
+        ns.get_dependency_provider().version = 1
+        return [item async for item in async_generator]
+
+    assert asyncio.run(_main()) == ["config v1", "config v1"]
+    assert ns.get_dependency_provider().resolution_count == 1
+
+
+def test_async_generator_asend_athrow_aclose(ns):
+    closed = []
+
+    @ns.inject_dependencies("config", refresh_every=1)
+    async def _async_generator(config):
+        try:
+            while True:
+                try:
+                    received = yield config.obtain_dependency()
+                except ValueError:
+                    received = "thrown"
+                if received is not None:
+                    yield received
+        finally:
+            closed.append(True)
+
+    async def _main():
+        async_generator = _async_generator()
+        assert await async_generator.__anext__() == "config v0"
+        assert await async_generator.asend("sent") == "sent"
+        ns.get_dependency_provider().version = 1
+        assert await async_generator.__anext__() == "config v1"
+        assert await async_generator.athrow(ValueError()) == "thrown"
+        await async_generator.aclose()
+
+    asyncio.run(_main())
+    assert closed == [True]
+
+
+def test_async_generator_exhausted(ns):
+    @ns.inject_dependencies("config", refresh_every=3)
+    async def _async_generator(config):
+        yield config.obtain_dependency()
+
+    async def _main():
+        return [item async for item in _async_generator()]
+
+    assert asyncio.run(_main()) == ["config v0"]
+
+
+@pytest.mark.parametrize("refresh_every", (0, -1, 1.5, True, "2"))
+def test_invalid_refresh_interval(ns, refresh_every):
+    def _generator(config):
+        yield config
+
+    with pytest.raises(InvalidRefreshIntervalError):
+        ns.inject_dependencies("config", refresh_every=refresh_every)(_generator)
+
+
+def test_refresh_interval_on_regular_function(ns):
+    def _function(config):
+        return config
+
+    with pytest.raises(InvalidRefreshIntervalError):
+        ns.inject_dependencies("config", refresh_every=1)(_function)
+
+
+def test_refresh_interval_with_in_obtainers(ns):
+    def _generator(config):
+        yield config
+
+    with pytest.raises(InvalidRefreshIntervalError):
+        ns.inject_dependencies("config", in_obtainers=True, refresh_every=1)(_generator)
+
+
+def test_bind_and_map_refreshing_generator(ns):
+    @ns.inject_dependencies("config", refresh_every=2)
+    def _generator(config):
+        yield config.obtain_dependency()
+
+    @ns.inject_dependencies("config", refresh_every=2)
+    async def _async_generator(config):
+        yield config.obtain_dependency()
+
+    for generator_func in (_generator, _async_generator):
+        with pytest.raises(NotAnInjectedFunctionError):
+            ns.bind(generator_func)
+
+        with pytest.raises(NotAnInjectedFunctionError):
+            ns.map(generator_func, [1])
+
+        with pytest.raises(NotAnInjectedFunctionError):
+            ns.imap(generator_func, [1])
+
+
+def test_bind_and_map_generator(ns):
+    @ns.inject_dependencies("config")
+    def _generator(count, config):
+        for _ in range(count):
+            yield config
+
+    assert list(ns.bind(_generator)(2)) == ["config v0", "config v0"]
+    assert [list(generator) for generator in ns.map(_generator, [1, 2])] == [["config v0"], ["config v0", "config v0"]]
@@ -0,0 +1,241 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import threading
+from sidein.Sidein import Sidein
+from sidein.ns.DependencyAttribute import DependencyAttribute
+from sidein.ns.DependencyCachingPolicy import DependencyCachingPolicy
+from sidein.ns.exc.DependencyAttributeError import DependencyAttributeError
+from sidein.providers.DependencyProviderInterface import DependencyProviderInterface
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+
+
+class _CountingProvider(DependencyProviderInterface):
+    def __init__(self):
+        self.resolution_count = 0
+
+    def get_dependency(self, name):
+        if name == "missing":
+            raise DependencyProviderException(name)
+
+        self.resolution_count += 1
+        return "{} #{}".format(name, self.resolution_count)
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    ns_.set_dependency_provider(_CountingProvider())
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+def test_per_instance(ns):
+    class _Repository:
+        database = ns.dependency("database")
+
+    repository = _Repository()
+    assert ns.get_dependency_provider().resolution_count == 0
+    assert repository.database == "database #1"
+    assert repository.database == "database #1"
+    assert vars(repository) == {"database": "database #1"}
+
+    assert _Repository().database == "database #2"
+
+    del repository.database
+    assert repository.database == "database #3"
+
+
+def test_per_class(ns):
+    class _Repository:
+        config = ns.dependency("config", DependencyCachingPolicy.PER_CLASS)
+
+    class _SubRepository(_Repository):
+        pass
+
+    assert _Repository().config == "config #1"
+    assert _Repository().config == "config #1"
+    assert _SubRepository().config == "config #1"
+    assert ns.get_dependency_provider().resolution_count == 1
+
+
+def test_per_class_concurrent(ns):
+    class _Repository:
+        config = ns.dependency("config", DependencyCachingPolicy.PER_CLASS)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_Repository().config)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["config #1"] * 8
+
+
+def test_never_cached(ns):
+    class _Repository:
+        clock = ns.dependency("clock", DependencyCachingPolicy.NEVER)
+
+    repository = _Repository()
+    assert repository.clock == "clock #1"
+    assert repository.clock == "clock #2"
+
+
+def test_override_applies(ns):
+    class _Repository:
+        database = ns.dependency("database", DependencyCachingPolicy.NEVER)
+
+    with ns.override(database="fake database"):
+        assert _Repository().database == "fake database"
+
+
+def test_class_access_returns_descriptor(ns):
+    class _Repository:
+        database = ns.dependency("database")
+
+    attribute = _Repository.database
+    assert isinstance(attribute, DependencyAttribute)
+    assert attribute.get_dependency_name() == "database"
+    assert attribute.get_attribute_name() == "database"
+    assert attribute.get_caching_policy() is DependencyCachingPolicy.PER_INSTANCE
+
+
+def test_slots_class(ns):
+    @ns.inject_dependency_attributes()
+    class _Repository:
+        """Docstring."""
+
+        __slots__ = ("value",)
+
+        database = ns.dependency("database")
+
+        def __init__(self, value):
+            self.value = value
+
+        def get(self):
+            return self.value, self.database
+
+    repository = _Repository(1)
+    assert not hasattr(repository, "__dict__")
+    assert _Repository.__name__ == "_Repository"
+    assert _Repository.__doc__ == "Docstring."
+    assert repository.get() == (1, "database #1")
+    assert repository.get() == (1, "database #1")
+    assert _Repository(2).get() == (2, "database #2")
+
+
+def test_slots_class_inherited(ns):
+    @ns.inject_dependency_attributes()
+    class _Base:
+        __slots__ = ()
+
+        database = ns.dependency("database")
+
+    @ns.inject_dependency_attributes()
+    class _Derived(_Base):
+        __slots__ = ()
+
+        cache = ns.dependency("cache")
+
+    derived = _Derived()
+    assert derived.database == "database #1"
+    assert derived.cache == "cache #2"
+    assert (derived.database, derived.cache) == ("database #1", "cache #2")
+    assert vars(_Derived)["__slots__"] == ("_sidein_dependency_cache",)
+
+
+def test_slots_class_with_custom_getattr(ns):
+    @ns.inject_dependency_attributes()
+    class _Proxy:
+        __slots__ = ()
+
+        database = ns.dependency("database")
+
+        def __getattr__(self, name):
+            return "proxied {}".format(name)
+
+    proxy = _Proxy()
+    assert proxy.database == "database #1"
+    assert proxy.database == "database #1"
+    assert proxy.other == "proxied other"
+
+
+def test_undecorated_slots_class_with_custom_getattr(ns):
+    class _Proxy:
+        __slots__ = ()
+
+        database = ns.dependency("database")
+
+        def __getattr__(self, name):
+            raise KeyError(name)
+
+    with pytest.raises(DependencyAttributeError):
+        _Proxy().database
+
+
+def test_dict_class_returned_unchanged(ns):
+    class _Repository:
+        database = ns.dependency("database")
+
+    assert ns.inject_dependency_attributes()(_Repository) is _Repository
+
+
+def test_undecorated_slots_class(ns):
+    class _Repository:
+        __slots__ = ()
+
+        database = ns.dependency("database")
+
+    with pytest.raises(DependencyAttributeError):
+        _Repository().database
+
+
+def test_missing_dependency(ns):
+    class _Repository:
+        database = ns.dependency("missing")
+
+    with pytest.raises(DependencyProviderException):
+        _Repository().database
+
+
+def test_invalid_arguments(ns):
+    with pytest.raises(DependencyAttributeError):
+        ns.dependency("database", "per_instance")
+
+    with pytest.raises(DependencyAttributeError):
+        ns.inject_dependency_attributes()(lambda: None)
@@ -0,0 +1,146 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import asyncio
+from sidein.Sidein import Sidein
+from sidein.ns.exc.NotAFunctionError import NotAFunctionError
+from sidein.obtainer.DependencyObtainerInterface import DependencyObtainerInterface
+from sidein.tracing.RecordingTracingHook import RecordingTracingHook
+from sidein.tracing.TracingOperation import TracingOperation
+
+
+@pytest.fixture
+def ns():
+    ns_name = __file__
+
+    ns_ = Sidein.ns(ns_name)
+    container = ns_.get_dependency_provider()
+    container.add_dependency("database", "database value")
+    container.add_dependency("cache", "cache value")
+    yield ns_
+
+    Sidein.get_namespace_manager().remove_namespace(ns_name)
+
+
+@pytest.mark.parametrize("as_kwargs", (True, False))
+@pytest.mark.parametrize("names", (("database",), ("database", "cache")))
+def test_method_injection(ns, as_kwargs, names):
+    class _Repository:
+        def __init__(self, prefix):
+            self.prefix = prefix
+
+        @ns.inject_method_dependencies(*names, as_kwargs=as_kwargs)
+        def get(self, argument, database=None, cache=None, keyword=None):
+            return self.prefix, argument, database, cache, keyword
+
+    expected_cache = "cache value" if "cache" in names else None
+    assert _Repository("p").get(1) == ("p", 1, "database value", expected_cache, None)
+    assert _Repository("p").get(1, keyword=2) == ("p", 1, "database value", expected_cache, 2)
+    assert _Repository("p").get.__name__ == "get"
+
+
+def test_instance_keyword_passed_through(ns):
+    class _Repository:
+        @ns.inject_method_dependencies("database")
+        def get(self, instance, database):
+            return instance, database
+
+    assert _Repository().get(instance="argument") == ("argument", "database value")
+
+
+def test_classmethod(ns):
+    class _Repository:
+        @classmethod
+        @ns.inject_method_dependencies("database", as_kwargs=False)
+        def get(cls, database):
+            return cls, database
+
+    assert _Repository.get() == (_Repository, "database value")
+
+
+def test_in_obtainers(ns):
+    class _Repository:
+        @ns.inject_method_dependencies("database", in_obtainers=True)
+        def get(self, database):
+            return database
+
+    obtainer = _Repository().get()
+    assert isinstance(obtainer, DependencyObtainerInterface)
+    assert obtainer.obtain_dependency() == "database value"
+
+
+def test_override_applies(ns):
+    class _Repository:
+        @ns.inject_method_dependencies("database")
+        def get(self, database):
+            return database
+
+    with ns.override(database="fake database"):
+        assert _Repository().get() == "fake database"
+
+
+def test_tracing(ns):
+    class _Repository:
+        @ns.inject_method_dependencies("database", "cache", as_kwargs=False)
+        def get(self, database, cache):
+            return database, cache
+
+    hook = RecordingTracingHook()
+    ns.set_tracing_hook(hook)
+    assert _Repository().get() == ("database value", "cache value")
+    assert TracingOperation.DEPENDENCY_INJECTION in [event.get_operation() for event in hook.get_recorded_events()]
+
+
+def test_bind(ns):
+    class _Repository:
+        @ns.inject_method_dependencies("database")
+        def get(self, argument, database):
+            return argument, database
+
+    repository = _Repository()
+    assert ns.bind(_Repository.get)(repository, 1) == (1, "database value")
+
+
+def test_async_method(ns):
+    class _Repository:
+        @ns.inject_method_dependencies("database")
+        async def get(self, database):
+            return database
+
+    assert asyncio.run(_Repository().get()) == "database value"
+
+
+def test_not_a_function(ns):
+    with pytest.raises(NotAFunctionError):
+        ns.inject_method_dependencies("database")(1)
@@ -0,0 +1,130 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import pickle
+import importlib
+import multiprocessing
+import concurrent.futures
+from sidein.Sidein import Sidein
+from sidein.ns.exc.NotPicklableFunctionError import NotPicklableFunctionError
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+
+
+@pytest.fixture
+def functions():
+    functions_ = importlib.reload(importlib.import_module("_picklable_injection_functions"))
+
+    container = GlobalSimpleContainer()
+    container.add_dependency("multiplier", 2)
+    container.add_dependency("addend", 3)
+    container.add_dependency("decorators", {"decorator": functions_.negating_decorator})
+    Sidein.ns(functions_.NAMESPACE_NAME).set_dependency_provider(container)
+    yield functions_
+
+    Sidein.get_namespace_manager().remove_namespace(functions_.NAMESPACE_NAME)
+
+
+def test_module_level_decorator(functions):
+    restored = pickle.loads(pickle.dumps(functions.multiply))
+    assert restored is functions.multiply
+    assert restored(5) == 10
+
+
+def test_decorated_without_rebinding(functions):
+    restored = pickle.loads(pickle.dumps(functions.add_injected))
+    assert restored is not functions.add_injected
+    assert restored(5) == 8
+
+    assert pickle.loads(pickle.dumps(restored))(1) == 4
+
+
+def test_decorate_with_dependency(functions):
+    restored = pickle.loads(pickle.dumps(functions.identity))
+    assert restored is functions.identity
+    assert restored(5) == -5
+
+
+def test_method(functions):
+    calculator = pickle.loads(pickle.dumps(functions.Calculator()))
+    assert calculator.multiply(5) == 10
+    assert pickle.loads(pickle.dumps(calculator.multiply))(6) == 12
+
+
+def test_metadata_and_bind(functions):
+    assert functions.add_injected.__name__ == "add"
+    assert functions.add_injected.__wrapped__ is not None
+    assert Sidein.ns(functions.NAMESPACE_NAME).bind(functions.add_injected)(5) == 8
+
+
+def test_nested_function(functions):
+    ns = Sidein.ns(functions.NAMESPACE_NAME)
+
+    def _nested(addend):
+        return addend
+
+    with pytest.raises(NotPicklableFunctionError):
+        ns.inject_dependencies("addend", picklable=True)(_nested)
+
+    with pytest.raises(NotPicklableFunctionError):
+        ns.decorate_with_dependency("decorators", functions.extract_decorator, picklable=True)(lambda: None)
+
+
+def test_stacked_decorators(functions):
+    assert functions.multiply_and_add(5) == 13
+
+
+@pytest.mark.parametrize("decorator_name", ("inject_dependencies", "decorate_with_dependency"))
+def test_non_regular_functions(functions, decorator_name):
+    ns = Sidein.ns(functions.NAMESPACE_NAME)
+    decorator = (ns.inject_dependencies("addend", picklable=True) if decorator_name == "inject_dependencies" else ns.decorate_with_dependency("decorators", functions.extract_decorator, picklable=True))
+
+    async def _coroutine_function(addend=None):
+        return addend
+
+    def _generator_function(addend=None):
+        yield addend
+
+    async def _async_generator_function(addend=None):
+        yield addend
+
+    for func in (_coroutine_function, _generator_function, _async_generator_function):
+        with pytest.raises(NotPicklableFunctionError, match="regular functions"):
+            decorator(func)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="The 'fork' start method is not available.")
+def test_process_pool_executor(functions):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork"), initializer=functions.initialize_worker) as executor:
+        assert list(executor.map(functions.multiply, range(4))) == [0, 100, 200, 300]
+        assert list(executor.map(functions.add_injected, range(4))) == [3, 4, 5, 6]
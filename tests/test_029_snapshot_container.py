@@ -0,0 +1,175 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+import pickle
+import threading
+import multiprocessing
+import concurrent.futures
+from sidein.Sidein import Sidein
+from sidein.providers.snapshot.DependencySnapshot import DependencySnapshot
+from sidein.providers.snapshot.SnapshotContainer import SnapshotContainer
+from sidein.providers.snapshot.exc.DependencyInSnapshotNotFoundException import DependencyInSnapshotNotFoundException
+from sidein.providers.snapshot.exc.InvalidSnapshotError import InvalidSnapshotError
+from sidein.providers.snapshot.exc.SnapshotSerializationError import SnapshotSerializationError
+from sidein.providers.exc.DependencyProviderException import DependencyProviderException
+from sidein.providers.simplecontainer.GlobalSimpleContainer import GlobalSimpleContainer
+
+
+DEPENDENCIES = {
+    "lookup_table": {number: number * number for number in range(1000)},
+    "schema": {"type": "object", "properties": {"name": {"type": "string"}}},
+    "empty": None,
+}
+
+
+@pytest.fixture(params=("shared_memory", "file"))
+def snapshot(request, tmp_path):
+    if request.param == "shared_memory":
+        snapshot_ = DependencySnapshot.export_to_shared_memory(DEPENDENCIES)
+    else:
+        snapshot_ = DependencySnapshot.export_to_file(DEPENDENCIES, str(tmp_path / "snapshot.bin"))
+
+    yield snapshot_
+
+    snapshot_.close()
+    snapshot_.unlink()
+
+
+def test_snapshot(snapshot):
+    assert snapshot.get_dependency_names() == ("lookup_table", "schema", "empty")
+    assert snapshot.has_dependency("schema")
+    assert not snapshot.has_dependency("missing")
+    assert snapshot.load_dependency("lookup_table") == DEPENDENCIES["lookup_table"]
+    assert snapshot.load_dependency("empty") is None
+
+    with pytest.raises(KeyError):
+        snapshot.load_dependency("missing")
+
+
+def test_pickled_snapshot_attaches(snapshot):
+    with pickle.loads(pickle.dumps(snapshot)) as attached_snapshot:
+        assert attached_snapshot.get_shared_memory_name() == snapshot.get_shared_memory_name()
+        assert attached_snapshot.get_file_path() == snapshot.get_file_path()
+        assert attached_snapshot.load_dependency("schema") == DEPENDENCIES["schema"]
+
+
+def test_container_loads_lazily(snapshot):
+    container = SnapshotContainer(snapshot)
+    assert container.get_snapshot() is snapshot
+    assert container.get_all_dependency_names() == ("lookup_table", "schema", "empty")
+    assert container.get_never_loaded_names() == ("empty", "lookup_table", "schema")
+
+    schema = container.get_dependency("schema")
+    assert schema == DEPENDENCIES["schema"]
+    assert container.get_dependency("schema") is schema
+    assert container.get_never_loaded_names() == ("empty", "lookup_table")
+
+    assert container.get_dependency("empty") is None
+    assert container.get_never_loaded_names() == ("lookup_table",)
+
+
+def test_container_missing_dependency(snapshot):
+    container = SnapshotContainer(snapshot)
+
+    with pytest.raises(DependencyInSnapshotNotFoundException):
+        container.get_dependency("missing")
+
+    assert issubclass(DependencyInSnapshotNotFoundException, DependencyProviderException)
+
+
+def test_container_concurrent_loading(snapshot):
+    container = SnapshotContainer(snapshot)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(container.get_dependency("lookup_table"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result is results[0] for result in results)
+
+
+def test_loaded_dependencies_survive_closing(tmp_path):
+    snapshot = DependencySnapshot.export_to_file(DEPENDENCIES, str(tmp_path / "snapshot.bin"))
+    container = SnapshotContainer(snapshot)
+    schema = container.get_dependency("schema")
+    snapshot.close()
+    snapshot.close()
+
+    assert container.get_dependency("schema") is schema
+    with pytest.raises(InvalidSnapshotError):
+        container.get_dependency("lookup_table")
+
+
+def test_export_from_simple_container():
+    simple_container = GlobalSimpleContainer()
+    simple_container.add_dependency("schema", DEPENDENCIES["schema"])
+
+    with DependencySnapshot.export_to_shared_memory(simple_container.get_all_dependencies_view()) as snapshot:
+        assert SnapshotContainer(snapshot).get_dependency("schema") == DEPENDENCIES["schema"]
+        snapshot.unlink()
+
+
+def test_unserializable_dependency(tmp_path):
+    with pytest.raises(SnapshotSerializationError) as exc_info:
+        DependencySnapshot.export_to_file({"function": lambda: None}, str(tmp_path / "snapshot.bin"))
+
+    assert exc_info.value.get_raised_exception() is not None
+
+
+def test_invalid_file(tmp_path):
+    file_path = tmp_path / "snapshot.bin"
+
+    file_path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(InvalidSnapshotError):
+        DependencySnapshot.attach_to_file(str(file_path))
+
+    file_path.write_bytes(b"short")
+    with pytest.raises(InvalidSnapshotError):
+        DependencySnapshot.attach_to_file(str(file_path))
+
+
+def _initialize_worker(snapshot):
+    Sidein.ns(__file__).set_dependency_provider(SnapshotContainer(snapshot))
+
+
+def _look_up(number):
+    return Sidein.ns(__file__).get_dependency("lookup_table")[number]
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="The 'fork' start method is not available.")
+def test_process_pool_executor(snapshot):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork"), initializer=_initialize_worker, initargs=(snapshot,)) as executor:
+        assert list(executor.map(_look_up, range(5))) == [0, 1, 4, 9, 16]
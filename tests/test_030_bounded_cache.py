@@ -0,0 +1,85 @@
+#!/bin/false
+
+# Copyright (c) 2022 Vít Labuda. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#  1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#     disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#     following disclaimer in the documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote
+#     products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import sys
+import os
+import os.path
+if "SIDEIN_TESTS_AUTOPATH" in os.environ:
+    __TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+    __MODULE_DIR = os.path.realpath(os.path.join(__TESTS_DIR, ".."))
+    if __TESTS_DIR not in sys.path:
+        sys.path.insert(0, __TESTS_DIR)
+    if __MODULE_DIR not in sys.path:
+        sys.path.insert(0, __MODULE_DIR)
+
+import pytest
+from sidein.providers._BoundedCache import _BoundedCache
+
+
+@pytest.fixture
+def cache():
+    yield _BoundedCache(3)
+
+
+def test_get_and_put(cache):
+    assert cache.get("key") is None
+    assert cache.get("key", "default") == "default"
+
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+    assert len(cache) == 1
+
+
+def test_oldest_entry_is_evicted(cache):
+    for index in range(5):
+        cache.put(index, str(index))
+
+    assert len(cache) == 3
+    assert [cache.get(index) for index in range(5)] == [None, None, "2", "3", "4"]
+
+
+def test_replacing_entry_does_not_evict(cache):
+    for index in range(3):
+        cache.put(index, str(index))
+
+    cache.put(0, "replaced")
+    assert [cache.get(index) for index in range(3)] == ["replaced", "1", "2"]
+
+
+def test_pop_and_clear(cache):
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    cache.pop("a")
+    cache.pop("nonexistent")
+    assert (cache.get("a"), cache.get("b")) == (None, 2)
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_default_max_size():
+    cache = _BoundedCache()
+    for index in range(10000):
+        cache.put(index, index)
+
+    assert len(cache) == _BoundedCache.DEFAULT_MAX_SIZE